@@ -6,8 +6,9 @@ from typing import NamedTuple, NoReturn
 
 from cachetools import LRUCache
 
-from explainshell import errors
+from explainshell import errors, timing
 from explainshell.models import ParsedManpage
+from explainshell.name_index import NameIndex
 from explainshell.store import Store
 
 
@@ -28,6 +29,8 @@ class ManpageCacheInfo(NamedTuple):
     entries: int
     size_bytes: int
     max_bytes: int
+    # Lookups answered by the name index without touching the cache or DB.
+    rejected: int
 
 
 # Sized for our current prod instances.
@@ -100,6 +103,7 @@ class CachingStore(Store):
         max_cache_bytes: int = _MANPAGE_CACHE_MAX_BYTES,
         max_entry_bytes: int = _MANPAGE_CACHE_MAX_ENTRY_BYTES,
         max_entries: int = _MANPAGE_CACHE_MAX_ENTRIES,
+        name_index: NameIndex | None = None,
     ) -> None:
         self._db_path = db_path
         self._local = local()
@@ -115,6 +119,10 @@ class CachingStore(Store):
         self._manpage_cache_misses = 0
         self._manpage_cache_max_entry_bytes = max_entry_bytes
         self._manpage_cache_max_entries = max_entries
+        # Prebuilt by the caller at boot (see web/__init__.py) so it is ready
+        # before the first request; otherwise built on first nearest_names().
+        self._name_index = name_index
+        self._name_index_rejects = 0
 
     @property
     def _conn(self) -> sqlite3.Connection:
@@ -157,31 +165,76 @@ class CachingStore(Store):
     def find_man_page(
         self, name: str, distro: str | None = None, release: str | None = None
     ) -> list[ParsedManpage]:
-        key = (name, distro, release)
-        with self._lock:
-            try:
-                value = self._manpage_cache[key]
-            except KeyError:
-                self._manpage_cache_misses += 1
-            else:
-                self._manpage_cache_hits += 1
-                if isinstance(value, _FindManpageMiss):
-                    raise errors.ProgramDoesNotExist(*value.args)
-                return list(value)
-
-        try:
-            value: _CacheValue = tuple(
-                self._store().find_man_page(name, distro=distro, release=release)
-            )
-        except errors.ProgramDoesNotExist as exc:
-            value = _FindManpageMiss(exc.args)
+        with timing.stage("lookup-miss") as stage:
+            rejected = self._reject_unknown_name(name)
+            if rejected is not None:
+                stage.name = "lookup-rejected"
+                # Not cached: typos and junk tokens would only evict real entries.
+                with self._lock:
+                    self._name_index_rejects += 1
+                raise errors.ProgramDoesNotExist(rejected)
+
+            key = (name, distro, release)
+            with self._lock:
+                try:
+                    value = self._manpage_cache[key]
+                except KeyError:
+                    self._manpage_cache_misses += 1
+                else:
+                    self._manpage_cache_hits += 1
+                    stage.name = "lookup-hit"
+                    if isinstance(value, _FindManpageMiss):
+                        raise errors.ProgramDoesNotExist(*value.args)
+                    return list(value)
 
+            try:
+                value: _CacheValue = tuple(
+                    self._store().find_man_page(name, distro=distro, release=release)
+                )
+            except errors.ProgramDoesNotExist as exc:
+                value = _FindManpageMiss(exc.args)
+
+            with self._lock:
+                self._cache_manpage(key, value)
+
+            if isinstance(value, _FindManpageMiss):
+                raise errors.ProgramDoesNotExist(*value.args)
+            return list(value)
+
+    def _reject_unknown_name(self, name: str) -> str | None:
+        """Return the ProgramDoesNotExist argument if *name* cannot match.
+
+        Mirrors the mapping lookups in Store.find_man_page (exact name, then
+        the name with a trailing ``.section`` removed). Returns None when
+        there is no index or the lookup has to go to the DB.
+        """
+        index = self._name_index
+        if index is None or name.endswith(".gz") or name in index:
+            return None
+        if name != ".":
+            head, separator, _ = name.rpartition(".")
+            if separator:
+                return None if head in index else head
+        return name
+
+    def nearest_names(self, name: str, k: int = 5, max_distance: int = 2) -> list[str]:
+        """Return up to *k* known command names within *max_distance* edits.
+
+        Used for "did you mean" suggestions; see NameIndex.nearest.
+        """
+        if self._name_index is None:
+            with self._lock:
+                if self._name_index is None:
+                    self._name_index = NameIndex(self._store().mapping_names())
+        return self._name_index.nearest(name, k=k, max_distance=max_distance)
+
+    def cached_keys(self) -> list[_CacheKey]:
+        """Return the keys of cached lookups.
+
+        Used to warm a replacement store before it takes over.
+        """
         with self._lock:
-            self._cache_manpage(key, value)
-
-        if isinstance(value, _FindManpageMiss):
-            raise errors.ProgramDoesNotExist(*value.args)
-        return list(value)
+            return list(self._manpage_cache)
 
     def manpage_cache_info(self) -> ManpageCacheInfo:
         with self._lock:
@@ -191,6 +244,7 @@ class CachingStore(Store):
                 entries=len(self._manpage_cache),
                 size_bytes=self._manpage_cache.currsize,
                 max_bytes=self._manpage_cache.maxsize,
+                rejected=self._name_index_rejects,
             )
 
     def _cache_manpage(self, key: _CacheKey, value: _CacheValue) -> None:
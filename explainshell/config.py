@@ -4,10 +4,53 @@ import os
 HOST_IP = os.getenv("HOST_IP", "")
 DB_PATH = os.getenv("DB_PATH")
 DEBUG = os.getenv("DEBUG", "true").lower() not in ("0", "false", "no")
+# Seconds between checks for a new DB (a changed DB_PATH.sha256 sidecar) in
+# non-debug serving. 0 disables hot-swapping: the DB is then fixed for the
+# lifetime of the process.
+DB_RELOAD_INTERVAL = float(os.getenv("DB_RELOAD_INTERVAL", "0"))
+# Per-stage timings of /explain requests (see explainshell.timing), as a
+# comma-separated list of sinks: "header" adds a Server-Timing response
+# header, "log" logs them as structured fields. Empty disables timing.
+SERVER_TIMING = frozenset(s for s in os.getenv("SERVER_TIMING", "").split(",") if s)
+# Serve Prometheus metrics at /metrics (see explainshell.web.metrics).
+METRICS = os.getenv("METRICS", "false").lower() in ("1", "true", "yes")
 MANDOC_PATH = os.getenv(
     "MANDOC_PATH",
     os.path.join(os.path.dirname(os.path.dirname(__file__)), "tools", "mandoc-md"),
 )
+# Pages rendered per mandoc process during extraction (see
+# explainshell.extraction.mandoc). 0 or 1 runs mandoc once per page.
+MANDOC_BATCH_SIZE = int(os.getenv("MANDOC_BATCH_SIZE", "0"))
+# How manpage.get_synopsis_and_aliases reads a page's NAME section:
+# "lexgrog" (run man-db's lexgrog), "native" (parse the roff source), or
+# "verify" (run both, warn when they differ, keep lexgrog's answer). Stays
+# on lexgrog until tools/name_conformance.py agrees on a full release.
+NAME_PARSER = os.getenv("NAME_PARSER", "lexgrog")
+# Content-addressed cache of LLM responses used by `manager extract` (disable
+# per run with --no-llm-cache), and the size it is trimmed to.
+LLM_CACHE_DIR = os.getenv(
+    "LLM_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "explainshell",
+        "llm",
+    ),
+)
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "1024"))
+# Sidecar cache of input .gz digests keyed by (path, size, mtime, inode), so
+# `manager extract` only re-hashes files that changed. Empty disables it.
+SHA256_CACHE_PATH = os.getenv(
+    "SHA256_CACHE_PATH",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+        "explainshell",
+        "sha256.sqlite3",
+    ),
+)
+# Requests / tokens per minute allowed for interactive LLM extraction calls
+# (the provider account's limits); 0 means unlimited.
+LLM_RPM = int(os.getenv("LLM_RPM", "0"))
+LLM_TPM = int(os.getenv("LLM_TPM", "0"))
 
 # Mapping from source-path prefix to external URL template.
 # Templates may use {section} and {name} placeholders.
@@ -2,138 +2,238 @@
 
 Checks:
     - Malformed source paths (must be distro/release/section/name.section.gz)
+    - Corrupt options JSON
     - Shadowed duplicates (same name+section+distro from different sources)
     - Orphaned mappings (mapping rows referencing non-existent manpage sources)
     - Unreachable manpages (manpages with no mapping pointing to them)
     - positional set on flagged options (positional should only be on positional operands)
     - Stale subcommand mappings (mapping for "cmd sub" but parent doesn't declare it)
+
+Everything but the source path regex runs in SQL: duplicates are a GROUP BY,
+orphans and unreachable manpages anti-joins, and options and subcommands are
+read with SQLite's JSON functions. Source paths (and the error message of
+corrupt options JSON) are checked in one streaming pass over the rows.
+
+Every check only relates rows of the same distro/release, so with
+``jobs > 1`` the checks run per distro/release shard, on that many threads
+(sqlite releases the GIL while it runs a query).
 """
 
+import concurrent.futures
 import json
 import os
 import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-from explainshell import config, errors, util
-from explainshell.store import validate_source_path
+from explainshell import errors, util
+from explainshell.store import distro_sql, release_sql, validate_source_path
 
+Issue = tuple[str, str]
 
-def check(db_path: str) -> list[tuple[str, str]]:
-    """Run integrity checks and return a list of (severity, message) tuples."""
-    conn = sqlite3.connect(db_path)
+
+@dataclass
+class CheckResult:
+    """Issues found, and the seconds each check took (summed over shards)."""
+
+    issues: list[Issue] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    shards: int = 1
+
+
+@dataclass(frozen=True)
+class _Shard:
+    """The rows one run of the checks looks at.
+
+    ``manpages`` is an SQL condition on a parsed_manpages source column,
+    written with a ``{source}`` placeholder; ``mappings`` one on a mappings
+    row, written with ``{distro}``/``{release}`` placeholders.
+    """
+
+    manpages: str = "1"
+    manpages_params: tuple = ()
+    mappings: str = "1"
+    mappings_params: tuple = ()
+
+    def manpages_where(self, source: str) -> str:
+        return self.manpages.format(source=source)
+
+    def mappings_where(self, distro: str, release: str) -> str:
+        return self.mappings.format(distro=distro, release=release)
+
+
+def _section(source: str) -> str:
+    return util.name_section(os.path.basename(source)[:-3])[1]
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
+    conn.create_function("es_section", 1, _section, deterministic=True)
+    return conn
+
 
-    issues: list[tuple[str, str]] = []
+def _mapping_partition(conn: sqlite3.Connection, alias: str) -> tuple[str, str]:
+    """(distro, release) expressions for mappings row *alias*.
 
-    # 1. Malformed source paths.
-    for row in conn.execute("SELECT source, name FROM parsed_manpages"):
+    Uses the indexed partition columns, or their definition on DBs built
+    before they existed.
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_xinfo(mappings)")}
+    if "distro" in columns:
+        return f"{alias}.distro", f"{alias}.release"
+    return distro_sql(f"{alias}.dst"), release_sql(f"{alias}.dst")
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+
+def _check_rows(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """Malformed source paths and corrupt options JSON, in one pass."""
+    issues: list[Issue] = []
+    rows = conn.execute(
+        "SELECT source, name, "
+        "CASE WHEN options != '' AND NOT json_valid(options) THEN options END "
+        "AS bad_options "
+        f"FROM parsed_manpages WHERE {shard.manpages_where('source')}",
+        shard.manpages_params,
+    )
+    for source, name, bad_options in rows:
         try:
-            validate_source_path(row["source"])
+            validate_source_path(source)
         except errors.InvalidSourcePath:
             issues.append(
-                (
-                    "error",
-                    (
-                        f"malformed source path: {row['source']!r} "
-                        f"(manpage {row['name']!r})"
-                    ),
-                )
+                ("error", f"malformed source path: {source!r} (manpage {name!r})")
             )
+        if bad_options is not None:
+            try:
+                json.loads(bad_options)
+            except (json.JSONDecodeError, TypeError) as exc:
+                issues.append(
+                    ("error", f"corrupt options JSON: {name!r} ({source!r}): {exc}")
+                )
+    return issues
 
-    # 2. Shadowed duplicates: same name+section+distro from different sources.
-    rows = conn.execute("SELECT source, name FROM parsed_manpages").fetchall()
-    seen: dict[tuple[str, str, str, str], str] = {}
-    for row in rows:
-        source = row["source"]
-        name = row["name"]
-        try:
-            distro, release = config.parse_distro_release(source)
-        except (IndexError, ValueError):
-            continue  # already caught by malformed-source check
-        _, section = util.name_section(os.path.basename(source)[:-3])
-        key = (name, section, distro, release)
-        if key in seen:
+
+def _check_duplicates(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """Shadowed duplicates: same name+section+distro from different sources."""
+    issues: list[Issue] = []
+    # Sources without distro/release/section/file are malformed, which
+    # _check_rows reports.
+    rows = conn.execute(
+        "SELECT name, es_section(source) AS section, "
+        f"{distro_sql('source')} AS distro, {release_sql('source')} AS release, "
+        "json_group_array(json_array(rowid, source)) AS sources "
+        "FROM parsed_manpages "
+        f"WHERE source LIKE '%/%/%/%' AND {shard.manpages_where('source')} "
+        "GROUP BY name, section, distro, release HAVING COUNT(*) > 1",
+        shard.manpages_params,
+    )
+    for name, section, distro, release, sources in rows:
+        first, *rest = [s for _, s in sorted(json.loads(sources))]
+        for source in rest:
             issues.append(
                 (
                     "error",
                     (
                         f"shadowed duplicate: {name}({section}) in {distro}/{release} "
-                        f"from both {seen[key]!r} and {source!r}"
+                        f"from both {first!r} and {source!r}"
                     ),
                 )
             )
-        else:
-            seen[key] = source
+    return issues
 
-    # 3. Orphaned mappings: mapping rows referencing non-existent manpage sources.
-    orphans = conn.execute(
+
+def _check_orphans(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """Orphaned mappings: mapping rows referencing non-existent manpage sources."""
+    distro, release = _mapping_partition(conn, "m")
+    rows = conn.execute(
         "SELECT m.src, m.dst FROM mappings m "
-        "LEFT JOIN parsed_manpages mp ON m.dst = mp.source WHERE mp.source IS NULL"
-    ).fetchall()
-    for row in orphans:
+        "LEFT JOIN parsed_manpages mp ON m.dst = mp.source "
+        f"WHERE mp.source IS NULL AND {shard.mappings_where(distro, release)}",
+        shard.mappings_params,
+    )
+    return [
+        (
+            "error",
+            f"orphaned mapping: src={src!r} -> dst={dst!r} (manpage does not exist)",
+        )
+        for src, dst in rows
+    ]
+
+
+def _check_positional(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """positional set on options that also have flags."""
+    # Corrupt options JSON reads as no options (_check_rows reports it).
+    # SQL narrows the scan to flagged options with a positional; the option
+    # itself is decoded here so the message shows Python values (True, not
+    # SQLite's 1).
+    rows = conn.execute(
+        "SELECT p.name, o.value "
+        "FROM parsed_manpages p, "
+        "json_each(CASE WHEN json_valid(p.options) THEN p.options ELSE '[]' END) o "
+        f"WHERE {shard.manpages_where('p.source')} "
+        "AND json_extract(o.value, '$.positional') IS NOT NULL "
+        "AND (json_array_length(o.value, '$.short') > 0 "
+        "OR json_array_length(o.value, '$.long') > 0)",
+        shard.manpages_params,
+    )
+    issues: list[Issue] = []
+    for name, value in rows:
+        o = json.loads(value)
+        positional = o.get("positional")
+        if not positional:
+            continue
+        flags = (o.get("short") or []) + (o.get("long") or [])
         issues.append(
             (
-                "error",
+                "warning",
                 (
-                    f"orphaned mapping: src={row['src']!r} -> dst={row['dst']!r} "
-                    f"(manpage does not exist)"
+                    f"positional on flagged option: {name!r} has "
+                    f"positional={positional!r} on option {flags}"
                 ),
             )
         )
+    return issues
 
-    # 4. positional set on flagged options.
-    for row in conn.execute("SELECT source, name, options FROM parsed_manpages"):
-        opts_json = row["options"]
-        if not opts_json:
-            continue
-        try:
-            opts = json.loads(opts_json)
-        except (json.JSONDecodeError, TypeError) as exc:
-            issues.append(
-                (
-                    "error",
-                    f"corrupt options JSON: {row['name']!r} ({row['source']!r}): {exc}",
-                )
-            )
-            continue
-        for o in opts:
-            short = o.get("short") or []
-            long = o.get("long") or []
-            positional = o.get("positional")
-            if positional and (short or long):
-                flags = short + long
-                issues.append(
-                    (
-                        "warning",
-                        (
-                            f"positional on flagged option: {row['name']!r} has "
-                            f"positional={positional!r} on option {flags}"
-                        ),
-                    )
-                )
 
-    # 5. Stale subcommand mappings: subcommand mapping exists but the parent
-    #    manpage doesn't declare that subcommand.
-    # Exclude alias mappings where src matches the manpage name (e.g.
-    # "pg_autoctl config check" is a real manpage name, not a subcommand).
-    subcmd_mappings = conn.execute(
-        "SELECT m.src, m.dst FROM mappings m "
+def _check_subcommands(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """Stale subcommand mappings: the parent manpage (in the same
+    distro/release) is missing or doesn't declare the subcommand.
+
+    Alias mappings whose src is the manpage's own name (e.g.
+    "pg_autoctl config check" is a real manpage name, not a subcommand) are
+    not subcommand mappings.
+    """
+    distro, release = _mapping_partition(conn, "m")
+    parent = "SUBSTR(m.src, 1, INSTR(m.src, ' ') - 1)"
+    sub = "SUBSTR(m.src, INSTR(m.src, ' ') + 1)"
+    # The first parent row (by rowid) of each name, per distro/release.
+    rows = conn.execute(
+        "WITH parents AS ("
+        f"  SELECT name, {distro_sql('source')} AS distro, "
+        f"  {release_sql('source')} AS release, subcommands, MIN(rowid) "
+        f"  FROM parsed_manpages WHERE {shard.manpages_where('source')} "
+        "  GROUP BY name, distro, release"
+        ") "
+        f"SELECT m.src, m.dst, {parent} AS parent, {sub} AS sub, "
+        "p.subcommands IS NULL AS missing "
+        "FROM mappings m "
         "JOIN parsed_manpages mp ON m.dst = mp.source "
-        "WHERE m.src LIKE '% %' AND m.src != mp.name"
-    ).fetchall()
-    for row in subcmd_mappings:
-        src = row["src"]
-        dst = row["dst"]
-        parent_name = src.split(" ", 1)[0]
-        sub_name = src.split(" ", 1)[1]
-        # Scope parent lookup to the same distro/release as the mapping dst.
-        # dst format: "distro/release/section/file.gz"
-        dr_prefix = dst.rsplit("/", 2)[0] + "/"  # "distro/release/"
-        parent_row = conn.execute(
-            "SELECT subcommands FROM parsed_manpages "
-            "WHERE name = ? AND source LIKE ? LIMIT 1",
-            (parent_name, dr_prefix + "%"),
-        ).fetchone()
-        if parent_row is None:
+        f"LEFT JOIN parents p ON p.name = {parent} "
+        f"AND p.distro = {distro} AND p.release = {release} "
+        "WHERE m.src LIKE '% %' AND m.src != mp.name "
+        f"AND {shard.mappings_where(distro, release)} "
+        "AND (p.subcommands IS NULL OR NOT EXISTS ("
+        f"  SELECT 1 FROM json_each(p.subcommands) WHERE value = {sub}))",
+        shard.manpages_params + shard.mappings_params,
+    )
+    issues: list[Issue] = []
+    for src, dst, parent_name, sub_name, missing in rows:
+        if missing:
             issues.append(
                 (
                     "error",
@@ -144,34 +244,118 @@ def check(db_path: str) -> list[tuple[str, str]]:
                 )
             )
         else:
-            subcommands = json.loads(parent_row["subcommands"])
-            if sub_name not in subcommands:
-                issues.append(
+            issues.append(
+                (
+                    "warning",
                     (
-                        "warning",
-                        (
-                            f"stale subcommand mapping: {src!r} -> {dst!r} "
-                            f"(parent {parent_name!r} does not declare "
-                            f"{sub_name!r} in subcommands)"
-                        ),
-                    )
+                        f"stale subcommand mapping: {src!r} -> {dst!r} "
+                        f"(parent {parent_name!r} does not declare "
+                        f"{sub_name!r} in subcommands)"
+                    ),
                 )
+            )
+    return issues
 
-    # 6. Unreachable manpages: manpages with no mapping pointing to them.
-    unreachable = conn.execute(
+
+def _check_unreachable(conn: sqlite3.Connection, shard: _Shard) -> list[Issue]:
+    """Unreachable manpages: manpages with no mapping pointing to them."""
+    rows = conn.execute(
         "SELECT mp.name, mp.source FROM parsed_manpages mp "
-        "LEFT JOIN mappings m ON mp.source = m.dst WHERE m.src IS NULL"
+        "LEFT JOIN mappings m ON mp.source = m.dst "
+        f"WHERE m.src IS NULL AND {shard.manpages_where('mp.source')}",
+        shard.manpages_params,
+    )
+    return [
+        (
+            "warning",
+            f"unreachable manpage: {name!r} ({source!r}) has no mappings",
+        )
+        for name, source in rows
+    ]
+
+
+_CHECKS: tuple[tuple[str, Callable[[sqlite3.Connection, _Shard], list[Issue]]], ...] = (
+    ("source paths", _check_rows),
+    ("shadowed duplicates", _check_duplicates),
+    ("orphaned mappings", _check_orphans),
+    ("positional options", _check_positional),
+    ("subcommand mappings", _check_subcommands),
+    ("unreachable manpages", _check_unreachable),
+)
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+
+def _shards(conn: sqlite3.Connection) -> list[_Shard]:
+    """One shard per distro/release in the DB, plus one for the rows that
+    have none (sources with fewer than two slashes).
+
+    A release's manpages are a range of the source primary key, and its
+    mappings an equality on the partition columns.
+    """
+    distro, release = _mapping_partition(conn, "mappings")
+    rows = conn.execute(
+        f"SELECT DISTINCT {distro}, {release} FROM mappings "
+        "UNION "
+        f"SELECT DISTINCT {distro_sql('source')}, {release_sql('source')} "
+        "FROM parsed_manpages WHERE source LIKE '%/%/%'"
     ).fetchall()
-    for row in unreachable:
-        issues.append(
-            (
-                "warning",
-                (
-                    f"unreachable manpage: {row['name']!r} ({row['source']!r}) "
-                    f"has no mappings"
-                ),
+    shards = []
+    for d, r in rows:
+        prefix = f"{d}/{r}/"
+        shards.append(
+            _Shard(
+                manpages="{source} >= ? AND {source} < ?",
+                # The first string after every "d/r/..." one.
+                manpages_params=(prefix, prefix[:-1] + "0"),
+                mappings="{distro} = ? AND {release} = ?",
+                mappings_params=(d, r),
             )
         )
+    shards.append(_Shard(manpages="{source} NOT LIKE '%/%/%'", mappings="0"))
+    return shards
 
-    conn.close()
-    return issues
+
+def _run_shard(db_path: str, shard: _Shard) -> list[tuple[list[Issue], float]]:
+    """Issues and seconds of every check in ``_CHECKS`` order, for one shard."""
+    conn = _connect(db_path)
+    try:
+        out = []
+        for _, fn in _CHECKS:
+            t0 = time.perf_counter()
+            issues = fn(conn, shard)
+            out.append((issues, time.perf_counter() - t0))
+        return out
+    finally:
+        conn.close()
+
+
+def run_checks(db_path: str, jobs: int = 1) -> CheckResult:
+    """Run every integrity check, on *jobs* threads of distro/release shards."""
+    if jobs > 1:
+        conn = _connect(db_path)
+        try:
+            shards = _shards(conn)
+        finally:
+            conn.close()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+            per_shard = list(ex.map(lambda sh: _run_shard(db_path, sh), shards))
+    else:
+        per_shard = [_run_shard(db_path, _Shard())]
+
+    result = CheckResult(shards=len(per_shard))
+    for i, (name, _) in enumerate(_CHECKS):
+        result.timings[name] = 0.0
+        for shard_results in per_shard:
+            issues, seconds = shard_results[i]
+            result.issues.extend(issues)
+            result.timings[name] += seconds
+    return result
+
+
+def check(db_path: str, jobs: int = 1) -> list[Issue]:
+    """Run integrity checks and return a list of (severity, message) tuples."""
+    return run_checks(db_path, jobs).issues
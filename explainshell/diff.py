@@ -1,14 +1,26 @@
 """Man page comparison and diff formatting.
 
 Moved from manager.py to be usable by regression tests and other consumers.
+
+``DiffLog`` streams per-file comparison records to a JSONL file in a run
+directory, which ``manager diff ... --resume`` reads back to skip the
+files an interrupted run already compared.
 """
 
 from __future__ import annotations
 
 import difflib
+import enum
+import json
+import os
+import threading
+
+from pydantic import BaseModel
 
 from explainshell.models import ParsedManpage
 
+DIFFS_FILENAME = "diffs.jsonl"
+
 # ParsedManpage-level fields to compare in diff mode.
 _MP_FIELDS = (
     "name",
@@ -258,3 +270,71 @@ def format_diff(stored_mp: ParsedManpage, fresh_mp: ParsedManpage) -> list[str]:
         out.append(f"  {_DIM}(no changes){_RESET}")
 
     return out
+
+
+# ---------------------------------------------------------------------------
+# JSONL diff log
+# ---------------------------------------------------------------------------
+
+
+def _json_default(val: object) -> object:
+    if isinstance(val, BaseModel):
+        return val.model_dump(mode="json")
+    if isinstance(val, enum.Enum):
+        return val.value
+    if isinstance(val, (set, frozenset)):
+        return sorted(val)
+    raise TypeError(f"{type(val).__name__} is not JSON serializable")
+
+
+class DiffLog:
+    """Append-only JSONL log of per-file records in a run directory.
+
+    Every record is one line, written and flushed as soon as it is logged,
+    so an interrupted run keeps everything it compared. ``compare_manpages``
+    entries can be logged as they are (options and other models are dumped
+    to JSON). Thread-safe.
+    """
+
+    def __init__(self, run_dir: str, filename: str = DIFFS_FILENAME) -> None:
+        self.path = os.path.join(run_dir, filename)
+        self._lock = threading.Lock()
+        partial = False
+        if os.path.isfile(self.path) and os.path.getsize(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+        self._f = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        if partial:
+            # Finish a record cut short by a killed run, so it stays on its
+            # own (unparseable) line instead of swallowing the next one.
+            self._f.write("\n")
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, default=_json_default, ensure_ascii=False)
+        with self._lock:
+            self._f.write(line + "\n")
+            self._f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._f.close()
+
+
+def load_diff_log(run_dir: str, filename: str = DIFFS_FILENAME) -> list[dict]:
+    """Records of the JSONL log in *run_dir*, oldest first.
+
+    A missing log reads as empty. A line that does not parse (the last
+    record of a run killed mid-write) is ignored.
+    """
+    path = os.path.join(run_dir, filename)
+    if not os.path.isfile(path):
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
@@ -0,0 +1,226 @@
+"""Columnar export of the database for analytics.
+
+Writes three flat tables, as Parquet or Arrow IPC files in one directory:
+
+    manpages   one row per parsed manpage (name, synopsis, extractor/model,
+               option and alias counts, raw-page provenance)
+    options    one row per extracted option
+    mappings   one row per command-name mapping
+
+Rows are read from SQLite and written ``batch_rows`` at a time, straight
+from the stored JSON columns (no ``ParsedManpage`` is built), so memory
+stays bounded however large the database is. All tables are read in one
+transaction, so they are a consistent snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections.abc import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from explainshell.store import distro_sql, release_sql
+
+FORMATS = ("parquet", "arrow")
+
+_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+_STRINGS = pa.list_(pa.string())
+
+MANPAGES_SCHEMA = pa.schema(
+    [
+        ("source", pa.string()),
+        ("distro", pa.string()),
+        ("release", pa.string()),
+        ("section", pa.string()),
+        ("name", pa.string()),
+        ("synopsis", pa.string()),
+        ("aliases", _STRINGS),
+        ("n_options", pa.int32()),
+        ("dashless_opts", pa.bool_()),
+        ("subcommands", _STRINGS),
+        ("updated", pa.bool_()),
+        # JSON, as stored: false, true or the name of a positional.
+        ("nested_cmd", pa.string()),
+        ("extractor", pa.string()),
+        ("model", pa.string()),
+        ("generator", pa.string()),
+        ("generated_at", pa.string()),
+        ("source_gz_sha256", pa.string()),
+    ]
+)
+
+OPTIONS_SCHEMA = pa.schema(
+    [
+        ("source", pa.string()),
+        ("ordinal", pa.int32()),
+        ("short", _STRINGS),
+        ("long", _STRINGS),
+        # JSON: false, true or a list of allowed values.
+        ("has_argument", pa.string()),
+        ("positional", pa.string()),
+        ("prefix", pa.string()),
+        # JSON: false, true or a list of option values that start a command.
+        ("nested_cmd", pa.string()),
+        ("text", pa.string()),
+    ]
+)
+
+MAPPINGS_SCHEMA = pa.schema(
+    [
+        ("src", pa.string()),
+        ("dst", pa.string()),
+        ("score", pa.int32()),
+        ("distro", pa.string()),
+        ("release", pa.string()),
+    ]
+)
+
+
+def _section(source: str) -> str | None:
+    base = os.path.basename(source)
+    if not base.endswith(".gz") or "." not in base[:-3]:
+        return None
+    return base[:-3].rsplit(".", 1)[1]
+
+
+def _manpage_rows(conn: sqlite3.Connection, batch_rows: int) -> Iterator[dict]:
+    cur = conn.execute(
+        "SELECT p.source, "
+        f"{distro_sql('p.source')} AS distro, {release_sql('p.source')} AS release, "
+        "p.name, p.synopsis, p.aliases, json_array_length(p.options) AS n_options, "
+        "p.dashless_opts, p.subcommands, p.updated, p.nested_cmd, p.extractor, "
+        "json_extract(p.extraction_meta, '$.model') AS model, "
+        "m.generator, m.generated_at, m.source_gz_sha256 "
+        "FROM parsed_manpages p LEFT JOIN manpages m ON m.source = p.source "
+        "ORDER BY p.source"
+    )
+    while rows := cur.fetchmany(batch_rows):
+        cols: dict[str, list] = {name: [] for name in MANPAGES_SCHEMA.names}
+        for row in rows:
+            cols["source"].append(row["source"])
+            cols["distro"].append(row["distro"])
+            cols["release"].append(row["release"])
+            cols["section"].append(_section(row["source"]))
+            cols["name"].append(row["name"])
+            cols["synopsis"].append(row["synopsis"])
+            cols["aliases"].append([a[0] for a in json.loads(row["aliases"])])
+            cols["n_options"].append(row["n_options"])
+            cols["dashless_opts"].append(bool(row["dashless_opts"]))
+            cols["subcommands"].append(json.loads(row["subcommands"]))
+            cols["updated"].append(bool(row["updated"]))
+            cols["nested_cmd"].append(row["nested_cmd"])
+            cols["extractor"].append(row["extractor"])
+            cols["model"].append(row["model"])
+            cols["generator"].append(row["generator"])
+            cols["generated_at"].append(row["generated_at"])
+            cols["source_gz_sha256"].append(row["source_gz_sha256"])
+        yield cols
+
+
+def _json_or_none(val: object) -> str | None:
+    return None if val is None else json.dumps(val)
+
+
+def _option_rows(conn: sqlite3.Connection, batch_rows: int) -> Iterator[dict]:
+    cur = conn.execute("SELECT source, options FROM parsed_manpages ORDER BY source")
+    cols: dict[str, list] = {name: [] for name in OPTIONS_SCHEMA.names}
+    n = 0
+    for source, options_json in cur:
+        for ordinal, o in enumerate(json.loads(options_json)):
+            positional = o.get("positional")
+            cols["source"].append(source)
+            cols["ordinal"].append(ordinal)
+            cols["short"].append(o.get("short") or [])
+            cols["long"].append(o.get("long") or [])
+            cols["has_argument"].append(_json_or_none(o.get("has_argument", False)))
+            cols["positional"].append(
+                positional
+                if positional is None or isinstance(positional, str)
+                else json.dumps(positional)
+            )
+            cols["prefix"].append(o.get("prefix"))
+            cols["nested_cmd"].append(_json_or_none(o.get("nested_cmd", False)))
+            cols["text"].append(o.get("text"))
+            n += 1
+        if n >= batch_rows:
+            yield cols
+            cols = {name: [] for name in OPTIONS_SCHEMA.names}
+            n = 0
+    if n:
+        yield cols
+
+
+def _mapping_rows(conn: sqlite3.Connection, batch_rows: int) -> Iterator[dict]:
+    cur = conn.execute(
+        "SELECT src, dst, score, "
+        f"{distro_sql('dst')} AS distro, {release_sql('dst')} AS release "
+        "FROM mappings ORDER BY dst, src"
+    )
+    while rows := cur.fetchmany(batch_rows):
+        yield {name: [row[name] for row in rows] for name in MAPPINGS_SCHEMA.names}
+
+
+_TABLES = (
+    ("manpages", MANPAGES_SCHEMA, _manpage_rows),
+    ("options", OPTIONS_SCHEMA, _option_rows),
+    ("mappings", MAPPINGS_SCHEMA, _mapping_rows),
+)
+
+
+def _write_table(
+    path: str, fmt: str, schema: pa.Schema, batches: Iterator[dict]
+) -> int:
+    """Write *batches* to *path* (atomically); returns the number of rows."""
+    tmp = path + ".tmp"
+    n = 0
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(tmp, schema)
+    else:
+        writer = pa.ipc.new_file(tmp, schema)
+    try:
+        try:
+            for cols in batches:
+                batch = pa.RecordBatch.from_pydict(cols, schema=schema)
+                writer.write_batch(batch)
+                n += batch.num_rows
+        finally:
+            writer.close()
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return n
+
+
+def table_path(out_dir: str, table: str, fmt: str) -> str:
+    """Path of *table*'s file in an export written to *out_dir* as *fmt*."""
+    return os.path.join(out_dir, table + _EXTENSIONS[fmt])
+
+
+def export(
+    db_path: str, out_dir: str, fmt: str = "parquet", batch_rows: int = 10_000
+) -> dict[str, int]:
+    """Export *db_path* to ``<table>.<fmt>`` files in *out_dir*.
+
+    Returns the number of rows written per table. Raises ValueError for an
+    unknown *fmt*.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (expected one of {FORMATS})")
+    os.makedirs(out_dir, exist_ok=True)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    counts = {}
+    try:
+        conn.execute("BEGIN")
+        for table, schema, rows in _TABLES:
+            path = table_path(out_dir, table, fmt)
+            counts[table] = _write_table(path, fmt, schema, rows(conn, batch_rows))
+    finally:
+        conn.close()
+    return counts
@@ -11,10 +11,14 @@ import subprocess
 from pathlib import Path
 
 from explainshell import config, manpage, models, roff_utils
+from explainshell.extraction.sha256cache import Sha256Cache, file_sha256
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 _TRACKED_MANDOC = (_REPO_ROOT / "tools" / "mandoc-md").resolve()
 
+# Digest cache used by gz_sha256, installed for the duration of an extract run.
+_sha256_cache: Sha256Cache | None = None
+
 
 def build_manpage_metadata(
     gz_path: str,
@@ -24,9 +28,21 @@ def build_manpage_metadata(
     subcommands: list[str] | None = None,
     extractor: str | None = None,
     extraction_meta: models.ExtractionMeta | None = None,
+    synopsis: str | None = None,
+    aliases: list[tuple[str, int]] | None = None,
+    nested_cmd: bool | None = None,
 ) -> models.ParsedManpage:
-    """One place to assemble synopsis, aliases, and detection metadata."""
-    synopsis, aliases = manpage.get_synopsis_and_aliases(gz_path)
+    """One place to assemble synopsis, aliases, and detection metadata.
+
+    Callers that already parsed the NAME section or ran nested-command
+    detection on the file (see ``LLMExtractor.prepare``) pass the results in
+    as *synopsis* / *aliases* and *nested_cmd*; anything left as None is read
+    from the file.
+    """
+    if aliases is None:
+        synopsis, aliases = manpage.get_synopsis_and_aliases(gz_path)
+    if nested_cmd is None:
+        nested_cmd = roff_utils.detect_nested_cmd(gz_path)
     return models.ParsedManpage(
         source=config.source_from_path(gz_path),
         name=manpage.extract_name(gz_path),
@@ -34,7 +50,7 @@ def build_manpage_metadata(
         options=options,
         aliases=aliases,
         dashless_opts=dashless_opts,
-        nested_cmd=roff_utils.detect_nested_cmd(gz_path),
+        nested_cmd=nested_cmd,
         subcommands=subcommands or [],
         extractor=extractor,
         extraction_meta=extraction_meta,
@@ -61,12 +77,17 @@ def build_raw_manpage(
     )
 
 
+def set_sha256_cache(cache: Sha256Cache | None) -> None:
+    """Install (or with None, remove) the digest cache used by gz_sha256."""
+    global _sha256_cache
+    _sha256_cache = cache
+
+
 def gz_sha256(gz_path: str) -> str:
-    h = hashlib.sha256()
-    with open(gz_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    cache = _sha256_cache
+    if cache is not None:
+        return cache.sha256(gz_path)
+    return file_sha256(gz_path)
 
 
 def _file_sha256_prefix(path: str, length: int = 12) -> str:
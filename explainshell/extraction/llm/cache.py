@@ -0,0 +1,212 @@
+"""Content-addressed on-disk cache of LLM responses.
+
+Entries are keyed by a sha256 over the model, reasoning effort, system
+prompt and user content of a request, so re-running extraction after a
+change to ``response.py`` or ``postprocess.py`` serves every unchanged chunk
+locally and only pays for chunks whose prompt actually changed.
+
+Each entry is one small JSON file under ``<root>/<key[:2]>/<key>.json``,
+written atomically so concurrent runs can share a cache directory. Reads
+bump the file's mtime, and once the directory grows past ``max_bytes`` the
+least recently used entries are evicted.
+
+Only responses that went on to produce a successful extraction are stored
+(see ``LLMExtractor``), so a malformed response is never replayed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, replace
+
+from explainshell.extraction.llm.prompt import SYSTEM_PROMPT
+from explainshell.extraction.llm.providers import TokenUsage, _parse_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Eviction trims the cache to this fraction of max_bytes, so a full cache is
+# not rescanned on every write.
+_EVICT_TO = 0.9
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters of a ResponseCache, for the extraction report."""
+
+    hits: int = 0
+    misses: int = 0
+    # Tokens the cached responses cost when they were first fetched. Entries
+    # filled from batch results have no per-request usage and count as zero.
+    input_tokens_saved: int = 0
+    output_tokens_saved: int = 0
+    reasoning_tokens_saved: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """On-disk LLM response cache for one model (see module docstring)."""
+
+    def __init__(
+        self,
+        root: str,
+        model: str,
+        *,
+        system_prompt: str = SYSTEM_PROMPT,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        base, effort = _parse_model(model)
+        # Hash the request identity once; each key only adds the user content.
+        self._prefix = hashlib.sha256(
+            json.dumps([base, effort, system_prompt]).encode()
+        )
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._total_bytes: int | None = None  # computed on first put
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the lookup counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def key(self, user_content: str) -> str:
+        h = self._prefix.copy()
+        h.update(b"\0")
+        h.update(user_content.encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, user_content: str) -> tuple[str, TokenUsage] | None:
+        """Return the cached ``(response, usage)`` for *user_content*, if any."""
+        path = self._path(self.key(user_content))
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            response = entry["response"]
+            usage = TokenUsage(**entry.get("usage", {}))
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("dropping unreadable LLM cache entry %s: %s", path, e)
+            self._remove(path)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            self._stats.input_tokens_saved += usage.input_tokens
+            self._stats.output_tokens_saved += usage.output_tokens
+            self._stats.reasoning_tokens_saved += usage.reasoning_tokens
+
+        # Mark as recently used for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return response, usage
+
+    def put(
+        self, user_content: str, response: str, usage: TokenUsage | None = None
+    ) -> None:
+        """Store *response* for *user_content*; never raises on I/O errors.
+
+        Existing entries are kept: the key already pins the request, and the
+        first entry is the one that recorded the tokens it cost.
+        """
+        usage = usage or TokenUsage()
+        path = self._path(self.key(user_content))
+        if os.path.exists(path):
+            return
+        data = json.dumps(
+            {
+                "response": response,
+                "usage": {
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens,
+                    "reasoning_tokens": usage.reasoning_tokens,
+                },
+            }
+        ).encode()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("failed to write LLM cache entry %s: %s", path, e)
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def discard(self, user_content: str) -> None:
+        """Remove the entry for *user_content*, e.g. when it no longer validates."""
+        self._remove(self._path(self.key(user_content)))
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Return ``(mtime, size, path)`` of every entry under the root."""
+        entries = []
+        try:
+            shards = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            for e in os.scandir(shard.path):
+                if not e.name.endswith(".json"):
+                    continue
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue  # evicted by a concurrent run
+                entries.append((st.st_mtime, st.st_size, e.path))
+        return entries
+
+    def _evict_locked(self) -> None:
+        """Delete least recently used entries down to the low-water mark."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * _EVICT_TO)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+        self._total_bytes = total
+        self._stats.evictions += evicted
+        if evicted:
+            logger.info(
+                "evicted %d LLM cache entr%s from %s",
+                evicted,
+                "y" if evicted == 1 else "ies",
+                self.root,
+            )
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -7,7 +7,8 @@ glues together the other LLM submodules into one extraction pipeline:
 1. ``prepare()`` reads the man page, strips mandoc artifacts, removes known
    low-value sections, numbers the remaining lines, and chunks the text.
 2. ``extract()`` sends one request per chunk through the configured provider
-   and accumulates token/latency stats.
+   (concurrently, within a limit shared by all files, when
+   ``llm_concurrency > 1``) and accumulates token/latency stats.
 3. ``finalize()`` parses each raw JSON response, converts line references back
    into option text, dedups cross-chunk overlap, runs extractor-agnostic
    postprocessing, and builds ``ParsedManpage`` / ``RawManpage`` results.
@@ -44,6 +45,8 @@ Public API:
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import json
 import logging
 import os
@@ -55,9 +58,10 @@ from typing import Protocol, runtime_checkable
 import dotenv
 from pydantic import ValidationError
 
-from explainshell import config, manpage
+from explainshell import config, manpage, roff_utils
 from explainshell.errors import ExtractionError, FailureReason, SkippedExtraction
 from explainshell.extraction.common import build_manpage_metadata, build_raw_manpage
+from explainshell.extraction.llm.cache import ResponseCache
 from explainshell.extraction.llm.prompt import SYSTEM_PROMPT
 from explainshell.extraction.llm.providers import (
     BatchProvider,
@@ -66,6 +70,13 @@ from explainshell.extraction.llm.providers import (
     make_batch_provider,
     make_provider,
 )
+from explainshell.extraction.llm.ratelimit import (
+    RateLimiter,
+    RateLimiterCancelled,
+    estimate_tokens,
+    is_throttle,
+    retry_after_seconds,
+)
 from explainshell.extraction.llm.response import (
     dedup_ref_options,
     llm_option_to_store_option,
@@ -76,11 +87,11 @@ from explainshell.extraction.llm.response import (
 from explainshell.extraction.llm.text import (
     MAX_CHUNKS,
     MAX_MANPAGE_CHARS,
+    LineTable,
     chunk_text,
     clean_mandoc_artifacts,
     filter_sections,
     get_manpage_text,
-    number_lines,
 )
 from explainshell.extraction.postprocess import postprocess
 from explainshell.extraction.types import (
@@ -96,6 +107,9 @@ dotenv.load_dotenv(dotenv.find_dotenv(".env.example"))
 
 logger = logging.getLogger(__name__)
 
+# Attempts per chunk before giving up on transient provider errors and 429s.
+_MAX_LLM_ATTEMPTS = 6
+
 # Manpage source paths that must be skipped during LLM extraction because
 # the provider's content filter flags them as jailbreak false-positives.
 # This list is reserved for failures we don't control upstream — do NOT
@@ -132,34 +146,40 @@ class PreparedFile:
 
     Fields
     ------
-    synopsis:       Synopsis line from lexgrog, or None.
+    synopsis:       Synopsis line from the NAME section, or None.
     aliases:        (name, score) tuples for alternative command names.
-    original_lines: 1-indexed line number → original line content (before
-                    numbering). Used by finalize to map LLM line references
-                    back to source text.
+    original_lines: LineTable of the filtered text: 1-indexed line number →
+                    original line content (before numbering). Used by finalize
+                    to map LLM line references back to source text.
     basename:       Manpage file stem without .gz/.section suffixes (e.g. "tar").
-    numbered_text:  Full manpage text with "  42| …" line-number prefixes,
-                    used for debug dumps.
+    numbered_text:  Derived property — the text with "  42| …" line-number
+                    prefixes, rendered on demand for debug dumps.
     plain_text_len: Length of the original plain text before filtering/chunking.
     plain_text:     Original unfiltered manpage text (used for RawManpage storage).
     requests:       Pre-formatted user-content strings, one per chunk, ready to
                     submit to the LLM provider.
+    nested_cmd:     Whether the SYNOPSIS takes a nested command (see
+                    ``roff_utils.detect_nested_cmd``).
     n_chunks:       Derived property — ``len(requests)``.
     """
 
     synopsis: str | None
     aliases: list[tuple[str, int]]
-    original_lines: dict[int, str]
+    original_lines: LineTable
     basename: str
-    numbered_text: str
     plain_text_len: int
     plain_text: str
     requests: list[str]
+    nested_cmd: bool = False
 
     @property
     def n_chunks(self) -> int:
         return len(self.requests)
 
+    @property
+    def numbered_text(self) -> str:
+        return self.original_lines.numbered()
+
 
 @runtime_checkable
 class BatchExtractor(Extractor, Protocol):
@@ -183,6 +203,72 @@ class ChunkResult:
     messages: list[dict[str, str]]
     raw_response: str
     usage: TokenUsage
+    # Served from the response cache (usage is then zero: nothing was billed).
+    cached: bool = False
+
+
+def prepare_file(gz_path: str) -> PreparedFile:
+    """Pre-process a manpage without calling LLM (see LLMExtractor.prepare).
+
+    Module-level and dependent only on *gz_path*, so the batch runner can
+    run it in worker processes.
+
+    Everything read from the source file (the NAME section, mandoc and the
+    SYNOPSIS scan for nested commands) happens here, once; ``finalize`` works
+    only from the returned ``PreparedFile``.
+    """
+    source = config.source_from_path(gz_path)
+
+    if source in _BLACKLISTED_SOURCES:
+        raise SkippedExtraction("blacklisted", reason_class=FailureReason.BLACKLISTED)
+
+    # Decompressed once for both the NAME parser and the SYNOPSIS scan.
+    source_lines = roff_utils.read_source(gz_path)
+    synopsis, aliases = manpage.get_synopsis_and_aliases(gz_path, source_lines)
+    plain_text = clean_mandoc_artifacts(get_manpage_text(gz_path))
+    basename = os.path.splitext(os.path.splitext(os.path.basename(gz_path))[0])[0]
+
+    if len(plain_text) > MAX_MANPAGE_CHARS:
+        raise SkippedExtraction(
+            f"manpage too large ({len(plain_text):,} chars, limit {MAX_MANPAGE_CHARS:,})",
+            stats=ExtractionStats(plain_text_len=len(plain_text)),
+            reason_class=FailureReason.MANPAGE_TOO_LARGE,
+        )
+
+    filtered_text, removal_counts = filter_sections(plain_text)
+    if removal_counts:
+        logger.debug(
+            "%s: filtered sections: %s (saved %d chars)",
+            basename,
+            ", ".join(f"{k} ({v})" for k, v in sorted(removal_counts.items())),
+            len(plain_text) - len(filtered_text),
+        )
+
+    original_lines = LineTable(filtered_text)
+    chunks = chunk_text(filtered_text)
+    n_chunks = len(chunks)
+
+    if n_chunks > MAX_CHUNKS:
+        raise ExtractionError(
+            f"too many chunks ({n_chunks:,}, limit {MAX_CHUNKS})",
+            reason_class=FailureReason.TOO_MANY_CHUNKS,
+        )
+
+    requests: list[str] = []
+    for i, chunk in enumerate(chunks):
+        chunk_info = f" (part {i + 1} of {n_chunks})" if n_chunks > 1 else ""
+        requests.append(LLMExtractor._build_user_content(chunk, chunk_info))
+
+    return PreparedFile(
+        synopsis=synopsis,
+        aliases=aliases,
+        original_lines=original_lines,
+        basename=basename,
+        plain_text_len=len(plain_text),
+        plain_text=plain_text,
+        requests=requests,
+        nested_cmd=roff_utils.detect_nested_cmd(gz_path, source_lines),
+    )
 
 
 class LLMExtractor:
@@ -193,6 +279,10 @@ class LLMExtractor:
     and ``batch_provider``.
     """
 
+    # Picklable stand-in for prepare(), used by run_batch to prepare files
+    # on a process pool (the extractor itself holds provider clients).
+    prepare_worker = staticmethod(prepare_file)
+
     def __init__(self, config: ExtractorConfig) -> None:
         self._model = config.model or ""
         self._run_dir = config.run_dir
@@ -203,13 +293,36 @@ class LLMExtractor:
             self.batch_provider: BatchProvider = make_batch_provider(self._model)
         except ValueError:
             pass  # model doesn't support batch; accessed only via --batch flag
+        self.response_cache: ResponseCache | None = None
+        if config.llm_cache_dir:
+            self.response_cache = ResponseCache(
+                config.llm_cache_dir,
+                self._model,
+                max_bytes=config.llm_cache_max_bytes,
+            )
+        self.rate_limiter = RateLimiter(
+            self._model,
+            rpm=config.llm_rpm,
+            tpm=config.llm_tpm,
+            max_concurrency=config.llm_concurrency,
+        )
+        # Chunk calls of all files share these workers, so at most
+        # llm_concurrency requests are in flight however many files are.
+        self._chunk_pool: concurrent.futures.ThreadPoolExecutor | None = None
+        if config.llm_concurrency > 1:
+            self._chunk_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=config.llm_concurrency,
+                thread_name_prefix="llm-chunk",
+            )
         self._cancelled = threading.Event()
 
     def cancel(self) -> None:
         """Signal all in-progress extract() calls to stop after their current
         LLM request completes.  Does not abort already in-flight HTTP calls,
-        but prevents the next chunk from being submitted."""
+        but prevents any chunk that has not started yet from being sent, and
+        wakes calls waiting on the rate limiter."""
         self._cancelled.set()
+        self.rate_limiter.cancel()
 
     def extract(self, gz_path: str) -> ExtractionResult:
         """Full extraction pipeline: prepare → LLM calls → finalize."""
@@ -221,7 +334,7 @@ class LLMExtractor:
             "%s: %d chars (%d numbered), %d chunk(s)",
             basename,
             prepared.plain_text_len,
-            len(prepared.numbered_text),
+            prepared.original_lines.numbered_len,
             n_chunks,
         )
 
@@ -230,102 +343,80 @@ class LLMExtractor:
             plain_text_len=prepared.plain_text_len,
         )
 
-        all_chunk_data: list[ChunkResult] = []
         t0 = time.monotonic()
-
-        for i, user_content in enumerate(prepared.requests):
-            if self._cancelled.is_set():
-                raise ExtractionError("cancelled", reason_class=FailureReason.CANCELLED)
-
-            chunk_label = (
-                f"chunk {i + 1}/{n_chunks}" if n_chunks > 1 else "single chunk"
-            )
-            logger.info(
-                "%s: calling LLM (%s, %d chars)...",
-                basename,
-                chunk_label,
-                len(user_content),
-            )
-
-            try:
-                cr = self._call_llm(user_content)
-            except ExtractionError as e:
-                if e.raw_response:
-                    self._dump_failed_response(gz_path, i, e.raw_response)
-                raise
-
+        all_chunk_data = self._call_chunks(gz_path, prepared)
+        for cr in all_chunk_data:
             stats.input_tokens += cr.usage.input_tokens
             stats.output_tokens += cr.usage.output_tokens
             stats.reasoning_tokens += cr.usage.reasoning_tokens
-            n_opts = len(cr.data["options"])
-            logger.info(
-                "%s: LLM returned %d option(s) for %s",
-                basename,
-                n_opts,
-                chunk_label,
-            )
-            all_chunk_data.append(cr)
 
         stats.elapsed_seconds = time.monotonic() - t0
-        return self._finalize(gz_path, prepared, all_chunk_data, stats)
-
-    def prepare(self, gz_path: str) -> PreparedFile:
-        """Pre-process a manpage without calling LLM.
-
-        Raises SkippedExtraction if the manpage is too large.
+        result = self._finalize(gz_path, prepared, all_chunk_data, stats)
+        if self.response_cache is not None:
+            for user_content, cr in zip(prepared.requests, all_chunk_data, strict=True):
+                if not cr.cached:
+                    self.response_cache.put(user_content, cr.raw_response, cr.usage)
+        return result
+
+    def _call_chunks(self, gz_path: str, prepared: PreparedFile) -> list[ChunkResult]:
+        """Call the LLM for every chunk of *prepared*, returned in chunk order.
+
+        With a chunk pool the calls are issued concurrently, sharing the
+        pool's ``llm_concurrency`` slots with every other file being
+        extracted; a failed chunk cancels this file's chunks that have not
+        started yet.
         """
-        source = config.source_from_path(gz_path)
+        calls = [
+            functools.partial(self._call_chunk, gz_path, prepared, i)
+            for i in range(prepared.n_chunks)
+        ]
+        if self._chunk_pool is None:
+            return [call() for call in calls]
 
-        if source in _BLACKLISTED_SOURCES:
-            raise SkippedExtraction(
-                "blacklisted", reason_class=FailureReason.BLACKLISTED
-            )
+        futures = [self._chunk_pool.submit(call) for call in calls]
+        try:
+            return [f.result() for f in futures]
+        finally:
+            for f in futures:
+                f.cancel()
 
-        synopsis, aliases = manpage.get_synopsis_and_aliases(gz_path)
-        plain_text = clean_mandoc_artifacts(get_manpage_text(gz_path))
-        basename = os.path.splitext(os.path.splitext(os.path.basename(gz_path))[0])[0]
+    def _call_chunk(self, gz_path: str, prepared: PreparedFile, i: int) -> ChunkResult:
+        """Run one chunk's LLM call, unless extraction has been cancelled."""
+        if self._cancelled.is_set():
+            raise ExtractionError("cancelled", reason_class=FailureReason.CANCELLED)
 
-        if len(plain_text) > MAX_MANPAGE_CHARS:
-            raise SkippedExtraction(
-                f"manpage too large ({len(plain_text):,} chars, limit {MAX_MANPAGE_CHARS:,})",
-                stats=ExtractionStats(plain_text_len=len(plain_text)),
-                reason_class=FailureReason.MANPAGE_TOO_LARGE,
-            )
+        basename = prepared.basename
+        n_chunks = prepared.n_chunks
+        user_content = prepared.requests[i]
+        chunk_label = f"chunk {i + 1}/{n_chunks}" if n_chunks > 1 else "single chunk"
+        logger.info(
+            "%s: calling LLM (%s, %d chars)...",
+            basename,
+            chunk_label,
+            len(user_content),
+        )
 
-        filtered_text, removal_counts = filter_sections(plain_text)
-        if removal_counts:
-            logger.debug(
-                "%s: filtered sections: %s (saved %d chars)",
-                basename,
-                ", ".join(f"{k} ({v})" for k, v in sorted(removal_counts.items())),
-                len(plain_text) - len(filtered_text),
-            )
+        try:
+            cr = self._call_llm(user_content)
+        except ExtractionError as e:
+            if e.raw_response:
+                self._dump_failed_response(gz_path, i, e.raw_response)
+            raise
 
-        numbered_text, original_lines = number_lines(filtered_text)
-        chunks = chunk_text(filtered_text)
-        n_chunks = len(chunks)
+        logger.info(
+            "%s: LLM returned %d option(s) for %s",
+            basename,
+            len(cr.data["options"]),
+            chunk_label,
+        )
+        return cr
 
-        if n_chunks > MAX_CHUNKS:
-            raise ExtractionError(
-                f"too many chunks ({n_chunks:,}, limit {MAX_CHUNKS})",
-                reason_class=FailureReason.TOO_MANY_CHUNKS,
-            )
+    def prepare(self, gz_path: str) -> PreparedFile:
+        """Pre-process a manpage without calling LLM.
 
-        requests: list[str] = []
-        for i, chunk in enumerate(chunks):
-            chunk_info = f" (part {i + 1} of {n_chunks})" if n_chunks > 1 else ""
-            requests.append(self._build_user_content(chunk, chunk_info))
-
-        return PreparedFile(
-            synopsis=synopsis,
-            aliases=aliases,
-            original_lines=original_lines,
-            basename=basename,
-            numbered_text=numbered_text,
-            plain_text_len=len(plain_text),
-            plain_text=plain_text,
-            requests=requests,
-        )
+        Raises SkippedExtraction if the manpage is too large.
+        """
+        return prepare_file(gz_path)
 
     def finalize(
         self,
@@ -337,7 +428,9 @@ class LLMExtractor:
 
         Used by run_batch after collecting provider results.  The returned
         stats carry ``chunks`` and ``plain_text_len``; token counts are
-        tracked at the batch level by the runner.
+        tracked at the batch level by the runner.  On success the responses
+        are added to the response cache (without usage, which the batch API
+        only reports in aggregate).
         """
         all_chunk_data: list[ChunkResult] = []
         stats = ExtractionStats(
@@ -363,7 +456,13 @@ class LLMExtractor:
                 )
             )
 
-        return self._finalize(gz_path, prepared, all_chunk_data, stats)
+        result = self._finalize(gz_path, prepared, all_chunk_data, stats)
+        if self.response_cache is not None:
+            for user_content, response_text in zip(
+                prepared.requests, responses, strict=True
+            ):
+                self.response_cache.put(user_content, response_text)
+        return result
 
     def _finalize(
         self,
@@ -376,12 +475,11 @@ class LLMExtractor:
         basename = prepared.basename
         original_lines = prepared.original_lines
         n_chunks = prepared.n_chunks
-        numbered_text = prepared.numbered_text
 
         stem = self._artifact_stem(gz_path)
         if self._run_dir and self._debug:
             with open(self._artifact_path("markdown", stem, ".md"), "w") as f:
-                f.write(numbered_text)
+                f.write(prepared.numbered_text)
 
         all_raw: list[dict] = []
         dashless_opts = False
@@ -440,6 +538,9 @@ class LLMExtractor:
             subcommands=subcommands,
             extractor="llm",
             extraction_meta=ExtractionMeta(model=self._model),
+            synopsis=prepared.synopsis,
+            aliases=prepared.aliases,
+            nested_cmd=prepared.nested_cmd,
         )
 
         raw_mp = build_raw_manpage(
@@ -465,43 +566,93 @@ class LLMExtractor:
         return FailureReason.PROVIDER_ERROR
 
     def _call_llm(self, user_content: str) -> ChunkResult:
-        """Call LLM via the provider with retries."""
+        """Call LLM via the provider with retries, unless the response is cached."""
         messages = self._build_messages(user_content)
 
-        provider = self.provider
-        retryable = provider.retryable_exceptions
-
-        last_err: Exception | None = None
-        for attempt in range(3):
+        cache = self.response_cache
+        cached = cache.get(user_content) if cache is not None else None
+        if cache is not None and cached is not None:
             try:
-                content, usage = provider.call(user_content)
-                data, raw = process_llm_result(content)
+                data, raw = process_llm_result(cached[0])
+            except ExtractionError as e:
+                # Stale after a validator change; fetch a fresh response.
+                logger.warning("discarding cached LLM response: %s", e)
+                cache.discard(user_content)
+            else:
                 return ChunkResult(
                     data=data,
                     messages=messages,
                     raw_response=raw,
-                    usage=usage,
+                    usage=TokenUsage(0, 0),
+                    cached=True,
                 )
-            except ExtractionError:
-                raise
+
+        provider = self.provider
+        retryable = provider.retryable_exceptions
+        limiter = self.rate_limiter
+        est_tokens = estimate_tokens(user_content)
+
+        last_err: Exception | None = None
+        for attempt in range(_MAX_LLM_ATTEMPTS):
+            try:
+                ticket = limiter.acquire(est_tokens)
+            except RateLimiterCancelled as e:
+                raise ExtractionError(
+                    "cancelled", reason_class=FailureReason.CANCELLED
+                ) from e
+            if self._cancelled.is_set():
+                # Cancelled while this call waited for its slot.
+                limiter.release(ticket)
+                raise ExtractionError("cancelled", reason_class=FailureReason.CANCELLED)
+            try:
+                content, usage = provider.call(user_content)
             except retryable as e:
                 last_err = e
                 wait = 2**attempt
+                if is_throttle(e):
+                    # The limiter holds back every caller, this one included.
+                    limiter.throttle(ticket, retry_after_seconds(e) or wait)
+                    logger.warning(
+                        "LLM call attempt %d rate limited (%s), retrying",
+                        attempt + 1,
+                        e,
+                    )
+                    continue
+                limiter.release(ticket)
                 logger.warning(
                     "LLM call attempt %d failed (%s), retrying in %ds",
                     attempt + 1,
                     e,
                     wait,
                 )
-                time.sleep(wait)
+                if self._cancelled.wait(wait):
+                    raise ExtractionError(
+                        "cancelled", reason_class=FailureReason.CANCELLED
+                    ) from e
+                continue
             except Exception as e:
+                limiter.release(ticket)
                 raise ExtractionError(
                     f"LLM call failed: {e}",
                     reason_class=self._classify_provider_error(e),
                 ) from e
+            except BaseException:
+                limiter.release(ticket)
+                raise
+
+            limiter.release(
+                ticket, tokens=(usage.input_tokens + usage.output_tokens) or est_tokens
+            )
+            data, raw = process_llm_result(content)
+            return ChunkResult(
+                data=data,
+                messages=messages,
+                raw_response=raw,
+                usage=usage,
+            )
 
         raise ExtractionError(
-            f"LLM call failed after 3 attempts: {last_err}",
+            f"LLM call failed after {_MAX_LLM_ATTEMPTS} attempts: {last_err}",
             reason_class=self._classify_provider_error(last_err)
             if last_err is not None
             else FailureReason.PROVIDER_ERROR,
@@ -51,6 +51,27 @@ class BatchEntry(NamedTuple):
     """The user-role prompt text sent to the LLM."""
 
 
+class BatchPoll(Protocol):
+    """Non-blocking status checks of one submitted batch.
+
+    Lets a single poller thread multiplex every in-flight batch; see
+    ``BatchProvider.start_poll``.
+    """
+
+    job_id: str
+
+    retry_after: float | None
+    """Minimum seconds before the next ``poll()``, when the provider asked
+    for a back-off (e.g. after a poll error); None otherwise."""
+
+    def poll(self) -> Any | None:
+        """Check the batch once: the finished job, or None while it runs.
+
+        Raises ExtractionError when the job failed or polling gave up.
+        """
+        ...
+
+
 class BatchProvider(Protocol):
     """Batch API interface (not all providers support this)."""
 
@@ -58,6 +79,10 @@ class BatchProvider(Protocol):
 
     def make_poll_client(self) -> Any: ...
 
+    def start_poll(self, client: Any, job_id: str, poll_interval: int) -> BatchPoll:
+        """Begin polling *job_id*; *poll_interval* scales error back-offs."""
+        ...
+
     def poll_batch(
         self,
         client: Any,
@@ -22,6 +22,69 @@ logger = logging.getLogger(__name__)
 LLM_TIMEOUT_SECONDS = 300
 
 
+_MAX_POLL_ERRORS = 5  # consecutive poll errors before giving up
+
+
+class _BatchPoll:
+    """Status checks of one Gemini batch job (see ``BatchPoll``)."""
+
+    def __init__(self, client: Client, job_id: str) -> None:
+        self.job_id = job_id
+        self.retry_after: float | None = None
+        self._client = client
+        self._consecutive_errors = 0
+        self._prev_state: str | None = None
+
+    def poll(self) -> BatchJob | None:
+        job_id = self.job_id
+        try:
+            job = self._client.batches.get(name=job_id)
+            self._consecutive_errors = 0
+        except Exception as e:
+            self._consecutive_errors += 1
+            logger.warning(
+                "batch %s: poll error (%d/%d): %s",
+                job_id,
+                self._consecutive_errors,
+                _MAX_POLL_ERRORS,
+                e,
+            )
+            if self._consecutive_errors >= _MAX_POLL_ERRORS:
+                raise ExtractionError(
+                    f"Batch poll failed after {_MAX_POLL_ERRORS} consecutive errors: {e}",
+                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+                ) from e
+            return None
+
+        state = job.state.name if hasattr(job.state, "name") else str(job.state)
+
+        if state in ("JOB_STATE_SUCCEEDED", "SUCCEEDED"):
+            return job
+        if state in ("JOB_STATE_FAILED", "FAILED"):
+            raise ExtractionError(
+                f"Batch job failed: {job_id}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            )
+        if state in ("JOB_STATE_CANCELLED", "CANCELLED"):
+            raise ExtractionError(
+                f"Batch job cancelled: {job_id}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            )
+        if state in ("JOB_STATE_EXPIRED", "EXPIRED"):
+            raise ExtractionError(
+                f"Batch job expired: {job_id}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            )
+
+        # Log state changes at INFO, unchanged polls at DEBUG.
+        if state != self._prev_state:
+            logger.info("batch %s: state=%s", job_id, state)
+            self._prev_state = state
+        else:
+            logger.debug("batch %s: state=%s", job_id, state)
+        return None
+
+
 class GeminiProvider:
     """Implements LLMProvider + BatchProvider for Gemini."""
 
@@ -102,6 +165,9 @@ class GeminiProvider:
         """Fetch a batch's current state by ID. For diagnostics; not on any hot path."""
         return self.client.batches.get(name=batch_id)
 
+    def start_poll(self, client: Client, job_id: str, poll_interval: int) -> _BatchPoll:
+        return _BatchPoll(client, job_id)
+
     def poll_batch(
         self,
         client: Client,
@@ -109,10 +175,11 @@ class GeminiProvider:
         poll_interval: int,
         stop_event: threading.Event | None,
     ) -> BatchJob:
-        consecutive_errors = 0
-        max_consecutive_errors = 5
-
-        def _wait() -> None:
+        poll = self.start_poll(client, job_id, poll_interval)
+        while True:
+            job = poll.poll()
+            if job is not None:
+                return job
             if stop_event is not None:
                 stop_event.wait(poll_interval)
                 if stop_event.is_set():
@@ -120,55 +187,6 @@ class GeminiProvider:
             else:
                 time.sleep(poll_interval)
 
-        while True:
-            try:
-                job = client.batches.get(name=job_id)
-                consecutive_errors = 0
-            except Exception as e:
-                consecutive_errors += 1
-                logger.warning(
-                    "batch %s: poll error (%d/%d): %s",
-                    job_id,
-                    consecutive_errors,
-                    max_consecutive_errors,
-                    e,
-                )
-                if consecutive_errors >= max_consecutive_errors:
-                    raise ExtractionError(
-                        f"Batch poll failed after {max_consecutive_errors} consecutive errors: {e}",
-                        reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                    ) from e
-                _wait()
-                continue
-
-            state = job.state.name if hasattr(job.state, "name") else str(job.state)
-
-            if state in ("JOB_STATE_SUCCEEDED", "SUCCEEDED"):
-                return job
-            if state in ("JOB_STATE_FAILED", "FAILED"):
-                raise ExtractionError(
-                    f"Batch job failed: {job_id}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                )
-            if state in ("JOB_STATE_CANCELLED", "CANCELLED"):
-                raise ExtractionError(
-                    f"Batch job cancelled: {job_id}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                )
-            if state in ("JOB_STATE_EXPIRED", "EXPIRED"):
-                raise ExtractionError(
-                    f"Batch job expired: {job_id}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                )
-
-            logger.info(
-                "batch %s: state=%s, polling again in %ds...",
-                job_id,
-                state,
-                poll_interval,
-            )
-            _wait()
-
     def collect_results(self, job: BatchJob) -> BatchResults:
         results: dict[str, str] = {}
         usage = TokenUsage()
@@ -61,6 +61,148 @@ def _azure_base_url() -> str:
     )
 
 
+class _BatchPoll:
+    """Status checks of one OpenAI batch (see ``BatchPoll``).
+
+    Carries the state ``poll_batch`` keeps between polls: consecutive poll
+    errors, the last logged progress, and the wall-time deadline after which
+    the batch is cancelled so partial results can still be collected.
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        job_id: str,
+        poll_interval: int,
+        stall_timeout: int,
+        retryable: tuple[type[Exception], ...],
+    ) -> None:
+        self.job_id = job_id
+        self.retry_after: float | None = None
+        self._client = client
+        self._retryable = retryable
+        self._poll_interval = poll_interval
+        self._stall_timeout = stall_timeout
+        self._consecutive_errors = 0
+        self._prev_counts: tuple[int, int] = (0, 0)
+        self._prev_status: str | None = None
+        self._start_time = time.monotonic()
+        self._cancel_initiated_at: float | None = None
+
+    def poll(self) -> Batch | None:
+        client = self._client
+        job_id = self.job_id
+        self.retry_after = None
+        try:
+            batch = client.batches.retrieve(job_id)
+            self._consecutive_errors = 0
+        except self._retryable as e:
+            self._consecutive_errors += 1
+            backoff = min(
+                self._poll_interval * 2 ** (self._consecutive_errors - 1),
+                MAX_ERROR_BACKOFF,
+            )
+            logger.warning(
+                "batch %s: poll error (%d/%d), retrying in %ds: %s",
+                job_id,
+                self._consecutive_errors,
+                MAX_POLL_ERRORS,
+                backoff,
+                e,
+            )
+            if self._consecutive_errors >= MAX_POLL_ERRORS:
+                raise ExtractionError(
+                    f"Batch poll failed after {MAX_POLL_ERRORS} consecutive errors: {e}",
+                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+                ) from e
+            self.retry_after = backoff
+            return None
+        except Exception as e:
+            raise ExtractionError(
+                f"Batch poll failed with non-retryable error: {e}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            ) from e
+
+        status = batch.status
+        counts = batch.request_counts
+        counts_str = ""
+        if counts:
+            counts_str = f" (completed={counts.completed}, failed={counts.failed}, total={counts.total})"
+
+        if status == "completed":
+            return batch
+        if status == "failed":
+            raise ExtractionError(
+                f"Batch job failed: {job_id}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            )
+        if status == "cancelled":
+            if self._cancel_initiated_at is not None:
+                # We cancelled it due to stall — return for partial result collection.
+                return batch
+            raise ExtractionError(
+                f"Batch job cancelled: {job_id}",
+                reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+            )
+        if status == "expired":
+            logger.warning(
+                "batch %s: expired%s, collecting partial results...",
+                job_id,
+                counts_str,
+            )
+            return batch
+
+        # Log progress changes at INFO, unchanged polls at DEBUG.
+        curr_counts = (counts.completed, counts.failed) if counts else (0, 0)
+        if curr_counts != self._prev_counts or status != self._prev_status:
+            logger.info(
+                "batch %s: status=%s%s",
+                job_id,
+                status,
+                counts_str,
+            )
+            self._prev_counts = curr_counts
+            self._prev_status = status
+        else:
+            logger.debug("batch %s: status=%s%s", job_id, status, counts_str)
+
+        now = time.monotonic()
+
+        # Wall-time deadline: the API caps batches at 24h, so cancel
+        # before that to attempt partial result collection.
+        if self._cancel_initiated_at is None:
+            elapsed = now - self._start_time
+            if elapsed >= self._stall_timeout:
+                elapsed_min = int(elapsed // 60)
+                logger.warning(
+                    "batch %s: wall-time limit reached (%d minutes)%s, cancelling...",
+                    job_id,
+                    elapsed_min,
+                    counts_str,
+                )
+                try:
+                    client.batches.cancel(job_id)
+                except Exception as e:
+                    raise ExtractionError(
+                        f"Batch wall-time limit reached and cancel failed: {e}",
+                        reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+                    ) from e
+                self._cancel_initiated_at = now
+        else:
+            cancel_wait = now - self._cancel_initiated_at
+            if cancel_wait >= CANCEL_WAIT_TIMEOUT:
+                cancel_min = int(cancel_wait // 60)
+                logger.warning(
+                    "batch %s: cancellation did not complete after "
+                    "%d minutes%s, collecting partial results...",
+                    job_id,
+                    cancel_min,
+                    counts_str,
+                )
+                return batch
+        return None
+
+
 class OpenAIProvider:
     """Implements LLMProvider + BatchProvider for OpenAI."""
 
@@ -172,6 +314,15 @@ class OpenAIProvider:
         """Fetch a batch's current state by ID. For diagnostics; not on any hot path."""
         return self.client.batches.retrieve(batch_id)
 
+    def start_poll(self, client: OpenAI, job_id: str, poll_interval: int) -> _BatchPoll:
+        return _BatchPoll(
+            client,
+            job_id,
+            poll_interval,
+            self._stall_timeout,
+            self.retryable_exceptions,
+        )
+
     def poll_batch(
         self,
         client: OpenAI,
@@ -179,137 +330,18 @@ class OpenAIProvider:
         poll_interval: int,
         stop_event: threading.Event | None,
     ) -> Batch:
-        consecutive_errors = 0
-        prev_counts: tuple[int, int] = (0, 0)
-        prev_status: str | None = None
-        start_time = time.monotonic()
-        cancel_initiated_at: float | None = None
+        poll = self.start_poll(client, job_id, poll_interval)
         while True:
-            try:
-                batch = client.batches.retrieve(job_id)
-                consecutive_errors = 0
-            except self.retryable_exceptions as e:
-                consecutive_errors += 1
-                backoff = min(
-                    poll_interval * 2 ** (consecutive_errors - 1),
-                    MAX_ERROR_BACKOFF,
-                )
-                logger.warning(
-                    "batch %s: poll error (%d/%d), retrying in %ds: %s",
-                    job_id,
-                    consecutive_errors,
-                    MAX_POLL_ERRORS,
-                    backoff,
-                    e,
-                )
-                if consecutive_errors >= MAX_POLL_ERRORS:
-                    raise ExtractionError(
-                        f"Batch poll failed after {MAX_POLL_ERRORS} consecutive errors: {e}",
-                        reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                    ) from e
-                if stop_event is not None:
-                    stop_event.wait(backoff)
-                    if stop_event.is_set():
-                        raise KeyboardInterrupt
-                else:
-                    time.sleep(backoff)
-                continue
-            except Exception as e:
-                raise ExtractionError(
-                    f"Batch poll failed with non-retryable error: {e}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                ) from e
-
-            status = batch.status
-            counts = batch.request_counts
-            counts_str = ""
-            if counts:
-                counts_str = f" (completed={counts.completed}, failed={counts.failed}, total={counts.total})"
-
-            if status == "completed":
-                return batch
-            if status == "failed":
-                raise ExtractionError(
-                    f"Batch job failed: {job_id}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                )
-            if status == "cancelled":
-                if cancel_initiated_at is not None:
-                    # We cancelled it due to stall — return for partial result collection.
-                    return batch
-                raise ExtractionError(
-                    f"Batch job cancelled: {job_id}",
-                    reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                )
-            if status == "expired":
-                logger.warning(
-                    "batch %s: expired%s, collecting partial results...",
-                    job_id,
-                    counts_str,
-                )
+            batch = poll.poll()
+            if batch is not None:
                 return batch
-
-            # Log progress changes at INFO, unchanged polls at DEBUG.
-            curr_counts = (counts.completed, counts.failed) if counts else (0, 0)
-            if curr_counts != prev_counts or status != prev_status:
-                logger.info(
-                    "batch %s: status=%s%s",
-                    job_id,
-                    status,
-                    counts_str,
-                )
-                prev_counts = curr_counts
-                prev_status = status
-            else:
-                logger.debug(
-                    "batch %s: status=%s%s, polling again in %ds...",
-                    job_id,
-                    status,
-                    counts_str,
-                    poll_interval,
-                )
-
-            now = time.monotonic()
-
-            # Wall-time deadline: the API caps batches at 24h, so cancel
-            # before that to attempt partial result collection.
-            if cancel_initiated_at is None:
-                elapsed = now - start_time
-                if elapsed >= self._stall_timeout:
-                    elapsed_min = int(elapsed // 60)
-                    logger.warning(
-                        "batch %s: wall-time limit reached (%d minutes)%s, cancelling...",
-                        job_id,
-                        elapsed_min,
-                        counts_str,
-                    )
-                    try:
-                        client.batches.cancel(job_id)
-                    except Exception as e:
-                        raise ExtractionError(
-                            f"Batch wall-time limit reached and cancel failed: {e}",
-                            reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                        ) from e
-                    cancel_initiated_at = now
-            else:
-                cancel_wait = now - cancel_initiated_at
-                if cancel_wait >= CANCEL_WAIT_TIMEOUT:
-                    cancel_min = int(cancel_wait // 60)
-                    logger.warning(
-                        "batch %s: cancellation did not complete after "
-                        "%d minutes%s, collecting partial results...",
-                        job_id,
-                        cancel_min,
-                        counts_str,
-                    )
-                    return batch
-
+            wait = poll.retry_after if poll.retry_after is not None else poll_interval
             if stop_event is not None:
-                stop_event.wait(poll_interval)
+                stop_event.wait(wait)
                 if stop_event.is_set():
                     raise KeyboardInterrupt
             else:
-                time.sleep(poll_interval)
+                time.sleep(wait)
 
     def _cleanup_batch_files(self, job: Batch) -> None:
         """Delete input/output/error files associated with a completed batch.
@@ -0,0 +1,257 @@
+"""Client-side rate limiting for interactive LLM calls.
+
+Each ``LLMExtractor`` owns one ``RateLimiter`` for its model, shared by every
+thread extracting through it. Before a request is sent the limiter waits
+until:
+
+- the provider has not asked us to back off (``Retry-After`` on a 429),
+- fewer than the current concurrency limit of requests are in flight,
+- the last minute's requests and tokens leave room under the configured
+  requests-per-minute / tokens-per-minute budgets.
+
+Tokens are budgeted up front from the prompt length and corrected with the
+provider-reported usage once the response arrives. Concurrency adapts AIMD
+style: every successful call raises the limit by ``1 / limit`` (about one
+slot per round of requests), every throttle halves it.
+
+``cancel()`` wakes every waiting caller and makes ``acquire`` raise
+``RateLimiterCancelled`` from then on, so a cancelled run does not sit out
+a Retry-After pause or a full budget window before noticing.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from explainshell.extraction.llm.prompt import SYSTEM_PROMPT
+
+logger = logging.getLogger(__name__)
+
+_WINDOW_SECONDS = 60.0
+# Rough prompt-size-to-tokens ratio, only used until real usage is known.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(user_content: str) -> int:
+    """Estimate the input tokens of a request with *user_content*."""
+    return (len(SYSTEM_PROMPT) + len(user_content)) // _CHARS_PER_TOKEN
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Return True if *exc* is a provider 429 (rate limit / quota) error."""
+    return any(getattr(exc, attr, None) == 429 for attr in ("status_code", "code"))
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the back-off a provider error asks for, if it says.
+
+    Reads ``retry-after-ms`` / ``retry-after`` (delta-seconds form) from the
+    HTTP response attached to OpenAI and Gemini SDK errors.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class RateLimiterCancelled(Exception):
+    """Raised by ``RateLimiter.acquire`` once the limiter is cancelled."""
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters of a RateLimiter, for the run log."""
+
+    requests: int = 0
+    tokens: int = 0
+    throttle_events: int = 0
+    # Total time callers spent waiting for a slot or for budget.
+    wait_seconds: float = 0.0
+    # From the first request to the last release.
+    active_seconds: float = 0.0
+    concurrency: int = 0
+
+
+class _Ticket:
+    """One request's entry in the sliding window."""
+
+    __slots__ = ("expired", "sent_at", "tokens")
+
+    def __init__(self, sent_at: float, tokens: int) -> None:
+        self.sent_at = sent_at
+        self.tokens = tokens
+        self.expired = False
+
+
+class RateLimiter:
+    """Request scheduler for one provider model (see module docstring).
+
+    ``rpm`` / ``tpm`` of None (or 0) mean no budget; ``max_concurrency``
+    caps the AIMD concurrency limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        max_concurrency: int = 1,
+    ) -> None:
+        self.name = name
+        self._rpm = rpm or None
+        self._tpm = tpm or None
+        self._max_concurrency = max(max_concurrency, 1)
+        self._limit = float(self._max_concurrency)
+        self._in_flight = 0
+        self._window: collections.deque[_Ticket] = collections.deque()
+        self._window_tokens = 0
+        self._resume_at = 0.0
+        self._first_at: float | None = None
+        self._last_at = 0.0
+        self._stats = RateLimiterStats()
+        self._cancelled = False
+        self._cond = threading.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        """Current concurrency limit."""
+        with self._cond:
+            return int(self._limit)
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        with self._cond:
+            s = RateLimiterStats(**vars(self._stats))
+            if self._first_at is not None:
+                s.active_seconds = self._last_at - self._first_at
+            s.concurrency = int(self._limit)
+            return s
+
+    def acquire(self, est_tokens: int) -> _Ticket:
+        """Block until a request of about *est_tokens* may be sent.
+
+        Raises RateLimiterCancelled if the limiter is, or gets, cancelled.
+        """
+        with self._cond:
+            start = now = time.monotonic()
+            while True:
+                if self._cancelled:
+                    raise RateLimiterCancelled(self.name)
+                delay = self._delay_locked(now, est_tokens)
+                if delay <= 0:
+                    break
+                self._cond.wait(None if math.isinf(delay) else delay)
+                now = time.monotonic()
+            ticket = _Ticket(now, est_tokens)
+            self._window.append(ticket)
+            self._window_tokens += est_tokens
+            self._in_flight += 1
+            self._stats.requests += 1
+            self._stats.wait_seconds += now - start
+            if self._first_at is None:
+                self._first_at = now
+            return ticket
+
+    def release(self, ticket: _Ticket, *, tokens: int | None = None) -> None:
+        """Finish a request; *tokens* is its reported usage when it succeeded."""
+        with self._cond:
+            self._release_locked(ticket, tokens)
+            if tokens is not None:
+                self._limit = min(
+                    self._limit + 1 / self._limit, float(self._max_concurrency)
+                )
+            self._cond.notify_all()
+
+    def throttle(self, ticket: _Ticket, pause: float) -> None:
+        """Finish a request the provider rejected with a 429.
+
+        Halves the concurrency limit and holds every caller for *pause*
+        seconds (the provider's ``Retry-After`` when it sent one).
+        """
+        with self._cond:
+            self._release_locked(ticket, None)
+            old = int(self._limit)
+            self._limit = max(self._limit / 2, 1.0)
+            self._resume_at = max(self._resume_at, time.monotonic() + pause)
+            self._stats.throttle_events += 1
+            logger.warning(
+                "%s: throttled by provider, pausing %.1fs; concurrency %d -> %d",
+                self.name,
+                pause,
+                old,
+                int(self._limit),
+            )
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Wake every waiting caller and refuse further requests.
+
+        Requests already sent are unaffected; their tickets are still
+        released as usual.
+        """
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def log_summary(self) -> None:
+        """Log achieved throughput and throttling for the run."""
+        s = self.stats
+        if not s.requests:
+            return
+        minutes = max(s.active_seconds, 1.0) / 60
+        logger.info(
+            "%s: %d request(s), %.1f req/min, %.0f tokens/min; "
+            "%d throttle event(s), %.1fs waiting for rate limits; "
+            "final concurrency %d",
+            self.name,
+            s.requests,
+            s.requests / minutes,
+            s.tokens / minutes,
+            s.throttle_events,
+            s.wait_seconds,
+            s.concurrency,
+        )
+
+    def _release_locked(self, ticket: _Ticket, tokens: int | None) -> None:
+        self._in_flight -= 1
+        self._last_at = time.monotonic()
+        if tokens is None:
+            return
+        self._stats.tokens += tokens
+        if not ticket.expired:
+            self._window_tokens += tokens - ticket.tokens
+        ticket.tokens = tokens
+
+    def _delay_locked(self, now: float, est_tokens: int) -> float:
+        """Seconds until a request may go out (``inf``: until a release)."""
+        while self._window and self._window[0].sent_at <= now - _WINDOW_SECONDS:
+            old = self._window.popleft()
+            old.expired = True
+            self._window_tokens -= old.tokens
+        if now < self._resume_at:
+            return self._resume_at - now
+        if self._in_flight >= int(self._limit):
+            return math.inf
+        if not self._window:
+            # Always let a lone request through, even one over the budget.
+            return 0.0
+        until_oldest_expires = self._window[0].sent_at + _WINDOW_SECONDS - now
+        if self._rpm and len(self._window) >= self._rpm:
+            return until_oldest_expires
+        if self._tpm and self._window_tokens + est_tokens > self._tpm:
+            return until_oldest_expires
+        return 0.0
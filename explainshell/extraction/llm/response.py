@@ -5,9 +5,11 @@ from __future__ import annotations
 import json
 import logging
 import re
+from collections.abc import Mapping
 
 from explainshell import models
 from explainshell.errors import ExtractionError, FailureReason
+from explainshell.extraction.llm.text import LineTable
 
 logger = logging.getLogger(__name__)
 
@@ -97,7 +99,7 @@ def process_llm_result(content: str) -> tuple[dict, str]:
 
 
 def extract_text_from_lines(
-    original_lines: dict[int, str], start: int, end: int
+    original_lines: Mapping[int, str], start: int, end: int
 ) -> str:
     """Build description text from line range [start, end] (1-indexed, inclusive).
 
@@ -106,11 +108,11 @@ def extract_text_from_lines(
     """
     if start < 1 or end < start:
         return ""
-    selected: list[str] = []
-    for i in range(start, end + 1):
-        line = original_lines.get(i, "")
-        line = line.removeprefix("> ")
-        selected.append(line)
+    if isinstance(original_lines, LineTable):
+        span = original_lines.span(start, end)
+    else:
+        span = [original_lines.get(i, "") for i in range(start, end + 1)]
+    selected = [line.removeprefix("> ") for line in span]
 
     if not selected:
         return ""
@@ -204,7 +206,7 @@ def sanitize_option_fields(
 
 
 def llm_option_to_store_option(
-    raw: dict, original_lines: dict[int, str]
+    raw: dict, original_lines: Mapping[int, str]
 ) -> models.Option:
     """Convert one LLM option dict to a models.Option.
 
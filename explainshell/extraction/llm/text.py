@@ -3,12 +3,13 @@ line numbering, and chunking."""
 
 from __future__ import annotations
 
+import itertools
 import os
 import re
-import subprocess
+from array import array
+from collections.abc import Iterator, Mapping
 
-from explainshell import config
-from explainshell.errors import ExtractionError, FailureReason
+from explainshell.extraction import mandoc
 
 # 60K chars ≈ 15-20K tokens. This is deliberately conservative: benchmarking at
 # 100K showed that pages fitting in one larger chunk (e.g. avrdude at 68K chars)
@@ -43,22 +44,13 @@ _BLACKLISTED_SECTIONS = frozenset(
 
 
 def get_manpage_text(gz_path: str) -> str:
-    """Run patched ``mandoc -T markdown <gz_path>`` to get markdown directly."""
+    """Render *gz_path* to markdown with the patched ``mandoc -T markdown``.
+
+    Goes through the shared ``MandocPool`` when MANDOC_BATCH_SIZE is above 1.
+    """
     if not os.path.isfile(gz_path):
         raise FileNotFoundError(f"manpage file not found: {gz_path}")
-    result = subprocess.run(
-        [config.MANDOC_PATH, "-T", "markdown", gz_path],
-        capture_output=True,
-        text=True,
-        timeout=60,
-        check=False,
-    )
-    if result.returncode != 0 or not result.stdout.strip():
-        raise ExtractionError(
-            f"mandoc failed for {gz_path}: {result.stderr}",
-            reason_class=FailureReason.MANDOC_FAILED,
-        )
-    return result.stdout.strip()
+    return mandoc.render(gz_path)
 
 
 def _split_sections(text: str) -> list[tuple[int, str]]:
@@ -178,20 +170,77 @@ def _build_preamble(text: str) -> str:
     return preamble
 
 
-def number_lines(text: str) -> tuple[str, dict[int, str]]:
+class LineTable(Mapping[int, str]):
+    """The 1-indexed lines of a text, without a string object per line.
+
+    Holds the text itself plus an ``array('I')`` of line start offsets, so
+    a page costs its own size plus four bytes a line. Reads as a mapping of
+    line number → line (what ``number_lines`` used to return as a dict);
+    ``span`` slices a range of lines straight out of the text, and
+    ``numbered`` renders the line-numbered view only when asked.
+    """
+
+    __slots__ = ("_starts", "text")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # _starts[k] is the offset of line k + 1; the final entry is
+        # len(text) + 1, so line n always ends one character before line n + 1.
+        self._starts = array("I", [0])
+        self._starts.extend(
+            itertools.accumulate(len(line) + 1 for line in text.split("\n"))
+        )
+
+    def __reduce__(self):
+        return (LineTable, (self.text,))
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(1, len(self) + 1))
+
+    def __getitem__(self, lineno: int) -> str:
+        if not 1 <= lineno <= len(self):
+            raise KeyError(lineno)
+        return self.text[self._starts[lineno - 1] : self._starts[lineno] - 1]
+
+    def span(self, start: int, end: int) -> list[str]:
+        """Lines *start*..*end* (1-indexed, inclusive); "" past the last line."""
+        start = max(start, 1)
+        if end < start:
+            return []
+        last = min(end, len(self))
+        lines = []
+        if start <= last:
+            lines = self.text[self._starts[start - 1] : self._starts[last] - 1].split(
+                "\n"
+            )
+        return lines + [""] * (end - max(last, start - 1))
+
+    @property
+    def _width(self) -> int:
+        return len(str(len(self)))
+
+    @property
+    def numbered_len(self) -> int:
+        """``len(self.numbered())``, without rendering it."""
+        return len(self.text) + len(self) * (self._width + 2)
+
+    def numbered(self) -> str:
+        """The text with "  42| " line-number prefixes."""
+        width = self._width
+        return "\n".join(f"{i:>{width}}| {line}" for i, line in self.items())
+
+
+def number_lines(text: str) -> tuple[str, LineTable]:
     """Add line numbers to every line of text.
 
     Returns (numbered_text, original_lines) where original_lines is a
-    dict mapping 1-indexed line numbers to their original content.
+    LineTable mapping 1-indexed line numbers to their original content.
     """
-    lines = text.split("\n")
-    original_lines: dict[int, str] = {}
-    numbered: list[str] = []
-    width = len(str(len(lines)))
-    for i, line in enumerate(lines, 1):
-        original_lines[i] = line
-        numbered.append(f"{i:>{width}}| {line}")
-    return "\n".join(numbered), original_lines
+    table = LineTable(text)
+    return table.numbered(), table
 
 
 _BARE_HEADING_RE = re.compile(r"^\s*\d+\|\s*\*\*[-+]")
@@ -226,9 +275,17 @@ def chunk_text(text: str) -> list[str]:
     When a single section exceeds the chunk size, it is sub-split at
     paragraph (blank-line) boundaries.
     """
-    numbered_full, _ = number_lines(text)
-    if len(numbered_full) <= CHUNK_SIZE_CHARS:
-        return [numbered_full]
+    total_lines = text.count("\n") + 1
+    width = len(str(total_lines))
+
+    def _numbered_len(chars: int, newlines: int) -> int:
+        """Length of a block of *chars* characters and *newlines* line breaks
+        once numbered; the same wherever the block starts, as every line
+        number is padded to *width*."""
+        return chars + (newlines + 1) * (width + 2)
+
+    if _numbered_len(len(text), total_lines - 1) <= CHUNK_SIZE_CHARS:
+        return [number_lines(text)[0]]
 
     sections = _split_sections(text)
     preamble = _build_preamble(text)
@@ -241,9 +298,6 @@ def chunk_text(text: str) -> list[str]:
         )
     budget = CHUNK_SIZE_CHARS - len(preamble_text)
 
-    total_lines = text.count("\n") + 1
-    width = len(str(total_lines))
-
     def _number_block(start_line: int, block_text: str) -> str:
         lines = block_text.split("\n")
         numbered = []
@@ -252,36 +306,51 @@ def chunk_text(text: str) -> list[str]:
             numbered.append(f"{lineno:>{width}}| {line}")
         return "\n".join(numbered)
 
+    def _block_len(block_text: str) -> int:
+        return _numbered_len(len(block_text), block_text.count("\n"))
+
+    # Candidate blocks below are sized from running character and newline
+    # counts rather than by numbering each candidate, which kept chunking
+    # quadratic in the size of a long section.
+
     def _split_by_lines(start_line: int, block_text: str) -> list[tuple[int, str]]:
         """Last-resort split: cut at line boundaries to fit budget."""
         lines = block_text.split("\n")
         result: list[tuple[int, str]] = []
         cur_lines: list[str] = []
+        cur_chars = 0
         cur_start = start_line
         for line in lines:
-            candidate = "\n".join(cur_lines + [line])
-            if len(_number_block(cur_start, candidate)) > budget and cur_lines:
+            # Adding a line adds its text plus one "\n" per line already held.
+            n = len(cur_lines)
+            if _numbered_len(cur_chars + n + len(line), n) > budget and cur_lines:
                 result.append((cur_start, "\n".join(cur_lines)))
                 cur_start += len(cur_lines)
                 cur_lines = []
+                cur_chars = 0
             cur_lines.append(line)
+            cur_chars += len(line)
         if cur_lines:
             result.append((cur_start, "\n".join(cur_lines)))
         return result
 
     blocks: list[tuple[int, str]] = []
     for start_line, section_text in sections:
-        numbered = _number_block(start_line, section_text)
-        if len(numbered) <= budget:
+        if _block_len(section_text) <= budget:
             blocks.append((start_line, section_text))
         else:
             paragraphs = section_text.split("\n\n")
             cur_paras: list[str] = []
+            # Characters and newlines of "\n\n".join(cur_paras).
+            cur_chars = cur_newlines = 0
             cur_start = start_line
             for para in paragraphs:
-                candidate = "\n\n".join(cur_paras + [para])
-                numbered_candidate = _number_block(cur_start, candidate)
-                if len(numbered_candidate) > budget and cur_paras:
+                sep = 2 if cur_paras else 0
+                para_newlines = para.count("\n")
+                candidate_len = _numbered_len(
+                    cur_chars + sep + len(para), cur_newlines + sep + para_newlines
+                )
+                if candidate_len > budget and cur_paras:
                     carried: list[str] = []
                     while len(cur_paras) > 1 and _is_bare_option_heading_raw(
                         cur_paras[-1]
@@ -291,13 +360,18 @@ def chunk_text(text: str) -> list[str]:
                     blocks.append((cur_start, emitted))
                     cur_start = cur_start + emitted.count("\n") + 2
                     cur_paras = carried
+                    kept = "\n\n".join(carried)
+                    cur_chars, cur_newlines = len(kept), kept.count("\n")
+                    sep = 2 if cur_paras else 0
                 cur_paras.append(para)
+                cur_chars += sep + len(para)
+                cur_newlines += sep + para_newlines
             if cur_paras:
                 blocks.append((cur_start, "\n\n".join(cur_paras)))
 
     final_blocks: list[tuple[int, str]] = []
     for start_line, block_text in blocks:
-        if len(_number_block(start_line, block_text)) > budget:
+        if _block_len(block_text) > budget:
             final_blocks.extend(_split_by_lines(start_line, block_text))
         else:
             final_blocks.append((start_line, block_text))
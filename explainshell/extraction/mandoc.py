@@ -0,0 +1,357 @@
+"""Rendering manpages to markdown with the patched mandoc.
+
+``render_page`` runs ``mandoc -T markdown`` on a single page. For the
+thousands of small pages in a release directory, starting mandoc (and
+gunzipping the page) costs more than the rendering itself, so
+``MandocPool`` renders many pages per mandoc process instead. mandoc
+renders every file it is given, one after the other, so the pool passes a
+batch of pages separated by a tiny sentinel page and splits the output on
+the sentinel's own rendering.
+
+A batch that does not split cleanly (mandoc exited non-zero, a page came
+out empty, or the number of pieces is off) is rendered again one page at a
+time, so the pool returns the same text, and raises the same errors, as
+``render_page``.
+
+With ``MANDOC_BATCH_SIZE`` above 1, ``render`` goes through a pool shared
+by the process; ``prefetch`` lets callers that know which pages come next
+queue them so they share a batch.
+"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import concurrent.futures
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import uuid
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from explainshell import config
+from explainshell.errors import ExtractionError, FailureReason
+
+logger = logging.getLogger(__name__)
+
+# Seconds one mandoc process may run, for a single page or a whole batch.
+_TIMEOUT = 60
+
+# How long a worker waits for more requests before rendering a short batch.
+_LINGER = 0.005
+
+# Prefetched pages kept for ``render`` to pick up; older ones are dropped
+# (and rendered again if they are asked for after all).
+_MAX_PREFETCHED = 1024
+
+_SENTINEL_SOURCE = ".TH EXPLAINSHELL-SENTINEL 7 2000-01-01\n.SH NAME\nsentinel \\- {}\n"
+
+
+def render_page(gz_path: str, mandoc_path: str | None = None) -> str:
+    """Run patched ``mandoc -T markdown <gz_path>`` to get markdown directly."""
+    result = subprocess.run(
+        [mandoc_path or config.MANDOC_PATH, "-T", "markdown", gz_path],
+        capture_output=True,
+        text=True,
+        timeout=_TIMEOUT,
+        check=False,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        raise ExtractionError(
+            f"mandoc failed for {gz_path}: {result.stderr}",
+            reason_class=FailureReason.MANDOC_FAILED,
+        )
+    return result.stdout.strip()
+
+
+# ---------------------------------------------------------------------------
+# Sentinel page
+# ---------------------------------------------------------------------------
+
+# (pid, path, marker) of this process's sentinel page.
+_sentinel: tuple[int, str, str] | None = None
+_sentinel_lock = threading.Lock()
+
+
+def _remove_sentinel(pid: int, path: str) -> None:
+    # Forked children inherit the atexit hook; only the creator removes it.
+    if os.getpid() == pid:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _sentinel_page() -> tuple[str, str]:
+    """Path and unique marker text of the sentinel page, written on first use."""
+    global _sentinel
+    with _sentinel_lock:
+        if _sentinel is None or _sentinel[0] != os.getpid():
+            marker = f"explainshell-sentinel-{uuid.uuid4().hex}"
+            fd, path = tempfile.mkstemp(prefix="explainshell-sentinel-", suffix=".7")
+            with os.fdopen(fd, "w") as f:
+                f.write(_SENTINEL_SOURCE.format(marker))
+            atexit.register(_remove_sentinel, os.getpid(), path)
+            _sentinel = (os.getpid(), path, marker)
+        return _sentinel[1], _sentinel[2]
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class MandocPoolStats:
+    batches: int = 0
+    pages: int = 0
+    # Pages rendered again on their own because their batch did not split.
+    fallbacks: int = 0
+
+
+class MandocPool:
+    """Renders pages in batches of up to *batch_size*, one mandoc per batch.
+
+    *workers* long-lived threads take queued pages off a shared queue, so
+    concurrent ``render`` calls and ``prefetch``-ed pages end up in the same
+    mandoc process. Thread-safe; a forked child starts its own threads on
+    first use. If mandoc can't be made to render batches (see ``_calibrate``)
+    every page is rendered with ``render_page``.
+    """
+
+    def __init__(
+        self,
+        mandoc_path: str | None = None,
+        batch_size: int = 32,
+        workers: int = 2,
+    ) -> None:
+        self.mandoc_path = mandoc_path or config.MANDOC_PATH
+        self.batch_size = batch_size
+        self.workers = workers
+        self.stats = MandocPoolStats()
+        self._reset()
+        _pools.add(self)
+
+    def render(self, gz_path: str) -> str:
+        """Render *gz_path* to markdown, waiting for its batch if needed."""
+        with self._lock:
+            if not self._ensure_started():
+                fut = None
+            else:
+                fut = self._prefetched.pop(gz_path, None) or self._submit(gz_path)
+        if fut is None:
+            return render_page(gz_path, self.mandoc_path)
+        return fut.result()
+
+    def prefetch(self, gz_paths: Iterable[str]) -> None:
+        """Start rendering *gz_paths* ahead of the ``render`` calls for them."""
+        with self._lock:
+            if not self._ensure_started():
+                return
+            for gz_path in gz_paths:
+                if gz_path not in self._prefetched:
+                    self._prefetched[gz_path] = self._submit(gz_path)
+            while len(self._prefetched) > _MAX_PREFETCHED:
+                del self._prefetched[next(iter(self._prefetched))]
+
+    def close(self) -> None:
+        """Render what is queued, then stop the worker threads."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+            threads, self._threads = self._threads, []
+        for t in threads:
+            t.join()
+
+    # -- internals ----------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._queue: collections.deque[tuple[str, concurrent.futures.Future[str]]] = (
+            collections.deque()
+        )
+        self._prefetched: dict[str, concurrent.futures.Future[str]] = {}
+        self._threads: list[threading.Thread] = []
+        self._started = False
+        self._closed = False
+        # The sentinel page's own rendering; None when batching is unavailable.
+        self._separator: str | None = None
+        self._sentinel_path = ""
+
+    def _ensure_started(self) -> bool:
+        """Start the workers on first use (lock held); False if not batching."""
+        if not self._started:
+            self._started = True
+            self._separator = self._calibrate()
+            if self._separator is not None:
+                for i in range(self.workers):
+                    t = threading.Thread(
+                        target=self._work, name=f"mandoc-{i}", daemon=True
+                    )
+                    t.start()
+                    self._threads.append(t)
+        return self._separator is not None and not self._closed
+
+    def _calibrate(self) -> str | None:
+        """Render the sentinel page alone and twice in a row.
+
+        Batching is only used if the sentinel renders to text containing its
+        marker, and two sentinels in one process render to exactly that text
+        twice, with nothing but whitespace around it.
+        """
+        path, marker = _sentinel_page()
+        self._sentinel_path = path
+        try:
+            alone = self._run([path])
+            twice = self._run([path, path])
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("mandoc batching unavailable: %s", e)
+            return None
+        separator = alone.stdout.strip()
+        if (
+            alone.returncode != 0
+            or twice.returncode != 0
+            or marker not in separator
+            or twice.stdout.count(separator) != 2
+            or twice.stdout.replace(separator, "").strip()
+        ):
+            logger.warning(
+                "mandoc batching unavailable: %s does not render pages back to "
+                "back; rendering one page per process",
+                self.mandoc_path,
+            )
+            return None
+        return separator
+
+    def _submit(self, gz_path: str) -> concurrent.futures.Future[str]:
+        fut: concurrent.futures.Future[str] = concurrent.futures.Future()
+        self._queue.append((gz_path, fut))
+        self._wakeup.notify()
+        return fut
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._wakeup.wait()
+                if not self._queue:
+                    return
+                if len(self._queue) < self.batch_size and not self._closed:
+                    # Give concurrent callers a moment to join this batch.
+                    self._wakeup.wait(_LINGER)
+                n = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(n)]
+            if batch:
+                self._render_batch(batch)
+
+    def _render_batch(
+        self, batch: list[tuple[str, concurrent.futures.Future[str]]]
+    ) -> None:
+        texts = self._split([gz_path for gz_path, _ in batch])
+        fallbacks = 0
+        for (gz_path, fut), text in zip(batch, texts):
+            if text is None:
+                fallbacks += 1
+                try:
+                    text = render_page(gz_path, self.mandoc_path)
+                except Exception as e:
+                    fut.set_exception(e)
+                    continue
+            fut.set_result(text)
+        with self._lock:
+            self.stats.batches += 1
+            self.stats.pages += len(batch)
+            # A batch of one is rendered with render_page by design.
+            if len(batch) > 1:
+                self.stats.fallbacks += fallbacks
+
+    def _split(self, gz_paths: list[str]) -> list[str | None]:
+        """Each page's markdown from one mandoc run; None where it's unclear."""
+        failed: list[str | None] = [None] * len(gz_paths)
+        if len(gz_paths) == 1:
+            return failed
+        args: list[str] = []
+        for i, gz_path in enumerate(gz_paths):
+            if i:
+                args.append(self._sentinel_path)
+            args.append(gz_path)
+        try:
+            result = self._run(args)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug("mandoc batch of %d failed: %s", len(gz_paths), e)
+            return failed
+        if result.returncode != 0:
+            return failed
+        assert self._separator is not None
+        pieces = result.stdout.split(self._separator)
+        if len(pieces) != len(gz_paths):
+            return failed
+        return [piece.strip() or None for piece in pieces]
+
+    def _run(self, paths: list[str]) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [self.mandoc_path, "-T", "markdown", *paths],
+            capture_output=True,
+            text=True,
+            timeout=_TIMEOUT,
+            check=False,
+        )
+
+
+_pools: weakref.WeakSet[MandocPool] = weakref.WeakSet()
+
+
+# ---------------------------------------------------------------------------
+# Shared pool
+# ---------------------------------------------------------------------------
+
+_shared: MandocPool | None = None
+_shared_lock = threading.Lock()
+
+
+def _after_fork_in_child() -> None:
+    # Locks may have been held and threads don't survive the fork.
+    global _shared_lock, _sentinel_lock
+    _shared_lock = threading.Lock()
+    _sentinel_lock = threading.Lock()
+    for pool in list(_pools):
+        pool._reset()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def shared_pool() -> MandocPool | None:
+    """The process's pool, or None unless MANDOC_BATCH_SIZE is above 1."""
+    global _shared
+    if config.MANDOC_BATCH_SIZE <= 1:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = MandocPool(batch_size=config.MANDOC_BATCH_SIZE)
+        return _shared
+
+
+def render(gz_path: str) -> str:
+    """Render *gz_path*, through the shared pool when batching is enabled."""
+    pool = shared_pool()
+    if pool is None:
+        return render_page(gz_path)
+    return pool.render(gz_path)
+
+
+def prefetch(gz_paths: Iterable[str]) -> None:
+    """Queue *gz_paths* on the shared pool; a no-op when batching is off."""
+    pool = shared_pool()
+    if pool is not None:
+        pool.prefetch(gz_paths)
+
+
+def prefetch_size() -> int:
+    """How many pages callers should prefetch together (1 when batching is off)."""
+    return max(config.MANDOC_BATCH_SIZE, 1)
@@ -2,6 +2,9 @@
 
 Written atomically after each batch completes, so it survives crashes.
 Thread-safe for parallel batch mode (jobs > 1).
+
+``extract --resume <run_dir>`` reads it back (see ``load_batch_manifest``)
+to re-attach to the provider batches of an interrupted run.
 """
 
 from __future__ import annotations
@@ -13,6 +16,8 @@ from typing import Literal, Protocol
 
 from pydantic import BaseModel
 
+MANIFEST_FILENAME = "batch-manifest.json"
+
 
 class BatchManifestEntry(BaseModel):
     """One batch's record in the manifest."""
@@ -49,20 +54,50 @@ class BatchManifestWriter(Protocol):
     ) -> None: ...
 
 
+def load_batch_manifest(run_dir: str) -> BatchManifest:
+    """Read the batch manifest of a previous run in *run_dir*.
+
+    Falls back to the copy embedded in ``report.json``, which replaces the
+    standalone manifest once a run writes its report (including a run that
+    was interrupted).
+
+    Raises FileNotFoundError if the run has neither, and ValueError if the
+    manifest does not validate.
+    """
+    path = os.path.join(run_dir, MANIFEST_FILENAME)
+    if os.path.isfile(path):
+        with open(path) as f:
+            return BatchManifest.model_validate_json(f.read())
+    report_path = os.path.join(run_dir, "report.json")
+    if os.path.isfile(report_path):
+        with open(report_path) as f:
+            data = json.load(f).get("batch_manifest")
+        if data is not None:
+            return BatchManifest.model_validate(data)
+    raise FileNotFoundError(f"no batch manifest in {run_dir}")
+
+
 class FileBatchManifestWriter:
     """Thread-safe manifest writer for batch extraction runs.
 
     Records batch outcomes incrementally and flushes to disk after each update.
+    Pass *previous* (a loaded manifest) to continue a resumed run's manifest.
     """
 
-    def __init__(self, path: str, model: str, batch_size: int) -> None:
+    def __init__(
+        self,
+        path: str,
+        model: str,
+        batch_size: int,
+        previous: BatchManifest | None = None,
+    ) -> None:
         self._path = path
         self._data = BatchManifest(
             version=1,
             model=model,
             batch_size=batch_size,
             total_batches=None,
-            batches=[],
+            batches=list(previous.batches) if previous is not None else [],
         )
         self._lock = threading.Lock()
         os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -0,0 +1,135 @@
+"""Single-thread poller for in-flight provider batches.
+
+Instead of one thread per batch sleeping a fixed 30 s between status checks,
+every submitted batch is registered with one ``BatchPoller``, which checks
+each batch when it is due and resolves a future once it finishes.
+
+Poll intervals adapt to the age of a batch: a fresh batch is checked every
+few seconds, an older one about every tenth of its age, up to a cap, so
+small batches are picked up quickly and long-running ones are not polled
+needlessly.  A back-off requested by the provider (``BatchPoll.retry_after``)
+is always honoured.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from explainshell.extraction.llm.providers import BatchPoll
+
+logger = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL = 5.0
+MAX_POLL_INTERVAL = 60.0
+# Poll a running batch about every this fraction of its age.
+_AGE_FRACTION = 0.1
+
+
+@dataclass(order=True)
+class _Watch:
+    due: float
+    seq: int
+    poll: BatchPoll = field(compare=False)
+    future: concurrent.futures.Future[Any] = field(compare=False)
+    started: float = field(compare=False)
+
+
+class BatchPoller:
+    """Polls every watched batch from one background thread.
+
+    ``watch`` returns a future that resolves to the finished provider job,
+    or fails with the ``ExtractionError`` raised by ``BatchPoll.poll``.
+    ``close`` stops the thread and cancels the futures of batches still
+    running.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._heap: list[_Watch] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def watch(self, poll: BatchPoll) -> concurrent.futures.Future[Any]:
+        """Start polling *poll*; the first check happens right away."""
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchPoller is closed")
+            heapq.heappush(self._heap, _Watch(now, next(self._seq), poll, future, now))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="batch-poller", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def close(self) -> None:
+        """Stop polling and cancel the futures of unfinished batches."""
+        with self._cond:
+            self._closed = True
+            watches, self._heap = self._heap, []
+            self._cond.notify()
+        for w in watches:
+            w.future.cancel()
+
+    def interval(self, age: float) -> float:
+        """Seconds until a batch that has been running for *age* is polled again."""
+        return min(max(age * _AGE_FRACTION, self.min_interval), self.max_interval)
+
+    def _next_due(self) -> _Watch | None:
+        """Block until a watch is due and pop it; None once closed."""
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                if self._heap and self._heap[0].due <= now:
+                    return heapq.heappop(self._heap)
+                self._cond.wait(self._heap[0].due - now if self._heap else None)
+            return None
+
+    def _run(self) -> None:
+        while (w := self._next_due()) is not None:
+            try:
+                job = w.poll.poll()
+            except Exception as e:
+                self._resolve(w, exc=e)
+                continue
+            if job is not None:
+                self._resolve(w, job=job)
+                continue
+            now = time.monotonic()
+            wait = max(self.interval(now - w.started), w.poll.retry_after or 0.0)
+            logger.debug("batch %s: next poll in %.0fs", w.poll.job_id, wait)
+            with self._cond:
+                if self._closed:
+                    w.future.cancel()
+                    return
+                w.due = now + wait
+                w.seq = next(self._seq)
+                heapq.heappush(self._heap, w)
+
+    @staticmethod
+    def _resolve(w: _Watch, job: Any = None, exc: BaseException | None = None) -> None:
+        try:
+            if exc is not None:
+                w.future.set_exception(exc)
+            else:
+                w.future.set_result(job)
+        except concurrent.futures.InvalidStateError:
+            pass  # cancelled by close()
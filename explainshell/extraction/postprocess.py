@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import re
 from dataclasses import dataclass
@@ -91,7 +92,29 @@ def strip_trailing_blanks(opt: Option) -> Option:
     return opt.model_copy(update={"text": stripped})
 
 
-def _subset_has_cross_reference(subset: Option, extra_flags: frozenset[str]) -> bool:
+# A flag mention: the flag with no letter, digit or dash on either side.
+_FLAG_MENTION = r"(?<![a-zA-Z0-9\-])(?:{})(?![a-zA-Z0-9\-])"
+
+
+@functools.lru_cache(maxsize=4096)
+def _flag_pattern(flag: str) -> re.Pattern[str]:
+    return re.compile(_FLAG_MENTION.format(re.escape(flag)))
+
+
+def _flags_pattern(flags: frozenset[str]) -> re.Pattern[str]:
+    """One alternation matching a mention of any of *flags*."""
+    # Longest first, so a flag that prefixes another doesn't shadow it.
+    alternation = "|".join(
+        re.escape(f) for f in sorted(flags, key=lambda f: (-len(f), f))
+    )
+    return re.compile(_FLAG_MENTION.format(alternation))
+
+
+def _subset_has_cross_reference(
+    subset: Option,
+    extra_flags: frozenset[str],
+    superset_pattern: re.Pattern[str] | None = None,
+) -> bool:
     """Check if subset's description mentions any of the superset's extra flags.
 
     This guards against false-positive subset merges that occur when the LLM
@@ -104,13 +127,22 @@ def _subset_has_cross_reference(subset: Option, extra_flags: frozenset[str]) ->
     single-letter flags like ``k`` do not match inside ordinary words
     ("work", "make") and flag prefixes like ``-M`` do not match inside
     longer tokens.
+
+    *superset_pattern*, the ``_flags_pattern`` of all the superset's flags,
+    lets a caller comparing one superset against many subsets scan each
+    description once: no mention of any superset flag means no mention of
+    an extra one.
     """
     desc = subset.text
-    for flag in extra_flags:
-        pattern = r"(?<![a-zA-Z0-9\-])" + re.escape(flag) + r"(?![a-zA-Z0-9\-])"
-        if re.search(pattern, desc):
+    if superset_pattern is not None:
+        mentioned = {m.group() for m in superset_pattern.finditer(desc)}
+        if not mentioned:
+            return False
+        if not mentioned.isdisjoint(extra_flags):
             return True
-    return False
+        # Only the subset's own flags showed up; an extra flag may still be
+        # mentioned at an overlapping position, so check each one.
+    return any(_flag_pattern(flag).search(desc) for flag in extra_flags)
 
 
 def dedup_options(options: list[Option]) -> tuple[list[Option], int]:
@@ -166,22 +198,37 @@ def dedup_options(options: list[Option]) -> tuple[list[Option], int]:
 
     # Pass 2: strict-subset dedup.  For each surviving option, search
     # ALL other surviving options (bidirectional) for the closest
-    # qualifying superset.
+    # qualifying superset.  A superset holds every flag of the subset, so
+    # the only candidates are the options listed under the subset's rarest
+    # flag in an inverted flag -> options index.
+    index: dict[str, list[int]] = {}
+    for j, fj in enumerate(flags_list):
+        if j not in removed:
+            for flag in fj:
+                index.setdefault(flag, []).append(j)
+    patterns: dict[int, re.Pattern[str]] = {}
+
     for i in range(len(options)):
         if i in removed or not flags_list[i]:
             continue
         fi = flags_list[i]
         best_j: int | None = None
         best_extra_len: int = 0
-        for j in range(len(options)):
-            if j == i or j in removed or not flags_list[j]:
+        # Postings are in index order, so ties still go to the earliest j.
+        for j in min((index[f] for f in fi), key=len):
+            if j == i or j in removed:
                 continue
             fj = flags_list[j]
-            if fi < fj and _subset_has_cross_reference(options[i], fj - fi):
-                extra = len(fj - fi)
-                if best_j is None or extra < best_extra_len:
-                    best_j = j
-                    best_extra_len = extra
+            if not fi < fj:
+                continue
+            extra = len(fj) - len(fi)
+            if best_j is not None and extra >= best_extra_len:
+                continue
+            if j not in patterns:
+                patterns[j] = _flags_pattern(fj)
+            if _subset_has_cross_reference(options[i], fj - fi, patterns[j]):
+                best_j = j
+                best_extra_len = extra
         if best_j is not None:
             sup = options[best_j]
             sub = options[i]
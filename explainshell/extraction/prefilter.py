@@ -1,8 +1,13 @@
 """Pre-extraction classification of input .gz files.
 
 Each file resolves to exactly one ``Decision`` (Work, SizeSkip, AlreadyStored,
-FilterSkip, Symlink, ContentDup). ``Classifier.classify`` is a stateful,
-single-pass call: it has no external side effects (no DB writes, no logging),
+FilterSkip, Symlink, ContentDup). ``Classifier.classify_all`` classifies a
+whole input set: the filesystem work (stat, realpath, hashing) runs in a
+thread pool, DB membership is answered from sets loaded once up front, and
+the content-dedup decision is made sequentially in input order, so the
+outcome is the same as classifying the files one by one with ``classify``.
+
+Classification has no external side effects (no DB writes, no logging),
 but it does mutate ``_hash_to_canonical`` in the ``Work`` branch so a later
 same-hash sibling in the same input set classifies as ``ContentDup``. It is
 not safe to call concurrently or to retry. ``apply_decisions`` is the
@@ -12,8 +17,10 @@ per-file log lines, and produces the buckets the extract command consumes.
 
 from __future__ import annotations
 
+import concurrent.futures
 import logging
 import os
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from explainshell import config, models, store
@@ -105,6 +112,15 @@ def _matches_filter(
     return False
 
 
+@dataclass(frozen=True)
+class _Probe:
+    """Filesystem facts about one input, gathered off the main thread."""
+
+    size: int | None
+    # realpath of the file when it is a symlink, else None.
+    canonical_path: str | None
+
+
 @dataclass
 class Classifier:
     s: store.Store
@@ -119,6 +135,7 @@ class Classifier:
     _filter_index: dict[str, tuple[str, models.ExtractionMeta]] = field(
         init=False, default_factory=dict
     )
+    _stored_sources: set[str] = field(init=False, default_factory=set)
 
     def __post_init__(self) -> None:
         # When --overwrite is set we want every canonical to be re-extracted,
@@ -128,27 +145,68 @@ class Classifier:
                 self._hash_to_canonical[_dedup_key(sha, source)] = source
         if self.filter_specs:
             self._filter_index = self.s.extractor_info_index()
+        self._stored_sources = self.s.manpage_sources()
 
     def classify(self, gz_path: str) -> Decision:
-        short_path = config.source_from_path(gz_path)
-
+        """Classify a single file."""
+        d = self._decide(gz_path, self._probe(gz_path))
+        if d is None:
+            d = self._dedup(gz_path, common.gz_sha256(gz_path))
+        return d
+
+    def classify_all(
+        self, gz_paths: Sequence[str], workers: int | None = None
+    ) -> list[Decision]:
+        """Classify *gz_paths*, returning one decision per path, in order.
+
+        Stats and hashes run on *workers* threads (the executor default when
+        None); only files that reach the dedup check are hashed.
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="prefilter"
+        ) as pool:
+            probes = pool.map(self._probe, gz_paths)
+            decisions = [self._decide(p, pr) for p, pr in zip(gz_paths, probes)]
+            pending = [i for i, d in enumerate(decisions) if d is None]
+            hashes = dict(
+                zip(pending, pool.map(common.gz_sha256, [gz_paths[i] for i in pending]))
+            )
+        # Dedup walks the files in input order, whichever hash finished first,
+        # so the first of a set of identical files is always the canonical.
+        return [
+            d if d is not None else self._dedup(p, hashes[i])
+            for i, (p, d) in enumerate(zip(gz_paths, decisions))
+        ]
+
+    def _probe(self, gz_path: str) -> _Probe:
+        size = None
         if self.small_only or self.large_only:
             size = os.path.getsize(gz_path)
+        canonical_path = None
+        if os.path.islink(gz_path):
+            canonical_path = os.path.realpath(gz_path)
+        return _Probe(size, canonical_path)
+
+    def _decide(self, gz_path: str, probe: _Probe) -> Decision | None:
+        """Every check short of content dedup; None if the file needs hashing."""
+        short_path = config.source_from_path(gz_path)
+
+        size = probe.size
+        if size is not None:
             if self.small_only and size > self.size_threshold:
                 return SizeSkip(gz_path, short_path, size, self.size_threshold, "small")
             if self.large_only and size <= self.size_threshold:
                 return SizeSkip(gz_path, short_path, size, self.size_threshold, "large")
 
-        if os.path.islink(gz_path):
-            canonical_path = os.path.realpath(gz_path)
-            canonical_source = config.source_from_path(canonical_path)
+        if probe.canonical_path is not None:
+            canonical_source = config.source_from_path(probe.canonical_path)
             if canonical_source != short_path:
                 return Symlink(
                     gz_path=gz_path,
                     short_path=short_path,
                     canonical_source=canonical_source,
-                    stale_in_db=self.s.has_manpage_source(short_path),
-                    canonical_in_inputs=canonical_path in self.normalized_inputs,
+                    stale_in_db=short_path in self._stored_sources,
+                    canonical_in_inputs=probe.canonical_path in self.normalized_inputs,
                 )
 
         if self.overwrite and self.filter_specs:
@@ -174,10 +232,12 @@ class Classifier:
                     stored_model=stored_meta.model,
                 )
 
-        if not self.overwrite and self.s.has_manpage_source(short_path):
+        if not self.overwrite and short_path in self._stored_sources:
             return AlreadyStored(gz_path, short_path)
+        return None
 
-        h = common.gz_sha256(gz_path)
+    def _dedup(self, gz_path: str, h: str) -> Decision:
+        short_path = config.source_from_path(gz_path)
         key = _dedup_key(h, short_path)
         canonical = self._hash_to_canonical.get(key)
         if canonical is not None:
@@ -25,6 +25,7 @@ class ExtractConfig(BaseModel):
     drop: bool = False
     jobs: int = 1
     batch_size: int | None = None
+    resume: str | None = None
     debug: bool = False
     small_only: bool = False
     large_only: bool = False
@@ -123,6 +124,36 @@ class OptionCountSummary(BaseModel):
         )
 
 
+class PipelineSummary(BaseModel):
+    """Stage timings and memory high-water marks of a batch-API run."""
+
+    batches: int = 0
+    prepare_seconds: float = 0.0
+    submit_seconds: float = 0.0
+    poll_seconds: float = 0.0
+    finalize_seconds: float = 0.0
+    max_inflight_batches: int = 0
+    max_held_files: int = 0
+    max_batch_requests: int = 0
+    max_batch_chars: int = 0
+    process_peak_rss_mb: float = 0.0
+
+
+class LLMCacheSummary(BaseModel):
+    """LLM response cache lookups during a run.
+
+    Tokens saved are what the cached responses cost when first fetched;
+    entries filled from batch results carry no per-request usage.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    input_tokens_saved: int = 0
+    output_tokens_saved: int = 0
+    reasoning_tokens_saved: int = 0
+    evictions: int = 0
+
+
 class FailureEntry(BaseModel):
     """One file that failed extraction, with classification."""
 
@@ -153,5 +184,7 @@ class ExtractionReport(BaseModel):
     option_counts: OptionCountSummary = Field(default_factory=OptionCountSummary.empty)
     failures: list[FailureEntry] = Field(default_factory=list)
     skips: list[SkipEntry] = Field(default_factory=list)
+    pipeline: PipelineSummary | None = None
+    llm_cache: LLMCacheSummary | None = None
     batch_manifest: dict[str, Any] | None = None
     reason: str | None = None
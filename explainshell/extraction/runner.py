@@ -6,10 +6,16 @@ no DB access, no CLI concerns.
 
 from __future__ import annotations
 
+import collections
 import concurrent.futures
 import logging
+import multiprocessing
+import os
+import resource
+import sys
 import threading
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Iterator, Sequence
 from typing import Any, Literal, NamedTuple
 
 from explainshell.errors import (
@@ -18,15 +24,19 @@ from explainshell.errors import (
     FatalExtractionError,
     SkippedExtraction,
 )
+from explainshell.extraction import mandoc
+from explainshell.extraction.llm.cache import ResponseCache
 from explainshell.extraction.llm.extractor import BatchExtractor, PreparedFile
-from explainshell.extraction.llm.providers import BatchEntry, TokenUsage
+from explainshell.extraction.llm.providers import BatchEntry, BatchPoll, TokenUsage
 from explainshell.extraction.manifest import BatchManifestWriter
+from explainshell.extraction.poller import BatchPoller
 from explainshell.extraction.types import (
     BatchResult,
     ExtractionOutcome,
     ExtractionResult,
     ExtractionStats,
     Extractor,
+    PipelineStats,
 )
 from explainshell.util import fmt_tokens
 
@@ -93,6 +103,19 @@ class WorkItem(NamedTuple):
     """Output of the prepare phase (chunked prompts, metadata)."""
 
 
+class ResumedBatch(NamedTuple):
+    """A provider batch submitted by an earlier, interrupted run."""
+
+    batch_idx: int
+    """Index of the batch in the earlier run's manifest."""
+
+    batch_id: str
+    """Provider job ID to re-attach to."""
+
+    files: list[str]
+    """Files of the batch, in submission order (request keys index them)."""
+
+
 class _BatchOutput(NamedTuple):
     """Return value from processing one provider batch."""
 
@@ -102,6 +125,36 @@ class _BatchOutput(NamedTuple):
     usage: TokenUsage
     """Aggregate token usage for this batch."""
 
+    n_requests: int = 0
+    """Requests (chunks) submitted in this batch."""
+
+    n_chars: int = 0
+    """Total characters of request content in this batch."""
+
+    submit_seconds: float = 0.0
+    """Time spent building and submitting the batch."""
+
+    poll_seconds: float = 0.0
+    """Time spent waiting on the provider (poll + collect)."""
+
+    finalize_seconds: float = 0.0
+    """Time spent finalizing the batch's files."""
+
+    resubmit: tuple[WorkItem, ...] = ()
+    """Files of a re-attached batch that the provider never answered."""
+
+    batch_idx: int = 0
+    """Index of the batch, for its manifest entry."""
+
+    batch_id: str | None = None
+    """Provider job ID, or None if the batch was never submitted."""
+
+    files: tuple[str, ...] = ()
+    """Files of the batch, for its manifest entry."""
+
+    error: str | None = None
+    """Why the whole batch failed, if it did."""
+
 
 def _tally(batch: BatchResult, entry: ExtractionResult) -> None:
     """Update batch counters and stats from a single file result."""
@@ -114,6 +167,24 @@ def _tally(batch: BatchResult, entry: ExtractionResult) -> None:
         batch.n_failed += 1
 
 
+def _process_peak_rss_bytes() -> int:
+    """Peak resident set size of this process over its lifetime.
+
+    Prepare workers are separate processes and not included; nor is the
+    figure reset per run, so it also covers whatever ran before.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux but in bytes on macOS.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
 def _extract_one(extractor: Extractor, gz_path: str) -> ExtractionResult:
     """Run extractor on a single file.
 
@@ -197,10 +268,15 @@ def run_parallel(
     Keeps at most ``jobs`` tasks submitted at a time so a late fatal error
     does not leave the entire remaining corpus pre-queued.
 
+    Files are started largest first (longest-processing-time-first, with
+    the compressed size standing in for the number of LLM chunks), so big
+    pages overlap the bulk of the run instead of forming its tail.
+
     ``on_start`` runs in worker threads. ``on_result`` runs in the main thread.
     Callback exceptions are treated as fatal.
     """
     batch = BatchResult()
+    gz_files = sorted(gz_files, key=_file_size, reverse=True)
 
     def _do_one(gz_path: str) -> ExtractionResult:
         if on_start:
@@ -253,6 +329,42 @@ def run_parallel(
     return batch
 
 
+class _BatchGrouper:
+    """Incrementally groups work items into batches of about ``batch_size`` requests.
+
+    Each work item stays whole (all its chunks in one batch).  A batch may
+    exceed ``batch_size`` when a single file has more chunks than the limit.
+    """
+
+    def __init__(self, batch_size: int) -> None:
+        self._batch_size = batch_size
+        self._current: list[WorkItem] = []
+        self._current_size = 0
+
+    def add(self, item: WorkItem) -> list[WorkItem] | None:
+        """Add *item*; return the previous batch if *item* did not fit in it."""
+        full = None
+        n = item.prepared.n_chunks
+        if self._current and self._current_size + n > self._batch_size:
+            full = self._current
+            self._current = []
+            self._current_size = 0
+        self._current.append(item)
+        self._current_size += n
+        return full
+
+    def __len__(self) -> int:
+        """Number of files in the batch being filled."""
+        return len(self._current)
+
+    def flush(self) -> list[WorkItem] | None:
+        """Return the last, partially filled batch (if any)."""
+        last = self._current or None
+        self._current = []
+        self._current_size = 0
+        return last
+
+
 def group_work_items(
     work_items: list[WorkItem],
     batch_size: int,
@@ -262,19 +374,11 @@ def group_work_items(
     Each work item stays whole (all its chunks in one batch).  A batch may
     exceed ``batch_size`` when a single file has more chunks than the limit.
     """
-    batches: list[list[WorkItem]] = []
-    current: list[WorkItem] = []
-    current_size = 0
-    for item in work_items:
-        n = item.prepared.n_chunks
-        if current and current_size + n > batch_size:
-            batches.append(current)
-            current = []
-            current_size = 0
-        current.append(item)
-        current_size += n
-    if current:
-        batches.append(current)
+    grouper = _BatchGrouper(batch_size)
+    batches = [batch for item in work_items if (batch := grouper.add(item))]
+    last = grouper.flush()
+    if last:
+        batches.append(last)
     return batches
 
 
@@ -286,185 +390,434 @@ def _prep_stats(prepared: PreparedFile) -> ExtractionStats:
     )
 
 
-def _process_one_batch(
-    extractor: BatchExtractor,
-    manifest: BatchManifestWriter,
-    batch_idx: int,
-    total_batches: int,
-    batch_items: list[WorkItem],
-    inflight: _InflightBatches,
-) -> _BatchOutput:
-    """Process a single provider batch: submit -> poll -> collect -> finalize.
-
-    Never raises for normal batch/file failures — returns FAILED entries
-    instead.  Only truly unexpected errors (``KeyboardInterrupt``,
-    ``SystemExit``) propagate.
-    """
-    bp = extractor.batch_provider
-    entries: list[ExtractionResult] = []
-    finalized: set[str] = set()
-    usage = TokenUsage()
-    job_id: str | None = None
-    batch_error: str | None = None
+# Prepared files kept queued ahead of the consumer, per prepare worker. Bounds
+# memory when batch submission (not preparation) is the bottleneck.
+_PREPARE_QUEUE_PER_JOB = 4
 
-    def _add(entry: ExtractionResult) -> None:
-        finalized.add(entry.gz_path)
-        entries.append(entry)
+# Base of the back-off after a failed status check (doubling per error).
+_POLL_ERROR_BACKOFF = 30
 
-    try:
-        # Build batch requests.
-        requests: list[BatchEntry] = []
-        for item_idx, (gz_path, prepared) in enumerate(batch_items):
-            for chunk_idx, user_content in enumerate(prepared.requests):
-                requests.append(BatchEntry(f"{item_idx}:{chunk_idx}", user_content))
 
-        total_chars = sum(len(req.user_content) for req in requests)
-        logger.info(
-            "submitting batch %d/%d (%d requests, %s chars)...",
-            batch_idx,
-            total_batches,
-            len(requests),
-            f"{total_chars:,}",
+def _prepare_one(
+    prepare: Callable[[str], PreparedFile], gz_path: str
+) -> WorkItem | ExtractionResult:
+    """Prepare one file, turning expected failures into an ExtractionResult.
+
+    Module-level so it can run in a worker process: exceptions are converted
+    here because extraction errors do not survive pickling with their
+    ``reason_class``/``stats`` intact.
+    """
+    try:
+        return WorkItem(gz_path, prepare(gz_path))
+    except SkippedExtraction as e:
+        return ExtractionResult(
+            gz_path=gz_path,
+            outcome=ExtractionOutcome.SKIPPED,
+            stats=e.stats,
+            error=e.reason,
+            reason_class=e.reason_class,
+        )
+    except ExtractionError as e:
+        return ExtractionResult(
+            gz_path=gz_path,
+            outcome=ExtractionOutcome.FAILED,
+            error=str(e),
+            reason_class=e.reason_class,
+        )
+    except Exception as e:
+        return ExtractionResult(
+            gz_path=gz_path,
+            outcome=ExtractionOutcome.FAILED,
+            error=str(e),
+            reason_class=FailureReason.UNEXPECTED,
         )
 
-        client = bp.make_poll_client()
-        job_id = bp.submit_batch(requests)
-        logger.info("batch %d/%d submitted: %s", batch_idx, total_batches, job_id)
-        inflight.register(bp, client, job_id)
 
-        # Persist the batch ID immediately so it survives crashes/interrupts.
-        manifest.record_batch(
-            batch_idx=batch_idx,
-            batch_id=job_id,
-            status="submitted",
-            files=[item.gz_path for item in batch_items],
+def _prepare_chunk(
+    prepare: Callable[[str], PreparedFile], gz_paths: list[str]
+) -> list[WorkItem | ExtractionResult]:
+    """Prepare *gz_paths* in order, letting mandoc render them as one batch.
+
+    Module-level for the same reason as ``_prepare_one``.
+    """
+    mandoc.prefetch(gz_paths)
+    return [_prepare_one(prepare, gz_path) for gz_path in gz_paths]
+
+
+def _iter_prepared(
+    extractor: BatchExtractor,
+    gz_files: list[str],
+    jobs: int,
+    on_start: Callable[[str], None] | None,
+) -> Iterator[WorkItem | ExtractionResult]:
+    """Yield the prepare outcome of each file, in ``gz_files`` order.
+
+    With ``jobs > 1`` files are prepared on a pool of ``jobs`` workers: a
+    process pool when the extractor exposes a picklable ``prepare_worker``
+    (prepare is mostly a mandoc subprocess plus pure-Python text processing),
+    otherwise threads.  At most ``jobs * _PREPARE_QUEUE_PER_JOB``
+    files (or ``jobs + 1`` chunks, if more) are in flight or waiting to be
+    consumed.  ``on_start`` runs in the calling thread when a file is handed
+    to the pool.
+
+    When mandoc batching is enabled (``MANDOC_BATCH_SIZE``), files are handed
+    out in chunks of that size so each chunk is rendered by one mandoc run.
+    """
+    chunk_size = mandoc.prefetch_size()
+    chunks = (gz_files[i : i + chunk_size] for i in range(0, len(gz_files), chunk_size))
+    if jobs <= 1:
+        for chunk in chunks:
+            mandoc.prefetch(chunk)
+            for gz_path in chunk:
+                if on_start:
+                    on_start(gz_path)
+                yield _prepare_one(extractor.prepare, gz_path)
+        return
+
+    worker = getattr(extractor, "prepare_worker", None)
+    executor: concurrent.futures.Executor
+    if worker is not None:
+        # Not forked: by now this process runs poller, batch and chunk-pool
+        # threads whose locks a forked child could inherit held.
+        # prepare_worker is module-level, so it pickles by reference.
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("forkserver")
         )
+        prepare = worker
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+        prepare = extractor.prepare
+
+    queue: collections.deque[
+        concurrent.futures.Future[list[WorkItem | ExtractionResult]]
+    ] = collections.deque()
+    # Always keep every worker busy, however large the chunks.
+    max_chunks = max(jobs * _PREPARE_QUEUE_PER_JOB // chunk_size, jobs + 1)
+
+    def _fill() -> None:
+        while len(queue) < max_chunks:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            if on_start:
+                for gz_path in chunk:
+                    on_start(gz_path)
+            queue.append(executor.submit(_prepare_chunk, prepare, chunk))
+
+    try:
+        _fill()
+        while queue:
+            outcomes = queue.popleft().result()
+            _fill()
+            yield from outcomes
+    finally:
+        # Also reached when the consumer stops early (interrupt, fatal error).
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _BatchTask:
+    """One provider batch: submit -> poll -> collect -> finalize.
+
+    ``submit`` and ``finish`` run on the batch pool (or inline); in between,
+    the batch only waits in the shared ``BatchPoller``, so no thread is
+    held while the provider works on it.
+
+    ``total_batches`` is only used for log messages; it is None while files
+    are still being prepared and the final count is unknown.
+
+    With ``resume_id``, re-attaches to that already submitted provider batch
+    instead of submitting one; ``item_keys`` then gives each item's position
+    in the original batch, which its request keys are built from.  If the
+    job turns out cancelled, failed or expired, whatever results it has are
+    collected and the files left without a complete set of responses are
+    returned in ``_BatchOutput.resubmit`` instead of being failed.
+
+    Neither stage raises for normal batch/file failures — ``finish``
+    returns FAILED entries instead.  Only truly unexpected errors
+    (``KeyboardInterrupt``, ``SystemExit``) propagate.
+    """
 
+    def __init__(
+        self,
+        extractor: BatchExtractor,
+        manifest: BatchManifestWriter,
+        batch_idx: int,
+        total_batches: int | None,
+        batch_items: list[WorkItem],
+        inflight: _InflightBatches,
+        resume_id: str | None = None,
+        item_keys: list[int] | None = None,
+    ) -> None:
+        self.extractor = extractor
+        self.manifest = manifest
+        self.batch_idx = batch_idx
+        self.of_total = total_batches if total_batches is not None else "?"
+        self.batch_items = batch_items
+        self.inflight = inflight
+        self.resume_id = resume_id
+        self.keys = item_keys if item_keys is not None else range(len(batch_items))
+        self.bp = extractor.batch_provider
+        self.cache: ResponseCache | None = getattr(extractor, "response_cache", None)
+        self.job_id: str | None = None
+        self.responses_by_key: dict[str, str] = {}
+        self.n_requests = self.n_chars = 0
+        self.submit_seconds = 0.0
+        self._submitted_at = 0.0
+        self._error: Exception | None = None
+
+    def submit(self) -> BatchPoll | None:
+        """Build the batch requests and submit them (or re-attach).
+
+        Returns the poll handle of the provider job, or None when there is
+        nothing to wait for: every request was served from the response
+        cache, or submitting failed (reported by ``finish``).
+        """
+        bp = self.bp
+        batch_idx, of_total = self.batch_idx, self.of_total
+        t0 = time.monotonic()
+        self._submitted_at = t0
         try:
-            completed_job = bp.poll_batch(
-                client, job_id, poll_interval=30, stop_event=inflight.stop_event
-            )
-        except KeyboardInterrupt:
-            # Leave registered so cancel_all() can cancel the provider batch.
-            raise
-        except Exception:
-            inflight.deregister(job_id)
-            raise
-        else:
-            inflight.deregister(job_id)
-        collected = bp.collect_results(completed_job)
-        usage = collected.usage
-
-        batch_complete_msg = (
-            f"batch {batch_idx}/{total_batches} completed: "
-            f"{len(collected.responses)} result(s), "
-            f"input={fmt_tokens(collected.usage.input_tokens)} tokens, "
-            f"output={fmt_tokens(collected.usage.output_tokens)} tokens"
-        )
-        if collected.usage.reasoning_tokens:
-            batch_complete_msg += (
-                f", reasoning={fmt_tokens(collected.usage.reasoning_tokens)} tokens"
-            )
-        logger.info(batch_complete_msg)
-
-        # Finalize each file in this batch.
-        for item_idx, (gz_path, prepared) in enumerate(batch_items):
-            n_chunks = prepared.n_chunks
-            responses: list[str] = []
-            file_failed = False
-
-            for chunk_idx in range(n_chunks):
-                key_str = f"{item_idx}:{chunk_idx}"
-                response_text = collected.responses.get(key_str)
-                if response_text is None:
-                    logger.error(
-                        "missing batch result for %s chunk %d", gz_path, chunk_idx
-                    )
-                    file_failed = True
-                    break
-                responses.append(response_text)
-
-            if file_failed:
-                _add(
-                    ExtractionResult(
-                        gz_path=gz_path,
-                        outcome=ExtractionOutcome.FAILED,
-                        error="incomplete batch result: missing response for one or more chunks",
-                        stats=_prep_stats(prepared),
-                        reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                    ),
+            # Build batch requests, serving what we can from the response cache.
+            requests: list[BatchEntry] = []
+            for item_idx, (_gz_path, prepared) in zip(self.keys, self.batch_items):
+                for chunk_idx, user_content in enumerate(prepared.requests):
+                    key = f"{item_idx}:{chunk_idx}"
+                    hit = self.cache.get(user_content) if self.cache else None
+                    if hit is not None:
+                        self.responses_by_key[key] = hit[0]
+                    else:
+                        requests.append(BatchEntry(key, user_content))
+
+            self.n_requests = len(requests)
+            self.n_chars = sum(len(req.user_content) for req in requests)
+            if self.responses_by_key:
+                logger.info(
+                    "batch %d/%s: %d request(s) served from the LLM cache",
+                    batch_idx,
+                    of_total,
+                    len(self.responses_by_key),
                 )
-                continue
-
-            try:
-                finalize_result = extractor.finalize(gz_path, prepared, responses)
-            except ExtractionError as e:
-                logger.error("failed to finalize %s: %s", gz_path, e)
-                _add(
-                    ExtractionResult(
-                        gz_path=gz_path,
-                        outcome=ExtractionOutcome.FAILED,
-                        error=str(e),
-                        stats=_prep_stats(prepared),
-                        reason_class=e.reason_class,
-                    ),
+            if not requests:
+                return None
+
+            client = bp.make_poll_client()
+            if self.resume_id is not None:
+                self.job_id = self.resume_id
+                logger.info(
+                    "re-attaching to batch %d/%s: %s (%d requests)",
+                    batch_idx,
+                    of_total,
+                    self.job_id,
+                    self.n_requests,
                 )
-                continue
-            except Exception as e:
-                logger.error("failed to finalize %s: %s", gz_path, e)
-                _add(
-                    ExtractionResult(
-                        gz_path=gz_path,
-                        outcome=ExtractionOutcome.FAILED,
-                        error=str(e),
-                        stats=_prep_stats(prepared),
-                        reason_class=FailureReason.UNEXPECTED,
-                    ),
+            else:
+                logger.info(
+                    "submitting batch %d/%s (%d requests, %s chars)...",
+                    batch_idx,
+                    of_total,
+                    self.n_requests,
+                    f"{self.n_chars:,}",
                 )
-                continue
-
-            _add(finalize_result)
+                self.job_id = bp.submit_batch(requests)
+                logger.info(
+                    "batch %d/%s submitted: %s", batch_idx, of_total, self.job_id
+                )
+                # Persist the batch ID immediately so it survives crashes/interrupts.
+                self.manifest.record_batch(
+                    batch_idx=batch_idx,
+                    batch_id=self.job_id,
+                    status="submitted",
+                    files=[item.gz_path for item in self.batch_items],
+                )
+            # Registered until finish() so cancel_all() can cancel the
+            # provider batch on interrupt.
+            self.inflight.register(bp, client, self.job_id)
+            return bp.start_poll(client, self.job_id, _POLL_ERROR_BACKOFF)
+        except Exception as e:
+            self._error = e
+            return None
+        finally:
+            self._submitted_at = time.monotonic()
+            self.submit_seconds = self._submitted_at - t0
+
+    def finish(self, job: Any = None, error: Exception | None = None) -> _BatchOutput:
+        """Collect the finished *job* (or handle the poll *error*) and
+        finalize every file of the batch."""
+        bp = self.bp
+        batch_idx, of_total = self.batch_idx, self.of_total
+        resume_id = self.resume_id
+        job_id = self.job_id
+        entries: list[ExtractionResult] = []
+        finalized: set[str] = set()
+        usage = TokenUsage()
+        batch_error: str | None = None
+        poll_seconds = finalize_seconds = 0.0
+        resubmit: list[WorkItem] = []
+        error = error or self._error
+
+        def _add(entry: ExtractionResult) -> None:
+            finalized.add(entry.gz_path)
+            entries.append(entry)
 
-    except Exception as e:
-        # FAILED entries for all unfinalized files in this batch.
-        batch_error = str(e)
-        logger.error("batch %d failed: %s", batch_idx, e)
-        for gz_path, prepared in batch_items:
-            if gz_path not in finalized:
-                _add(
-                    ExtractionResult(
-                        gz_path=gz_path,
-                        outcome=ExtractionOutcome.FAILED,
-                        error=f"batch {batch_idx} failed: {e}",
-                        stats=_prep_stats(prepared),
-                        reason_class=FailureReason.PROVIDER_BATCH_ERROR,
-                    ),
+        try:
+            if job_id is not None:
+                self.inflight.deregister(job_id)
+            if error is not None:
+                if (
+                    resume_id is None
+                    or job_id is None
+                    or not isinstance(error, ExtractionError)
+                ):
+                    raise error
+                # Typically cancelled by the interrupt we are resuming from:
+                # keep what the provider finished and resubmit the rest.
+                logger.warning(
+                    "batch %d/%s: %s; collecting partial results",
+                    batch_idx,
+                    of_total,
+                    error,
                 )
+                job = bp.retrieve_batch(resume_id)
+            if job_id is not None:
+                collected = bp.collect_results(job)
+                usage = collected.usage
+                self.responses_by_key.update(collected.responses)
+
+                batch_complete_msg = (
+                    f"batch {batch_idx}/{of_total} completed: "
+                    f"{len(collected.responses)} result(s), "
+                    f"input={fmt_tokens(collected.usage.input_tokens)} tokens, "
+                    f"output={fmt_tokens(collected.usage.output_tokens)} tokens"
+                )
+                if collected.usage.reasoning_tokens:
+                    batch_complete_msg += f", reasoning={fmt_tokens(collected.usage.reasoning_tokens)} tokens"
+                logger.info(batch_complete_msg)
+            t2 = time.monotonic()
+            poll_seconds = t2 - self._submitted_at
+
+            # Finalize each file in this batch.
+            for item_idx, item in zip(self.keys, self.batch_items):
+                gz_path, prepared = item
+                n_chunks = prepared.n_chunks
+                responses: list[str] = []
+                file_failed = False
+
+                for chunk_idx in range(n_chunks):
+                    key_str = f"{item_idx}:{chunk_idx}"
+                    response_text = self.responses_by_key.get(key_str)
+                    if response_text is None:
+                        if resume_id is None:
+                            logger.error(
+                                "missing batch result for %s chunk %d",
+                                gz_path,
+                                chunk_idx,
+                            )
+                        file_failed = True
+                        break
+                    responses.append(response_text)
+
+                if file_failed and resume_id is not None:
+                    logger.info("resubmitting %s", gz_path)
+                    finalized.add(gz_path)
+                    resubmit.append(item)
+                    continue
+                if file_failed:
+                    _add(
+                        ExtractionResult(
+                            gz_path=gz_path,
+                            outcome=ExtractionOutcome.FAILED,
+                            error="incomplete batch result: missing response for one or more chunks",
+                            stats=_prep_stats(prepared),
+                            reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+                        ),
+                    )
+                    continue
 
-    # Record to manifest before releasing batch items.
-    manifest.record_batch(
-        batch_idx=batch_idx,
-        batch_id=job_id,
-        status="failed" if batch_error else "completed",
-        files=[item.gz_path for item in batch_items],
-        error=batch_error,
-    )
+                try:
+                    finalize_result = self.extractor.finalize(
+                        gz_path, prepared, responses
+                    )
+                except ExtractionError as e:
+                    logger.error("failed to finalize %s: %s", gz_path, e)
+                    if self.cache is not None:
+                        # A cached response may no longer pass validation.
+                        for user_content in prepared.requests:
+                            self.cache.discard(user_content)
+                    _add(
+                        ExtractionResult(
+                            gz_path=gz_path,
+                            outcome=ExtractionOutcome.FAILED,
+                            error=str(e),
+                            stats=_prep_stats(prepared),
+                            reason_class=e.reason_class,
+                        ),
+                    )
+                    continue
+                except Exception as e:
+                    logger.error("failed to finalize %s: %s", gz_path, e)
+                    _add(
+                        ExtractionResult(
+                            gz_path=gz_path,
+                            outcome=ExtractionOutcome.FAILED,
+                            error=str(e),
+                            stats=_prep_stats(prepared),
+                            reason_class=FailureReason.UNEXPECTED,
+                        ),
+                    )
+                    continue
 
-    # Sanity check: every file in this batch should be finalized.
-    batch_paths = {item.gz_path for item in batch_items}
-    missing = batch_paths - finalized
-    if missing:
-        logger.error(
-            "BUG: %d file(s) in batch %d were never finalized: %s",
-            len(missing),
-            batch_idx,
-            sorted(missing),
-        )
+                _add(finalize_result)
 
-    # Release PreparedFile references for this batch.
-    batch_items.clear()
+            finalize_seconds = time.monotonic() - t2
+        except Exception as e:
+            # FAILED entries for all unfinalized files in this batch.
+            batch_error = str(e)
+            logger.error("batch %d failed: %s", batch_idx, e)
+            for gz_path, prepared in self.batch_items:
+                if gz_path not in finalized:
+                    _add(
+                        ExtractionResult(
+                            gz_path=gz_path,
+                            outcome=ExtractionOutcome.FAILED,
+                            error=f"batch {batch_idx} failed: {e}",
+                            stats=_prep_stats(prepared),
+                            reason_class=FailureReason.PROVIDER_BATCH_ERROR,
+                        ),
+                    )
+
+        # The batch is recorded as finished in the manifest only once the
+        # main thread has handed its results to on_result (see run_batch).
+        files = tuple(item.gz_path for item in self.batch_items)
+
+        # Sanity check: every file in this batch should be finalized.
+        batch_paths = {item.gz_path for item in self.batch_items}
+        missing = batch_paths - finalized
+        if missing:
+            logger.error(
+                "BUG: %d file(s) in batch %d were never finalized: %s",
+                len(missing),
+                batch_idx,
+                sorted(missing),
+            )
 
-    return _BatchOutput(entries=entries, usage=usage)
+        # Release PreparedFile references for this batch.
+        self.batch_items.clear()
+        self.responses_by_key.clear()
+
+        return _BatchOutput(
+            entries=entries,
+            usage=usage,
+            n_requests=self.n_requests,
+            n_chars=self.n_chars,
+            submit_seconds=self.submit_seconds,
+            poll_seconds=poll_seconds,
+            finalize_seconds=finalize_seconds,
+            resubmit=tuple(resubmit),
+            batch_idx=batch_idx,
+            batch_id=job_id,
+            files=files,
+            error=batch_error,
+        )
 
 
 def run_batch(
@@ -476,165 +829,300 @@ def run_batch(
     jobs: int = 1,
     on_start: Callable[[str], None] | None = None,
     on_result: Callable[[str, ExtractionResult], None] | None = None,
+    resume: Sequence[ResumedBatch] = (),
+    last_batch_idx: int = 0,
 ) -> BatchResult:
     """Run LLM extraction via provider batch API.
 
+    Preparing files and submitting batches are pipelined: prepared files
+    stream into batch groups, and each group is submitted as soon as it is
+    full, while later files are still being prepared.  Batch composition is
+    the same as preparing everything up front, since files are grouped in
+    ``gz_files`` order.
+
     Files are finalized as soon as their batch completes (per-batch),
     not after all batches finish.  The optional ``on_result`` callback
     is invoked immediately after each file is finalized, always from the
-    main thread.
-
-    When ``jobs > 1``, up to that many provider batches are submitted
-    and polled concurrently via a thread pool.
+    main thread; a batch is recorded ``completed`` in *manifest* only after
+    ``on_result`` has seen all its files.
+
+    When ``jobs > 1``, files are prepared on a pool of ``jobs`` workers
+    (see ``_iter_prepared``) and up to ``jobs`` provider batches are in
+    flight at once.  A thread pool submits and finalizes batches; waiting
+    on the provider is left to one ``BatchPoller`` thread, which polls
+    every in-flight batch with intervals adapted to its age and hands each
+    completed batch back to the pool for finalization.
+
+    Every stage is bounded, so the number of ``PreparedFile`` objects alive
+    at once is proportional to the in-flight batches rather than to
+    ``gz_files``: at most ``jobs * _PREPARE_QUEUE_PER_JOB`` prepared files
+    wait for grouping, one batch is being filled, and prepare blocks while
+    ``jobs`` batches are in flight.  Stage timings and memory high-water
+    marks are returned in ``BatchResult.pipeline``.
+
+    ``resume`` lists provider batches of an interrupted run to re-attach to
+    before new files are submitted: their files are re-prepared (locally,
+    no LLM calls) so the results can be finalized, and files the provider
+    never answered are grouped into new batches along with ``gz_files``.
+    New batches are numbered after ``last_batch_idx``, the highest index in
+    the earlier run's manifest (finished batches included, so their entries
+    are not overwritten), and after the resumed ones.
     """
     result = BatchResult()
-
-    # Phase 1: prepare all files.
-    work_items: list[WorkItem] = []
-    for gz_path in gz_files:
-        if on_start:
-            on_start(gz_path)
-        try:
-            prepared = extractor.prepare(gz_path)
-        except SkippedExtraction as e:
-            entry = ExtractionResult(
-                gz_path=gz_path,
-                outcome=ExtractionOutcome.SKIPPED,
-                stats=e.stats,
-                error=e.reason,
-                reason_class=e.reason_class,
-            )
-            _tally(result, entry)
-            if on_result:
-                on_result(gz_path, entry)
-            continue
-        except ExtractionError as e:
-            logger.error("failed to prepare %s: %s", gz_path, e)
-            entry = ExtractionResult(
-                gz_path=gz_path,
-                outcome=ExtractionOutcome.FAILED,
-                error=str(e),
-                reason_class=e.reason_class,
-            )
-            _tally(result, entry)
-            if on_result:
-                on_result(gz_path, entry)
-            continue
-        except Exception as e:
-            logger.error("failed to prepare %s: %s", gz_path, e)
-            entry = ExtractionResult(
-                gz_path=gz_path,
-                outcome=ExtractionOutcome.FAILED,
-                error=str(e),
-                reason_class=FailureReason.UNEXPECTED,
-            )
-            _tally(result, entry)
-            if on_result:
-                on_result(gz_path, entry)
-            continue
-        work_items.append(WorkItem(gz_path, prepared))
-
-    if not work_items:
-        return result
-
-    # Phase 2: submit in batches, finalizing files per-batch.
-    total_requests = sum(item.prepared.n_chunks for item in work_items)
-    total_files = len(work_items)
-    batches = group_work_items(work_items, batch_size)
-    del work_items  # references now owned by batches
-    total_batches = len(batches)
-    logger.info(
-        "collected %d request(s) from %d file(s) in %d batch(es)",
-        total_requests,
-        total_files,
-        total_batches,
-    )
-
-    manifest.set_total_batches(total_batches)
+    pipeline = PipelineStats()
+    grouper = _BatchGrouper(batch_size)
+    inflight = _InflightBatches()
+    n_batches = max(last_batch_idx, max((b.batch_idx for b in resume), default=0))
+    total_files = 0
+    total_requests = 0
+    # Files handed back by re-attached batches, to be grouped again.
+    resubmit: collections.deque[WorkItem] = collections.deque()
+    t0 = time.monotonic()
 
     def _handle_output(output: _BatchOutput) -> None:
         """Tally results and invoke callbacks in the main thread."""
         result.stats.input_tokens += output.usage.input_tokens
         result.stats.output_tokens += output.usage.output_tokens
         result.stats.reasoning_tokens += output.usage.reasoning_tokens
+        pipeline.submit_seconds += output.submit_seconds
+        pipeline.poll_seconds += output.poll_seconds
+        pipeline.finalize_seconds += output.finalize_seconds
+        pipeline.max_batch_requests = max(
+            pipeline.max_batch_requests, output.n_requests
+        )
+        pipeline.max_batch_chars = max(pipeline.max_batch_chars, output.n_chars)
         for entry in output.entries:
             _tally(result, entry)
             if on_result:
                 on_result(entry.gz_path, entry)
+        # Only now, with every result handed to on_result: a batch marked
+        # completed is one whose files --resume will not extract again.
+        manifest.record_batch(
+            batch_idx=output.batch_idx,
+            batch_id=output.batch_id,
+            status="failed" if output.error else "completed",
+            files=list(output.files),
+            error=output.error,
+        )
+        resubmit.extend(output.resubmit)
+
+    def _handle_unprepared(outcome: ExtractionResult) -> None:
+        if outcome.outcome == ExtractionOutcome.FAILED:
+            logger.error("failed to prepare %s: %s", outcome.gz_path, outcome.error)
+        _tally(result, outcome)
+        if on_result:
+            on_result(outcome.gz_path, outcome)
+
+    poller = BatchPoller()
+    # Parallel: rolling thread pool — at most `jobs` batches in flight.
+    executor = (
+        concurrent.futures.ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    )
+    # In-flight batch futures -> number of files in the batch.
+    pending: dict[concurrent.futures.Future[_BatchOutput], int] = {}
+    # The subset of `pending` that re-attached to a resumed batch.
+    reattached: set[concurrent.futures.Future[_BatchOutput]] = set()
+
+    def _note_held(in_flight: int, held_files: int) -> None:
+        pipeline.max_inflight_batches = max(pipeline.max_inflight_batches, in_flight)
+        pipeline.max_held_files = max(
+            pipeline.max_held_files, held_files + len(grouper)
+        )
 
-    inflight = _InflightBatches()
+    def _drain(block: bool) -> None:
+        """Handle finished batches; with *block*, wait for at least one."""
+        if not pending:
+            return
+        done, _ = concurrent.futures.wait(
+            pending,
+            timeout=None if block else 0,
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        for f in done:
+            del pending[f]
+            reattached.discard(f)
+            _handle_output(f.result())
+
+    def _dispatch(
+        items: list[WorkItem],
+        total_batches: int | None,
+        resumed: ResumedBatch | None = None,
+        item_keys: list[int] | None = None,
+    ) -> None:
+        nonlocal n_batches
+        if resumed is None:
+            n_batches += 1
+            batch_idx = n_batches
+        else:
+            batch_idx = resumed.batch_idx
+        task = _BatchTask(
+            extractor,
+            manifest,
+            batch_idx,
+            total_batches,
+            items,
+            inflight,
+            resumed.batch_id if resumed is not None else None,
+            item_keys,
+        )
+        if executor is None:
+            # Sequential: process batches inline.
+            _note_held(1, len(items))
+            poll = task.submit()
+            job, error = None, None
+            if poll is not None:
+                try:
+                    job = poller.watch(poll).result()
+                except Exception as e:
+                    error = e
+            _handle_output(task.finish(job, error))
+            return
+        while len(pending) >= jobs:
+            _drain(block=True)
+        f = _start(task, executor)
+        pending[f] = len(items)
+        if resumed is not None:
+            reattached.add(f)
+        _note_held(len(pending), sum(pending.values()))
+
+    def _start(
+        task: _BatchTask, pool: concurrent.futures.ThreadPoolExecutor
+    ) -> concurrent.futures.Future[_BatchOutput]:
+        """Run *task* through pool (submit) -> poller -> pool (finish)."""
+        out: concurrent.futures.Future[_BatchOutput] = concurrent.futures.Future()
+
+        def _finish(job: Any, error: Exception | None) -> None:
+            try:
+                out.set_result(task.finish(job, error))
+            except BaseException as e:
+                out.set_exception(e)
+
+        def _polled(f: concurrent.futures.Future[Any]) -> None:
+            if f.cancelled():
+                out.cancel()  # interrupted
+                return
+            error = f.exception()
+            try:
+                pool.submit(_finish, None if error else f.result(), error)
+            except RuntimeError:
+                out.cancel()  # pool already shut down by an interrupt
 
-    if jobs <= 1:
-        # Sequential: process batches inline.
-        try:
-            for batch_idx, batch_items in enumerate(batches, 1):
-                output = _process_one_batch(
-                    extractor,
-                    manifest,
-                    batch_idx,
-                    total_batches,
-                    batch_items,
-                    inflight,
-                )
-                _handle_output(output)
-        except KeyboardInterrupt:
-            logger.info("interrupted, cancelling in-flight batches...")
-            inflight.cancel_all()
-            result.interrupted = True
-    else:
-        # Parallel: rolling thread pool — at most `jobs` batches in flight.
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
-        try:
-            pending: dict[concurrent.futures.Future[_BatchOutput], int] = {}
-            batch_iter = iter(enumerate(batches, 1))
-
-            def _submit_next() -> bool:
-                """Submit next batch if available. Returns False when exhausted."""
-                item = next(batch_iter, None)
-                if item is None:
-                    return False
-                idx, items = item
-                batches[idx - 1] = None  # type: ignore[call-overload]  # release ref
-                f = executor.submit(
-                    _process_one_batch,
-                    extractor,
-                    manifest,
-                    idx,
-                    total_batches,
-                    items,
-                    inflight,
-                )
-                pending[f] = idx
-                return True
-
-            # Seed the pool with up to `jobs` batches.
-            for _ in range(jobs):
-                if not _submit_next():
-                    break
-
-            # As each finishes, tally results and submit next.
-            while pending:
-                done, _ = concurrent.futures.wait(
-                    pending, return_when=concurrent.futures.FIRST_COMPLETED
-                )
-                for f in done:
-                    _handle_output(f.result())
-                    del pending[f]
-                    _submit_next()
-        except KeyboardInterrupt:
-            logger.info("interrupted, cancelling in-flight batches...")
-            inflight.cancel_all()
+        def _submitted(f: concurrent.futures.Future[BatchPoll | None]) -> None:
+            try:
+                poll = f.result()
+            except BaseException as e:
+                out.set_exception(e)
+                return
+            if poll is None:
+                _finish(None, None)
+            else:
+                poller.watch(poll).add_done_callback(_polled)
+
+        pool.submit(task.submit).add_done_callback(_submitted)
+        return out
+
+    def _group(item: WorkItem) -> None:
+        nonlocal total_requests
+        total_requests += item.prepared.n_chunks
+        full = grouper.add(item)
+        if full:
+            _dispatch(full, None)
+
+    def _reattach() -> None:
+        nonlocal total_files
+        prepared: dict[str, WorkItem] = {}
+        files = [gz_path for b in resume for gz_path in b.files]
+        for outcome in _iter_prepared(extractor, files, jobs, on_start):
+            if isinstance(outcome, ExtractionResult):
+                _handle_unprepared(outcome)
+            else:
+                prepared[outcome.gz_path] = outcome
+        for b in resume:
+            keys = [i for i, gz_path in enumerate(b.files) if gz_path in prepared]
+            if not keys:
+                continue
+            total_files += len(keys)
+            items = [prepared.pop(b.files[i]) for i in keys]
+            _dispatch(items, None, resumed=b, item_keys=keys)
+
+    try:
+        if resume:
+            _reattach()
+        for outcome in _iter_prepared(extractor, gz_files, jobs, on_start):
+            if isinstance(outcome, ExtractionResult):
+                _handle_unprepared(outcome)
+            else:
+                total_files += 1
+                _group(outcome)
+            _drain(block=False)
+            while resubmit:
+                _group(resubmit.popleft())
+        pipeline.prepare_seconds = time.monotonic() - t0
+
+        # Re-attached batches may still hand files back for resubmission.
+        while reattached or resubmit:
+            while resubmit:
+                _group(resubmit.popleft())
+            if reattached:
+                _drain(block=True)
+
+        last = grouper.flush()
+        if last is not None:
+            total_batches = n_batches + 1
+            manifest.set_total_batches(total_batches)
+            logger.info(
+                "collected %d request(s) from %d file(s) in %d batch(es)",
+                total_requests,
+                total_files,
+                total_batches,
+            )
+            _dispatch(last, total_batches)
+        elif total_files:
+            manifest.set_total_batches(n_batches)
+        while pending:
+            _drain(block=True)
+    except KeyboardInterrupt:
+        logger.info("interrupted, cancelling in-flight batches...")
+        inflight.cancel_all()
+        if executor is not None:
             executor.shutdown(wait=False, cancel_futures=True)
-            result.interrupted = True
-        else:
+        # Batches already finalized on a worker still hand over their
+        # results. The rest stay "submitted" in the manifest, so --resume
+        # re-attaches to them.
+        for f in list(pending):
+            if f.done() and not f.cancelled() and f.exception() is None:
+                del pending[f]
+                _handle_output(f.result())
+        result.interrupted = True
+    else:
+        if executor is not None:
             executor.shutdown(wait=True)
+    finally:
+        poller.close()
+
+    if not total_files:
+        return result
 
+    pipeline.batches = n_batches
+    pipeline.process_peak_rss_bytes = _process_peak_rss_bytes()
+    result.pipeline = pipeline
     n_succeeded = result.n_succeeded
     logger.info(
         "batch: %d/%d file(s) extracted successfully",
         n_succeeded,
         total_files,
     )
+    logger.info(
+        "batch pipeline: prepare %.1fs, submit %.1fs, poll %.1fs, finalize %.1fs; "
+        "peak %d batch(es) / %d file(s) in flight, process peak RSS %d MiB",
+        pipeline.prepare_seconds,
+        pipeline.submit_seconds,
+        pipeline.poll_seconds,
+        pipeline.finalize_seconds,
+        pipeline.max_inflight_batches,
+        pipeline.max_held_files,
+        pipeline.process_peak_rss_bytes // (1024 * 1024),
+    )
     return result
 
 
@@ -647,10 +1135,14 @@ def run(
     jobs: int = 1,
     on_start: Callable[[str], None] | None = None,
     on_result: Callable[[str, ExtractionResult], None] | None = None,
+    resume: Sequence[ResumedBatch] = (),
+    last_batch_idx: int = 0,
 ) -> BatchResult:
     """Unified dispatcher for all execution modes.
 
-    - ``batch_size`` set → batch mode (requires ``BatchExtractor``).
+    - ``batch_size`` set → batch mode (requires ``BatchExtractor``); only
+      batch mode can ``resume`` the provider batches of an earlier run
+      (see ``run_batch`` for ``last_batch_idx``).
     - ``jobs > 1`` → parallel mode via thread pool.
     - otherwise → sequential.
     """
@@ -671,7 +1163,11 @@ def run(
             on_start=on_start,
             on_result=on_result,
             manifest=manifest,
+            resume=resume,
+            last_batch_idx=last_batch_idx,
         )
+    if resume:
+        raise ValueError("resuming batches requires batch mode")
     if jobs > 1:
         return run_parallel(
             extractor,
@@ -719,6 +1215,8 @@ def run_batch_collected(
     batch_size: int = 50,
     jobs: int = 1,
     on_start: Callable[[str], None] | None = None,
+    resume: Sequence[ResumedBatch] = (),
+    last_batch_idx: int = 0,
 ) -> tuple[BatchResult, list[ExtractionResult]]:
     """Like ``run_batch``, but collects per-file results into a list."""
     files: list[ExtractionResult] = []
@@ -730,5 +1228,7 @@ def run_batch_collected(
         on_start=on_start,
         on_result=lambda _p, e: files.append(e),
         manifest=manifest,
+        resume=resume,
+        last_batch_idx=last_batch_idx,
     )
     return batch, files
@@ -0,0 +1,157 @@
+"""Persistent cache of input file digests.
+
+``extract`` needs the sha256 of every input ``.gz`` (for content dedup in
+the prefilter, and for ``RawManpage.source_gz_sha256``), and the manpage
+trees it runs over rarely change between runs. This sidecar SQLite file
+remembers each file's digest together with its (size, mtime_ns, inode),
+so an unchanged file is answered from a ``stat`` instead of being read.
+
+Any mismatch in the stat key, or any error reading the cache, falls back
+to hashing the file. A digest is only stored if the file's stat key did not
+change while it was being hashed. Lookups are memoized in memory as well, so
+within a run each file is hashed at most once however many callers ask.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Pending inserts are committed in groups of this many (and on close).
+_COMMIT_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_sha256 (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode    INTEGER NOT NULL,
+    sha256   TEXT NOT NULL
+)
+"""
+
+_StatKey = tuple[int, int, int]
+
+
+def file_sha256(path: str) -> str:
+    """Hash the contents of *path*."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _stat_key(path: str) -> _StatKey:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+@dataclass
+class Sha256CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class Sha256Cache:
+    """Sidecar digest cache backed by the SQLite file at *path*.
+
+    Thread-safe. If the file cannot be opened the cache logs a warning and
+    hashes every file, so a broken cache never fails a run.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.stats = Sha256CacheStats()
+        self._memo: dict[str, tuple[_StatKey, str]] = {}
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._conn: sqlite3.Connection | None = None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(
+                "sha256 cache %s unavailable, hashing all files: %s", path, e
+            )
+
+    def sha256(self, gz_path: str) -> str:
+        """Return the sha256 of *gz_path*, reading the file only if needed."""
+        path = os.path.abspath(gz_path)
+        key = _stat_key(path)
+        cached = self._lookup(path, key)
+        if cached is not None:
+            return cached
+
+        digest = file_sha256(path)
+        with self._lock:
+            self.stats.misses += 1
+        # A file rewritten while it was read may not match the digest; hand
+        # the digest back but don't remember it.
+        if _stat_key(path) == key:
+            self._store(path, key, digest)
+        return digest
+
+    def close(self) -> None:
+        """Commit pending entries and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning("failed to write sha256 cache %s: %s", self.path, e)
+            self._conn = None
+
+    def _lookup(self, path: str, key: _StatKey) -> str | None:
+        with self._lock:
+            memo = self._memo.get(path)
+            if memo is not None and memo[0] == key:
+                self.stats.hits += 1
+                return memo[1]
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, inode, sha256 FROM file_sha256"
+                    " WHERE path = ?",
+                    (path,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug("sha256 cache lookup failed for %s: %s", path, e)
+                return None
+            if row is None or tuple(row[:3]) != key:
+                return None
+            self._memo[path] = (key, row[3])
+            self.stats.hits += 1
+            return row[3]
+
+    def _store(self, path: str, key: _StatKey, digest: str) -> None:
+        with self._lock:
+            self._memo[path] = (key, digest)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO file_sha256"
+                    " (path, size, mtime_ns, inode, sha256) VALUES (?, ?, ?, ?, ?)",
+                    (path, *key, digest),
+                )
+                self._uncommitted += 1
+                if self._uncommitted >= _COMMIT_EVERY:
+                    self._conn.commit()
+                    self._uncommitted = 0
+            except sqlite3.Error as e:
+                logger.debug("sha256 cache write failed for %s: %s", path, e)
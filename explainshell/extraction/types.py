@@ -89,6 +89,36 @@ class ExtractionResult:
     reason_class: FailureReason | None = None
 
 
+@dataclass
+class PipelineStats:
+    """Stage timings and memory high-water marks of a batch-API run.
+
+    Stage seconds other than ``prepare_seconds`` are summed over batches,
+    so with ``jobs > 1`` they can exceed the run's wall-clock time.
+    """
+
+    # Provider batches submitted.
+    batches: int = 0
+    # Wall-clock time from the first prepare to the last prepared file.
+    prepare_seconds: float = 0.0
+    # Building and submitting batch requests.
+    submit_seconds: float = 0.0
+    # Waiting on the provider (poll + collect).
+    poll_seconds: float = 0.0
+    # Running extractor.finalize over each batch's files.
+    finalize_seconds: float = 0.0
+    # Peak number of provider batches in flight at once.
+    max_inflight_batches: int = 0
+    # Peak number of prepared files held by the runner (grouped or in flight).
+    max_held_files: int = 0
+    # Largest batch, in requests and in request characters.
+    max_batch_requests: int = 0
+    max_batch_chars: int = 0
+    # Peak resident set size of the extracting process over its lifetime
+    # (prepare workers not included), in bytes.
+    process_peak_rss_bytes: int = 0
+
+
 @dataclass
 class BatchResult:
     """Aggregated result from running an extractor over multiple files.
@@ -105,6 +135,8 @@ class BatchResult:
     n_skipped: int = 0
     n_failed: int = 0
     interrupted: bool = False
+    # Only set by the batch-API runner.
+    pipeline: PipelineStats | None = None
 
 
 @dataclass(frozen=True)
@@ -124,12 +156,28 @@ class ExtractorConfig:
     ``debug``: when True, ``_finalize()`` writes full prompt/response
     artifacts (.md, .prompt.json, .response.txt) into *run_dir*.
     Failed responses are always written when *run_dir* is set.
+
+    ``llm_cache_dir``: when set, LLM responses are served from and stored
+    in a content-addressed cache there, bounded to ``llm_cache_max_bytes``
+    (see ``explainshell.extraction.llm.cache``).
+
+    ``llm_concurrency``: maximum LLM requests in flight across all files.
+    Above 1, the chunks of a multi-chunk page are sent concurrently.
+
+    ``llm_rpm`` / ``llm_tpm``: requests / tokens per minute budgets for
+    interactive LLM calls; None means unlimited (see
+    ``explainshell.extraction.llm.ratelimit``).
     """
 
     model: str | None = None
     run_dir: str | None = None
     repo_root: str | None = None
     debug: bool = False
+    llm_cache_dir: str | None = None
+    llm_cache_max_bytes: int = 1024 * 1024 * 1024
+    llm_concurrency: int = 1
+    llm_rpm: int | None = None
+    llm_tpm: int | None = None
 
 
 @runtime_checkable
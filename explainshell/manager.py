@@ -21,6 +21,8 @@ Reasoning effort can be appended to the model string:
 
 from __future__ import annotations
 
+import concurrent.futures
+import dataclasses
 import logging
 import os
 import sys
@@ -30,16 +32,25 @@ import time
 import click
 
 from explainshell import config, errors, store, util
-from explainshell.diff import format_diff
+from explainshell.diff import DiffLog, compare_manpages, format_diff, load_diff_log
 from explainshell.extraction import (
     BatchResult,
     ExtractionOutcome,
     ExtractionResult,
+    ExtractionStats,
     ExtractorConfig,
+    common,
     make_extractor,
     prefilter,
 )
-from explainshell.extraction.manifest import FileBatchManifestWriter
+from explainshell.extraction.llm.cache import ResponseCache
+from explainshell.extraction.llm.ratelimit import RateLimiter
+from explainshell.extraction.manifest import (
+    MANIFEST_FILENAME,
+    BatchManifest,
+    FileBatchManifestWriter,
+    load_batch_manifest,
+)
 from explainshell.extraction.report import (
     DbCounts,
     ExtractConfig,
@@ -47,11 +58,15 @@ from explainshell.extraction.report import (
     ExtractSummary,
     FailureEntry,
     GitInfo,
+    LLMCacheSummary,
     OptionCountSummary,
+    PipelineSummary,
     SkipEntry,
     TokenUsage,
 )
-from explainshell.extraction.runner import run
+from explainshell.extraction.runner import ResumedBatch, run
+from explainshell.extraction.sha256cache import Sha256Cache
+from explainshell.models import ParsedManpage
 
 logger = logging.getLogger("explainshell.manager")
 
@@ -102,56 +117,155 @@ def _parse_mode(raw: str | None) -> tuple[str | None, str | None]:
 # ---------------------------------------------------------------------------
 
 
+# Per-file results of the left-hand extractor in a ``diff extractors`` run.
+_LEFT_RESULTS_FILENAME = "diff-left.jsonl"
+
+
+def _diffed_sources(run_dir: str | None) -> set[str]:
+    """Sources an earlier run in *run_dir* already compared.
+
+    Files whose comparison failed are not included, so a resumed run tries
+    them again.
+    """
+    if not run_dir:
+        return set()
+    return {r["source"] for r in load_diff_log(run_dir) if r["status"] != "failed"}
+
+
+def _result_record(source: str, entry: ExtractionResult) -> dict:
+    """A JSON-serializable record of *entry*, for ``_LEFT_RESULTS_FILENAME``."""
+    return {
+        "source": source,
+        "outcome": entry.outcome.value,
+        "error": entry.error,
+        "reason_class": entry.reason_class,
+        "stats": dataclasses.asdict(entry.stats),
+        "mp": entry.mp,
+    }
+
+
+def _result_from_record(gz_path: str, rec: dict) -> ExtractionResult:
+    """Rebuild the ExtractionResult written by ``_result_record``."""
+    return ExtractionResult(
+        mp=ParsedManpage.model_validate(rec["mp"]) if rec["mp"] else None,
+        stats=ExtractionStats(**rec["stats"]),
+        gz_path=gz_path,
+        outcome=ExtractionOutcome(rec["outcome"]),
+        error=rec["error"],
+        reason_class=errors.FailureReason(rec["reason_class"])
+        if rec["reason_class"]
+        else None,
+    )
+
+
+def _side_summary(entry: ExtractionResult) -> dict:
+    return {
+        "outcome": entry.outcome.value,
+        "error": entry.error,
+        "input_tokens": entry.stats.input_tokens,
+        "output_tokens": entry.stats.output_tokens,
+    }
+
+
+def _diff_extractor_config(
+    model: str | None, run_dir: str | None, jobs: int, debug: bool = False
+) -> ExtractorConfig:
+    return ExtractorConfig(
+        model=model,
+        run_dir=run_dir,
+        debug=debug,
+        # As in extract: -j also caps the LLM requests in flight.
+        llm_concurrency=jobs,
+        llm_rpm=config.LLM_RPM or None,
+        llm_tpm=config.LLM_TPM or None,
+    )
+
+
 def _run_diff_extractors(
     gz_files: list[str],
     diff_left: tuple,
     diff_right: tuple,
-    run_dir: str,
+    run_dir: str | None,
     batch_size: int | None = None,
+    jobs: int = 1,
 ) -> BatchResult:
-    """Run --diff A..B mode: compare two extractors on each file."""
+    """Run --diff A..B mode: compare two extractors on each file.
+
+    The left extractor runs on every file, then the right one; each
+    right-hand result is compared with its left-hand one on a background
+    thread as it arrives.  With a *run_dir*, left-hand results are kept in
+    ``diff-left.jsonl`` and every comparison is appended to ``diffs.jsonl``,
+    so a rerun in the same dir skips the files already compared and reuses
+    the left-hand results it has.
+    """
     left_mode, left_model = diff_left
     right_mode, right_model = diff_right
     left_label = left_mode if not left_model else f"{left_mode} ({left_model})"
     right_label = right_mode if not right_model else f"{right_mode} ({right_model})"
     label = f"{left_label} vs {right_label}"
 
-    left_cfg = ExtractorConfig(model=left_model, run_dir=run_dir)
-    right_cfg = ExtractorConfig(model=right_model, run_dir=run_dir)
+    left_cfg = _diff_extractor_config(left_model, run_dir, jobs)
+    right_cfg = _diff_extractor_config(right_model, run_dir, jobs)
     left_ext = make_extractor(left_mode, left_cfg)
     right_ext = make_extractor(right_mode, right_cfg)
 
-    left_files: list[ExtractionResult] = []
-    right_files: list[ExtractionResult] = []
-
-    left_bs = batch_size
-    right_bs = batch_size
+    diffed = _diffed_sources(run_dir)
+    work_files = [p for p in gz_files if config.source_from_path(p) not in diffed]
+    by_source = {config.source_from_path(p): p for p in work_files}
+
+    # Left-hand results, by source.  Those of an earlier run are reused
+    # unless they failed; their tokens were spent by that run.
+    left_results: dict[str, ExtractionResult] = {}
+    reused: set[str] = set()
+    if run_dir:
+        for rec in load_diff_log(run_dir, _LEFT_RESULTS_FILENAME):
+            gz_path = by_source.get(rec["source"])
+            if gz_path is not None and rec["outcome"] != "failed":
+                left_results[rec["source"]] = _result_from_record(gz_path, rec)
+                reused.add(rec["source"])
+    left_work = [
+        p for p in work_files if config.source_from_path(p) not in left_results
+    ]
+    if diffed or reused:
+        logger.info(
+            "resuming %s: %d file(s) already compared, %d left-hand result(s) "
+            "reused, %d file(s) left",
+            run_dir,
+            len(gz_files) - len(work_files),
+            len(reused),
+            len(work_files),
+        )
 
-    logger.info("running %s extractor on %d file(s)...", left_label, len(gz_files))
-    run(
-        left_ext,
-        gz_files,
-        batch_size=left_bs,
-        on_result=lambda _p, e: left_files.append(e),
-    )
-    logger.info("running %s extractor on %d file(s)...", right_label, len(gz_files))
-    run(
-        right_ext,
-        gz_files,
-        batch_size=right_bs,
-        on_result=lambda _p, e: right_files.append(e),
+    left_log = DiffLog(run_dir, _LEFT_RESULTS_FILENAME) if run_dir else None
+    diff_log = DiffLog(run_dir) if run_dir else None
+    differ = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="diff"
     )
-
+    pending: list[concurrent.futures.Future] = []
     batch = BatchResult()
-    for left_entry, right_entry in zip(left_files, right_files):
-        gz_path = left_entry.gz_path
+
+    def on_left(gz_path: str, entry: ExtractionResult) -> None:
+        short_path = config.source_from_path(gz_path)
+        left_results[short_path] = entry
+        if left_log is not None:
+            left_log.write(_result_record(short_path, entry))
+
+    def compare(gz_path: str, right_entry: ExtractionResult) -> None:
         short_path = config.source_from_path(gz_path)
+        left_entry = left_results[short_path]
         left_ok = left_entry.outcome == ExtractionOutcome.SUCCESS
         right_ok = right_entry.outcome == ExtractionOutcome.SUCCESS
+        record = {
+            "source": short_path,
+            "status": "diffed",
+            "left": _side_summary(left_entry),
+            "right": _side_summary(right_entry),
+            "diffs": [],
+        }
 
         # Always accumulate stats from successful extractions, even when
         # the other side failed — the tokens were consumed either way.
-        if left_ok:
+        if left_ok and short_path not in reused:
             batch.stats += left_entry.stats
         if right_ok:
             batch.stats += right_entry.stats
@@ -182,9 +296,13 @@ def _run_diff_extractors(
                 or right_entry.outcome == ExtractionOutcome.FAILED
             ):
                 batch.n_failed += 1
+                record["status"] = "failed"
             else:
                 batch.n_skipped += 1
-            continue
+                record["status"] = "skipped"
+            if diff_log is not None:
+                diff_log.write(record)
+            return
 
         logger.info("=== %s (%s) ===", short_path, label)
         for line in format_diff(left_entry.mp, right_entry.mp):
@@ -210,7 +328,48 @@ def _run_diff_extractors(
             )
 
         batch.n_succeeded += 1
+        if diff_log is not None:
+            record["diffs"] = compare_manpages(left_entry.mp, right_entry.mp)
+            diff_log.write(record)
+
+    def on_right(gz_path: str, entry: ExtractionResult) -> None:
+        pending.append(differ.submit(compare, gz_path, entry))
 
+    try:
+        if left_work:
+            logger.info(
+                "running %s extractor on %d file(s)...", left_label, len(left_work)
+            )
+            run(
+                left_ext,
+                left_work,
+                batch_size=batch_size,
+                jobs=jobs,
+                on_result=on_left,
+            )
+        logger.info(
+            "running %s extractor on %d file(s)...", right_label, len(work_files)
+        )
+        run(
+            right_ext,
+            work_files,
+            batch_size=batch_size,
+            jobs=jobs,
+            on_result=on_right,
+        )
+    except KeyboardInterrupt:
+        logger.info("interrupted by user (Ctrl+C)")
+        batch.interrupted = True
+    finally:
+        differ.shutdown(wait=True)
+        for log in (left_log, diff_log):
+            if log is not None:
+                log.close()
+
+    for fut in pending:
+        fut.result()
+    if batch.interrupted and run_dir:
+        logger.info("to pick up where it stopped, rerun with --resume %s", run_dir)
     return batch
 
 
@@ -218,53 +377,180 @@ def _run_diff_db(
     gz_files: list[str],
     mode: str,
     model: str | None,
-    run_dir: str,
+    run_dir: str | None,
     debug: bool,
     s: store.Store,
     batch_size: int | None = None,
+    jobs: int = 1,
+    previous_manifest: BatchManifest | None = None,
 ) -> BatchResult:
-    """Run --diff db mode: compare fresh extraction against the DB."""
-    cfg = ExtractorConfig(model=model, run_dir=run_dir, debug=debug)
+    """Run --diff db mode: compare fresh extraction against the DB.
+
+    Stored rows are fetched and compared on a background thread, so the
+    runner keeps extracting meanwhile.  With a *run_dir*, every comparison
+    is appended to ``diffs.jsonl`` (and ``--batch`` runs keep a batch
+    manifest); files a previous run in the same dir already compared are
+    skipped, and the batches of *previous_manifest* are re-attached to.
+    """
+    cfg = _diff_extractor_config(model, run_dir, jobs, debug)
     ext = make_extractor(mode, cfg)
 
     from explainshell import manpage as _manpage
 
-    total = len(gz_files)
+    diffed = _diffed_sources(run_dir)
+    work_files = [p for p in gz_files if config.source_from_path(p) not in diffed]
+    n_compared = len(gz_files) - len(work_files)
+    resumed_batches: list[ResumedBatch] = []
+    if previous_manifest is not None:
+        _, resumed_batches = _plan_resume(previous_manifest)
+        submitted = {os.path.normpath(p) for b in resumed_batches for p in b.files}
+        work_files = [p for p in work_files if os.path.normpath(p) not in submitted]
+    if n_compared or resumed_batches:
+        logger.info(
+            "resuming %s: %d file(s) already compared, re-attaching to %d "
+            "batch(es), %d file(s) left to submit",
+            run_dir,
+            n_compared,
+            len(resumed_batches),
+            len(work_files),
+        )
+
+    manifest = None
+    if batch_size is not None and run_dir and model:
+        manifest = FileBatchManifestWriter(
+            os.path.join(run_dir, MANIFEST_FILENAME),
+            model=model,
+            batch_size=batch_size,
+            previous=previous_manifest,
+        )
+    diff_log = DiffLog(run_dir) if run_dir else None
+    differ = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="diff"
+    )
+    pending: list[concurrent.futures.Future] = []
+
+    total = len(work_files) + sum(len(b.files) for b in resumed_batches)
     counter = {"n": 0}
+    counter_lock = threading.Lock()
 
     def on_start(gz_path: str) -> None:
-        counter["n"] += 1
+        with counter_lock:
+            counter["n"] += 1
+            n = counter["n"]
         short_path = config.source_from_path(gz_path)
-        logger.info(
-            "[%d/%d] [%s] extracting (%s)...", counter["n"], total, short_path, mode
-        )
+        logger.info("[%d/%d] [%s] extracting (%s)...", n, total, short_path, mode)
 
-    def on_result(gz_path: str, entry: ExtractionResult) -> None:
+    def compare(gz_path: str, entry: ExtractionResult) -> None:
         short_path = config.source_from_path(gz_path)
+        record: dict = {"source": short_path, "error": entry.error, "diffs": []}
         if entry.outcome == ExtractionOutcome.SKIPPED:
             logger.info("[%s] skipped: %s", short_path, entry.error)
-            return
-        if entry.outcome == ExtractionOutcome.FAILED:
+            record["status"] = "skipped"
+        elif entry.outcome == ExtractionOutcome.FAILED:
             logger.error("failed to process %s: %s", short_path, entry.error)
-            return
-        name = _manpage.extract_name(gz_path)
-        logger.info("=== %s ===", short_path)
-        try:
-            # Prefer exact source match (fully populated) over name lookup.
+            record["status"] = "failed"
+        else:
+            name = _manpage.extract_name(gz_path)
+            logger.info("=== %s ===", short_path)
             try:
-                results = s.find_man_page(short_path)
+                # Prefer exact source match (fully populated) over name lookup.
+                try:
+                    results = s.find_man_page(short_path)
+                except errors.ProgramDoesNotExist:
+                    results = s.find_man_page(name)
+                stored_mp = results[0]
             except errors.ProgramDoesNotExist:
-                results = s.find_man_page(name)
-            stored_mp = results[0]
-        except errors.ProgramDoesNotExist:
-            logger.info("  (not in DB, nothing to diff)")
-        else:
-            for line in format_diff(stored_mp, entry.mp):
-                logger.info(line)
+                logger.info("  (not in DB, nothing to diff)")
+                record["status"] = "not_in_db"
+            else:
+                for line in format_diff(stored_mp, entry.mp):
+                    logger.info(line)
+                record["status"] = "diffed"
+                if diff_log is not None:
+                    record["diffs"] = compare_manpages(stored_mp, entry.mp)
+        if diff_log is not None:
+            diff_log.write(record)
 
-    return run(
-        ext, gz_files, batch_size=batch_size, on_start=on_start, on_result=on_result
-    )
+    def on_result(gz_path: str, entry: ExtractionResult) -> None:
+        pending.append(differ.submit(compare, gz_path, entry))
+
+    try:
+        result = run(
+            ext,
+            work_files,
+            batch_size=batch_size,
+            jobs=jobs,
+            on_start=on_start,
+            on_result=on_result,
+            manifest=manifest,
+            resume=resumed_batches,
+            last_batch_idx=_last_batch_idx(previous_manifest),
+        )
+    except KeyboardInterrupt:
+        logger.info("interrupted by user (Ctrl+C)")
+        result = BatchResult(interrupted=True)
+    finally:
+        differ.shutdown(wait=True)
+        if diff_log is not None:
+            diff_log.close()
+
+    for fut in pending:
+        fut.result()
+    if result.interrupted and run_dir:
+        logger.info("to pick up where it stopped, rerun with --resume %s", run_dir)
+    return result
+
+
+def _plan_resume(manifest: BatchManifest) -> tuple[set[str], list[ResumedBatch]]:
+    """Split an interrupted run's batches into finished files and batches to
+    re-attach to.
+
+    A file counts as finished once the last batch it was submitted in
+    completed: run_batch records that only after the batch's results were
+    passed to on_result and stored, successfully or not.  Every
+    other batch that reached the provider is re-attached, unless all of its
+    files were submitted again in a later batch.
+    """
+    batches = sorted(manifest.batches, key=lambda b: b.batch_idx)
+    latest: dict[str, int] = {}
+    for b in batches:
+        for gz_path in b.files:
+            latest[os.path.normpath(gz_path)] = b.batch_idx
+    done: set[str] = set()
+    resumed: list[ResumedBatch] = []
+    for b in batches:
+        current = [p for p in b.files if latest[os.path.normpath(p)] == b.batch_idx]
+        if b.status == "completed":
+            done.update(os.path.normpath(p) for p in current)
+        elif b.batch_id is not None and current:
+            resumed.append(ResumedBatch(b.batch_idx, b.batch_id, b.files))
+    return done, resumed
+
+
+def _last_batch_idx(manifest: BatchManifest | None) -> int:
+    """Highest batch index an interrupted run used; new batches go after it."""
+    if manifest is None:
+        return 0
+    return max((b.batch_idx for b in manifest.batches), default=0)
+
+
+def _install_sha256_cache(ctx: click.Context) -> None:
+    """Serve input digests from SHA256_CACHE_PATH until the command exits."""
+    if not config.SHA256_CACHE_PATH:
+        return
+    cache = Sha256Cache(config.SHA256_CACHE_PATH)
+    common.set_sha256_cache(cache)
+
+    def _close() -> None:
+        common.set_sha256_cache(None)
+        cache.close()
+        logger.debug(
+            "sha256 cache: %d hit(s), %d file(s) hashed",
+            cache.stats.hits,
+            cache.stats.misses,
+        )
+
+    ctx.call_on_close(_close)
 
 
 def _format_decision(d: prefilter.Decision) -> str:
@@ -310,8 +596,7 @@ def _run_plan(
         normalized_inputs={os.path.normpath(p) for p in gz_files},
     )
     counts: dict[str, int] = {}
-    for gz_path in gz_files:
-        d = classifier.classify(gz_path)
+    for d in classifier.classify_all(gz_files):
         kind = type(d).__name__
         counts[kind] = counts.get(kind, 0) + 1
         logger.info("%s", _format_decision(d))
@@ -425,7 +710,7 @@ def _write_report(run_dir: str, report: ExtractionReport) -> None:
     os.replace(tmp, path)
     logger.info("report written to %s", path)
     # Clean up standalone batch manifest (now embedded in report).
-    manifest_path = os.path.join(run_dir, "batch-manifest.json")
+    manifest_path = os.path.join(run_dir, MANIFEST_FILENAME)
     if os.path.isfile(manifest_path):
         os.remove(manifest_path)
 
@@ -451,14 +736,21 @@ def _setup_console_logging(log_level_str: str) -> None:
     logging.getLogger("explainshell").setLevel(log_level)
 
 
-def _attach_run_log(log_level_str: str) -> str:
-    """Create a timestamped run dir and attach a file handler. Returns the run dir."""
+def _attach_run_log(log_level_str: str, run_dir: str | None = None) -> str:
+    """Create a timestamped run dir and attach a file handler. Returns the run dir.
+
+    An existing *run_dir* (``--resume``) is reused and its run log
+    appended to.
+    """
     import datetime
 
     log_level = getattr(logging, log_level_str.upper())
-    # local wall-clock on purpose — these dir names are read by humans
-    timestamp = datetime.datetime.now(tz=None).astimezone().strftime("%Y%m%d_%H%M%S")
-    run_dir = os.path.join(_LOGS_ROOT, timestamp)
+    if run_dir is None:
+        # local wall-clock on purpose — these dir names are read by humans
+        timestamp = (
+            datetime.datetime.now(tz=None).astimezone().strftime("%Y%m%d_%H%M%S")
+        )
+        run_dir = os.path.join(_LOGS_ROOT, timestamp)
     os.makedirs(run_dir, exist_ok=True)
     log_path = os.path.join(run_dir, "run.log")
 
@@ -473,11 +765,11 @@ def _attach_run_log(log_level_str: str) -> str:
     return run_dir
 
 
-def _ensure_run_dir(ctx: click.Context) -> str:
+def _ensure_run_dir(ctx: click.Context, reuse: str | None = None) -> str:
     """Lazily create the run dir for commands that need one. Cached on ctx."""
     run_dir = ctx.obj.get("run_dir")
     if run_dir is None:
-        run_dir = _attach_run_log(ctx.obj["log_level"])
+        run_dir = _attach_run_log(ctx.obj["log_level"], reuse)
         ctx.obj["run_dir"] = run_dir
     return run_dir
 
@@ -552,12 +844,32 @@ def _require_db(ctx: click.Context, *, must_exist: bool = False) -> str:
     default=None,
     help="Batch size for provider batch API (gemini/, openai/, and azure/ models).",
 )
+@click.option(
+    "--resume",
+    "resume_dir",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help=(
+        "Resume an interrupted --batch run from its run directory: re-attach "
+        "to the provider batches it submitted and only submit files it never "
+        "did. Pass the same mode and FILES as the original run."
+    ),
+)
 @click.option(
     "--debug",
     "debug",
     is_flag=True,
     help="Write full prompt/response debug artifacts.",
 )
+@click.option(
+    "--no-llm-cache",
+    "no_llm_cache",
+    is_flag=True,
+    help=(
+        "Send every request to the LLM provider instead of serving unchanged "
+        "chunks from the response cache (LLM_CACHE_DIR)."
+    ),
+)
 @click.option(
     "--small-only",
     "small_only",
@@ -593,7 +905,9 @@ def extract(
     drop: bool,
     jobs: int,
     batch: int | None,
+    resume_dir: str | None,
     debug: bool,
+    no_llm_cache: bool,
     small_only: bool,
     large_only: bool,
     reason: str | None,
@@ -621,6 +935,24 @@ def extract(
             except ValueError as e:
                 raise click.UsageError(f"--filter-db: {e}")
 
+    previous_manifest: BatchManifest | None = None
+    if resume_dir is not None:
+        if dry_run or drop:
+            raise click.UsageError(
+                "--resume cannot be combined with --dry-run or --drop"
+            )
+        try:
+            previous_manifest = load_batch_manifest(resume_dir)
+        except (OSError, ValueError) as e:
+            raise click.UsageError(f"--resume: {e}")
+        if previous_manifest.model != model:
+            raise click.UsageError(
+                f"--resume: the run used model {previous_manifest.model!r}, "
+                f"not {model!r}"
+            )
+        if batch is None:
+            batch = previous_manifest.batch_size
+
     if batch is not None:
         if batch < 1:
             raise click.UsageError("--batch must be >= 1")
@@ -651,6 +983,8 @@ def extract(
             click.echo("Aborted.")
             return
 
+    _install_sha256_cache(ctx)
+
     if dry_run:
         db_path = _require_db(ctx, must_exist=True)
         s = store.Store(db_path, read_only=True)
@@ -664,7 +998,7 @@ def extract(
         )
         return
 
-    run_dir: str = _ensure_run_dir(ctx)
+    run_dir: str = _ensure_run_dir(ctx, resume_dir)
     db_path = _require_db(ctx)
     s = store.Store.create(db_path)
     if drop:
@@ -675,7 +1009,18 @@ def extract(
     symlinks_mapped = 0
     content_deduped = 0
 
-    cfg = ExtractorConfig(model=model, run_dir=run_dir, debug=debug)
+    cfg = ExtractorConfig(
+        model=model,
+        run_dir=run_dir,
+        debug=debug,
+        llm_cache_dir=None if no_llm_cache else config.LLM_CACHE_DIR,
+        llm_cache_max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024,
+        # As many requests in flight as before, but a page with many chunks
+        # can use the slots of workers that have run out of files.
+        llm_concurrency=jobs,
+        llm_rpm=config.LLM_RPM or None,
+        llm_tpm=config.LLM_TPM or None,
+    )
     extractor = make_extractor(parsed_mode, cfg)
 
     # Classify inputs (size / symlink / filter-db / already-stored / content-dup)
@@ -691,7 +1036,7 @@ def extract(
         size_threshold=_SIZE_FILTER_THRESHOLD,
         normalized_inputs={os.path.normpath(p) for p in gz_files},
     )
-    decisions = [classifier.classify(p) for p in gz_files]
+    decisions = classifier.classify_all(gz_files)
     classified = prefilter.apply_decisions(decisions, s, filter_db=filter_db)
 
     prefilter_skipped = classified.prefilter_skipped
@@ -699,6 +1044,22 @@ def extract(
     content_dup_files = classified.content_dups
     work_files = classified.work_files
 
+    resumed_batches: list[ResumedBatch] = []
+    if previous_manifest is not None:
+        done_files, resumed_batches = _plan_resume(previous_manifest)
+        submitted = done_files | {
+            os.path.normpath(p) for b in resumed_batches for p in b.files
+        }
+        work_files = [p for p in work_files if os.path.normpath(p) not in submitted]
+        logger.info(
+            "resuming %s: re-attaching to %d batch(es), %d file(s) already "
+            "finished, %d file(s) left to submit",
+            resume_dir,
+            len(resumed_batches),
+            len(done_files),
+            len(work_files),
+        )
+
     if classified.size_filtered:
         which = "--small-only" if small_only else "--large-only"
         logger.info(
@@ -713,7 +1074,9 @@ def extract(
     if content_dup_files:
         logger.info("deduplicated %d content-identical file(s)", len(content_dup_files))
 
-    extract_total = len(work_files) + prefilter_skipped
+    extract_total = (
+        len(work_files) + prefilter_skipped + sum(len(b.files) for b in resumed_batches)
+    )
 
     start_counter = {"n": 0}
     result_counter = {"n": 0}
@@ -779,8 +1142,10 @@ def extract(
 
     manifest = None
     if batch is not None:
-        manifest_path = os.path.join(run_dir, "batch-manifest.json")
-        manifest = FileBatchManifestWriter(manifest_path, model=model, batch_size=batch)
+        manifest_path = os.path.join(run_dir, MANIFEST_FILENAME)
+        manifest = FileBatchManifestWriter(
+            manifest_path, model=model, batch_size=batch, previous=previous_manifest
+        )
 
     fatal_error: str | None = None
     batch_result = BatchResult()
@@ -793,7 +1158,12 @@ def extract(
             on_start=on_start,
             on_result=on_result,
             manifest=manifest,
+            resume=resumed_batches,
+            last_batch_idx=_last_batch_idx(previous_manifest),
         )
+        rate_limiter = getattr(extractor, "rate_limiter", None)
+        if isinstance(rate_limiter, RateLimiter):
+            rate_limiter.log_summary()
 
         # Map symlinks to their canonical manpages (now that extraction is done).
         # Note: has_manpage_source checks the DB, not extraction outcomes. If a
@@ -826,6 +1196,7 @@ def extract(
         added = batch_result.n_succeeded
         if added > 0 or symlinks_mapped > 0 or content_deduped > 0:
             s.update_subcommand_mappings()
+            s.rebuild_search_index()
     except KeyboardInterrupt:
         logger.info("interrupted by user (Ctrl+C)")
         batch_result.interrupted = True
@@ -834,6 +1205,9 @@ def extract(
         batch_result = BatchResult(n_failed=1)
         fatal_error = str(e)
 
+    if batch_result.interrupted and manifest is not None:
+        logger.info("to pick up the submitted batches, rerun with --resume %s", run_dir)
+
     elapsed = time.monotonic() - t0
     rc = _log_summary(
         batch_result,
@@ -845,6 +1219,27 @@ def extract(
 
     import datetime as _dt
 
+    pipeline = batch_result.pipeline
+    response_cache = getattr(extractor, "response_cache", None)
+    llm_cache = None
+    if isinstance(response_cache, ResponseCache):
+        cache_stats = response_cache.stats
+        llm_cache = LLMCacheSummary(
+            hits=cache_stats.hits,
+            misses=cache_stats.misses,
+            input_tokens_saved=cache_stats.input_tokens_saved,
+            output_tokens_saved=cache_stats.output_tokens_saved,
+            reasoning_tokens_saved=cache_stats.reasoning_tokens_saved,
+            evictions=cache_stats.evictions,
+        )
+        if cache_stats.hits:
+            logger.info(
+                "LLM cache: %d hit(s), %d miss(es), saved %s input / %s output tokens",
+                cache_stats.hits,
+                cache_stats.misses,
+                util.fmt_tokens(cache_stats.input_tokens_saved),
+                util.fmt_tokens(cache_stats.output_tokens_saved),
+            )
     report = ExtractionReport(
         timestamp=_dt.datetime.now(_dt.timezone.utc).isoformat(),
         git=GitInfo(**util.git_metadata()),
@@ -856,6 +1251,7 @@ def extract(
             drop=drop,
             jobs=jobs,
             batch_size=batch,
+            resume=resume_dir,
             debug=debug,
             small_only=small_only,
             large_only=large_only,
@@ -883,6 +1279,23 @@ def extract(
         option_counts=OptionCountSummary.from_counts(option_counts),
         failures=failures,
         skips=skips,
+        pipeline=PipelineSummary(
+            batches=pipeline.batches,
+            prepare_seconds=round(pipeline.prepare_seconds, 1),
+            submit_seconds=round(pipeline.submit_seconds, 1),
+            poll_seconds=round(pipeline.poll_seconds, 1),
+            finalize_seconds=round(pipeline.finalize_seconds, 1),
+            max_inflight_batches=pipeline.max_inflight_batches,
+            max_held_files=pipeline.max_held_files,
+            max_batch_requests=pipeline.max_batch_requests,
+            max_batch_chars=pipeline.max_batch_chars,
+            process_peak_rss_mb=round(
+                pipeline.process_peak_rss_bytes / (1024 * 1024), 1
+            ),
+        )
+        if pipeline is not None
+        else None,
+        llm_cache=llm_cache,
         batch_manifest=manifest.to_dict() if manifest is not None else None,
         reason=reason,
     )
@@ -916,12 +1329,27 @@ def diff() -> None:
     required=True,
     help="Extraction strategy: llm:<model>.",
 )
+@click.option(
+    "-j", "--jobs", type=int, default=1, help="Number of parallel workers (default: 1)."
+)
 @click.option(
     "--batch",
     type=int,
     default=None,
     help="Batch size for provider batch API (gemini/, openai/, and azure/ models).",
 )
+@click.option(
+    "--resume",
+    "resume_dir",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help=(
+        "Continue an interrupted diff from its run directory: skip the files "
+        "it already compared (see diffs.jsonl there) and, for a --batch run, "
+        "re-attach to the provider batches it submitted. Pass the same mode "
+        "and FILES as the original run."
+    ),
+)
 @click.option(
     "--debug",
     "debug",
@@ -934,15 +1362,42 @@ def diff_db_cmd(
     ctx: click.Context,
     mode: str,
     files: tuple[str, ...],
+    jobs: int,
     batch: int | None,
+    resume_dir: str | None,
     debug: bool,
 ) -> None:
-    """Diff fresh extraction against the database."""
+    """Diff fresh extraction against the database.
+
+    Every file's comparison is also written to diffs.jsonl in the run
+    directory.
+    """
     try:
         parsed_mode, model = _parse_mode(mode)
     except ValueError as e:
         raise click.UsageError(str(e))
 
+    if jobs < 1:
+        raise click.UsageError("--jobs must be >= 1")
+
+    previous_manifest: BatchManifest | None = None
+    if resume_dir is not None:
+        try:
+            previous_manifest = load_batch_manifest(resume_dir)
+        except FileNotFoundError:
+            # Not a --batch run; only the files it compared are skipped.
+            pass
+        except (OSError, ValueError) as e:
+            raise click.UsageError(f"--resume: {e}")
+        if previous_manifest is not None:
+            if previous_manifest.model != model:
+                raise click.UsageError(
+                    f"--resume: the run used model {previous_manifest.model!r}, "
+                    f"not {model!r}"
+                )
+            if batch is None:
+                batch = previous_manifest.batch_size
+
     if batch is not None:
         if batch < 1:
             raise click.UsageError("--batch must be >= 1")
@@ -963,11 +1418,19 @@ def diff_db_cmd(
     if not gz_files:
         raise click.UsageError("No .gz files found.")
 
-    run_dir: str = _ensure_run_dir(ctx)
+    run_dir: str = _ensure_run_dir(ctx, resume_dir)
     s = store.Store.create(db_path)
     t0 = time.monotonic()
     batch_result = _run_diff_db(
-        gz_files, parsed_mode, model, run_dir, debug, s, batch_size=batch
+        gz_files,
+        parsed_mode,
+        model,
+        run_dir,
+        debug,
+        s,
+        batch_size=batch,
+        jobs=jobs,
+        previous_manifest=previous_manifest,
     )
     elapsed = time.monotonic() - t0
     rc = _log_summary(batch_result, 0, elapsed)
@@ -976,24 +1439,42 @@ def diff_db_cmd(
 
 
 @diff.command("extractors")
+@click.option(
+    "-j", "--jobs", type=int, default=1, help="Number of parallel workers (default: 1)."
+)
 @click.option(
     "--batch",
     type=int,
     default=None,
     help="Batch size for provider batch API (gemini/, openai/, and azure/ models).",
 )
+@click.option(
+    "--resume",
+    "resume_dir",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help=(
+        "Continue an interrupted comparison from its run directory: skip the "
+        "files it already compared and reuse its left-hand results. Pass the "
+        "same SPEC and FILES as the original run."
+    ),
+)
 @click.argument("spec")
 @click.argument("files", nargs=-1, required=True)
 @click.pass_context
 def diff_extractors_cmd(
     ctx: click.Context,
+    jobs: int,
     batch: int | None,
+    resume_dir: str | None,
     spec: str,
     files: tuple[str, ...],
 ) -> None:
     """Compare two extractors head-to-head.
 
     SPEC is A..B format (e.g. llm:openai/gpt-5-mini..llm:openai/gpt-5).
+    Every file's comparison is also written to diffs.jsonl in the run
+    directory.
     """
     if ".." not in spec:
         raise click.UsageError(
@@ -1007,6 +1488,8 @@ def diff_extractors_cmd(
     except ValueError as e:
         raise click.UsageError(str(e))
 
+    if jobs < 1:
+        raise click.UsageError("--jobs must be >= 1")
     if batch is not None:
         if batch < 1:
             raise click.UsageError("--batch must be >= 1")
@@ -1029,10 +1512,10 @@ def diff_extractors_cmd(
     if not gz_files:
         raise click.UsageError("No .gz files found.")
 
-    run_dir: str = _ensure_run_dir(ctx)
+    run_dir: str = _ensure_run_dir(ctx, resume_dir)
     t0 = time.monotonic()
     batch_result = _run_diff_extractors(
-        gz_files, left, right, run_dir, batch_size=batch
+        gz_files, left, right, run_dir, batch_size=batch, jobs=jobs
     )
     elapsed = time.monotonic() - t0
     rc = _log_summary(batch_result, 0, elapsed)
@@ -1040,6 +1523,36 @@ def diff_extractors_cmd(
         sys.exit(rc)
 
 
+@cli.command("export")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["parquet", "arrow"]),
+    default="parquet",
+    show_default=True,
+    help="Parquet files, or Arrow IPC (Feather v2) files.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "out_dir",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="Directory to write manpages, options and mappings tables to.",
+)
+@click.pass_context
+def export_cmd(ctx: click.Context, fmt: str, out_dir: str) -> None:
+    """Export the database as flat columnar tables for analytics."""
+    from explainshell import export
+
+    db_path = _require_db(ctx, must_exist=True)
+    t0 = time.monotonic()
+    counts = export.export(db_path, out_dir, fmt)
+    for table, n in counts.items():
+        click.echo(f"{table}: {n} row(s) -> {export.table_path(out_dir, table, fmt)}")
+    click.echo(f"Exported in {_fmt_elapsed(time.monotonic() - t0)}.")
+
+
 # ---------------------------------------------------------------------------
 # show command group
 # ---------------------------------------------------------------------------
@@ -1113,6 +1626,31 @@ def show_manpage(
             click.echo(f"  {alt.source} ({alt.name})")
 
 
+@show.command("search")
+@click.argument("query")
+@click.option("-n", "limit", default=10, help="Maximum number of results.")
+@click.option("--distro", default=None, help="Filter by distro (e.g. ubuntu).")
+@click.option("--release", default=None, help="Filter by release (e.g. 26.04).")
+@click.pass_context
+def show_search(
+    ctx: click.Context,
+    query: str,
+    limit: int,
+    distro: str | None,
+    release: str | None,
+) -> None:
+    """Full-text search manpage names, synopses and option text."""
+    if (distro is None) != (release is None):
+        raise click.UsageError("--distro and --release must be used together.")
+    s = store.Store(_require_db(ctx, must_exist=True), read_only=True)
+    results = s.search(query, limit=limit, distro=distro, release=release)
+    if not results:
+        click.echo(f"No results for: {query}", err=True)
+        sys.exit(1)
+    for r in results:
+        click.echo(f"{r.source}  {r.name} - {r.synopsis or ''}")
+
+
 @show.command("distros")
 @click.pass_context
 def show_distros(ctx: click.Context) -> None:
@@ -1170,14 +1708,59 @@ def show_stats(ctx: click.Context) -> None:
     click.echo(f"manpages (raw):    {n_manpages}")
     click.echo(f"parsed_manpages:   {n_parsed}")
     click.echo(f"mappings:          {n_mappings}")
+    has_options = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'options'"
+    ).fetchone()
+    if has_options:
+        n_options = conn.execute(
+            "SELECT COUNT(*) AS c FROM (SELECT DISTINCT source, ordinal FROM options)"
+        ).fetchone()["c"]
+        click.echo(f"options:           {n_options}")
+        n_positional = conn.execute(
+            "SELECT COUNT(*) AS c FROM "
+            "(SELECT DISTINCT source, ordinal FROM options WHERE positional IS NOT NULL)"
+        ).fetchone()["c"]
+        click.echo(f"  positional:      {n_positional}")
+
+    row = conn.execute("""
+        SELECT
+            AVG(json_array_length(options)) AS avg_options,
+            MAX(json_array_length(options)) AS max_options,
+            SUM(json_array_length(options) = 0) AS no_options
+        FROM parsed_manpages
+        WHERE json_valid(options)
+    """).fetchone()
+    if n_parsed:
+        click.echo(
+            f"options/manpage:   {row['avg_options'] or 0:.1f} avg, "
+            f"{row['max_options'] or 0} max, {row['no_options'] or 0} without any"
+        )
 
-    # Per-distro breakdown.
+    # Extractor/model mix.
     rows = conn.execute("""
         SELECT
-            SUBSTR(source, 1, INSTR(source, '/') - 1) as distro,
-            SUBSTR(source, INSTR(source, '/') + 1,
-                   INSTR(SUBSTR(source, INSTR(source, '/') + 1), '/') - 1) as release,
-            COUNT(*) as cnt
+            extractor,
+            json_extract(extraction_meta, '$.model') AS model,
+            COUNT(*) AS cnt
+        FROM parsed_manpages
+        GROUP BY extractor, model
+        ORDER BY cnt DESC, extractor, model
+    """).fetchall()
+    if rows:
+        click.echo("")
+        click.echo("per extractor/model:")
+        for row in rows:
+            label = row["extractor"] or "(none)"
+            if row["model"]:
+                label += f" ({row['model']})"
+            click.echo(f"  {label}: {row['cnt']}")
+
+    # Per-distro breakdown.
+    rows = conn.execute(f"""
+        SELECT
+            {store.distro_sql("source")} AS distro,
+            {store.release_sql("source")} AS release,
+            COUNT(*) AS cnt
         FROM parsed_manpages
         GROUP BY distro, release
         ORDER BY distro, release
@@ -1249,29 +1832,58 @@ _DB_CHECK_CYAN = "\033[36m"
 _DB_CHECK_RESET = "\033[0m"
 
 
+@cli.command("search-index")
+@click.pass_context
+def search_index_cmd(ctx: click.Context) -> None:
+    """Rebuild the full-text search index."""
+    s = store.Store.create(_require_db(ctx, must_exist=True))
+    n = s.rebuild_search_index()
+    s.close()
+    click.echo(f"Indexed {n} manpage(s).")
+
+
 @cli.command("db-check")
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    default=1,
+    help="Check this many distro/release shards in parallel (default: 1).",
+)
 @click.pass_context
-def db_check_cmd(ctx: click.Context) -> None:
+def db_check_cmd(ctx: click.Context, jobs: int) -> None:
     """Run database integrity checks."""
-    from explainshell.db_check import check as run_db_check
+    from explainshell.db_check import run_checks
 
-    issues = run_db_check(_require_db(ctx, must_exist=True))
+    if jobs < 1:
+        raise click.UsageError("--jobs must be >= 1")
+
+    t0 = time.monotonic()
+    result = run_checks(_require_db(ctx, must_exist=True), jobs=jobs)
+    elapsed = time.monotonic() - t0
+    issues = result.issues
     if not issues:
         click.echo("No issues found.")
-        return
-
-    n_errors = sum(1 for sev, _ in issues if sev == "error")
-    n_warnings = sum(1 for sev, _ in issues if sev == "warning")
-    for severity, msg in issues:
-        label = (
-            f"{_DB_CHECK_RED}ERROR{_DB_CHECK_RESET}"
-            if severity == "error"
-            else f"{_DB_CHECK_CYAN}WARNING{_DB_CHECK_RESET}"
-        )
-        click.echo(f"  {label}: {msg}")
-    click.echo(f"\n{n_errors} error(s), {n_warnings} warning(s)")
-    if n_errors:
-        sys.exit(1)
+    else:
+        for severity, msg in issues:
+            label = (
+                f"{_DB_CHECK_RED}ERROR{_DB_CHECK_RESET}"
+                if severity == "error"
+                else f"{_DB_CHECK_CYAN}WARNING{_DB_CHECK_RESET}"
+            )
+            click.echo(f"  {label}: {msg}")
+
+    shards = f", {result.shards} shard(s)" if jobs > 1 else ""
+    click.echo(f"\nChecks ({elapsed:.2f}s{shards}):")
+    for name, seconds in result.timings.items():
+        click.echo(f"  {name:<22} {seconds:>7.2f}s")
+
+    if issues:
+        n_errors = sum(1 for sev, _ in issues if sev == "error")
+        n_warnings = sum(1 for sev, _ in issues if sev == "warning")
+        click.echo(f"\n{n_errors} error(s), {n_warnings} warning(s)")
+        if n_errors:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
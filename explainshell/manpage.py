@@ -4,6 +4,8 @@ import os
 import re
 import subprocess
 
+from explainshell import config, roff_utils
+
 SPLIT_SYNOP = re.compile(r"([^ ]+) - (.*)$")
 
 logger = logging.getLogger(__name__)
@@ -60,29 +62,83 @@ def _run_lexgrog(gz_path: str, name: str) -> str:
     return proc.stdout.rstrip()
 
 
-def get_synopsis_and_aliases(gz_path: str) -> tuple[str | None, list[tuple[str, int]]]:
-    """Extract synopsis text and alias list from a man page via lexgrog.
+def _lexgrog_descriptions(gz_path: str, name: str) -> list[tuple[str, str]]:
+    """(name, description) pairs from lexgrog's output for *gz_path*."""
+    raw_synopsis = _run_lexgrog(gz_path, name)
+    parsed = [
+        _parse_synopsis(gz_path, line)
+        for line in raw_synopsis.splitlines()
+        if line.strip()
+    ]
+    return [p for p in parsed if p]
+
+
+def _native_descriptions(
+    gz_path: str, lines: list[str] | None = None
+) -> list[tuple[str, str]]:
+    """(name, description) pairs parsed from the NAME section of *gz_path*.
+
+    Parses *lines* when given, instead of reading the file again.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    if lines is None:
+        if not os.path.isfile(gz_path):
+            raise FileNotFoundError(f"manpage file not found: {gz_path}")
+        lines = roff_utils.read_source(gz_path)
+    return roff_utils.parse_name_section(lines)
+
+
+def _synopsis_and_aliases(
+    name: str, descriptions: list[tuple[str, str]]
+) -> tuple[str | None, list[tuple[str, int]]]:
+    """The first description, and every name that shares it, as aliases."""
+    if not descriptions:
+        return None, [(name, 10)]
+    d = collections.OrderedDict()
+    for prog, text in descriptions:
+        d.setdefault(text, []).append(prog)
+    synopsis, progs = next(iter(d.items()))
+    alias_names = dict.fromkeys(progs)
+    alias_names.pop(name, None)
+    return synopsis, [(name, 10)] + [(x, 1) for x in alias_names]
+
+
+def get_synopsis_and_aliases(
+    gz_path: str, lines: list[str] | None = None
+) -> tuple[str | None, list[tuple[str, int]]]:
+    """Extract synopsis text and alias list from a man page's NAME section.
 
     Returns (synopsis, aliases) where synopsis is a string or None and aliases
-    is a list of (name, score) tuples.
+    is a list of (name, score) tuples. *lines* is the page's source from
+    ``roff_utils.read_source``, for callers that already read it; lexgrog
+    always reads the file itself.
+
+    NAME_PARSER picks the parser: "lexgrog" (the default) runs man-db's
+    lexgrog; "native" reads the section with ``roff_utils.parse_name_section``;
+    "verify" runs both, logs a warning when they disagree and returns
+    lexgrog's result.
     """
     name = extract_name(gz_path)
-    raw_synopsis = _run_lexgrog(gz_path, name)
-
-    synopsis = None
-    aliases = [(name, 10)]
-
-    lines = raw_synopsis.splitlines()
-    parsed = [_parse_synopsis(gz_path, line) for line in lines if line.strip()]
-    parsed = [p for p in parsed if p]
-    if parsed:
-        d = collections.OrderedDict()
-        for prog, text in parsed:
-            d.setdefault(text, []).append(prog)
-        text, progs = next(iter(dict(d).items()))
-        synopsis = text
-        alias_names = set(progs)
-        alias_names.discard(name)
-        aliases = [(name, 10)] + [(x, 1) for x in alias_names]
-
-    return synopsis, aliases
+    if config.NAME_PARSER == "lexgrog":
+        return _synopsis_and_aliases(name, _lexgrog_descriptions(gz_path, name))
+
+    result = _synopsis_and_aliases(name, _native_descriptions(gz_path, lines))
+    if config.NAME_PARSER == "verify":
+        expected = _synopsis_and_aliases(name, _lexgrog_descriptions(gz_path, name))
+        if not same_synopsis_and_aliases(result, expected):
+            logger.warning(
+                "NAME parser disagrees with lexgrog for %s: %r vs lexgrog %r",
+                gz_path,
+                result,
+                expected,
+            )
+        return expected
+    return result
+
+
+def same_synopsis_and_aliases(
+    a: tuple[str | None, list[tuple[str, int]]],
+    b: tuple[str | None, list[tuple[str, int]]],
+) -> bool:
+    """Compare two ``get_synopsis_and_aliases`` results, ignoring alias order."""
+    return a[0] == b[0] and sorted(a[1]) == sorted(b[1])
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 import bashlex.ast
 import bashlex.parser
 
-from explainshell import errors, help_constants, util
+from explainshell import errors, help_constants, timing, util
 
 
 @dataclass
@@ -825,9 +825,10 @@ class Matcher(bashlex.ast.nodevisitor):
         logger.info(f"matching string {self.s}")
 
         # limit recursive parsing to a depth of 1
-        self.ast = bashlex.parser.parsesingle(
-            self.s, expansionlimit=1, strictmode=False
-        )
+        with timing.stage("parse"):
+            self.ast = bashlex.parser.parsesingle(
+                self.s, expansionlimit=1, strictmode=False
+            )
         if isinstance(self.ast, bashlex.ast.node):
             self.visit(self.ast)
             assert len(self.group_stack) == 1, (
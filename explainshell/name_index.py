@@ -0,0 +1,149 @@
+"""In-memory typo-tolerant index over the ``mappings.src`` command names.
+
+Built once per DB (at boot, and again on hot-swap) so the web app can
+suggest ``grep`` for ``grpe`` and reject names that cannot match without a
+SQL round trip.
+
+Layout: names are kept sorted in one tuple (a name's id is its position) and
+padded trigrams are stored CSR-style in three flat ``array('I')`` buffers --
+distinct trigram codes, posting offsets and name ids. With ~100k names that
+is a few MB on top of the name strings themselves, and a lookup touches only
+the posting lists of the query's own trigrams.
+"""
+
+import bisect
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+_Q = 3
+_PAD = "\x00" * (_Q - 1)
+
+
+def _trigram_codes(folded: str, length: int) -> set[int]:
+    """Return the hashed, padded trigrams of *folded*, keyed by *length*.
+
+    Each gram is hashed together with a name length, so one posting list
+    holds only names of one length and a lookup never counts names that the
+    length bound rules out. Hashes are only compared within one process (the
+    index is never persisted), and a 32-bit collision can only add
+    candidates, which are all verified with edit_distance.
+    """
+    padded = _PAD + folded + _PAD
+    return {
+        hash((length, padded[i : i + _Q])) & 0xFFFFFFFF
+        for i in range(len(padded) - _Q + 1)
+    }
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, giving up past *max_distance*.
+
+    Adjacent transpositions count as one edit, so ``grpe`` is one typo away
+    from ``grep``. Returns ``max_distance + 1`` once the distance is known
+    to exceed the bound.
+
+    >>> edit_distance("grpe", "grep", 2)
+    1
+    >>> edit_distance("tarr", "tar", 2)
+    1
+    >>> edit_distance("kitten", "sitting", 3)
+    3
+    >>> edit_distance("kitten", "sitting", 1)
+    2
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    # Only cells within max_distance of the diagonal can stay under the
+    # bound; everything outside the band is treated as already over it.
+    over = max_distance + 1
+    n = len(b)
+    prev2: list[int] = []
+    prev = [j if j <= max_distance else over for j in range(n + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (n + 1)
+        if i <= max_distance:
+            cur[0] = i
+        ca = a[i - 1]
+        row_min = cur[0]
+        for j in range(max(1, i - max_distance), min(n, i + max_distance) + 1):
+            cb = b[j - 1]
+            d = prev[j - 1] if ca == cb else prev[j - 1] + 1
+            d = min(d, prev[j] + 1, cur[j - 1] + 1)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                d = min(d, prev2[j - 2] + 1)
+            cur[j] = min(d, over)
+            row_min = min(row_min, d)
+        if row_min > max_distance:
+            return over
+        prev2, prev = prev, cur
+    return min(prev[n], over)
+
+
+class NameIndex:
+    """Exact-membership and nearest-name lookups over a fixed set of names."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self._names: tuple[str, ...] = tuple(sorted(set(names)))
+        postings: dict[int, list[int]] = {}
+        for name_id, name in enumerate(self._names):
+            folded = name.casefold()
+            for code in _trigram_codes(folded, len(folded)):
+                postings.setdefault(code, []).append(name_id)
+
+        self._codes = array("I", sorted(postings))
+        self._offsets = array("I", [0])
+        self._ids = array("I")
+        for code in self._codes:
+            self._ids.extend(postings[code])
+            self._offsets.append(len(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        i = bisect.bisect_left(self._names, name)
+        return i < len(self._names) and self._names[i] == name
+
+    def size_bytes(self) -> int:
+        """Approximate footprint of the posting buffers (names excluded)."""
+        return sum(
+            buf.itemsize * len(buf) for buf in (self._codes, self._offsets, self._ids)
+        )
+
+    def nearest(self, name: str, k: int = 5, max_distance: int = 2) -> list[str]:
+        """Return up to *k* names within *max_distance* edits of *name*.
+
+        Comparison is case-insensitive; results are ordered by distance, then
+        name, and never include *name* itself. Candidates come from the
+        q-gram bound (a string within d edits shares at least
+        ``len + 2 - 4 * d`` padded trigrams), floored at one shared trigram:
+        for very short names that keeps lookups off a full scan at the cost
+        of missing matches that share no trigram at all, which make poor
+        suggestions anyway.
+        """
+        if k <= 0 or not name:
+            return []
+        folded = name.casefold()
+        length = len(folded)
+        # Each edit (a transposition included) breaks at most q + 1 grams.
+        threshold = max(length + _Q - 1 - (_Q + 1) * max_distance, 1)
+        counts: Counter[int] = Counter()
+        for other in range(max(length - max_distance, 1), length + max_distance + 1):
+            for code in _trigram_codes(folded, other):
+                i = bisect.bisect_left(self._codes, code)
+                if i < len(self._codes) and self._codes[i] == code:
+                    counts.update(self._ids[self._offsets[i] : self._offsets[i + 1]])
+
+        scored = []
+        for name_id in [i for i, shared in counts.items() if shared >= threshold]:
+            candidate = self._names[name_id]
+            if candidate == name:
+                continue
+            d = edit_distance(folded, candidate.casefold(), max_distance)
+            if d <= max_distance:
+                scored.append((d, candidate))
+        scored.sort()
+        return [candidate for _, candidate in scored[:k]]
@@ -4,7 +4,9 @@ Reads raw roff source to detect manpage properties that the LLM
 extractor doesn't supply directly.
 
 Public API:
-    detect_nested_cmd(gz_path) -> bool
+    read_source(gz_path) -> list[str]
+    detect_nested_cmd(gz_path, lines=None) -> bool
+    parse_name_section(lines) -> list[tuple[str, str]]
 """
 
 import gzip
@@ -91,18 +93,27 @@ _COMMAND_ANGLE = re.compile(r"<command>", re.IGNORECASE)
 _COMMAND_IN_OPT = re.compile(r"-\w*command\w*", re.IGNORECASE)
 
 
-def detect_nested_cmd(gz_path: str) -> bool:
+def read_source(gz_path: str) -> list[str]:
+    """Return the roff source lines of *gz_path*, decompressing ``.gz`` files."""
+    opener = gzip.open if gz_path.endswith(".gz") else open
+    with opener(gz_path, "rt", errors="replace") as f:
+        return f.readlines()
+
+
+def detect_nested_cmd(gz_path: str, lines: list[str] | None = None) -> bool:
     """Detect whether a man page's positional args start a nested command.
 
     Checks the SYNOPSIS section for a positional argument named 'command'.
     Excludes angle-bracket patterns like <command> (git subcommand style).
+    *lines* is the page's source as returned by `read_source`, for callers
+    that already read it; otherwise the file is read here.
     """
-    try:
-        with gzip.open(gz_path, "rt", errors="replace") as f:
-            lines = f.readlines()
-    except Exception as e:
-        logger.warning("Failed to read %s for nested_cmd detection: %s", gz_path, e)
-        return False
+    if lines is None:
+        try:
+            lines = read_source(gz_path)
+        except Exception as e:
+            logger.warning("Failed to read %s for nested_cmd detection: %s", gz_path, e)
+            return False
 
     synopsis_lines = _extract_section(lines, "SYNOPSIS")
     for line in synopsis_lines:
@@ -119,3 +130,119 @@ def detect_nested_cmd(gz_path: str) -> bool:
             return True
 
     return False
+
+
+# Requests that start a new paragraph, line or display. In a NAME section
+# they separate "name \- description" records (man-db's lexgrog reads one
+# record per line), and whatever follows the last record, such as a usage
+# example set under it, is dropped unless it has a description of its own.
+_NAME_BREAK_MACROS = frozenset(
+    {
+        "br",
+        "sp",
+        "PP",
+        "LP",
+        "P",
+        "IP",
+        "TP",
+        "TQ",
+        "HP",
+        "RS",
+        "RE",
+        "EX",
+        "EE",
+        "nf",
+        "fi",
+        "in",
+        "INDENT",
+        "UNINDENT",
+        "Pp",
+        "Bd",
+        "Ed",
+    }
+)
+# man(7) font macros whose arguments are text. The alternating ones (BR,
+# IR, ...) set their arguments next to each other without a space.
+_NAME_FONT_MACROS = {
+    "B": " ",
+    "I": " ",
+    "SM": " ",
+    "SB": " ",
+    "BR": "",
+    "RB": "",
+    "BI": "",
+    "IB": "",
+    "IR": "",
+    "RI": "",
+}
+_ROFF_COMMENT = re.compile(r'\\".*')
+_MACRO_ARG = re.compile(r'"((?:[^"]|"")*)"?|(\S+)')
+
+
+def _macro_args(rest: str) -> list[str]:
+    """Split a request's arguments the way roff does (double quotes group)."""
+    return [
+        m.group(1).replace('""', '"') if m.group(1) is not None else m.group(2)
+        for m in _MACRO_ARG.finditer(rest)
+    ]
+
+
+def _clean_name_text(text: str) -> str:
+    """``_clean_roff`` plus the escapes seen in NAME lines."""
+    # \*(Aq (pod2man's apostrophe); other predefined strings are dropped.
+    text = re.sub(r"\\\*(\(Aq|\[Aq\])", "'", text)
+    text = re.sub(r"\\\*(\(..|\[[^\]]*\]|.)", "", text)
+    # groff long-form escapes: \f[B], \[em], \[aq].
+    text = re.sub(r"\\f\[[^\]]*\]", "", text)
+    text = re.sub(r"\\\[(em|en)\]", "-", text)
+    text = text.replace("\\[aq]", "'")
+    return _clean_roff(text)
+
+
+def _name_records(lines: list[str]) -> list[str]:
+    """Turn NAME section lines into cleaned "names - description" records."""
+    records: list[list[str]] = [[]]
+    for line in lines:
+        # Drop comments, whole-line (.\") and trailing.
+        line = _ROFF_COMMENT.sub("", line.rstrip("\n"))
+        if line.startswith((".", "'")):
+            parts = line[1:].strip().split(None, 1)
+            if not parts:
+                continue
+            macro, rest = parts[0], parts[1] if len(parts) > 1 else ""
+            if macro in _NAME_BREAK_MACROS:
+                records.append([])
+            elif macro in _NAME_FONT_MACROS:
+                records[-1].append(_NAME_FONT_MACROS[macro].join(_macro_args(rest)))
+            elif macro == "Nm":
+                # mdoc: ".Nm a ," / ".Nm b" name the page "a, b".
+                records[-1].append(" ".join(_macro_args(rest)))
+            elif macro == "Nd":
+                records[-1].append("- " + rest)
+            # Any other request (.IX, .ad, .nh, ...) carries no NAME text.
+            continue
+        records[-1].append(line)
+    cleaned = (_clean_name_text(" ".join(r)) for r in records)
+    return [re.sub(r"\s+", " ", r) for r in cleaned if r]
+
+
+def parse_name_section(lines: list[str]) -> list[tuple[str, str]]:
+    """Parse a man page's NAME section into (name, description) pairs.
+
+    *lines* is the page's roff source. Follows lexgrog: each record is
+    split at the first " - ", every comma-separated name before it gets the
+    description after it, names containing spaces are skipped, and one
+    trailing period is dropped from the description. Returns an empty list
+    if there is no NAME section or no record has a description.
+    """
+    pairs: list[tuple[str, str]] = []
+    for record in _name_records(_extract_section(lines, "NAME")):
+        names, sep, description = record.partition(" - ")
+        if not sep:
+            continue
+        description = description.strip().removesuffix(".")
+        for name in names.split(","):
+            name = name.strip()
+            if name and " " not in name:
+                pairs.append((name, description))
+    return pairs
@@ -13,7 +13,7 @@ from collections.abc import Iterator
 from typing import NamedTuple
 
 from explainshell import config, errors, util
-from explainshell.models import ExtractionMeta, ParsedManpage, RawManpage
+from explainshell.models import ExtractionMeta, Option, ParsedManpage, RawManpage
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +33,24 @@ def validate_source_path(source: str) -> None:
         )
 
 
+def distro_sql(column: str) -> str:
+    """SQL expression for the distro part of a ``distro/release/...`` *column*."""
+    return f"SUBSTR({column}, 1, INSTR({column}, '/') - 1)"
+
+
+def release_sql(column: str) -> str:
+    """SQL expression for the release part of a ``distro/release/...`` *column*."""
+    rest = f"SUBSTR({column}, INSTR({column}, '/') + 1)"
+    return f"SUBSTR({column}, INSTR({column}, '/') + 1, INSTR({rest}, '/') - 1)"
+
+
+# Virtual generated columns: computed from dst on read (and materialized only
+# in idx_mappings_partition), so writers keep inserting (src, dst, score).
+_MAPPINGS_PARTITION_COLUMNS = (
+    f"distro TEXT GENERATED ALWAYS AS ({distro_sql('dst')}) VIRTUAL",
+    f"release TEXT GENERATED ALWAYS AS ({release_sql('dst')}) VIRTUAL",
+)
+
 _CREATE_SCHEMA = """
 CREATE TABLE IF NOT EXISTS manpages (
     source             TEXT    PRIMARY KEY,
@@ -62,15 +80,35 @@ CREATE TABLE IF NOT EXISTS parsed_manpages (
 -- A single manpage may have many mappings (one per alias).
 -- For multi-cmd parents, sub-command mappings are also stored here
 -- (e.g. src='git commit' -> dst=<git-commit manpage id>).
+-- distro/release are derived from dst (see _MAPPINGS_PARTITION_COLUMNS) so
+-- distro-scoped lookups only touch their own partition of the index.
 CREATE TABLE IF NOT EXISTS mappings (
     src   TEXT    NOT NULL,      -- lookup key (command name or 'cmd subcmd')
     dst   TEXT    NOT NULL REFERENCES parsed_manpages(source) ON DELETE CASCADE,
     score INTEGER NOT NULL,      -- higher score = preferred match
+    {partition_columns},
     PRIMARY KEY (src, dst)
 );
 
 CREATE INDEX IF NOT EXISTS idx_mappings_dst ON mappings(dst);
 CREATE INDEX IF NOT EXISTS idx_mappings_src ON mappings(src, dst, score);
+CREATE INDEX IF NOT EXISTS idx_mappings_partition
+    ON mappings(distro, release, src, score, dst);
+
+-- Normalized view of parsed_manpages.options: one row per flag (or one row
+-- with a NULL flag for a flagless positional). The option text is not
+-- duplicated here; ordinal indexes into the parent row's options JSON array.
+CREATE TABLE IF NOT EXISTS options (
+    source       TEXT    NOT NULL REFERENCES parsed_manpages(source) ON DELETE CASCADE,
+    ordinal      INTEGER NOT NULL,  -- position in parsed_manpages.options
+    flag         TEXT,              -- e.g. '-a' or '--all'; NULL for positionals
+    kind         TEXT    NOT NULL,  -- 'short', 'long' or 'positional'
+    has_argument TEXT    NOT NULL DEFAULT 'false',  -- JSON (bool or list of choices)
+    positional   TEXT               -- positional name, if any
+);
+
+CREATE INDEX IF NOT EXISTS idx_options_flag ON options(flag);
+CREATE INDEX IF NOT EXISTS idx_options_source ON options(source, flag);
 
 -- Append-only event log for tracking DB lifecycle (extractions, uploads, etc.).
 CREATE TABLE IF NOT EXISTS db_events (
@@ -80,8 +118,46 @@ CREATE TABLE IF NOT EXISTS db_events (
     metadata  TEXT    NOT NULL DEFAULT '{}'  -- JSON blob with event-specific details
 );
 
+""".replace("{partition_columns}", ",\n    ".join(_MAPPINGS_PARTITION_COLUMNS))
+
+
+# Full-text index over manpage names, synopses and option text. Not part of
+# _CREATE_SCHEMA: it is derived data, (re)built in one pass by
+# rebuild_search_index() after an extraction run.
+_CREATE_SEARCH_SCHEMA = """
+DROP TABLE IF EXISTS manpage_search;
+CREATE VIRTUAL TABLE manpage_search USING fts5(
+    name,
+    synopsis,
+    options,                -- option help text, space-joined
+    source UNINDEXED,
+    prefix = '2 3',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
 """
 
+# bm25() column weights for (name, synopsis, options, source).
+_SEARCH_WEIGHTS = (10.0, 4.0, 1.0, 0.0)
+
+
+def _fts_query(query: str) -> str | None:
+    """Turn free text into an FTS5 query of ANDed prefix terms.
+
+    Only word characters survive, so user input can never reach FTS5's
+    query syntax.
+
+    >>> _fts_query('tar --extract')
+    '"tar"* "extract"*'
+    >>> _fts_query('c++filt')
+    '"c"* "filt"*'
+    >>> _fts_query('--') is None
+    True
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{t}"*' for t in terms)
+
 
 def _compress(text: str) -> bytes:
     return zlib.compress(text.encode("utf-8"))
@@ -91,12 +167,35 @@ def _decompress(data: bytes) -> str:
     return zlib.decompress(data).decode("utf-8")
 
 
+def _option_rows(m: ParsedManpage) -> list[tuple]:
+    """Build the ``options`` table rows for *m*."""
+    rows = []
+    for ordinal, o in enumerate(m.options):
+        has_argument = json.dumps(o.has_argument)
+        positional = str(o.positional) if o.positional else None
+        flags = [(f, "short") for f in o.short] + [(f, "long") for f in o.long]
+        if not flags and positional:
+            flags = [(None, "positional")]
+        for flag, kind in flags:
+            rows.append((m.source, ordinal, flag, kind, has_argument, positional))
+    return rows
+
+
 def _dr_prefix(source: str) -> str:
     """Extract 'distro/release/' prefix from a source path."""
     parts = source.split("/", 2)
     return f"{parts[0]}/{parts[1]}/"
 
 
+class SearchResult(NamedTuple):
+    """A single hit from Store.search."""
+
+    source: str
+    name: str
+    synopsis: str | None
+    score: float  # bm25 rank, lower is better
+
+
 class SubcommandMappingResult(NamedTuple):
     """Result of update_subcommand_mappings."""
 
@@ -123,14 +222,38 @@ class Store:
             self._conn = sqlite3.connect(db_path, check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
             self._conn.execute("PRAGMA foreign_keys = ON")
+        # DBs built before the mappings partition columns existed are still
+        # served (read-only); scoped lookups then filter in Python instead.
+        self._partitioned_mappings = self._has_column("mappings", "distro")
 
     @classmethod
     def create(cls, db_path: str) -> "Store":
         """Create a new (or open an existing) writable database and return a Store."""
         s = cls(db_path)
+        needs_backfill = s._has_table("parsed_manpages") and not s._has_table("options")
+        if s._has_table("mappings") and not s._partitioned_mappings:
+            # Must run before _CREATE_SCHEMA, which indexes the new columns.
+            logger.info("adding distro/release partition columns to mappings")
+            for column in _MAPPINGS_PARTITION_COLUMNS:
+                s._conn.execute(f"ALTER TABLE mappings ADD COLUMN {column}")
         s._conn.executescript(_CREATE_SCHEMA)
+        s._partitioned_mappings = True
+        if needs_backfill:
+            # DBs created before the options table existed: backfill it once.
+            s.rebuild_options()
         return s
 
+    def _has_table(self, name: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def _has_column(self, table: str, column: str) -> bool:
+        # table_xinfo (unlike table_info) lists generated columns too.
+        rows = self._conn.execute(f"PRAGMA table_xinfo({table})").fetchall()
+        return any(row["name"] == column for row in rows)
+
     def close(self) -> None:
         if self._conn:
             self._conn.close()
@@ -140,8 +263,10 @@ class Store:
         if not confirm:
             return
 
-        logger.info("dropping mappings, parsed_manpages, manpages tables")
+        logger.info("dropping options, mappings, parsed_manpages, manpages tables")
         self._conn.executescript("""
+            DROP TABLE IF EXISTS manpage_search;
+            DELETE FROM options;
             DELETE FROM mappings;
             DELETE FROM parsed_manpages;
             DELETE FROM manpages;
@@ -174,10 +299,7 @@ class Store:
             return [m]
 
         orig_name = name
-        logger.debug("looking up manpage in mappings with src %r", name)
-        mapping_rows = self._conn.execute(
-            "SELECT dst, score FROM mappings WHERE src = ?", (name,)
-        ).fetchall()
+        mapping_rows = self._mapping_rows(name, distro, release)
 
         section = None
         # Dotted command names (for example, ``systemd.exec``) are valid
@@ -187,10 +309,7 @@ class Store:
             head, separator, tail = name.rpartition(".")
             if separator:
                 name, section = head, tail
-                logger.debug("looking up manpage in mappings with src %r", name)
-                mapping_rows = self._conn.execute(
-                    "SELECT dst, score FROM mappings WHERE src = ?", (name,)
-                ).fetchall()
+                mapping_rows = self._mapping_rows(name, distro, release)
 
         if not mapping_rows:
             raise errors.ProgramDoesNotExist(name)
@@ -212,7 +331,8 @@ class Store:
                 len(manpage_rows),
             )
 
-        # Apply distro/release filter when requested
+        # Apply distro/release filter when requested. _mapping_rows already
+        # scoped the lookup unless the DB predates the partition columns.
         if distro is not None and release is not None:
             prefix = f"{distro}/{release}/"
             manpage_rows = [
@@ -259,6 +379,83 @@ class Store:
         results[0] = ParsedManpage.from_store(dict(row))
         return results
 
+    def _mapping_rows(
+        self, src: str, distro: str | None, release: str | None
+    ) -> list[sqlite3.Row]:
+        """Return (dst, score) rows for *src*, scoped when distro/release are set.
+
+        Scoped lookups read only the (distro, release) partition of
+        idx_mappings_partition, so their cost does not grow with the number
+        of releases in the DB.
+        """
+        logger.debug("looking up manpage in mappings with src %r", src)
+        if distro is not None and release is not None and self._partitioned_mappings:
+            return self._conn.execute(
+                "SELECT dst, score FROM mappings "
+                "WHERE distro = ? AND release = ? AND src = ?",
+                (distro, release, src),
+            ).fetchall()
+        return self._conn.execute(
+            "SELECT dst, score FROM mappings WHERE src = ?", (src,)
+        ).fetchall()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        distro: str | None = None,
+        release: str | None = None,
+    ) -> list[SearchResult]:
+        """Full-text search over manpage names, synopses and option text.
+
+        Every word in *query* is matched as a prefix; hits are ranked by
+        BM25 with name matches weighted highest, and an exact name match
+        always first. Returns an empty list when the search index has not
+        been built (see rebuild_search_index).
+        """
+        fts = _fts_query(query)
+        if fts is None:
+            return []
+        sql = (
+            "SELECT source, name, synopsis, bm25(manpage_search, ?, ?, ?, ?) AS score "
+            "FROM manpage_search WHERE manpage_search MATCH ?"
+        )
+        params: list = [*_SEARCH_WEIGHTS, fts]
+        if distro is not None and release is not None:
+            prefix = f"{distro}/{release}/"
+            sql += " AND source >= ? AND source < ?"
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        sql += " ORDER BY name = ? DESC, score LIMIT ?"
+        params += [query.strip(), limit]
+        try:
+            rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.debug("search unavailable: %s", e)
+            return []
+        return [
+            SearchResult(row["source"], row["name"], row["synopsis"], row["score"])
+            for row in rows
+        ]
+
+    def rebuild_search_index(self) -> int:
+        """(Re)build the manpage_search FTS5 table from parsed_manpages.
+
+        Option text is pulled out of the options JSON in SQL, so no page
+        is decoded in Python. Returns the number of indexed manpages.
+        """
+        self._conn.executescript(_CREATE_SEARCH_SCHEMA)
+        n = self._conn.execute(
+            """INSERT INTO manpage_search(name, synopsis, options, source)
+               SELECT p.name, p.synopsis,
+                      (SELECT group_concat(json_extract(o.value, '$.text'), ' ')
+                       FROM json_each(p.options) o),
+                      p.source
+               FROM parsed_manpages p"""
+        ).rowcount
+        self._conn.commit()
+        logger.info("rebuilt search index: %d manpage(s)", n)
+        return n
+
     def has_manpage_source(self, source: str) -> bool:
         """Return whether *source* exists in parsed_manpages."""
         row = self._conn.execute(
@@ -266,6 +463,94 @@ class Store:
         ).fetchone()
         return row is not None
 
+    def manpage_sources(self) -> set[str]:
+        """Return the sources of all parsed manpages.
+
+        One query for callers that would otherwise call
+        ``has_manpage_source`` once per file.
+        """
+        rows = self._conn.execute("SELECT source FROM parsed_manpages").fetchall()
+        return {row["source"] for row in rows}
+
+    def find_option(self, source: str, flag: str) -> Option | None:
+        """Return the option of *source* that declares *flag*, or None.
+
+        Looks the flag up in the normalized ``options`` table and decodes
+        only that option's JSON, instead of the page's whole options list.
+        Falls back to a full decode for pages the table does not cover
+        (older read-only DBs without the table, or pages without options).
+        """
+        try:
+            row = self._conn.execute(
+                "SELECT json_extract(p.options, '$[' || o.ordinal || ']') AS option "
+                "FROM options o JOIN parsed_manpages p ON p.source = o.source "
+                "WHERE o.source = ? AND o.flag = ? ORDER BY o.ordinal LIMIT 1",
+                (source, flag),
+            ).fetchone()
+            if row is not None:
+                return Option.model_validate(json.loads(row["option"]))
+            indexed = self._conn.execute(
+                "SELECT 1 FROM options WHERE source = ? LIMIT 1", (source,)
+            ).fetchone()
+            if indexed is not None:
+                return None
+        except sqlite3.OperationalError:
+            logger.debug("options table unavailable, decoding %s in full", source)
+
+        row = self._conn.execute(
+            "SELECT options FROM parsed_manpages WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None
+        for od in json.loads(row["options"]):
+            if flag in (od.get("short") or []) or flag in (od.get("long") or []):
+                return Option.model_validate(od)
+        return None
+
+    def sources_with_option(self, flag: str) -> list[str]:
+        """Return the sources of all manpages that declare *flag*.
+
+        Like `find_option`, falls back to scanning the options JSON of every
+        page on older read-only DBs without the ``options`` table.
+        """
+        try:
+            rows = self._conn.execute(
+                "SELECT DISTINCT source FROM options WHERE flag = ? ORDER BY source",
+                (flag,),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            logger.debug("options table unavailable, scanning all options for %s", flag)
+            rows = self._conn.execute(
+                "SELECT DISTINCT p.source FROM parsed_manpages p, "
+                "json_each(p.options) o "
+                "WHERE EXISTS (SELECT 1 FROM json_each(o.value, '$.short') f "
+                "WHERE f.value = ?1) "
+                "OR EXISTS (SELECT 1 FROM json_each(o.value, '$.long') f "
+                "WHERE f.value = ?1) "
+                "ORDER BY p.source",
+                (flag,),
+            ).fetchall()
+        return [row["source"] for row in rows]
+
+    def rebuild_options(self) -> int:
+        """Repopulate the ``options`` table from parsed_manpages.
+
+        Returns the number of rows inserted.
+        """
+        self._conn.execute("DELETE FROM options")
+        n = 0
+        for row in self._conn.execute("SELECT * FROM parsed_manpages").fetchall():
+            rows = _option_rows(ParsedManpage.from_store(dict(row)))
+            self._conn.executemany(
+                "INSERT INTO options(source, ordinal, flag, kind, has_argument, "
+                "positional) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            n += len(rows)
+        self._conn.commit()
+        logger.info("rebuilt options table: %d row(s)", n)
+        return n
+
     def delete_manpage(self, source: str) -> bool:
         """Delete a manpage and its mappings (via CASCADE) from the store.
 
@@ -379,10 +664,17 @@ class Store:
 
         # find all dsts of those srcs
         placeholders = ",".join("?" * len(srcs))
-        dst_rows = self._conn.execute(
-            f"SELECT DISTINCT dst FROM mappings WHERE src IN ({placeholders})",
-            srcs,
-        ).fetchall()
+        if distro is not None and release is not None and self._partitioned_mappings:
+            dst_rows = self._conn.execute(
+                "SELECT DISTINCT dst FROM mappings "
+                f"WHERE distro = ? AND release = ? AND src IN ({placeholders})",
+                [distro, release, *srcs],
+            ).fetchall()
+        else:
+            dst_rows = self._conn.execute(
+                f"SELECT DISTINCT dst FROM mappings WHERE src IN ({placeholders})",
+                srcs,
+            ).fetchall()
         suggestion_sources = [row["dst"] for row in dst_rows if row["dst"] not in skip]
         if not suggestion_sources:
             return []
@@ -542,6 +834,11 @@ class Store:
                        :extractor, :extraction_meta)""",
             m.to_store(),
         )
+        self._conn.executemany(
+            "INSERT INTO options(source, ordinal, flag, kind, has_argument, "
+            "positional) VALUES (?, ?, ?, ?, ?, ?)",
+            _option_rows(m),
+        )
         self._conn.commit()
 
         for alias, score in m.aliases:
@@ -567,6 +864,12 @@ class Store:
         for row in self._conn.execute("SELECT src, dst FROM mappings"):
             yield row["src"], row["dst"]
 
+    def mapping_names(self) -> list[str]:
+        """Return every distinct mapping src (the names find_man_page knows)."""
+        return [
+            row[0] for row in self._conn.execute("SELECT DISTINCT src FROM mappings")
+        ]
+
     def update_subcommand_mappings(self) -> SubcommandMappingResult:
         """Reconcile subcommand mappings using declared subcommands from LLM-extracted pages.
 
@@ -0,0 +1,131 @@
+"""Per-request stage timings.
+
+The web layer activates a RequestTimer for each request (see
+explainshell.web.views), and code below it marks stages with
+``timing.stage(name)``. SERVER_TIMING picks where they are reported, as a
+comma list: ``header`` sends a ``Server-Timing`` response header (for local
+profiling; prod strips it at the proxy), and ``log`` logs them as fields on
+the ``explainshell.web.timing`` logger, which is what prod uses;
+``SERVER_TIMING=header,log`` does both.
+
+Stages nest. Each one is charged only its own time, so a store lookup made
+during the matcher walk counts towards the lookup and not the walk. With no
+active timer ``stage`` returns a shared no-op, so instrumented code pays one
+context-var read when timing is off.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from typing import Self
+
+
+class _Stage:
+    """A running stage. ``name`` may be changed before it ends, for stages
+    whose outcome (e.g. cache hit or miss) is only known part-way."""
+
+    __slots__ = ("_start", "_timer", "name")
+
+    def __init__(self, timer: RequestTimer, name: str) -> None:
+        self._timer = timer
+        self.name = name
+
+    def __enter__(self) -> Self:
+        self._timer._nested.append(0.0)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = time.perf_counter() - self._start
+        self._timer._record(self.name, elapsed)
+
+
+class _NullStage:
+    name = ""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class RequestTimer:
+    """Accumulated time and call count per stage name for one request."""
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        # name -> [seconds, count], in the order stages first finished.
+        self._stages: dict[str, list] = {}
+        # Time spent in nested stages, one slot per running stage.
+        self._nested: list[float] = []
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def _record(self, name: str, elapsed: float) -> None:
+        nested = self._nested.pop()
+        if self._nested:
+            self._nested[-1] += elapsed
+        entry = self._stages.setdefault(name, [0.0, 0])
+        entry[0] += elapsed - nested
+        entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def stages(self) -> dict[str, tuple[float, int]]:
+        """Return ``{name: (seconds, count)}`` for the stages so far."""
+        return {name: (seconds, n) for name, (seconds, n) in self._stages.items()}
+
+    def header(self) -> str:
+        """Format the stages as a Server-Timing header value, plus ``total``."""
+        parts = []
+        for name, (seconds, count) in self.stages().items():
+            part = f"{name};dur={seconds * 1000:.2f}"
+            if count > 1:
+                part += f';desc="{count}x"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+    def fields(self) -> dict[str, float | int]:
+        """Return the stages as flat ``<name>_ms``/``<name>_n`` log fields."""
+        fields: dict[str, float | int] = {}
+        for name, (seconds, count) in self.stages().items():
+            key = name.replace("-", "_")
+            fields[f"{key}_ms"] = round(seconds * 1000, 2)
+            fields[f"{key}_n"] = count
+        fields["total_ms"] = round(self.elapsed() * 1000, 2)
+        return fields
+
+
+_current: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+def activate() -> Token:
+    """Start timing the current request; pass the token to `deactivate`."""
+    return _current.set(RequestTimer())
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> RequestTimer | None:
+    return _current.get()
+
+
+def stage(name: str) -> _Stage | _NullStage:
+    """Context manager timing *name* against the active timer, if any."""
+    timer = _current.get()
+    if timer is None:
+        return _NULL_STAGE
+    return timer.stage(name)
@@ -7,19 +7,43 @@ from flask import Flask, current_app, g, jsonify, send_from_directory
 
 from explainshell import config, store
 from explainshell.caching_store import CachingStore
+from explainshell.name_index import NameIndex
+from explainshell.web.db_reload import (
+    RELOADER_EXTENSION_KEY,
+    SNAPSHOT_EXTENSION_KEY,
+    DbReloader,
+    DbSnapshot,
+    read_sidecar,
+)
 
 logger = logging.getLogger(__name__)
 STORE_EXTENSION_KEY = "explainshell_store"
+NAME_INDEX_EXTENSION_KEY = "explainshell_name_index"
 _STORE_CREATE_LOCK = Lock()
 
 
+def _db_snapshot() -> DbSnapshot | None:
+    """Return the DB snapshot this request is pinned to, if hot-swap is on.
+
+    The first call in a request pins the app's current snapshot into ``g``
+    so a swap mid-request cannot mix data (or ETags) from two DBs.
+    """
+    if "db_snapshot" not in g:
+        g.db_snapshot = current_app.extensions.get(SNAPSHOT_EXTENSION_KEY)
+    return g.db_snapshot
+
+
 def get_store() -> store.Store:
     """Return the serving Store for the current Flask app.
 
-    Production keeps one read-only CachingStore per worker process. Debug/dev
-    keeps the old per-request Store behavior so DB rebuilds do not leave stale
-    positive or negative lookup cache entries behind.
+    Production keeps one read-only CachingStore per worker process (per DB
+    snapshot when hot-swap is enabled). Debug/dev keeps the old per-request
+    Store behavior so DB rebuilds do not leave stale positive or negative
+    lookup cache entries behind.
     """
+    snapshot = _db_snapshot()
+    if snapshot is not None:
+        return snapshot.store
     if STORE_EXTENSION_KEY not in current_app.extensions:
         if current_app.config["DEBUG"]:
             if "store" not in g:
@@ -29,7 +53,8 @@ def get_store() -> store.Store:
         with _STORE_CREATE_LOCK:
             if STORE_EXTENSION_KEY not in current_app.extensions:
                 current_app.extensions[STORE_EXTENSION_KEY] = CachingStore(
-                    current_app.config["DB_PATH"]
+                    current_app.config["DB_PATH"],
+                    name_index=current_app.extensions.get(NAME_INDEX_EXTENSION_KEY),
                 )
     return current_app.extensions[STORE_EXTENSION_KEY]
 
@@ -74,15 +99,27 @@ def _get_git_sha(project_root: str) -> str:
 
 
 def get_distros() -> list[tuple[str, str]]:
-    """Return the (distro, release) pairs snapshotted at app startup.
+    """Return the (distro, release) pairs of the serving DB.
 
-    The DB is read-only and baked into the Docker image in prod, so the
-    snapshot is valid for the lifetime of the process. Rebuilding the
-    DB in dev requires a server restart to pick up new distros.
+    Without hot-swap the DB is read-only and baked into the Docker image in
+    prod, so the list snapshotted at app startup is valid for the lifetime
+    of the process. Rebuilding the DB in dev requires a server restart to
+    pick up new distros.
     """
+    snapshot = _db_snapshot()
+    if snapshot is not None:
+        return snapshot.distros
     return current_app.config["STARTUP_DISTROS"]
 
 
+def get_db_sha256() -> str:
+    """Return the digest of the DB serving the current request."""
+    snapshot = _db_snapshot()
+    if snapshot is not None:
+        return snapshot.db_sha256
+    return current_app.config.get("DB_SHA256", "local")
+
+
 def create_app(db_path=None):
     """Application factory."""
     app = Flask(__name__)
@@ -97,6 +134,10 @@ def create_app(db_path=None):
     app.register_blueprint(bp)
     if config.DEBUG:
         app.register_blueprint(debug_bp)
+    if app.config["METRICS"]:
+        from explainshell.web import metrics
+
+        metrics.init_app(app)
 
     @app.teardown_appcontext
     def close_request_store(exc: BaseException | None) -> None:
@@ -107,10 +148,8 @@ def create_app(db_path=None):
     # Read the DB SHA256 once at startup. The file is computed at Docker
     # build time (see Dockerfile); it won't exist in dev unless created
     # manually.
-    sha_path = (app.config.get("DB_PATH") or "") + ".sha256"
-    if os.path.isfile(sha_path):
-        with open(sha_path) as f:
-            db_sha256 = f.read().strip()
+    db_sha256 = read_sidecar(app.config.get("DB_PATH") or "")
+    if db_sha256 is not None:
         logger.info("db sha256: %s", db_sha256)
     else:
         db_sha256 = "local"
@@ -132,29 +171,55 @@ def create_app(db_path=None):
     # Snapshot the distro list at startup. Used by get_distros() and
     # /health — both are served from memory, no per-request DB work.
     # The DB is read-only and baked into the Docker image, so distros
-    # only change when a new process boots.
+    # only change when a new process boots (or, with DB_RELOAD_INTERVAL
+    # set, when a new DB is swapped in; see db_reload.py).
     startup_distros: list[tuple[str, str]] = []
     db_path = app.config.get("DB_PATH")
+    reloader = None
     if db_path and os.path.isfile(db_path):
-        boot_store = store.Store(db_path, read_only=True)
-        try:
-            startup_distros = list(boot_store.distros())
-        finally:
-            boot_store.close()
+        if app.config["DB_RELOAD_INTERVAL"] > 0 and not app.config["DEBUG"]:
+            reloader = DbReloader(
+                app.extensions, db_path, app.config["DB_RELOAD_INTERVAL"]
+            )
+            app.extensions[RELOADER_EXTENSION_KEY] = reloader
+            startup_distros = reloader.install_initial(db_sha256).distros
+        else:
+            boot_store = store.Store(db_path, read_only=True)
+            try:
+                startup_distros = list(boot_store.distros())
+                if not app.config["DEBUG"]:
+                    # Built before the fork so every worker inherits it.
+                    app.extensions[NAME_INDEX_EXTENSION_KEY] = NameIndex(
+                        boot_store.mapping_names()
+                    )
+            finally:
+                boot_store.close()
     app.config["STARTUP_DISTROS"] = startup_distros
 
-    health_body = {
-        "db_sha256": db_sha256,
-        "app_version": app.config["APP_VERSION"],
-        "distros": [{"distro": d, "release": r} for d, r in startup_distros],
-    }
+    if reloader is not None:
+
+        @app.before_request
+        def check_db_reload() -> None:
+            reloader.maybe_reload()
 
     @app.route("/health")
     def health():
-        body = dict(health_body)
-        cached = app.extensions.get(STORE_EXTENSION_KEY)
+        snapshot = app.extensions.get(SNAPSHOT_EXTENSION_KEY)
+        if snapshot is not None:
+            sha, distros = snapshot.db_sha256, snapshot.distros
+            cached = snapshot.store
+        else:
+            sha, distros = db_sha256, startup_distros
+            cached = app.extensions.get(STORE_EXTENSION_KEY)
+        body = {
+            "db_sha256": sha,
+            "app_version": app.config["APP_VERSION"],
+            "distros": [{"distro": d, "release": r} for d, r in distros],
+        }
         if isinstance(cached, CachingStore):
             body["manpage_cache"] = cached.manpage_cache_info()._asdict()
+        if reloader is not None:
+            body["db_reload"] = reloader.info()
         return jsonify(body)
 
     @app.route("/favicon.ico")
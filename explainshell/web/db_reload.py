@@ -0,0 +1,299 @@
+"""Hot-swap the serving DB when a new file and ``.sha256`` sidecar land.
+
+Each worker process polls ``<DB_PATH>.sha256`` (at most once per
+``DB_RELOAD_INTERVAL`` seconds, piggybacking on incoming requests). When the
+digest changes, a background thread pins the new DB file under a private
+hard link, opens a fresh CachingStore on it (with its own name index) and
+warms its lookup cache with the keys that were hot on the old one. The result
+is published by swapping a single ``DbSnapshot`` reference; requests that
+already pinned the previous snapshot finish on it.
+
+Workers share the pinned links, and under ``gunicorn --preload`` they also
+share the boot snapshot's link with the master, which forks new workers
+onto it. So a process never unlinks a pin just because it is done with it.
+Each process using a pin holds a shared ``flock`` on ``<pin>.lock``, and a
+pin is removed only once an exclusive lock on that file succeeds, i.e. no
+live process holds it any more.
+"""
+
+import datetime
+import fcntl
+import glob
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from explainshell import errors
+from explainshell.caching_store import CachingStore
+from explainshell.name_index import NameIndex
+from explainshell.store import Store
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_EXTENSION_KEY = "explainshell_db_snapshot"
+RELOADER_EXTENSION_KEY = "explainshell_db_reloader"
+
+# Snapshots a process keeps open after a swap: the live one plus the
+# previous, which in-flight requests may still be reading.
+_KEEP_SNAPSHOTS = 2
+_LOCK_SUFFIX = ".lock"
+
+
+class DbSnapshot(NamedTuple):
+    """One consistent view of the serving DB, swapped as a single reference."""
+
+    store: CachingStore
+    db_path: str
+    db_sha256: str
+    distros: list[tuple[str, str]]
+    build_seconds: float
+
+
+def read_sidecar(db_path: str) -> str | None:
+    """Return the digest recorded in ``<db_path>.sha256``, or None."""
+    try:
+        with open(db_path + ".sha256") as f:
+            # sha256sum-style sidecars carry a trailing filename; keep the digest.
+            fields = f.read().split()
+    except OSError:
+        return None
+    return fields[0] if fields else None
+
+
+def _lock_pin(pinned: str) -> int:
+    """Take a shared lock on *pinned*'s lock file and return its descriptor.
+
+    Retries if a sweep removed the lock file between our open and flock, so
+    the lock returned is always on the file currently at that path.
+    """
+    lock_path = pinned + _LOCK_SUFFIX
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            if os.path.samestat(os.fstat(fd), os.stat(lock_path)):
+                return fd
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+
+
+def pin_db_file(db_path: str, sha256: str) -> tuple[str, int | None]:
+    """Hard-link *db_path* to a digest-named path and hold it.
+
+    Returns the pinned path and the descriptor of the shared lock held on
+    it; closing the descriptor lets `sweep_pins` remove the link. The link
+    keeps pointing at this version's inode even after a new DB is moved over
+    *db_path*, so connections the snapshot opens later (one per serving
+    thread) never see a newer file. Falls back to *db_path* itself, with no
+    lock, when linking is not possible (e.g. a read-only directory).
+    """
+    pinned = f"{db_path}.{sha256[:16]}"
+    lock_fd = None
+    try:
+        # Lock before linking, so a concurrent sweep cannot remove the link
+        # between our creating and holding it.
+        lock_fd = _lock_pin(pinned)
+        if os.path.exists(pinned):
+            if os.path.samefile(pinned, db_path):
+                # Another worker already pinned this version.
+                return pinned, lock_fd
+            os.unlink(pinned)
+        os.link(db_path, pinned)
+    except OSError as e:
+        if lock_fd is not None:
+            os.close(lock_fd)
+        logger.warning("could not pin %s (%s); serving it unpinned", db_path, e)
+        return db_path, None
+    return pinned, lock_fd
+
+
+def sweep_pins(db_path: str) -> list[str]:
+    """Remove the pinned links of *db_path* that no live process holds.
+
+    Returns the removed paths. A lock is released when the last descriptor
+    sharing it closes, including on process exit, so pins of workers that
+    died are collected by the next sweep in any process.
+    """
+    removed = []
+    for lock_path in glob.glob(glob.escape(db_path) + ".*" + _LOCK_SUFFIX):
+        try:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CLOEXEC)
+        except OSError:
+            continue
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            continue
+        pinned = lock_path.removesuffix(_LOCK_SUFFIX)
+        try:
+            for path in (pinned, lock_path):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            removed.append(pinned)
+        finally:
+            os.close(fd)
+    return removed
+
+
+def build_snapshot(
+    db_path: str, sha256: str, warm_keys: list[tuple] | None = None
+) -> DbSnapshot:
+    """Open *db_path* as a new snapshot and warm its caches."""
+    t0 = time.monotonic()
+    # Read the distro list and name index on a throwaway connection: the
+    # CachingStore must not open one here, since the initial snapshot is
+    # built before gunicorn forks its workers.
+    boot_store = Store(db_path, read_only=True)
+    try:
+        distros = list(boot_store.distros())
+        name_index = NameIndex(boot_store.mapping_names())
+    finally:
+        boot_store.close()
+    store = CachingStore(db_path, name_index=name_index)
+    for name, distro, release in warm_keys or []:
+        try:
+            store.find_man_page(name, distro=distro, release=release)
+        except errors.ProgramDoesNotExist:
+            pass
+    return DbSnapshot(
+        store=store,
+        db_path=db_path,
+        db_sha256=sha256,
+        distros=distros,
+        build_seconds=time.monotonic() - t0,
+    )
+
+
+class DbReloader:
+    """Watch the DB sidecar and publish new snapshots into *extensions*."""
+
+    def __init__(self, extensions: dict, db_path: str, interval: float) -> None:
+        self._extensions = extensions
+        self._db_path = db_path
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._building = False
+        # Snapshots replaced in this process, oldest first, and the pin
+        # lock this process holds for each pinned path it uses.
+        self._retired: list[DbSnapshot] = []
+        self._pin_locks: dict[str, int] = {}
+        self.reloads = 0
+        self.last_reload_at: str | None = None
+        self.last_error: str | None = None
+
+    def install_initial(self, sha256: str) -> DbSnapshot:
+        """Pin and publish the DB the process booted with."""
+        path, lock_fd = self._db_path, None
+        if sha256 != "local":
+            path, lock_fd = pin_db_file(self._db_path, sha256)
+        snapshot = build_snapshot(path, sha256)
+        self._publish(snapshot, lock_fd)
+        return snapshot
+
+    def maybe_reload(self) -> threading.Thread | None:
+        """Start a background rebuild if the sidecar changed. Cheap to call.
+
+        Returns the rebuild thread, if one was started.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        with self._lock:
+            if now < self._next_check or self._building:
+                return None
+            self._next_check = now + self._interval
+            current = self._extensions.get(SNAPSHOT_EXTENSION_KEY)
+            sha256 = read_sidecar(self._db_path)
+            if sha256 is None or (current and current.db_sha256 == sha256):
+                return None
+            self._building = True
+
+        thread = threading.Thread(
+            target=self._reload, args=(sha256,), name="db-reload", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _reload(self, sha256: str) -> None:
+        try:
+            # The sidecar identifies the DB version (it is the digest of the
+            # downloaded asset, not of the DB file) and is written after the
+            # DB is moved into place, so by now the file is the new one.
+            path, lock_fd = pin_db_file(self._db_path, sha256)
+            try:
+                old = self._extensions.get(SNAPSHOT_EXTENSION_KEY)
+                warm_keys = old.store.cached_keys() if old is not None else []
+                snapshot = build_snapshot(path, sha256, warm_keys)
+                if not snapshot.distros:
+                    snapshot.store.close()
+                    raise ValueError(f"{self._db_path} ({sha256[:16]}) has no manpages")
+            except BaseException:
+                if lock_fd is not None:
+                    os.close(lock_fd)
+                raise
+            self._publish(snapshot, lock_fd)
+            self.reloads += 1
+            self.last_reload_at = datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat()
+            self.last_error = None
+            logger.info(
+                "switched to db %s (%d distro(s), rebuilt in %.2fs, %d key(s) warmed)",
+                sha256[:16],
+                len(snapshot.distros),
+                snapshot.build_seconds,
+                len(warm_keys),
+            )
+        except Exception as e:
+            self.last_error = str(e)
+            logger.exception("db reload failed")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def _publish(self, snapshot: DbSnapshot, lock_fd: int | None) -> None:
+        old = self._extensions.get(SNAPSHOT_EXTENSION_KEY)
+        # A single reference assignment: readers see either the old or the
+        # new snapshot, never a mix of their fields.
+        self._extensions[SNAPSHOT_EXTENSION_KEY] = snapshot
+        if (
+            lock_fd is not None
+            and self._pin_locks.setdefault(snapshot.db_path, lock_fd) != lock_fd
+        ):
+            # Already held for this path (a rollback to a retained snapshot).
+            os.close(lock_fd)
+        if old is not None:
+            self._retired.append(old)
+        # The previous snapshot stays open for requests still running on it;
+        # older ones are closed along with this process's hold on their pin.
+        while len(self._retired) >= _KEEP_SNAPSHOTS:
+            stale = self._retired.pop(0)
+            stale.store.close()
+            if stale.db_path != snapshot.db_path:
+                stale_fd = self._pin_locks.pop(stale.db_path, None)
+                if stale_fd is not None:
+                    os.close(stale_fd)
+        for path in sweep_pins(self._db_path):
+            logger.info("removed unused pinned db %s", path)
+
+    def info(self) -> dict:
+        """Reload status for /health."""
+        snapshot = self._extensions.get(SNAPSHOT_EXTENSION_KEY)
+        return {
+            "reloads": self.reloads,
+            "last_reload_at": self.last_reload_at,
+            "last_error": self.last_error,
+            "build_seconds": (
+                round(snapshot.build_seconds, 3) if snapshot is not None else None
+            ),
+        }
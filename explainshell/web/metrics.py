@@ -0,0 +1,179 @@
+"""Prometheus metrics for the web app, served at /metrics.
+
+Enabled with METRICS=true. Under gunicorn each worker is a separate
+process. When PROMETHEUS_MULTIPROC_DIR is set (prod/docker/start.sh sets
+it), prometheus_client keeps every worker's values in mmapped files in that
+directory, and the worker that answers a scrape reports the sum over all
+workers. Recording a value costs a few dict lookups and an mmap write.
+Nothing is computed at scrape time beyond reading those files.
+
+The per-stage histograms come from the request's timing.RequestTimer, so
+they cover the same stages as the Server-Timing header. The manpage cache
+is exported as lookup counters plus entry and byte gauges, not as a hit
+ratio, because a ratio cannot be summed across workers. Compute it in the
+query:
+
+    sum(rate(explainshell_manpage_cache_lookups_total{result="hit"}[5m]))
+      / sum(rate(explainshell_manpage_cache_lookups_total[5m]))
+"""
+
+import os
+import time
+
+from flask import Flask, Response, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from explainshell import timing
+from explainshell.caching_store import CachingStore
+from explainshell.web import STORE_EXTENSION_KEY
+from explainshell.web.db_reload import SNAPSHOT_EXTENSION_KEY
+
+REQUEST_SECONDS = Histogram(
+    "explainshell_request_duration_seconds",
+    "Time to build a response, by route.",
+    ["route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+STAGE_SECONDS = Histogram(
+    "explainshell_stage_duration_seconds",
+    "Time per request spent in each stage (see explainshell.timing).",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+RESPONSES = Counter(
+    "explainshell_responses_total",
+    "Responses sent, by route and status code.",
+    ["route", "status"],
+)
+IN_FLIGHT = Gauge(
+    "explainshell_requests_in_flight",
+    "Requests being handled.",
+    multiprocess_mode="livesum",
+)
+PARSE_ERRORS = Counter(
+    "explainshell_parse_errors_total",
+    "Commands bashlex failed to parse.",
+)
+PROGRAM_NOT_FOUND = Counter(
+    "explainshell_program_not_found_total",
+    "Requests answered with the missing-manpage page, by route.",
+    ["route"],
+)
+CACHE_LOOKUPS = Counter(
+    "explainshell_manpage_cache_lookups_total",
+    "CachingStore.find_man_page calls, by how they were answered.",
+    ["result"],
+)
+CACHE_ENTRIES = Gauge(
+    "explainshell_manpage_cache_entries",
+    "Lookups held in the manpage cache.",
+    multiprocess_mode="livesum",
+)
+CACHE_BYTES = Gauge(
+    "explainshell_manpage_cache_bytes",
+    "Estimated size of the manpage cache.",
+    multiprocess_mode="livesum",
+)
+CACHE_MAX_BYTES = Gauge(
+    "explainshell_manpage_cache_max_bytes",
+    "Size budget of the manpage cache.",
+    multiprocess_mode="livesum",
+)
+
+# timing stage -> CACHE_LOOKUPS result label.
+_LOOKUP_STAGES = {
+    "lookup-hit": "hit",
+    "lookup-miss": "miss",
+    "lookup-rejected": "rejected",
+}
+
+
+def route_label() -> str:
+    """Bounded label for the current request: the endpoint name, with
+    /explain split into its two handlers."""
+    endpoint = request.endpoint
+    if endpoint == "main.explain_router":
+        return "explain_cmd" if "cmd" in request.args else "explain_program"
+    return endpoint or "unmatched"
+
+
+def count_parse_error() -> None:
+    """Count a command bashlex could not parse, if metrics are enabled."""
+    if current_app.config["METRICS"]:
+        PARSE_ERRORS.inc()
+
+
+def count_program_not_found(route: str) -> None:
+    """Count a missing man page on *route*, if metrics are enabled."""
+    if current_app.config["METRICS"]:
+        PROGRAM_NOT_FOUND.labels(route).inc()
+
+
+def _cached_store() -> CachingStore | None:
+    snapshot = current_app.extensions.get(SNAPSHOT_EXTENSION_KEY)
+    if snapshot is not None:
+        store = snapshot.store
+    else:
+        store = current_app.extensions.get(STORE_EXTENSION_KEY)
+    return store if isinstance(store, CachingStore) else None
+
+
+def _start_request() -> None:
+    g.metrics_start = time.perf_counter()
+    IN_FLIGHT.inc()
+
+
+def _record_response(response: Response) -> Response:
+    start = g.get("metrics_start")
+    if start is None:
+        return response
+    route = route_label()
+    REQUEST_SECONDS.labels(route).observe(time.perf_counter() - start)
+    RESPONSES.labels(route, str(response.status_code)).inc()
+
+    timer = timing.current()
+    if timer is not None:
+        for name, (seconds, count) in timer.stages().items():
+            STAGE_SECONDS.labels(name).observe(seconds)
+            result = _LOOKUP_STAGES.get(name)
+            if result is not None:
+                CACHE_LOOKUPS.labels(result).inc(count)
+
+    store = _cached_store()
+    if store is not None:
+        info = store.manpage_cache_info()
+        CACHE_ENTRIES.set(info.entries)
+        CACHE_BYTES.set(info.size_bytes)
+        CACHE_MAX_BYTES.set(info.max_bytes)
+    return response
+
+
+def _end_request(exc: BaseException | None) -> None:
+    if g.pop("metrics_start", None) is not None:
+        IN_FLIGHT.dec()
+
+
+def metrics() -> Response:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+def init_app(app: Flask) -> None:
+    """Record request metrics for *app* and serve them at /metrics."""
+    app.before_request(_start_request)
+    app.after_request(_record_response)
+    app.teardown_request(_end_request)
+    app.add_url_rule("/metrics", "metrics", metrics)
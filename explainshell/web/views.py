@@ -8,21 +8,58 @@ import markupsafe
 from flask import (
     Blueprint,
     current_app,
+    g,
     make_response,
     redirect,
     render_template,
     request,
 )
 
-from explainshell import config, errors, matcher, util
-from explainshell.web import get_distros, get_store, helpers
+from explainshell import config, errors, matcher, timing, util
+from explainshell.caching_store import CachingStore
+from explainshell.web import get_db_sha256, get_distros, get_store, helpers, metrics
 from explainshell.web.markdown import render_markdown
 
 logger = logging.getLogger(__name__)
+# SERVER_TIMING=log lines, on their own logger so a deployment can route
+# them without the rest of this module's INFO output.
+timing_logger = logging.getLogger("explainshell.web.timing")
 
 bp = Blueprint("main", __name__)
 
 
+@bp.before_request
+def _start_timing():
+    if current_app.config["SERVER_TIMING"] or current_app.config["METRICS"]:
+        g.timing_token = timing.activate()
+
+
+@bp.after_request
+def _report_timing(response):
+    timer = timing.current()
+    if timer is None:
+        return response
+    sinks = current_app.config["SERVER_TIMING"]
+    if "header" in sinks:
+        response.headers["Server-Timing"] = timer.header()
+    if "log" in sinks:
+        fields = timer.fields()
+        timing_logger.info(
+            "timing %s %s",
+            request.path,
+            " ".join(f"{k}={v}" for k, v in fields.items()),
+            extra={"server_timing": fields},
+        )
+    return response
+
+
+@bp.teardown_request
+def _stop_timing(exc):
+    token = g.pop("timing_token", None)
+    if token is not None:
+        timing.deactivate(token)
+
+
 def _is_known_distro(name):
     """Return True if *name* matches a distro in the cached distros list."""
     for distro, _release in get_distros():
@@ -277,39 +314,48 @@ def _handle_explain_cmd(url_distro, url_release):
             reverse=True,
         )
     try:
-        matches, helptext, debug_info = explain_cmd(
-            command,
-            get_store(),
-            distro=distro,
-            release=release,
-            explain_prefix=prefix,
-            distro_preference=distro_preference,
-        )
-        helptext = [(render_markdown(text), id_) for text, id_ in helptext]
+        with timing.stage("match"):
+            matches, helptext, debug_info = explain_cmd(
+                command,
+                get_store(),
+                distro=distro,
+                release=release,
+                explain_prefix=prefix,
+                distro_preference=distro_preference,
+            )
+        with timing.stage("markdown"):
+            helptext = [(render_markdown(text), id_) for text, id_ in helptext]
 
         # Compute distros scoped to the matched commands (intersection).
         cmd_names = [m["name"] for m in matches if "name" in m]
         if cmd_names:
-            sets = [set(get_store().distros_for_name(n)) for n in cmd_names]
+            with timing.stage("distros"):
+                sets = [set(get_store().distros_for_name(n)) for n in cmd_names]
             cmd_distros = sorted(sets[0].intersection(*sets[1:]))
         else:
             cmd_distros = list(get_distros())
 
-        body = render_template(
-            "explain.html",
-            matches=matches,
-            helptext=helptext,
-            getargs=command,
-            debug_info=debug_info,
-            available_distros=cmd_distros,
-        )
+        with timing.stage("render"):
+            body = render_template(
+                "explain.html",
+                matches=matches,
+                helptext=helptext,
+                getargs=command,
+                debug_info=debug_info,
+                available_distros=cmd_distros,
+            )
         return _cacheable_explain_response(body)
 
     except errors.ProgramDoesNotExist as error_msg:
+        metrics.count_program_not_found("explain_cmd")
         return render_template(
-            "errors/missingmanpage.html", title="missing man page", e=error_msg
+            "errors/missingmanpage.html",
+            title="missing man page",
+            e=error_msg,
+            near_matches=_near_matches(error_msg, distro, release),
         )
     except bashlex.errors.ParsingError as error_msg:
+        metrics.count_parse_error()
         logger.warning("%r parsing error: %s", command, error_msg.message)
         return render_template(
             "errors/parsingerror.html", title="parsing error!", e=error_msg
@@ -361,25 +407,104 @@ def _handle_explain_program(section, program, url_distro, url_release):
             mp, suggestions, raw_mp, debug_info = explain_program(
                 program, get_store(), distro=d, release=r
             )
-            cmd_distros = get_store().distros_for_name(raw_mp.name)
-            body = render_template(
-                "options.html",
-                mp=mp,
-                suggestions=suggestions,
-                raw_mp=raw_mp,
-                debug_info=debug_info,
-                available_distros=cmd_distros,
-            )
+            with timing.stage("distros"):
+                cmd_distros = get_store().distros_for_name(raw_mp.name)
+            with timing.stage("render"):
+                body = render_template(
+                    "options.html",
+                    mp=mp,
+                    suggestions=suggestions,
+                    raw_mp=raw_mp,
+                    debug_info=debug_info,
+                    available_distros=cmd_distros,
+                )
             return _cacheable_explain_response(body)
         except errors.ProgramDoesNotExist as e:
             last_error = e
             continue
 
+    metrics.count_program_not_found("explain_program")
     return render_template(
-        "errors/missingmanpage.html", title="missing man page", e=last_error
+        "errors/missingmanpage.html",
+        title="missing man page",
+        e=last_error,
+        near_matches=_near_matches(last_error, url_distro, url_release),
     )
 
 
+# Upper bound on "did you mean" links on the missing-manpage page.
+_NEAR_MATCHES_LIMIT = 5
+
+
+def _search_hits(query, distro=None, release=None, limit=10):
+    """Run a store search and shape the hits for templates."""
+    hits = []
+    for r in get_store().search(query, limit=limit, distro=distro, release=release):
+        hit_distro, hit_release = config.parse_distro_release(r.source)
+        name, section = util.name_section(os.path.basename(r.source)[:-3])
+        hits.append(
+            {
+                "name": name,
+                "text": f"{name}({section})",
+                "synopsis": r.synopsis,
+                "distro": hit_distro,
+                "release": hit_release,
+                "link": f"/explain/{hit_distro}/{hit_release}/{section}/{name}",
+            }
+        )
+    return hits
+
+
+def _typo_hits(name):
+    """Names a few edits away from *name*, when the store has a name index."""
+    store = get_store()
+    if not isinstance(store, CachingStore):
+        return []
+    # One edit for short names, otherwise nearly everything is a match.
+    max_distance = 1 if len(name) <= 4 else 2
+    return [
+        {
+            "name": near,
+            "text": near,
+            "synopsis": None,
+            "link": "/explain/" + urllib.parse.quote(near),
+        }
+        for near in store.nearest_names(
+            name, k=_NEAR_MATCHES_LIMIT, max_distance=max_distance
+        )
+    ]
+
+
+def _near_matches(error, distro=None, release=None):
+    """Suggestions for a ProgramDoesNotExist *error*: likely typos first,
+    then full-text search hits."""
+    if error is None or not error.args:
+        return []
+    seen = set()
+    matches = []
+    name = error.args[0]
+    hits = _search_hits(name, distro, release, _NEAR_MATCHES_LIMIT * 2)
+    for hit in itertools.chain(_typo_hits(name), hits):
+        if hit["name"] in seen:
+            continue
+        seen.add(hit["name"])
+        matches.append(hit)
+    return matches[:_NEAR_MATCHES_LIMIT]
+
+
+@bp.route("/search")
+def search():
+    """Full-text search over manpage names, synopses and option text."""
+    query = request.args.get("q", "").strip()[:200]
+    if not query:
+        return redirect("/")
+    not_modified = _not_modified_if_fresh()
+    if not_modified is not None:
+        return not_modified
+    body = render_template("search.html", query=query, results=_search_hits(query))
+    return _cacheable_explain_response(body)
+
+
 # 5 minutes in the browser, 7 days at the CDN, so a fix reaches clients
 # within minutes instead of being pinned in their cache for a week. The
 # ETag flips on every deploy, so the revalidations this costs are answered
@@ -397,14 +522,14 @@ def _explain_etag() -> str | None:
     """Return the ETag for cacheable explain responses, or None in DEBUG.
 
     ``<db_sha256[:16]>-<app_version>`` — two deploy-wide constants, so it
-    flips on any DB rebuild or code change and stays stable otherwise. It
-    deliberately does not depend on the request: caches key on the URL and
-    only use the ETag to validate that key, so one value per deploy is
-    enough to tell a client whether its copy is current.
+    flips on any DB rebuild (or hot-swap) or code change and stays stable
+    otherwise. It deliberately does not depend on the request: caches key
+    on the URL and only use the ETag to validate that key, so one value per
+    deploy is enough to tell a client whether its copy is current.
     """
     if current_app.config.get("DEBUG"):
         return None
-    db_sha = current_app.config.get("DB_SHA256", "local")
+    db_sha = get_db_sha256()
     app_ver = current_app.config.get("APP_VERSION", "local")
     return f"{db_sha[:16]}-{app_ver}"
 
@@ -483,12 +608,14 @@ def explain_program(program, store, distro=None, release=None):
 
     url = manpage_url(raw_mp.source)
 
+    with timing.stage("markdown"):
+        options = [render_markdown(o.text) for o in raw_mp.options]
     mp = {
         "source": os.path.basename(raw_mp.source)[:-3],
         "section": raw_mp.section,
         "program": program,
         "synopsis": synopsis,
-        "options": [render_markdown(o.text) for o in raw_mp.options],
+        "options": options,
         "url": url,
     }
 
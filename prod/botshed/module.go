@@ -1,6 +1,7 @@
 package botshed
 
 import (
+	"bytes"
 	"context"
 	"database/sql"
 	"fmt"
@@ -55,6 +56,10 @@ type Botshed struct {
 	bootPassthroughs atomic.Uint64
 	readyLogged      atomic.Bool
 
+	// Exported on /metrics, see writeMetrics.
+	shedTotal   atomic.Uint64
+	passedTotal atomic.Uint64
+
 	logger *zap.Logger
 }
 
@@ -182,6 +187,9 @@ func fetchOne(c *http.Client, upstream, cmd string) ([]byte, error) {
 }
 
 func (b *Botshed) ServeHTTP(w http.ResponseWriter, r *http.Request, next caddyhttp.Handler) error {
+	if r.Method == http.MethodGet && r.URL.Path == "/metrics" {
+		return b.serveMetrics(w, r, next)
+	}
 	if r.Method != http.MethodGet || !strings.HasPrefix(r.URL.Path, "/explain") {
 		return next.ServeHTTP(w, r)
 	}
@@ -202,8 +210,10 @@ func (b *Botshed) ServeHTTP(w http.ResponseWriter, r *http.Request, next caddyht
 
 	shed, hits := shouldShed(cmd, bn)
 	if !shed {
+		b.passedTotal.Add(1)
 		return next.ServeHTTP(w, r)
 	}
+	b.shedTotal.Add(1)
 
 	idx := fnv32(cmd) % uint32(len(canned))
 	body := canned[idx]
@@ -226,6 +236,54 @@ func (b *Botshed) ServeHTTP(w http.ResponseWriter, r *http.Request, next caddyht
 	return nil
 }
 
+// serveMetrics passes /metrics through to the app and appends botshed's
+// own counters to a successful response, so one scrape covers both.
+func (b *Botshed) serveMetrics(w http.ResponseWriter, r *http.Request, next caddyhttp.Handler) error {
+	buf := new(bytes.Buffer)
+	rec := caddyhttp.NewResponseRecorder(w, buf, func(status int, _ http.Header) bool {
+		return status == http.StatusOK
+	})
+	if err := next.ServeHTTP(rec, r); err != nil {
+		return err
+	}
+	if !rec.Buffered() {
+		return nil
+	}
+	b.writeMetrics(buf)
+	rec.Header().Del("Content-Length")
+	return rec.WriteResponse()
+}
+
+// writeMetrics renders botshed's counters in the Prometheus text format.
+func (b *Botshed) writeMetrics(w io.Writer) {
+	basenames := 0
+	if bn := b.basenames.Load(); bn != nil {
+		basenames = len(*bn)
+	}
+	ready := 0
+	if b.basenames.Load() != nil && b.canned.Load() != nil {
+		ready = 1
+	}
+	fmt.Fprintf(w, `# HELP botshed_requests_total /explain requests seen by botshed, by outcome.
+# TYPE botshed_requests_total counter
+botshed_requests_total{outcome="shed"} %d
+botshed_requests_total{outcome="passed"} %d
+botshed_requests_total{outcome="boot_passthrough"} %d
+# HELP botshed_ready Whether the basename set and canned responses are loaded.
+# TYPE botshed_ready gauge
+botshed_ready %d
+# HELP botshed_basenames Manpage basenames known to the detector.
+# TYPE botshed_basenames gauge
+botshed_basenames %d
+`,
+		b.shedTotal.Load(),
+		b.passedTotal.Load(),
+		b.bootPassthroughs.Load(),
+		ready,
+		basenames,
+	)
+}
+
 // shouldShed is the single source of truth for the detector decision.
 // ServeHTTP and the unit tests both call through here so the rule cannot
 // drift between production and the tests.
@@ -1,10 +1,14 @@
 package botshed
 
 import (
+	"io"
+	"net/http"
+	"net/http/httptest"
 	"strings"
 	"testing"
 
 	"github.com/caddyserver/caddy/v2/caddyconfig/caddyfile"
+	"github.com/caddyserver/caddy/v2/modules/caddyhttp"
 )
 
 func basenameSet(names ...string) map[string]struct{} {
@@ -126,3 +130,44 @@ func TestUnmarshalCaddyfile(t *testing.T) {
 		}
 	})
 }
+
+func TestServeMetrics(t *testing.T) {
+	var b Botshed
+	bn := basenameSet("ls.1")
+	b.basenames.Store(&bn)
+	b.shedTotal.Add(3)
+	b.passedTotal.Add(5)
+
+	serve := func(status int) *httptest.ResponseRecorder {
+		upstream := caddyhttp.HandlerFunc(func(w http.ResponseWriter, r *http.Request) error {
+			w.Header().Set("Content-Length", "20")
+			w.WriteHeader(status)
+			_, err := io.WriteString(w, "explainshell_up 1.0\n")
+			return err
+		})
+		w := httptest.NewRecorder()
+		r := httptest.NewRequest(http.MethodGet, "/metrics", nil)
+		if err := b.ServeHTTP(w, r, upstream); err != nil {
+			t.Fatalf("ServeHTTP: %v", err)
+		}
+		return w
+	}
+
+	body := serve(http.StatusOK).Body.String()
+	for _, want := range []string{
+		"explainshell_up 1.0\n",
+		`botshed_requests_total{outcome="shed"} 3`,
+		`botshed_requests_total{outcome="passed"} 5`,
+		"botshed_ready 0",
+		"botshed_basenames 1",
+	} {
+		if !strings.Contains(body, want) {
+			t.Errorf("metrics body missing %q:\n%s", want, body)
+		}
+	}
+
+	// Errors from the app pass through untouched.
+	if body := serve(http.StatusNotFound).Body.String(); strings.Contains(body, "botshed_") {
+		t.Errorf("botshed metrics appended to a 404:\n%s", body)
+	}
+}
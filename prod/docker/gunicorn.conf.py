@@ -0,0 +1,27 @@
+"""gunicorn server hooks. Settings are passed on the command line (start.sh)."""
+
+import logging
+import os
+
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    # SERVER_TIMING=log lines are INFO records, below what reaches stderr
+    # without a handler. Set up in the master so every worker inherits it.
+    if "log" in os.environ.get("SERVER_TIMING", "").split(","):
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("[%(asctime)s] [%(process)d] [TIMING] %(message)s")
+        )
+        timing_log = logging.getLogger("explainshell.web.timing")
+        timing_log.addHandler(handler)
+        timing_log.setLevel(logging.INFO)
+        timing_log.propagate = False
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests, cache size)
+    # from /metrics. Its counters and histograms still count towards totals.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -4,13 +4,19 @@ set -e
 # Single source of truth for the gunicorn bind / caddy upstream pair.
 export UPSTREAM_ADDR="${UPSTREAM_ADDR:-[::1]:8081}"
 
+# Per-worker metric files behind /metrics (see explainshell/web/metrics.py).
+# Wiped on boot so values from a previous run are not summed in.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # Caddy fronts gunicorn on :8080 and buffers responses so slow-read clients
 # cannot park gthread workers in wsgi.write(). Gunicorn binds localhost only.
 # Access logging lives in caddy (structured json with real client_ip from the
 # CF-Connecting-IP header); gunicorn only emits warnings/errors to stderr.
 # --timeout is main-thread heartbeat, not per-request; gthread worker
 # threads can still chug on slow requests past it.
-gunicorn -w 2 --threads 4 \
+gunicorn -c gunicorn.conf.py -w 2 --threads 4 \
   --timeout 15 --graceful-timeout 5 \
   --max-requests 10000 --max-requests-jitter 2000 --preload \
   -b "$UPSTREAM_ADDR" \
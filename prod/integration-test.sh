@@ -84,6 +84,18 @@ else
   echo "    ok (botshed shed)"
 fi
 
+echo "==> /metrics: app metrics plus botshed counters"
+metrics=$(curl -sS "http://localhost:$PORT/metrics")
+if ! echo "$metrics" | grep -q '^explainshell_request_duration_seconds_count{route="explain_cmd"}'; then
+  echo "    FAIL: no explain_cmd request histogram"; fail=1
+elif ! echo "$metrics" | grep -q '^botshed_requests_total{outcome="shed"} [1-9]'; then
+  echo "    FAIL: expected botshed shed counter >= 1"
+  echo "$metrics" | grep '^botshed' | sed 's/^/      /'
+  fail=1
+else
+  echo "    ok"
+fi
+
 if [ $fail -eq 0 ]; then
   echo "==> all integration probes passed"
 else
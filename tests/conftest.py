@@ -18,3 +18,10 @@ def _no_manager_log_files(tmp_path):
         patch("explainshell.manager._setup_console_logging"),
     ):
         yield
+
+
+@pytest.fixture(autouse=True)
+def _no_sha256_cache():
+    """Keep CLI tests from creating the digest cache under ~/.cache."""
+    with patch("explainshell.config.SHA256_CACHE_PATH", ""):
+        yield
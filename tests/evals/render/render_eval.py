@@ -32,6 +32,7 @@ from explainshell.extraction.llm.text import (  # noqa: E402
     clean_mandoc_artifacts,
     filter_sections,
 )
+from explainshell.extraction.mandoc import MandocPool  # noqa: E402
 from explainshell.web.markdown import render_markdown  # noqa: E402
 from tests.evals._common import (  # noqa: E402
     _format_delta,
@@ -123,7 +124,11 @@ class RenderedPage:
     metrics: dict[str, Any]
 
 
-def _mandoc_markdown(mandoc_path: str, manpage: Path) -> str:
+def _mandoc_markdown(
+    mandoc_path: str, manpage: Path, pool: MandocPool | None = None
+) -> str:
+    if pool is not None:
+        return pool.render(str(manpage)).rstrip() + "\n"
     result = subprocess.run(
         [mandoc_path, "-T", "markdown", str(manpage)],
         cwd=REPO_ROOT,
@@ -194,9 +199,11 @@ def _metrics(path: str, markdown: str, html: str) -> dict[str, Any]:
     }
 
 
-def _render_page(mandoc_path: str, manpage: Path) -> RenderedPage:
+def _render_page(
+    mandoc_path: str, manpage: Path, pool: MandocPool | None = None
+) -> RenderedPage:
     rel_path = _repo_relative(manpage)
-    markdown = _mandoc_markdown(mandoc_path, manpage)
+    markdown = _mandoc_markdown(mandoc_path, manpage, pool)
     html = render_markdown(markdown)
     return RenderedPage(
         path=rel_path,
@@ -220,6 +227,11 @@ def render_run(args: argparse.Namespace) -> int:
     for subdir in ("markdown", "html", "metrics"):
         (run_dir / subdir).mkdir(parents=True, exist_ok=True)
 
+    pool = None
+    if args.batch_size > 1:
+        pool = MandocPool(mandoc_path, batch_size=args.batch_size)
+        pool.prefetch(str(p) for p in corpus if p.is_file())
+
     pages: list[dict[str, Any]] = []
     failures: list[dict[str, str]] = []
     for manpage in corpus:
@@ -229,7 +241,7 @@ def render_run(args: argparse.Namespace) -> int:
             failures.append({"path": rel_path, "error": "file not found"})
             continue
         try:
-            page = _render_page(mandoc_path, manpage)
+            page = _render_page(mandoc_path, manpage, pool)
         except Exception as exc:
             failures.append({"path": rel_path, "error": str(exc)})
             continue
@@ -244,6 +256,9 @@ def render_run(args: argparse.Namespace) -> int:
             }
         )
 
+    if pool is not None:
+        pool.close()
+
     summary = {
         "label": args.label,
         "timestamp": datetime.now(UTC).isoformat(),
@@ -1393,6 +1408,13 @@ def build_parser() -> argparse.ArgumentParser:
     render_p.add_argument(
         "--corpus", default=str(DEFAULT_CORPUS), help="corpus file path"
     )
+    render_p.add_argument(
+        "--batch-size",
+        type=int,
+        default=config.MANDOC_BATCH_SIZE,
+        help="pages rendered per mandoc process (default: MANDOC_BATCH_SIZE, "
+        f"currently {config.MANDOC_BATCH_SIZE}; 0 or 1 renders one page per process)",
+    )
     render_p.add_argument("--output", help="run output directory")
     render_p.add_argument(
         "--fail-on-failure",
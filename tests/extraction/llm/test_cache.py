@@ -0,0 +1,98 @@
+"""Tests for explainshell.extraction.llm.cache — the on-disk response cache."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from explainshell.extraction.llm.cache import ResponseCache
+from explainshell.extraction.llm.providers import TokenUsage
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _cache(self, model: str = "openai/gpt-5-mini/medium", **kwargs):
+        return ResponseCache(self.root, model, **kwargs)
+
+    def test_miss_then_hit(self):
+        cache = self._cache()
+        self.assertIsNone(cache.get("chunk"))
+        cache.put("chunk", '{"options": []}', TokenUsage(100, 20, 5))
+
+        response, usage = cache.get("chunk")
+        self.assertEqual(response, '{"options": []}')
+        self.assertEqual(usage.input_tokens, 100)
+
+        stats = cache.stats
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.input_tokens_saved, 100)
+        self.assertEqual(stats.output_tokens_saved, 20)
+        self.assertEqual(stats.reasoning_tokens_saved, 5)
+
+    def test_key_covers_model_effort_prompt_and_content(self):
+        base = self._cache()
+        keys = {
+            base.key("chunk"),
+            base.key("chunk2"),
+            self._cache("openai/gpt-5/medium").key("chunk"),
+            self._cache("openai/gpt-5-mini/high").key("chunk"),
+            self._cache(system_prompt="other prompt").key("chunk"),
+        }
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(base.key("chunk"), self._cache().key("chunk"))
+
+    def test_put_keeps_existing_entry(self):
+        cache = self._cache()
+        cache.put("chunk", "first", TokenUsage(100, 20))
+        cache.put("chunk", "second")
+        response, usage = cache.get("chunk")
+        self.assertEqual(response, "first")
+        self.assertEqual(usage.input_tokens, 100)
+
+    def test_discard(self):
+        cache = self._cache()
+        cache.put("chunk", "response")
+        cache.discard("chunk")
+        self.assertIsNone(cache.get("chunk"))
+
+    def test_unreadable_entry_is_a_miss(self):
+        cache = self._cache()
+        cache.put("chunk", "response")
+        path = os.path.join(self.root, cache.key("chunk")[:2], cache.key("chunk"))
+        with open(path + ".json", "w") as f:
+            f.write("{not json")
+
+        self.assertIsNone(cache.get("chunk"))
+        self.assertFalse(os.path.exists(path + ".json"))
+
+    def test_evicts_least_recently_used(self):
+        cache = self._cache()
+        for offset, name in enumerate(("a", "b", "c")):
+            cache.put(name, "x" * 40)
+            # Age the entries so "a" is the oldest on disk.
+            path = os.path.join(self.root, cache.key(name)[:2], cache.key(name))
+            t = time.time() - 100 + offset
+            os.utime(path + ".json", (t, t))
+        entry_size = os.path.getsize(path + ".json")
+        # Reading "a" makes "b" the least recently used entry.
+        cache.get("a")
+
+        # Room for three and a half entries: adding a fourth evicts one.
+        cache.max_bytes = entry_size * 7 // 2
+        cache.put("d", "x" * 40)
+
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertIsNotNone(cache.get("d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,18 @@
 """Tests for explainshell.extraction.llm.LLMExtractor — integration and LLM extraction."""
 
+import gzip
 import os
+import shutil
 import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from explainshell import models
-from explainshell.errors import ExtractionError, SkippedExtraction
+from explainshell import config, models
+from explainshell.errors import ExtractionError, FailureReason, SkippedExtraction
 from explainshell.extraction import ExtractorConfig
 from explainshell.extraction.llm.extractor import (
     _BLACKLISTED_SOURCES,
@@ -17,6 +21,7 @@ from explainshell.extraction.llm.extractor import (
 )
 from explainshell.extraction.llm.providers import TokenUsage
 from explainshell.extraction.llm.response import normalize_subcommands
+from explainshell.extraction.llm.text import LineTable
 from tests.helpers import TESTS_DIR
 
 # ---------------------------------------------------------------------------
@@ -28,6 +33,8 @@ def _make_mock_extractor(
     model: str = "openai/test-model",
     run_dir: str | None = None,
     debug: bool = False,
+    llm_cache_dir: str | None = None,
+    llm_concurrency: int = 1,
 ) -> LLMExtractor:
     """Build an LLMExtractor whose provider is a MagicMock.
 
@@ -36,7 +43,13 @@ def _make_mock_extractor(
     missing — irrelevant for these tests).  retryable_exceptions is set
     so _call_llm's `except retryable as e:` clause type-checks.
     """
-    cfg = ExtractorConfig(model=model, run_dir=run_dir, debug=debug)
+    cfg = ExtractorConfig(
+        model=model,
+        run_dir=run_dir,
+        debug=debug,
+        llm_cache_dir=llm_cache_dir,
+        llm_concurrency=llm_concurrency,
+    )
     provider = MagicMock(retryable_exceptions=(ConnectionError,))
     with (
         patch(
@@ -55,6 +68,9 @@ class TestExtractIntegration(unittest.TestCase):
     def _make_extractor(self, model="openai/test-model", run_dir=None, debug=False):
         return _make_mock_extractor(model=model, run_dir=run_dir, debug=debug)
 
+    @patch(
+        "explainshell.extraction.llm.extractor.roff_utils.read_source", return_value=[]
+    )
     @patch(
         "explainshell.extraction.common.roff_utils.detect_nested_cmd",
         return_value=False,
@@ -70,6 +86,7 @@ class TestExtractIntegration(unittest.TestCase):
         mock_text,
         mock_common_synopsis,
         mock_nested_cmd,
+        mock_read_source,
     ):
         mock_synopsis.return_value = ("a test tool", [("dummy", 10)])
         mock_common_synopsis.return_value = ("a test tool", [("dummy", 10)])
@@ -99,6 +116,9 @@ class TestExtractIntegration(unittest.TestCase):
         self.assertEqual(raw.generator, "mandoc -T markdown")
         self.assertIn("-n", raw.source_text)
 
+    @patch(
+        "explainshell.extraction.llm.extractor.roff_utils.read_source", return_value=[]
+    )
     @patch(
         "explainshell.extraction.common.roff_utils.detect_nested_cmd",
         return_value=False,
@@ -114,6 +134,7 @@ class TestExtractIntegration(unittest.TestCase):
         mock_text,
         mock_common_synopsis,
         mock_nested_cmd,
+        mock_read_source,
     ):
         mock_synopsis.return_value = (None, [("dummy", 10)])
         mock_common_synopsis.return_value = (None, [("dummy", 10)])
@@ -132,6 +153,9 @@ class TestExtractIntegration(unittest.TestCase):
         self.assertEqual(len(result.mp.options), 1)
         self.assertEqual(result.mp.options[0].short, ["-v"])
 
+    @patch(
+        "explainshell.extraction.llm.extractor.roff_utils.read_source", return_value=[]
+    )
     @patch(
         "explainshell.extraction.common.roff_utils.detect_nested_cmd",
         return_value=False,
@@ -147,6 +171,7 @@ class TestExtractIntegration(unittest.TestCase):
         mock_text,
         mock_common_synopsis,
         mock_nested_cmd,
+        mock_read_source,
     ):
         mock_synopsis.return_value = ("a test tool", [("dummy", 10)])
         mock_common_synopsis.return_value = ("a test tool", [("dummy", 10)])
@@ -179,15 +204,7 @@ class TestExtractIntegration(unittest.TestCase):
 
 # Shared helpers for multi-chunk tests.
 _PLAIN_TEXT = "**-a**\n\nOption a.\n\n**-b**\n\nOption b."
-_ORIGINAL_LINES: dict[int, str] = {
-    1: "**-a**",
-    2: "",
-    3: "Option a.",
-    4: "",
-    5: "**-b**",
-    6: "",
-    7: "Option b.",
-}
+_ORIGINAL_LINES = LineTable(_PLAIN_TEXT)
 
 
 def _make_prepared(n_chunks: int = 2) -> PreparedFile:
@@ -196,7 +213,6 @@ def _make_prepared(n_chunks: int = 2) -> PreparedFile:
         aliases=[("dummy", 10)],
         original_lines=_ORIGINAL_LINES,
         basename="dummy",
-        numbered_text="   1| **-a**\n   2| ...",
         plain_text_len=len(_PLAIN_TEXT),
         plain_text=_PLAIN_TEXT,
         requests=["chunk0 content", "chunk1 content"][:n_chunks],
@@ -259,10 +275,15 @@ class TestMultiChunkExtract(unittest.TestCase):
         self.assertIn("missing 'options' key", str(ctx.exception))
         self.assertEqual(ctx.exception.raw_response, bad_response)
 
+    @patch(
+        "explainshell.extraction.llm.extractor.roff_utils.read_source", return_value=[]
+    )
     @patch("explainshell.extraction.llm.extractor.chunk_text")
     @patch("explainshell.extraction.llm.extractor.get_manpage_text")
     @patch("explainshell.extraction.llm.extractor.manpage.get_synopsis_and_aliases")
-    def test_too_many_chunks_raises(self, mock_synopsis, mock_text, mock_chunk_text):
+    def test_too_many_chunks_raises(
+        self, mock_synopsis, mock_text, mock_chunk_text, mock_read_source
+    ):
         """prepare() raises ExtractionError when chunk count exceeds MAX_CHUNKS."""
         from explainshell.extraction.llm.text import MAX_CHUNKS
 
@@ -275,6 +296,23 @@ class TestMultiChunkExtract(unittest.TestCase):
             ext.prepare("dummy.1.gz")
         self.assertIn("too many chunks", str(ctx.exception))
 
+    @patch.object(config, "NAME_PARSER", "native")
+    @patch("explainshell.extraction.llm.extractor.get_manpage_text")
+    def test_prepare_decompresses_source_once(self, mock_text):
+        """The NAME parser and nested-command scan share one read of the page."""
+        mock_text.return_value = "**-v**\n\nVerbose."
+        gz_path = os.path.join(TESTS_DIR, "manpages/ubuntu/26.04/1/xargs.1.gz")
+
+        ext = self._make_extractor()
+        with patch("explainshell.roff_utils.gzip.open", wraps=gzip.open) as gz_open:
+            prepared = ext.prepare(gz_path)
+
+        gz_open.assert_called_once()
+        self.assertEqual(
+            prepared.synopsis, "build and execute command lines from standard input"
+        )
+        self.assertTrue(prepared.nested_cmd)
+
     def test_blacklisted_source_skipped(self):
         """prepare() raises SkippedExtraction for blacklisted source paths."""
         # Pick the first blacklisted source and build a matching gz_path.
@@ -304,6 +342,276 @@ class TestMultiChunkExtract(unittest.TestCase):
                 self.assertEqual(f.read(), bad_response)
 
 
+def _make_prepared_chunks(basename: str, n_chunks: int) -> PreparedFile:
+    prepared = _make_prepared(1)
+    prepared.basename = basename
+    prepared.requests = [f"{basename} chunk{i}" for i in range(n_chunks)]
+    return prepared
+
+
+class TestConcurrentChunks(unittest.TestCase):
+    """extract() with llm_concurrency > 1 sends chunks concurrently."""
+
+    def _make_extractor(self, llm_concurrency: int = 3) -> LLMExtractor:
+        return _make_mock_extractor(llm_concurrency=llm_concurrency)
+
+    @patch(
+        "explainshell.extraction.common.roff_utils.detect_nested_cmd",
+        return_value=False,
+    )
+    @patch("explainshell.extraction.common.manpage.get_synopsis_and_aliases")
+    @patch("explainshell.extraction.common.gz_sha256", return_value="abc123")
+    @patch("explainshell.extraction.llm.extractor.LLMExtractor.prepare")
+    def test_results_kept_in_chunk_order(
+        self, mock_prepare, mock_sha, mock_common_synopsis, mock_nested_cmd
+    ):
+        """A slow first chunk still comes first when results are merged."""
+        mock_prepare.return_value = _make_prepared(2)
+        mock_common_synopsis.return_value = ("test tool", [("dummy", 10)])
+        ext = self._make_extractor()
+        chunk1_done = threading.Event()
+
+        def _call(user_content):
+            if user_content == "chunk0 content":
+                self.assertTrue(chunk1_done.wait(timeout=5))
+                return _CHUNK0_JSON, TokenUsage(10, 1)
+            chunk1_done.set()
+            return _CHUNK1_JSON, TokenUsage(20, 2)
+
+        ext.provider.call.side_effect = _call
+
+        with patch.object(ext, "_finalize") as mock_finalize:
+            ext.extract("dummy.1.gz")
+
+        all_chunk_data, stats = mock_finalize.call_args.args[2:]
+        self.assertEqual(
+            [cr.raw_response for cr in all_chunk_data], [_CHUNK0_JSON, _CHUNK1_JSON]
+        )
+        self.assertEqual(stats.input_tokens, 30)
+
+    @patch("explainshell.extraction.llm.extractor.LLMExtractor.prepare")
+    def test_in_flight_limit_shared_across_files(self, mock_prepare):
+        mock_prepare.side_effect = lambda gz_path: _make_prepared_chunks(
+            os.path.basename(gz_path), 4
+        )
+        ext = self._make_extractor(llm_concurrency=3)
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+
+        def _call(user_content):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return '{"options": []}', TokenUsage(1, 1)
+
+        ext.provider.call.side_effect = _call
+
+        with patch.object(ext, "_finalize"):
+            threads = [
+                threading.Thread(target=ext.extract, args=(f"page{i}.1.gz",))
+                for i in range(3)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(ext.provider.call.call_count, 12)
+        self.assertEqual(in_flight[1], 3)
+
+    @patch("explainshell.extraction.llm.extractor.LLMExtractor.prepare")
+    def test_cancel_stops_queued_chunks(self, mock_prepare):
+        """cancel() lets in-flight calls finish but sends no further chunks."""
+        mock_prepare.return_value = _make_prepared_chunks("big", 6)
+        ext = self._make_extractor(llm_concurrency=2)
+
+        def _call(user_content):
+            ext.cancel()
+            return '{"options": []}', TokenUsage(1, 1)
+
+        ext.provider.call.side_effect = _call
+
+        with self.assertRaises(ExtractionError) as ctx:
+            ext.extract("big.1.gz")
+        self.assertIn("cancelled", str(ctx.exception))
+        self.assertLessEqual(ext.provider.call.call_count, 2)
+
+
+class TestResponseCache(unittest.TestCase):
+    """extract() and finalize() go through the on-disk response cache."""
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _make_extractor(self) -> LLMExtractor:
+        return _make_mock_extractor(llm_cache_dir=self.cache_dir)
+
+    @patch(
+        "explainshell.extraction.common.roff_utils.detect_nested_cmd",
+        return_value=False,
+    )
+    @patch("explainshell.extraction.common.manpage.get_synopsis_and_aliases")
+    @patch("explainshell.extraction.common.gz_sha256", return_value="abc123")
+    @patch("explainshell.extraction.llm.extractor.LLMExtractor.prepare")
+    def test_rerun_served_from_cache(
+        self, mock_prepare, mock_sha, mock_common_synopsis, mock_nested_cmd
+    ):
+        mock_prepare.return_value = _make_prepared(2)
+        mock_common_synopsis.return_value = ("test tool", [("dummy", 10)])
+
+        first = self._make_extractor()
+        first.provider.call.side_effect = [
+            (_CHUNK0_JSON, TokenUsage(100, 10)),
+            (_CHUNK1_JSON, TokenUsage(200, 20)),
+        ]
+        first.extract("dummy.1.gz")
+
+        second = self._make_extractor()
+        result = second.extract("dummy.1.gz")
+
+        second.provider.call.assert_not_called()
+        self.assertEqual(len(result.mp.options), 2)
+        self.assertEqual(result.stats.input_tokens, 0)
+        stats = second.response_cache.stats
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.input_tokens_saved, 300)
+        self.assertEqual(stats.output_tokens_saved, 30)
+
+    def test_failed_extraction_not_cached(self):
+        ext = self._make_extractor()
+        ext.provider.call.return_value = ('{"error": "nope"}', TokenUsage(10, 5))
+        with self.assertRaises(ExtractionError):
+            ext._call_llm("some user content")
+        self.assertIsNone(ext.response_cache.get("some user content"))
+
+    def test_stale_cached_response_refetched(self):
+        """A cached response that no longer validates is replaced by a live call."""
+        ext = self._make_extractor()
+        ext.response_cache.put("chunk0 content", '{"error": "stale"}')
+        ext.provider.call.return_value = (_CHUNK0_JSON, TokenUsage(10, 5))
+
+        cr = ext._call_llm("chunk0 content")
+
+        self.assertFalse(cr.cached)
+        ext.provider.call.assert_called_once()
+        self.assertIsNone(ext.response_cache.get("chunk0 content"))
+
+    @patch(
+        "explainshell.extraction.common.roff_utils.detect_nested_cmd",
+        return_value=False,
+    )
+    @patch("explainshell.extraction.common.manpage.get_synopsis_and_aliases")
+    @patch("explainshell.extraction.common.gz_sha256", return_value="abc123")
+    def test_finalize_fills_cache(
+        self, mock_sha, mock_common_synopsis, mock_nested_cmd
+    ):
+        mock_common_synopsis.return_value = ("test tool", [("dummy", 10)])
+        ext = self._make_extractor()
+        ext.finalize("dummy.1.gz", _make_prepared(2), [_CHUNK0_JSON, _CHUNK1_JSON])
+
+        response, usage = ext.response_cache.get("chunk1 content")
+        self.assertEqual(response, _CHUNK1_JSON)
+        self.assertEqual(usage.input_tokens, 0)
+
+    def test_disabled_without_cache_dir(self):
+        self.assertIsNone(_make_mock_extractor().response_cache)
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str) -> None:
+        super().__init__("rate limited")
+        self.response = MagicMock(headers={"retry-after": retry_after})
+
+
+class TestRateLimiting(unittest.TestCase):
+    """_call_llm goes through the extractor's RateLimiter."""
+
+    def test_throttle_honours_retry_after(self):
+        ext = _make_mock_extractor(llm_concurrency=4)
+        ext.provider.retryable_exceptions = (_RateLimited,)
+        ext.provider.call.side_effect = [
+            _RateLimited("0.1"),
+            (_CHUNK0_JSON, TokenUsage(100, 10)),
+        ]
+
+        t0 = time.monotonic()
+        ext._call_llm("chunk0 content")
+
+        self.assertGreaterEqual(time.monotonic() - t0, 0.08)
+        self.assertEqual(ext.provider.call.call_count, 2)
+        stats = ext.rate_limiter.stats
+        self.assertEqual(stats.throttle_events, 1)
+        self.assertEqual(stats.requests, 2)
+        self.assertEqual(stats.tokens, 110)
+        self.assertEqual(stats.concurrency, 2)
+
+    def test_non_retryable_error_frees_slot(self):
+        ext = _make_mock_extractor()
+        ext.provider.call.side_effect = ValueError("bad request")
+        with self.assertRaises(ExtractionError):
+            ext._call_llm("chunk0 content")
+        # The only slot was returned; the next call does not block.
+        ext.provider.call.side_effect = None
+        ext.provider.call.return_value = (_CHUNK0_JSON, TokenUsage(10, 5))
+        ext._call_llm("chunk0 content")
+
+    def test_cancel_wakes_rate_limited_call(self):
+        ext = _make_mock_extractor(llm_concurrency=4)
+        ext.provider.retryable_exceptions = (_RateLimited,)
+        ext.provider.call.side_effect = _RateLimited("60")
+        threading.Timer(0.1, ext.cancel).start()
+
+        t0 = time.monotonic()
+        with self.assertRaises(ExtractionError) as ctx:
+            ext._call_llm("chunk0 content")
+
+        self.assertLess(time.monotonic() - t0, 5)
+        self.assertEqual(ctx.exception.reason_class, FailureReason.CANCELLED)
+        self.assertEqual(ext.provider.call.call_count, 1)
+
+    def test_cancel_after_acquire_releases_slot(self):
+        ext = _make_mock_extractor()
+        acquire = ext.rate_limiter.acquire
+
+        def _acquire_then_cancel(est_tokens):
+            ticket = acquire(est_tokens)
+            ext._cancelled.set()  # cancel() lands just as the slot is granted
+            return ticket
+
+        with (
+            patch.object(ext.rate_limiter, "acquire", _acquire_then_cancel),
+            self.assertRaises(ExtractionError) as ctx,
+        ):
+            ext._call_llm("chunk0 content")
+
+        self.assertEqual(ctx.exception.reason_class, FailureReason.CANCELLED)
+        ext.provider.call.assert_not_called()
+        self.assertEqual(ext.rate_limiter._in_flight, 0)
+
+    def test_cancel_stops_retries(self):
+        ext = _make_mock_extractor()
+        ext.provider.retryable_exceptions = (ConnectionError,)
+        ext.provider.call.side_effect = ConnectionError("reset")
+        threading.Timer(0.1, ext.cancel).start()
+
+        t0 = time.monotonic()
+        with self.assertRaises(ExtractionError) as ctx:
+            ext._call_llm("chunk0 content")
+
+        # The first back-off is 1s; cancel() cuts it short.
+        self.assertLess(time.monotonic() - t0, 0.9)
+        self.assertEqual(ctx.exception.reason_class, FailureReason.CANCELLED)
+        self.assertEqual(ext.provider.call.call_count, 1)
+
+
 class TestMultiChunkFinalize(unittest.TestCase):
     """Batch finalize() path with multiple chunks."""
 
@@ -363,7 +671,6 @@ class TestMultiChunkFinalize(unittest.TestCase):
             aliases=prepared.aliases,
             original_lines=prepared.original_lines,
             basename="git",
-            numbered_text=prepared.numbered_text,
             plain_text_len=prepared.plain_text_len,
             plain_text=prepared.plain_text,
             requests=prepared.requests[:1],
@@ -377,6 +684,25 @@ class TestMultiChunkFinalize(unittest.TestCase):
         result = ext.finalize("git.1.gz", prepared, [chunk_json])
         self.assertEqual(result.mp.subcommands, ["add", "commit", "push"])
 
+    @patch(
+        "explainshell.extraction.common.roff_utils.detect_nested_cmd",
+        side_effect=AssertionError("source re-read"),
+    )
+    @patch(
+        "explainshell.extraction.common.manpage.get_synopsis_and_aliases",
+        side_effect=AssertionError("lexgrog re-run"),
+    )
+    @patch("explainshell.extraction.common.gz_sha256", return_value="abc123")
+    def test_finalize_uses_prepared_source_info(self, _sha, _synopsis, _nested):
+        """finalize() builds metadata from PreparedFile without reading the file."""
+        prepared = _make_prepared(2)
+        prepared.nested_cmd = True
+        ext = self._make_extractor()
+        result = ext.finalize("dummy.1.gz", prepared, [_CHUNK0_JSON, _CHUNK1_JSON])
+        self.assertEqual(result.mp.synopsis, prepared.synopsis)
+        self.assertEqual(result.mp.aliases, prepared.aliases)
+        self.assertTrue(result.mp.nested_cmd)
+
 
 # ---------------------------------------------------------------------------
 # TestSubcommandNormalization
@@ -0,0 +1,137 @@
+"""Tests for explainshell.extraction.llm.ratelimit."""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from explainshell.extraction.llm.prompt import SYSTEM_PROMPT
+from explainshell.extraction.llm.ratelimit import (
+    RateLimiter,
+    RateLimiterCancelled,
+    estimate_tokens,
+    is_throttle,
+    retry_after_seconds,
+)
+
+
+def _error(status_code=429, **headers):
+    return SimpleNamespace(
+        status_code=status_code, response=SimpleNamespace(headers=headers)
+    )
+
+
+class TestHelpers(unittest.TestCase):
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens("x" * 400), (len(SYSTEM_PROMPT) + 400) // 4)
+
+    def test_is_throttle(self):
+        self.assertTrue(is_throttle(_error(429)))
+        self.assertTrue(is_throttle(SimpleNamespace(code=429)))
+        self.assertFalse(is_throttle(_error(500)))
+        self.assertFalse(is_throttle(ValueError("boom")))
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after_seconds(_error(**{"retry-after": "7"})), 7.0)
+        self.assertEqual(
+            retry_after_seconds(
+                _error(**{"retry-after-ms": "1500", "retry-after": "7"})
+            ),
+            1.5,
+        )
+        self.assertIsNone(
+            retry_after_seconds(
+                _error(**{"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"})
+            )
+        )
+        self.assertIsNone(retry_after_seconds(ValueError("boom")))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_rpm_budget_waits_for_window(self):
+        limiter = RateLimiter("m", rpm=2, max_concurrency=4)
+        with patch("explainshell.extraction.llm.ratelimit._WINDOW_SECONDS", 0.2):
+            for _ in range(2):
+                limiter.release(limiter.acquire(10), tokens=10)
+            t0 = time.monotonic()
+            limiter.release(limiter.acquire(10), tokens=10)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.15)
+        self.assertEqual(limiter.stats.requests, 3)
+
+    def test_tpm_budget_uses_reported_tokens(self):
+        limiter = RateLimiter("m", tpm=100, max_concurrency=4)
+        with patch("explainshell.extraction.llm.ratelimit._WINDOW_SECONDS", 0.2):
+            # Estimated at 90 but only 20 were used: the next 60 fits.
+            limiter.release(limiter.acquire(90), tokens=20)
+            t0 = time.monotonic()
+            limiter.release(limiter.acquire(60), tokens=60)
+            self.assertLess(time.monotonic() - t0, 0.1)
+            # 80 in the window now; another 60 must wait for it to expire.
+            limiter.release(limiter.acquire(60), tokens=60)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.15)
+        self.assertEqual(limiter.stats.tokens, 140)
+
+    def test_concurrency_limit_blocks_until_release(self):
+        limiter = RateLimiter("m", max_concurrency=1)
+        first = limiter.acquire(1)
+        acquired = threading.Event()
+
+        def _second():
+            limiter.release(limiter.acquire(1))
+            acquired.set()
+
+        t = threading.Thread(target=_second)
+        t.start()
+        self.assertFalse(acquired.wait(timeout=0.1))
+        limiter.release(first)
+        self.assertTrue(acquired.wait(timeout=5))
+        t.join()
+
+    def test_aimd(self):
+        limiter = RateLimiter("m", max_concurrency=8)
+        limiter.throttle(limiter.acquire(1), pause=0)
+        self.assertEqual(limiter.concurrency, 4)
+        limiter.throttle(limiter.acquire(1), pause=0)
+        self.assertEqual(limiter.concurrency, 2)
+        # Additive increase: about one slot per `limit` successes.
+        for _ in range(4):
+            limiter.release(limiter.acquire(1), tokens=1)
+        self.assertEqual(limiter.concurrency, 3)
+        self.assertEqual(limiter.stats.throttle_events, 2)
+
+    def test_throttle_pauses_all_callers(self):
+        limiter = RateLimiter("m", max_concurrency=4)
+        limiter.throttle(limiter.acquire(1), pause=0.2)
+        t0 = time.monotonic()
+        limiter.release(limiter.acquire(1))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.15)
+        self.assertGreater(limiter.stats.wait_seconds, 0.1)
+
+    def test_cancel_wakes_waiters(self):
+        limiter = RateLimiter("m", max_concurrency=1)
+        first = limiter.acquire(1)
+        errors = []
+
+        def _second():
+            try:
+                limiter.acquire(1)
+            except RateLimiterCancelled as e:
+                errors.append(e)
+
+        t = threading.Thread(target=_second)
+        t.start()
+        time.sleep(0.05)
+        limiter.cancel()
+        t.join(timeout=5)
+        self.assertFalse(t.is_alive())
+        self.assertEqual(len(errors), 1)
+        # In-flight requests still release; new ones are refused at once.
+        limiter.release(first)
+        with self.assertRaises(RateLimiterCancelled):
+            limiter.acquire(1)
+        self.assertEqual(limiter.stats.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
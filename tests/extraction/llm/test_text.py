@@ -1,15 +1,18 @@
 """Tests for explainshell.extraction.llm.text — mandoc text processing."""
 
 import os
+import pickle
 import re
 import unittest
 from unittest.mock import MagicMock, patch
 
 from explainshell.errors import ExtractionError
+from explainshell.extraction.llm.response import extract_text_from_lines
 from explainshell.extraction.llm.text import (
     _BLACKLISTED_SECTIONS,
     _MAX_PREAMBLE_CHARS,
     CHUNK_SIZE_CHARS,
+    LineTable,
     _build_preamble,
     chunk_text,
     clean_mandoc_artifacts,
@@ -26,7 +29,7 @@ from tests.helpers import TESTS_DIR
 
 @patch("explainshell.extraction.llm.text.os.path.isfile", return_value=True)
 class TestGetManpageText(unittest.TestCase):
-    @patch("explainshell.extraction.llm.text.subprocess.run")
+    @patch("explainshell.extraction.mandoc.subprocess.run")
     def test_success_returns_markdown(self, mock_run, _mock_isfile):
         md_output = (
             "# NAME\n\ngrep - search for patterns\n\n**-v**, **--invert-match**\n"
@@ -39,13 +42,13 @@ class TestGetManpageText(unittest.TestCase):
         self.assertIn("markdown", cmd)
         self.assertEqual(result, md_output.strip())
 
-    @patch("explainshell.extraction.llm.text.subprocess.run")
+    @patch("explainshell.extraction.mandoc.subprocess.run")
     def test_empty_output_raises(self, mock_run, _mock_isfile):
         mock_run.return_value = MagicMock(returncode=0, stdout="   ", stderr="")
         with self.assertRaises(ExtractionError):
             get_manpage_text("dummy.1.gz")
 
-    @patch("explainshell.extraction.llm.text.subprocess.run")
+    @patch("explainshell.extraction.mandoc.subprocess.run")
     def test_nonzero_exit_raises(self, mock_run, _mock_isfile):
         mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="error msg")
         with self.assertRaises(ExtractionError):
@@ -149,6 +152,21 @@ class TestChunkText(unittest.TestCase):
         for chunk in chunks:
             self.assertLessEqual(len(chunk), CHUNK_SIZE_CHARS)
 
+    def test_oversized_paragraph_splits_by_lines_within_budget(self):
+        # One paragraph of 30k short lines: 5-digit line numbers, cut at lines.
+        text = "# BIG\n\n" + "\n".join(f"word {i}" for i in range(30_000))
+        chunks = chunk_text(text)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), CHUNK_SIZE_CHARS)
+        numbered = [
+            line.split("| ", 1)[1]
+            for chunk in chunks
+            for line in chunk.split("\n")
+            if re.match(r"^\s*\d+\| ", line)
+        ]
+        self.assertEqual(numbered[-1], "word 29999")
+
     def test_single_unsplittable_line(self):
         # A single line with no breaks can't be split further — it stays as one oversized chunk
         text = "z" * (CHUNK_SIZE_CHARS + 1)
@@ -405,6 +423,47 @@ class TestNumberLines(unittest.TestCase):
         self.assertTrue(first_line.startswith("  1| "))
 
 
+class TestLineTable(unittest.TestCase):
+    TEXT = "> **-a**\n\nOption a.\n\n**-b**\nOption b.\n"
+
+    def test_matches_dict_of_lines(self):
+        table = LineTable(self.TEXT)
+        expected = dict(enumerate(self.TEXT.split("\n"), 1))
+        self.assertEqual(dict(table.items()), expected)
+        self.assertNotIn(0, table)
+        self.assertNotIn(len(expected) + 1, table)
+
+    def test_span_matches_line_by_line_lookup(self):
+        table = LineTable(self.TEXT)
+        for start in range(1, 10):
+            for end in range(start, 10):
+                self.assertEqual(
+                    table.span(start, end),
+                    [table.get(i, "") for i in range(start, end + 1)],
+                    (start, end),
+                )
+
+    def test_extract_text_same_as_dict(self):
+        table = LineTable(self.TEXT)
+        as_dict = dict(table.items())
+        for start, end in [(1, 3), (1, 8), (5, 6), (6, 12)]:
+            self.assertEqual(
+                extract_text_from_lines(table, start, end),
+                extract_text_from_lines(as_dict, start, end),
+            )
+
+    def test_numbered_view(self):
+        table = LineTable("\n".join(f"line{i}" for i in range(100)))
+        numbered, _ = number_lines(table.text)
+        self.assertEqual(table.numbered(), numbered)
+        self.assertEqual(table.numbered_len, len(numbered))
+        self.assertTrue(numbered.startswith("  1| line0\n  2| line1"))
+
+    def test_pickles(self):
+        table = pickle.loads(pickle.dumps(LineTable(self.TEXT)))
+        self.assertEqual(table.span(1, 3), ["> **-a**", "", "Option a."])
+
+
 # ---------------------------------------------------------------------------
 # TestFilterSections
 # ---------------------------------------------------------------------------
@@ -0,0 +1,158 @@
+"""Tests for explainshell.extraction.mandoc, against a fake mandoc script."""
+
+import concurrent.futures
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch
+
+from explainshell.errors import ExtractionError, FailureReason
+from explainshell.extraction import mandoc
+from explainshell.extraction.mandoc import MandocPool, render_page
+
+# Renders each input to "# <first line>\n\n<rest>", like mandoc renders
+# several files back to back, with SEPARATOR between files. Inputs containing
+# FAIL produce no output and make the run exit non-zero; every invocation is
+# appended to $FAKE_MANDOC_LOG.
+_FAKE_MANDOC = """\
+    import gzip, os, sys
+
+    with open(os.environ["FAKE_MANDOC_LOG"], "a") as log:
+        log.write(" ".join(sys.argv[3:]) + "\\n")
+    status = 0
+    for i, path in enumerate(sys.argv[3:]):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt") as f:
+            src = f.read()
+        if "FAIL" in src:
+            sys.stderr.write(f"mandoc: {path}: ERROR: bad page\\n")
+            status = 3
+            continue
+        head, _, rest = src.partition("\\n")
+        sys.stdout.write(f"{SEPARATOR if i else ''}# {head}\\n\\n{rest}\\n")
+    sys.exit(status)
+"""
+
+
+class TestMandocPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.log = os.path.join(self.tmpdir, "calls.log")
+        patcher = patch.dict(os.environ, {"FAKE_MANDOC_LOG": self.log})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mandoc = self._fake_mandoc('"\\n"')
+
+    def _fake_mandoc(self, separator: str) -> str:
+        path = os.path.join(self.tmpdir, "mandoc")
+        with open(path, "w") as f:
+            f.write(f"#!{sys.executable}\n")
+            f.write(f"SEPARATOR = {separator}\n")
+            f.write(textwrap.dedent(_FAKE_MANDOC))
+        os.chmod(path, 0o755)
+        return path
+
+    def _page(self, name: str, body: str = "") -> str:
+        path = os.path.join(self.tmpdir, f"{name}.1.gz")
+        with gzip.open(path, "wt") as f:
+            f.write(f"{name.upper()}\n{body or f'{name} does things'}\n")
+        return path
+
+    def _pool(self, batch_size: int = 8) -> MandocPool:
+        pool = MandocPool(self.mandoc, batch_size=batch_size)
+        self.addCleanup(pool.close)
+        return pool
+
+    def _page_runs(self) -> list[list[str]]:
+        """Each logged mandoc run's arguments, minus sentinel pages."""
+        with open(self.log) as f:
+            runs = [line.split() for line in f]
+        runs = [[a for a in run if a.endswith(".gz")] for run in runs]
+        return [run for run in runs if run]
+
+    def test_batch_matches_single_page_rendering(self):
+        pages = [self._page(f"p{i}") for i in range(5)]
+        expected = [render_page(p, self.mandoc) for p in pages]
+        os.unlink(self.log)
+
+        pool = self._pool()
+        pool.prefetch(pages)
+        self.assertEqual([pool.render(p) for p in pages], expected)
+        self.assertEqual(self._page_runs(), [pages])
+        self.assertEqual(pool.stats.fallbacks, 0)
+
+    def test_batch_size_limits_pages_per_run(self):
+        pages = [self._page(f"p{i}") for i in range(5)]
+        pool = self._pool(batch_size=2)
+        pool.prefetch(pages)
+        for p in pages:
+            pool.render(p)
+        # Two workers: batches may finish in either order.
+        self.assertEqual(sorted(self._page_runs()), [pages[0:2], pages[2:4], pages[4:]])
+
+    def test_failed_page_raises_and_others_render(self):
+        good = self._page("good")
+        bad = self._page("bad", body="FAIL")
+        other = self._page("other")
+        pool = self._pool()
+        pool.prefetch([good, bad, other])
+
+        self.assertEqual(pool.render(good), "# GOOD\n\ngood does things")
+        with self.assertRaises(ExtractionError) as cm:
+            pool.render(bad)
+        self.assertEqual(cm.exception.reason_class, FailureReason.MANDOC_FAILED)
+        self.assertIn("bad page", str(cm.exception))
+        self.assertEqual(pool.render(other), "# OTHER\n\nother does things")
+        # The batch exited non-zero, so each page was rendered on its own.
+        self.assertEqual(pool.stats.fallbacks, 3)
+
+    def test_concurrent_renders_share_batches(self):
+        pages = [self._page(f"p{i}") for i in range(16)]
+        pool = self._pool(batch_size=16)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as ex:
+            texts = list(ex.map(pool.render, pages))
+        self.assertEqual(texts, [f"# P{i}\n\np{i} does things" for i in range(16)])
+        self.assertLess(len(self._page_runs()), len(pages))
+
+    def test_unsplittable_output_renders_page_by_page(self):
+        # Output between files that isn't whitespace can't be attributed.
+        self.mandoc = self._fake_mandoc('"----\\n"')
+        pages = [self._page(f"p{i}") for i in range(3)]
+        pool = self._pool()
+        with self.assertLogs("explainshell.extraction.mandoc", "WARNING"):
+            pool.prefetch(pages)
+        self.assertEqual(
+            [pool.render(p) for p in pages],
+            [f"# P{i}\n\np{i} does things" for i in range(3)],
+        )
+        self.assertEqual(self._page_runs(), [[p] for p in pages])
+
+    def test_missing_binary_renders_page_by_page(self):
+        pool = self._pool()
+        pool.mandoc_path = os.path.join(self.tmpdir, "no-such-mandoc")
+        with self.assertLogs("explainshell.extraction.mandoc", "WARNING"):
+            pool.prefetch([self._page("p")])
+        with self.assertRaises(FileNotFoundError):
+            pool.render(self._page("p"))
+
+
+class TestSharedPool(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with (
+            patch("explainshell.config.MANDOC_BATCH_SIZE", 0),
+            patch.object(mandoc, "render_page", return_value="md") as single,
+        ):
+            self.assertIsNone(mandoc.shared_pool())
+            mandoc.prefetch(["/fake/a.1.gz"])
+            self.assertEqual(mandoc.render("/fake/a.1.gz"), "md")
+            self.assertEqual(mandoc.prefetch_size(), 1)
+        single.assert_called_once_with("/fake/a.1.gz")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for explainshell.extraction.poller — the shared batch poller."""
+
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from explainshell.errors import ExtractionError
+from explainshell.extraction.poller import BatchPoller
+
+
+class _FakePoll:
+    """BatchPoll that finishes after *n_running* checks."""
+
+    def __init__(self, job_id, n_running=0, error=None, retry_after=None):
+        self.job_id = job_id
+        self.retry_after = retry_after
+        self.checks: list[float] = []
+        self.threads: set[str] = set()
+        self._n_running = n_running
+        self._error = error
+
+    def poll(self):
+        self.checks.append(time.monotonic())
+        self.threads.add(threading.current_thread().name)
+        if len(self.checks) <= self._n_running:
+            return None
+        if self._error is not None:
+            raise self._error
+        return f"job-{self.job_id}"
+
+
+class TestBatchPoller(unittest.TestCase):
+    def setUp(self) -> None:
+        self.poller = BatchPoller(min_interval=0.01, max_interval=0.05)
+        self.addCleanup(self.poller.close)
+
+    def test_multiplexes_batches_on_one_thread(self):
+        polls = [_FakePoll(i, n_running=i) for i in range(5)]
+        futures = [self.poller.watch(p) for p in polls]
+
+        results = [f.result(timeout=5) for f in futures]
+
+        self.assertEqual(results, [f"job-{i}" for i in range(5)])
+        self.assertEqual(set().union(*(p.threads for p in polls)), {"batch-poller"})
+        self.assertEqual([len(p.checks) for p in polls], [1, 2, 3, 4, 5])
+
+    def test_poll_error_fails_future(self):
+        f = self.poller.watch(
+            _FakePoll("x", n_running=1, error=ExtractionError("gone"))
+        )
+        with self.assertRaises(ExtractionError):
+            f.result(timeout=5)
+
+    def test_honours_retry_after(self):
+        poll = _FakePoll("x", n_running=1, retry_after=0.2)
+        self.poller.watch(poll).result(timeout=5)
+        self.assertGreaterEqual(poll.checks[1] - poll.checks[0], 0.19)
+
+    def test_interval_grows_with_age(self):
+        poller = BatchPoller(min_interval=5, max_interval=60)
+        self.assertEqual(poller.interval(0), 5)
+        self.assertEqual(poller.interval(300), 30)
+        self.assertEqual(poller.interval(3600), 60)
+
+    def test_close_cancels_running_batches(self):
+        poller = BatchPoller(min_interval=10, max_interval=10)
+        f = poller.watch(_FakePoll("x", n_running=100))
+        poller.close()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            f.result(timeout=5)
+        with self.assertRaises(RuntimeError):
+            poller.watch(_FakePoll("y"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import random
+import re
+
 import pytest
 
 from explainshell.errors import ExtractionError
 from explainshell.extraction.postprocess import (
+    _flags_pattern,
     _subset_has_cross_reference,
     dedup_options,
     postprocess,
@@ -247,6 +251,79 @@ class TestDedupOptions:
         assert len(result) == 1
 
 
+def _reference_dedup(options: list[Option]) -> tuple[list[Option], int]:
+    """The original all-pairs dedup_options, kept as an oracle."""
+    flags_list = [frozenset(o.short + o.long) for o in options]
+    removed: set[int] = set()
+    seen: dict[frozenset[str], int] = {}
+    for i, fi in enumerate(flags_list):
+        if not fi:
+            continue
+        if fi in seen:
+            if len(options[i].text) > len(options[seen[fi]].text):
+                options[seen[fi]] = options[i]
+            removed.add(i)
+        else:
+            seen[fi] = i
+
+    def _mentions(desc: str, flags: frozenset[str]) -> bool:
+        return any(
+            re.search(r"(?<![a-zA-Z0-9\-])" + re.escape(f) + r"(?![a-zA-Z0-9\-])", desc)
+            for f in flags
+        )
+
+    for i, fi in enumerate(flags_list):
+        if i in removed or not fi:
+            continue
+        best_j, best_extra = None, 0
+        for j, fj in enumerate(flags_list):
+            if j == i or j in removed or not fj:
+                continue
+            if (
+                fi < fj
+                and _mentions(options[i].text, fj - fi)
+                and (best_j is None or len(fj - fi) < best_extra)
+            ):
+                best_j, best_extra = j, len(fj - fi)
+        if best_j is not None:
+            sup, sub = options[best_j], options[i]
+            if len(sub.text) > len(sup.text):
+                options[best_j] = sup.model_copy(
+                    update={"text": sub.text, "meta": sub.meta}
+                )
+            removed.add(i)
+    return [o for idx, o in enumerate(options) if idx not in removed], len(removed)
+
+
+def _random_options(rng: random.Random, n: int) -> list[Option]:
+    """Options drawn from a small flag pool, so subsets and mentions abound."""
+    pool = ["-a", "-b", "-M", "Z", "k", "--sort", "--sort-order", "-o", "--out"]
+    words = ["same", "as", "see", "work", "make", "--Macro", "(", ")", ",", "."]
+    options = []
+    for _ in range(n):
+        flags = rng.sample(pool, rng.randint(0, 3))
+        text = " ".join(rng.choices(pool + words, k=rng.randint(0, 8)))
+        options.append(
+            _opt(
+                text,
+                short=[f for f in flags if not f.startswith("--")],
+                long=[f for f in flags if f.startswith("--")],
+            )
+        )
+    return options
+
+
+class TestDedupMatchesAllPairs:
+    """The indexed dedup_options must agree with the all-pairs original."""
+
+    @pytest.mark.parametrize("seed", range(200))
+    def test_random_pages(self, seed: int) -> None:
+        rng = random.Random(seed)
+        options = _random_options(rng, rng.randint(1, 40))
+        expected = _reference_dedup(list(options))
+        assert dedup_options(list(options)) == expected
+
+
 class TestSubsetCrossReference:
     """Word-boundary matching in _subset_has_cross_reference."""
 
@@ -278,6 +355,17 @@ class TestSubsetCrossReference:
         opt = _opt("Identical to --sort.")
         assert _subset_has_cross_reference(opt, frozenset({"--sort"}))
 
+    def test_superset_pattern_finds_overlapping_extra_flag(self) -> None:
+        """An extra flag overlapping a reported mention of another flag is
+        still found."""
+        superset_flags = frozenset({"--foo", "--foo=bar"})
+        opt = _opt("Same as --foo=bar.")
+        pattern = _flags_pattern(superset_flags)
+        assert _subset_has_cross_reference(opt, frozenset({"--foo"}), pattern)
+        assert not _subset_has_cross_reference(
+            _opt("Unrelated."), frozenset({"--foo"}), pattern
+        )
+
 
 class TestSanitizeOption:
     """Field-combination rules, including the positional prefix sigil."""
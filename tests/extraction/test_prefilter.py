@@ -1,5 +1,6 @@
 """Unit tests for explainshell.extraction.prefilter."""
 
+import time
 import unittest
 from unittest.mock import patch
 
@@ -23,7 +24,7 @@ def _short(p: str) -> str:
 
 
 class _FakeStore:
-    """Minimal Store stand-in covering the four methods Classifier/apply touch."""
+    """Minimal Store stand-in covering the methods Classifier/apply touch."""
 
     def __init__(
         self,
@@ -43,8 +44,8 @@ class _FakeStore:
     def extractor_info_index(self) -> dict[str, tuple[str, ExtractionMeta]]:
         return dict(self._info)
 
-    def has_manpage_source(self, source: str) -> bool:
-        return source in self._in_db
+    def manpage_sources(self) -> set[str]:
+        return set(self._in_db)
 
     def delete_manpage(self, source: str) -> None:
         self.deleted.append(source)
@@ -303,6 +304,63 @@ class TestClassifyContentDup(unittest.TestCase):
         self.assertIsInstance(c.classify("/x/u/26.04/1/foo.1.gz"), Work)
 
 
+class TestClassifyAll(unittest.TestCase):
+    def setUp(self) -> None:
+        _PATCH_SOURCE.start()
+        self.addCleanup(_PATCH_SOURCE.stop)
+
+    @patch("os.path.islink", return_value=False)
+    def test_dedup_follows_input_order(self, _il) -> None:
+        paths = [f"/x/u/26.04/1/f{i}.1.gz" for i in range(8)]
+
+        def _slow_first(gz_path: str) -> str:
+            # Earlier files hash slower, so hashes finish in reverse order.
+            time.sleep(0.02 * (len(paths) - paths.index(gz_path)))
+            return "same-hash"
+
+        c = _make_classifier(_FakeStore())
+        with patch("explainshell.extraction.common.gz_sha256", side_effect=_slow_first):
+            decisions = c.classify_all(paths, workers=8)
+
+        self.assertEqual([d.gz_path for d in decisions], paths)
+        self.assertIsInstance(decisions[0], Work)
+        for d in decisions[1:]:
+            assert isinstance(d, ContentDup)
+            self.assertEqual(d.canonical_source, "u/26.04/1/f0.1.gz")
+
+    @patch("os.path.islink", return_value=False)
+    def test_matches_sequential_classify(self, _il) -> None:
+        paths = [
+            "/x/u/26.04/1/a.1.gz",
+            "/x/u/26.04/1/stored.1.gz",
+            "/x/u/26.04/1/b.1.gz",
+            "/x/u/24.04/1/a.1.gz",
+            "/x/u/26.04/1/c.1.gz",
+        ]
+        hashes = {p: "h1" if p.endswith(("a.1.gz", "c.1.gz")) else "h2" for p in paths}
+
+        def _make() -> Classifier:
+            return _make_classifier(
+                _FakeStore(
+                    known_sha256s={"h2": "u/26.04/1/canon.1.gz"},
+                    sources_in_db={"u/26.04/1/stored.1.gz"},
+                )
+            )
+
+        with patch(
+            "explainshell.extraction.common.gz_sha256", side_effect=hashes.get
+        ) as h:
+            sequential = _make()
+            expected = [sequential.classify(p) for p in paths]
+            h.reset_mock()
+            got = _make().classify_all(paths, workers=4)
+
+        self.assertEqual(got, expected)
+        # The already-stored file is never hashed.
+        hashed = {call.args[0] for call in h.call_args_list}
+        self.assertEqual(hashed, set(paths) - {"/x/u/26.04/1/stored.1.gz"})
+
+
 class TestApplyDecisions(unittest.TestCase):
     def test_buckets_each_decision_type(self) -> None:
         decisions = [
@@ -1,18 +1,34 @@
 """Tests for explainshell.extraction.runner — batch orchestration."""
 
+import functools
+import os
+import shutil
+import tempfile
 import threading
+import time
 import unittest
 from typing import ClassVar
 from unittest.mock import MagicMock, patch
 
 from explainshell.errors import ExtractionError, FatalExtractionError, SkippedExtraction
+from explainshell.extraction.llm.cache import ResponseCache
 from explainshell.extraction.llm.extractor import PreparedFile
 from explainshell.extraction.llm.providers import BatchResults, TokenUsage
+from explainshell.extraction.llm.text import LineTable
+from explainshell.extraction.manifest import (
+    BatchManifest,
+    BatchManifestEntry,
+    FileBatchManifestWriter,
+    load_batch_manifest,
+)
+from explainshell.extraction.poller import BatchPoller
 from explainshell.extraction.runner import (
+    ResumedBatch,
     WorkItem,
     _NullBatchManifestWriter,
     group_work_items,
     run,
+    run_batch,
     run_batch_collected,
     run_collected,
 )
@@ -28,9 +44,8 @@ def _make_prepared(basename: str, n_chunks: int = 1) -> PreparedFile:
     return PreparedFile(
         synopsis="test",
         aliases=[],
-        original_lines={},
+        original_lines=LineTable(""),
         basename=basename,
-        numbered_text="",
         plain_text_len=100,
         plain_text="x" * 100,
         requests=[f"content-{basename}-{i}" for i in range(n_chunks)],
@@ -48,6 +63,16 @@ def _make_result(gz_path: str = "") -> ExtractionResult:
     )
 
 
+def _prepare_in_worker(gz_path: str) -> PreparedFile:
+    """Picklable prepare_worker: records the preparing process in ``synopsis``."""
+    basename = os.path.basename(gz_path).split(".")[0]
+    if basename == "skipme":
+        raise SkippedExtraction("no options", ExtractionStats())
+    prepared = _make_prepared(basename)
+    prepared.synopsis = str(os.getpid())
+    return prepared
+
+
 class _FakeExtractor:
     """Fake that satisfies BatchExtractor for isinstance checks.
 
@@ -108,7 +133,7 @@ def _make_batch_provider(
     bp.make_poll_client.return_value = MagicMock()
 
     bp.submit_batch.return_value = "test-job-id"
-    bp.poll_batch.return_value = MagicMock()
+    bp.start_poll.return_value.poll.return_value = MagicMock()
 
     if error:
         bp.collect_results.side_effect = error
@@ -527,7 +552,7 @@ class TestRunBatchGenericExceptions(unittest.TestCase):
             return "job-1"
 
         bp.submit_batch.side_effect = _submit_batch
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -621,6 +646,34 @@ class TestRunDispatcher(unittest.TestCase):
         ext.extract.assert_called_once_with("/fake/a.1.gz")
         self.assertEqual(batch.n_succeeded, 1)
 
+    def test_parallel_mode_starts_largest_files_first(self):
+        """Files are submitted in decreasing size order (LPT scheduling)."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        files = []
+        for name, size in (("small", 10), ("huge", 300), ("tiny", 1), ("big", 200)):
+            path = os.path.join(tmpdir, f"{name}.1.gz")
+            with open(path, "wb") as f:
+                f.write(b"x" * size)
+            files.append(path)
+        files.append(os.path.join(tmpdir, "missing.1.gz"))
+
+        started: list[str] = []
+        lock = threading.Lock()
+
+        def _on_start(gz_path: str) -> None:
+            with lock:
+                started.append(os.path.basename(gz_path))
+
+        ext = MagicMock()
+        ext.extract.side_effect = _make_result
+        batch, _files = run_collected(ext, files, jobs=2, on_start=_on_start)
+
+        self.assertEqual(batch.n_succeeded, 5)
+        # Only two slots: the third file is submitted once one of these ends.
+        self.assertEqual(set(started[:2]), {"huge.1.gz", "big.1.gz"})
+        self.assertEqual(set(started[2:]), {"small.1.gz", "tiny.1.gz", "missing.1.gz"})
+
     def test_parallel_mode_submits_only_jobs_initially(self):
         """The parallel runner keeps only `jobs` tasks submitted at first."""
         import concurrent.futures
@@ -830,7 +883,7 @@ class TestParallelBatchMode(unittest.TestCase):
         bp = MagicMock()
         bp.make_poll_client.return_value = MagicMock()
         bp.submit_batch.return_value = "job-id"
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -877,7 +930,7 @@ class TestParallelBatchMode(unittest.TestCase):
             return "job-1"
 
         bp.submit_batch.side_effect = _submit_batch
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -909,7 +962,7 @@ class TestParallelBatchMode(unittest.TestCase):
         bp = MagicMock()
         bp.make_poll_client.return_value = MagicMock()
         bp.submit_batch.return_value = "job-id"
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -936,6 +989,58 @@ class TestParallelBatchMode(unittest.TestCase):
         for t in callback_threads:
             self.assertIs(t, main_thread)
 
+    def test_parallel_batches_polled_from_one_thread(self):
+        """In-flight batches are polled by the shared poller thread and
+        collected back in the batch pool."""
+        gz_paths = [f"/fake/cmd{i}.1.gz" for i in range(3)]
+        ext = _make_extractor(
+            {gz: _make_prepared(f"cmd{i}") for i, gz in enumerate(gz_paths)}
+        )
+        lock = threading.Lock()
+        poll_threads: set[str] = set()
+        collect_threads: set[str] = set()
+        polls = {"n": 0}
+
+        def _poll():
+            with lock:
+                poll_threads.add(threading.current_thread().name)
+                polls["n"] += 1
+                # Every batch reports "running" on its first check.
+                return MagicMock() if polls["n"] > 3 else None
+
+        def _collect(*_args):
+            with lock:
+                collect_threads.add(threading.current_thread().name)
+            return BatchResults(
+                {"0:0": '{"options":[],"dashless_opts":false}'},
+                TokenUsage(100, 50),
+            )
+
+        bp = MagicMock()
+        bp.make_poll_client.return_value = MagicMock()
+        bp.submit_batch.return_value = "job-id"
+        bp.start_poll.return_value.poll.side_effect = _poll
+        bp.start_poll.return_value.retry_after = None
+        bp.collect_results.side_effect = _collect
+        ext.batch_provider = bp
+
+        fast_poller = functools.partial(
+            BatchPoller, min_interval=0.01, max_interval=0.01
+        )
+        with patch("explainshell.extraction.runner.BatchPoller", fast_poller):
+            batch, _files = run_batch_collected(
+                ext,
+                gz_paths,
+                batch_size=1,
+                jobs=3,
+                manifest=_NullBatchManifestWriter(),
+            )
+
+        self.assertEqual(batch.n_succeeded, 3)
+        self.assertEqual(poll_threads, {"batch-poller"})
+        self.assertNotIn("batch-poller", collect_threads)
+        self.assertNotIn(threading.main_thread().name, collect_threads)
+
     def test_parallel_make_poll_client_failure(self):
         """make_poll_client failure in a worker produces FAILED entries for
         that batch; other batches are unaffected."""
@@ -960,7 +1065,7 @@ class TestParallelBatchMode(unittest.TestCase):
 
         bp.make_poll_client.side_effect = _make_poll_client
         bp.submit_batch.return_value = "job-id"
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -1016,7 +1121,7 @@ class TestParallelBatchMode(unittest.TestCase):
         bp = MagicMock()
         bp.make_poll_client.return_value = MagicMock()
         bp.submit_batch.return_value = "job-id"
-        bp.poll_batch.return_value = MagicMock()
+        bp.start_poll.return_value.poll.return_value = MagicMock()
         bp.collect_results.return_value = BatchResults(
             {"0:0": '{"options":[],"dashless_opts":false}'},
             TokenUsage(100, 50),
@@ -1034,6 +1139,451 @@ class TestParallelBatchMode(unittest.TestCase):
         self.assertEqual(bp.submit_batch.call_count, 2)
 
 
+class TestStreamingPrepare(unittest.TestCase):
+    """run_batch pipelines the prepare phase with batch submission."""
+
+    @staticmethod
+    def _make_bp() -> MagicMock:
+        bp = MagicMock()
+        bp.make_poll_client.return_value = MagicMock()
+        bp.submit_batch.return_value = "job-id"
+        bp.start_poll.return_value.poll.return_value = MagicMock()
+        bp.collect_results.return_value = BatchResults(
+            {"0:0": '{"options":[],"dashless_opts":false}'},
+            TokenUsage(100, 50),
+        )
+        return bp
+
+    def test_first_batch_submitted_before_last_file_prepared(self):
+        """The first full batch goes out while later files are still preparing."""
+        gz_files = [f"/fake/f{i}.1.gz" for i in range(3)]
+        prepared = {gz: _make_prepared(f"f{i}") for i, gz in enumerate(gz_files)}
+        ext = _make_extractor(prepared)
+        ext.batch_provider = self._make_bp()
+
+        submitted = threading.Event()
+        ext.batch_provider.submit_batch.side_effect = lambda *a, **kw: (
+            submitted.set() or "job-id"
+        )
+        waited: list[bool] = []
+
+        def _prepare(gz_path):
+            if gz_path == gz_files[-1]:
+                waited.append(submitted.wait(timeout=5))
+            return prepared[gz_path]
+
+        ext.prepare.side_effect = _prepare
+
+        batch, _files = run_batch_collected(
+            ext, gz_files, batch_size=1, jobs=2, manifest=_NullBatchManifestWriter()
+        )
+
+        self.assertEqual(waited, [True])
+        self.assertEqual(batch.n_succeeded, 3)
+
+    def test_batches_follow_input_order(self):
+        """Batch composition does not depend on which prepare finishes first."""
+        gz_files = [f"/fake/f{i}.1.gz" for i in range(4)]
+        prepared = {gz: _make_prepared(f"f{i}") for i, gz in enumerate(gz_files)}
+        ext = _make_extractor(prepared)
+        ext.batch_provider = self._make_bp()
+
+        def _prepare(gz_path):
+            if gz_path == gz_files[0]:
+                time.sleep(0.05)
+            return prepared[gz_path]
+
+        ext.prepare.side_effect = _prepare
+        manifest = MagicMock()
+
+        run_batch_collected(ext, gz_files, batch_size=2, jobs=4, manifest=manifest)
+
+        manifest.set_total_batches.assert_called_once_with(2)
+        submitted = sorted(
+            (c.kwargs["batch_idx"], c.kwargs["files"])
+            for c in manifest.record_batch.call_args_list
+            if c.kwargs["status"] == "submitted"
+        )
+        self.assertEqual(submitted, [(1, gz_files[:2]), (2, gz_files[2:])])
+
+    def test_pipeline_stats_bounded_by_inflight_batches(self):
+        """Held prepared files track in-flight batches, not corpus size."""
+        gz_files = [f"/fake/f{i}.1.gz" for i in range(20)]
+        prepared = {gz: _make_prepared(f"f{i}") for i, gz in enumerate(gz_files)}
+        ext = _make_extractor(prepared)
+        ext.batch_provider = self._make_bp()
+
+        batch, _files = run_batch_collected(
+            ext, gz_files, batch_size=2, jobs=1, manifest=_NullBatchManifestWriter()
+        )
+
+        pipeline = batch.pipeline
+        assert pipeline is not None
+        self.assertEqual(pipeline.batches, 10)
+        self.assertEqual(pipeline.max_inflight_batches, 1)
+        # The batch being submitted plus the first file of the next one.
+        self.assertLessEqual(pipeline.max_held_files, 3)
+        self.assertEqual(pipeline.max_batch_requests, 2)
+        self.assertEqual(pipeline.max_batch_chars, 2 * len("content-f10-0"))
+        self.assertGreater(pipeline.process_peak_rss_bytes, 0)
+
+    def test_no_pipeline_stats_without_work(self):
+        """Runs where every file is skipped at prepare report no pipeline."""
+        gz = "/fake/alpha.1.gz"
+        ext = _make_extractor({})
+        ext.prepare.side_effect = SkippedExtraction("empty", ExtractionStats())
+
+        batch, _files = run_batch_collected(
+            ext, [gz], manifest=_NullBatchManifestWriter()
+        )
+
+        self.assertEqual(batch.n_skipped, 1)
+        self.assertIsNone(batch.pipeline)
+
+    def test_prepare_worker_runs_in_process_pool(self):
+        """An extractor's prepare_worker is run in worker processes."""
+        gz_files = ["/fake/alpha.1.gz", "/fake/skipme.1.gz", "/fake/bravo.1.gz"]
+        ext = _make_extractor({})
+        ext.prepare_worker = _prepare_in_worker
+        ext.batch_provider = self._make_bp()
+
+        batch, files = run_batch_collected(
+            ext, gz_files, batch_size=1, jobs=2, manifest=_NullBatchManifestWriter()
+        )
+
+        ext.prepare.assert_not_called()
+        self.assertEqual(batch.n_succeeded, 2)
+        self.assertEqual(batch.n_skipped, 1)
+        skipped = next(f for f in files if f.gz_path == gz_files[1])
+        self.assertEqual(skipped.outcome, ExtractionOutcome.SKIPPED)
+        pids = {c.args[1].synopsis for c in ext.finalize.call_args_list}
+        self.assertNotIn(str(os.getpid()), pids)
+
+    def test_mandoc_batches_prefetched_in_chunks(self):
+        """With MANDOC_BATCH_SIZE set, files are handed out in mandoc batches."""
+        gz_files = [f"/fake/f{i}.1.gz" for i in range(5)]
+        prepared = {gz: _make_prepared(f"f{i}") for i, gz in enumerate(gz_files)}
+        ext = _make_extractor(prepared)
+        ext.batch_provider = self._make_bp()
+
+        with (
+            patch("explainshell.config.MANDOC_BATCH_SIZE", 2),
+            patch("explainshell.extraction.runner.mandoc.prefetch") as prefetch,
+        ):
+            batch, files = run_batch_collected(
+                ext, gz_files, batch_size=1, jobs=2, manifest=_NullBatchManifestWriter()
+            )
+
+        self.assertEqual(
+            sorted(c.args[0] for c in prefetch.call_args_list),
+            [gz_files[0:2], gz_files[2:4], gz_files[4:]],
+        )
+        self.assertEqual(batch.n_succeeded, 5)
+        self.assertEqual(sorted(f.gz_path for f in files), gz_files)
+
+
+class TestRunBatchResponseCache(unittest.TestCase):
+    """Batch requests already in the response cache are not submitted."""
+
+    def setUp(self) -> None:
+        self.cache = ResponseCache(tempfile.mkdtemp(), "openai/test-model")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache.root, ignore_errors=True)
+
+    def test_only_misses_submitted(self):
+        gz_a = "/fake/alpha.1.gz"
+        gz_b = "/fake/bravo.1.gz"
+        prepared_a = _make_prepared("alpha")
+        prepared_b = _make_prepared("bravo")
+        self.cache.put(prepared_a.requests[0], '{"options":[]}')
+
+        ext = _make_extractor({gz_a: prepared_a, gz_b: prepared_b})
+        ext.response_cache = self.cache
+        ext.batch_provider = _make_batch_provider(
+            responses={"1:0": '{"options":[],"dashless_opts":false}'}
+        )
+
+        batch, _files = run_batch_collected(
+            ext, [gz_a, gz_b], manifest=_NullBatchManifestWriter()
+        )
+
+        self.assertEqual(batch.n_succeeded, 2)
+        (submitted,) = ext.batch_provider.submit_batch.call_args.args
+        self.assertEqual([e.key for e in submitted], ["1:0"])
+        responses = {c.args[0]: c.args[2] for c in ext.finalize.call_args_list}
+        self.assertEqual(responses[gz_a], ['{"options":[]}'])
+
+    def test_fully_cached_batch_skips_provider(self):
+        gz = "/fake/alpha.1.gz"
+        prepared = _make_prepared("alpha")
+        self.cache.put(prepared.requests[0], '{"options":[]}')
+
+        ext = _make_extractor({gz: prepared})
+        ext.response_cache = self.cache
+        ext.batch_provider = _make_batch_provider()
+
+        batch, _files = run_batch_collected(
+            ext, [gz], manifest=_NullBatchManifestWriter()
+        )
+
+        self.assertEqual(batch.n_succeeded, 1)
+        ext.batch_provider.submit_batch.assert_not_called()
+        self.assertEqual(batch.stats.input_tokens, 0)
+
+    def test_finalize_failure_discards_cached_responses(self):
+        gz = "/fake/alpha.1.gz"
+        prepared = _make_prepared("alpha")
+        self.cache.put(prepared.requests[0], '{"options":[]}')
+
+        ext = _make_extractor({gz: prepared}, finalize_error=ExtractionError("stale"))
+        ext.response_cache = self.cache
+        ext.batch_provider = _make_batch_provider()
+
+        batch, _files = run_batch_collected(
+            ext, [gz], manifest=_NullBatchManifestWriter()
+        )
+
+        self.assertEqual(batch.n_failed, 1)
+        self.assertIsNone(self.cache.get(prepared.requests[0]))
+
+
+class TestRunBatchResume(unittest.TestCase):
+    """run_batch(resume=...) re-attaches to batches of an interrupted run."""
+
+    _OK = '{"options":[],"dashless_opts":false}'
+
+    def setUp(self) -> None:
+        self.paths = [f"/fake/{n}.1.gz" for n in ("alpha", "bravo", "charlie")]
+        self.prepared = {p: _make_prepared(p.split("/")[2][:-5]) for p in self.paths}
+        self.manifest = MagicMock()
+
+    def _run(self, ext, gz_files, resume, jobs=1):
+        return run_batch_collected(
+            ext,
+            gz_files,
+            batch_size=10,
+            jobs=jobs,
+            manifest=self.manifest,
+            resume=resume,
+        )
+
+    def test_reattaches_and_submits_only_new_files(self):
+        alpha, bravo, charlie = self.paths
+        ext = _make_extractor(self.prepared)
+        bp = _make_batch_provider(responses={"0:0": self._OK, "1:0": self._OK})
+        bp.submit_batch.return_value = "new-job"
+        ext.batch_provider = bp
+
+        batch, _files = self._run(
+            ext, [charlie], [ResumedBatch(3, "old-job", [alpha, bravo])]
+        )
+
+        self.assertEqual(batch.n_succeeded, 3)
+        polled = [c.args[1] for c in bp.start_poll.call_args_list]
+        self.assertEqual(polled, ["old-job", "new-job"])
+        submitted = [e.user_content for e in bp.submit_batch.call_args.args[0]]
+        self.assertEqual(submitted, ["content-charlie-0"])
+        # The re-attached batch keeps its index; new batches follow it.
+        recorded = [
+            (c.kwargs["batch_idx"], c.kwargs["status"])
+            for c in self.manifest.record_batch.call_args_list
+        ]
+        self.assertEqual(
+            recorded, [(3, "completed"), (4, "submitted"), (4, "completed")]
+        )
+        self.manifest.set_total_batches.assert_called_once_with(4)
+
+    def test_new_batches_follow_finished_ones(self):
+        """A finished batch can have a higher index than the re-attached one
+        (with jobs > 1); new batches must not reuse and overwrite it."""
+        alpha, bravo, charlie = self.paths
+        with tempfile.TemporaryDirectory() as run_dir:
+            previous = BatchManifest(
+                version=1,
+                model="m",
+                batch_size=10,
+                total_batches=None,
+                batches=[
+                    BatchManifestEntry(
+                        batch_idx=1,
+                        batch_id="old-job",
+                        status="submitted",
+                        error=None,
+                        files=[alpha],
+                    ),
+                    BatchManifestEntry(
+                        batch_idx=2,
+                        batch_id="done-job",
+                        status="completed",
+                        error=None,
+                        files=[bravo],
+                    ),
+                ],
+            )
+            path = os.path.join(run_dir, "batch-manifest.json")
+            self.manifest = FileBatchManifestWriter(
+                path, model="m", batch_size=10, previous=previous
+            )
+            ext = _make_extractor(self.prepared)
+            bp = _make_batch_provider(responses={"0:0": self._OK})
+            bp.submit_batch.return_value = "new-job"
+            ext.batch_provider = bp
+
+            batch, _files = run_batch_collected(
+                ext,
+                [charlie],
+                batch_size=10,
+                manifest=self.manifest,
+                resume=[ResumedBatch(1, "old-job", [alpha])],
+                last_batch_idx=2,
+            )
+
+            self.assertEqual(batch.n_succeeded, 2)
+            entries = {
+                b.batch_idx: (b.batch_id, b.status, b.files)
+                for b in load_batch_manifest(run_dir).batches
+            }
+        self.assertEqual(
+            entries,
+            {
+                1: ("old-job", "completed", [alpha]),
+                2: ("done-job", "completed", [bravo]),
+                3: ("new-job", "completed", [charlie]),
+            },
+        )
+
+    def test_cancelled_batch_resubmits_unanswered_files(self):
+        alpha, bravo, charlie = self.paths
+        ext = _make_extractor(self.prepared)
+        bp = _make_batch_provider()
+        bp.start_poll.return_value.poll.side_effect = [
+            ExtractionError("Batch job cancelled: old-job"),
+            MagicMock(),
+        ]
+        # Only alpha's request finished before the batch was cancelled.
+        bp.collect_results.side_effect = [
+            BatchResults({"0:0": self._OK}, TokenUsage(10, 5)),
+            BatchResults({"0:0": self._OK, "1:0": self._OK}, TokenUsage(20, 10)),
+        ]
+        ext.batch_provider = bp
+
+        batch, files = self._run(
+            ext, [charlie], [ResumedBatch(1, "old-job", [alpha, bravo])], jobs=2
+        )
+
+        self.assertEqual(batch.n_succeeded, 3)
+        self.assertEqual(batch.n_failed, 0)
+        bp.retrieve_batch.assert_called_once_with("old-job")
+        submitted = [e.user_content for e in bp.submit_batch.call_args.args[0]]
+        self.assertEqual(submitted, ["content-charlie-0", "content-bravo-0"])
+        self.assertEqual(sorted(f.gz_path for f in files), sorted(self.paths))
+
+    def test_keys_survive_a_file_that_no_longer_prepares(self):
+        alpha, bravo, _charlie = self.paths
+        ext = _make_extractor(self.prepared)
+        prepare = ext.prepare.side_effect
+
+        def _prepare(gz_path):
+            if gz_path == alpha:
+                raise SkippedExtraction("no options", ExtractionStats())
+            return prepare(gz_path)
+
+        ext.prepare.side_effect = _prepare
+        # bravo was the second file of the original batch.
+        bp = _make_batch_provider(responses={"1:0": self._OK})
+        ext.batch_provider = bp
+
+        batch, _files = self._run(ext, [], [ResumedBatch(1, "old-job", [alpha, bravo])])
+
+        self.assertEqual((batch.n_succeeded, batch.n_skipped), (1, 1))
+        bp.submit_batch.assert_not_called()
+        ext.finalize.assert_called_once()
+        self.assertEqual(ext.finalize.call_args.args[0], bravo)
+
+    def _interrupted_run(self, on_result):
+        """Run alpha and bravo as one-file batches on two workers, with
+        Ctrl-C arriving while preparing charlie, after alpha's batch was
+        finalized on a worker but before the main thread handled it."""
+        alpha, bravo, _charlie = self.paths
+        ext = _make_extractor(self.prepared)
+        finalized = threading.Event()
+        finalize = ext.finalize.side_effect
+
+        def _finalize(gz_path, prepared, responses):
+            try:
+                return finalize(gz_path, prepared, responses)
+            finally:
+                if gz_path == alpha:
+                    finalized.set()
+
+        ext.finalize.side_effect = _finalize
+        bp = _make_batch_provider(responses={"0:0": self._OK})
+        bravo_poll = MagicMock()
+        # bravo's batch is still with the provider when the interrupt hits.
+        bravo_poll.poll.side_effect = lambda *a: time.sleep(0.05)
+        bp.start_poll.side_effect = [bp.start_poll.return_value, bravo_poll]
+        ext.batch_provider = bp
+
+        def _iter_prepared(extractor, gz_files, jobs, on_start):
+            yield WorkItem(alpha, self.prepared[alpha])
+            yield WorkItem(bravo, self.prepared[bravo])
+            self.assertTrue(finalized.wait(timeout=5))
+            time.sleep(0.05)  # let the worker publish alpha's batch output
+            raise KeyboardInterrupt
+
+        with patch("explainshell.extraction.runner._iter_prepared", _iter_prepared):
+            return run_batch(
+                ext,
+                self.paths,
+                batch_size=1,
+                jobs=2,
+                manifest=self.manifest,
+                on_result=on_result,
+            )
+
+    def _recorded(self):
+        return [
+            (c.kwargs["batch_idx"], c.kwargs["status"], c.kwargs["files"])
+            for c in self.manifest.record_batch.call_args_list
+        ]
+
+    def test_interrupt_hands_over_finished_batches(self):
+        """A batch finalized before Ctrl-C reaches on_result before it is
+        recorded completed, so --resume never skips unsaved files."""
+        alpha, bravo, _charlie = self.paths
+        events = []
+        self.manifest.record_batch.side_effect = lambda **kw: events.append(
+            ("record", kw["status"], tuple(kw["files"]))
+        )
+
+        batch = self._interrupted_run(lambda p, _e: events.append(("result", p)))
+
+        self.assertTrue(batch.interrupted)
+        self.assertLess(
+            events.index(("result", alpha)),
+            events.index(("record", "completed", (alpha,))),
+        )
+        self.assertNotIn(("record", "completed", (bravo,)), events)
+
+    def test_batch_not_completed_until_results_handled(self):
+        """Ctrl-C while on_result is storing a batch leaves it re-attachable."""
+        alpha, _bravo, _charlie = self.paths
+
+        def _on_result(gz_path, entry):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self._interrupted_run(_on_result)
+
+        self.assertIn((1, "submitted", [alpha]), self._recorded())
+        self.assertNotIn((1, "completed", [alpha]), self._recorded())
+
+    def test_resume_requires_batch_mode(self):
+        with self.assertRaises(ValueError):
+            run(MagicMock(), [], resume=[ResumedBatch(1, "job", [])])
+
+
 class TestGroupWorkItems(unittest.TestCase):
     """Tests for group_work_items: groups work items into batches
     respecting batch_size as a request count limit."""
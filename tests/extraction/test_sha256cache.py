@@ -0,0 +1,81 @@
+"""Tests for explainshell.extraction.sha256cache."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from explainshell.extraction import common
+from explainshell.extraction.sha256cache import Sha256Cache
+
+
+class TestSha256Cache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.db = os.path.join(self.tmpdir, "cache", "sha256.sqlite3")
+        self.gz = os.path.join(self.tmpdir, "foo.1.gz")
+        self._write(b"original")
+
+    def _write(self, data: bytes, mtime_ns: int | None = None) -> None:
+        with open(self.gz, "wb") as f:
+            f.write(data)
+        if mtime_ns is not None:
+            os.utime(self.gz, ns=(mtime_ns, mtime_ns))
+
+    def _open(self) -> Sha256Cache:
+        cache = Sha256Cache(self.db)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_persists_across_runs(self):
+        first = self._open()
+        self.assertEqual(first.sha256(self.gz), hashlib.sha256(b"original").hexdigest())
+        first.close()
+
+        second = self._open()
+        with patch(
+            "explainshell.extraction.sha256cache.file_sha256",
+            side_effect=AssertionError("file was re-read"),
+        ):
+            digest = second.sha256(self.gz)
+        self.assertEqual(digest, hashlib.sha256(b"original").hexdigest())
+        self.assertEqual((second.stats.hits, second.stats.misses), (1, 0))
+
+    def test_changed_file_is_rehashed(self):
+        cache = self._open()
+        cache.sha256(self.gz)
+        # Same size, different mtime.
+        self._write(b"modified", mtime_ns=1_000_000_000)
+        self.assertEqual(cache.sha256(self.gz), hashlib.sha256(b"modified").hexdigest())
+        self.assertEqual(cache.stats.misses, 2)
+
+    def test_hashes_each_file_once_per_run(self):
+        cache = self._open()
+        with patch(
+            "explainshell.extraction.sha256cache.file_sha256", return_value="d"
+        ) as h:
+            for _ in range(3):
+                self.assertEqual(cache.sha256(self.gz), "d")
+        h.assert_called_once()
+
+    def test_unusable_cache_falls_back_to_hashing(self):
+        # The cache path is a directory, so SQLite cannot open it.
+        os.makedirs(self.db)
+        with self.assertLogs("explainshell.extraction.sha256cache", "WARNING"):
+            cache = self._open()
+        self.assertEqual(cache.sha256(self.gz), hashlib.sha256(b"original").hexdigest())
+
+    def test_gz_sha256_uses_installed_cache(self):
+        cache = self._open()
+        common.set_sha256_cache(cache)
+        self.addCleanup(common.set_sha256_cache, None)
+        common.gz_sha256(self.gz)
+        common.gz_sha256(self.gz)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -209,3 +209,28 @@ class TestFindManpageCache:
         store = cached_store_factory([mp])
 
         assert ("ubuntu", "26.04") in list(store.distros())
+
+    def test_nearest_names(self, cached_store_factory: _CachedStoreFactory) -> None:
+        store = cached_store_factory(
+            [_make_manpage("grep", "1"), _make_manpage("tar", "1")]
+        )
+
+        assert store.nearest_names("grpe") == ["grep"]
+        assert store.nearest_names("tarr", max_distance=1) == ["tar"]
+        assert store.nearest_names("zzzzzz") == []
+
+    def test_name_index_rejects_unknown_names_without_caching(
+        self, cached_store_factory: _CachedStoreFactory
+    ) -> None:
+        store = cached_store_factory([_make_manpage("grep", "1")])
+        store.nearest_names("grep")
+
+        with pytest.raises(errors.ProgramDoesNotExist, match="nosuch"):
+            store.find_man_page("nosuch")
+        with pytest.raises(errors.ProgramDoesNotExist, match="nosuch"):
+            store.find_man_page("nosuch.1")
+        assert store.find_man_page("grep.1")[0].name == "grep"
+
+        info = store.manpage_cache_info()
+        assert info.rejected == 2
+        assert info.entries == 1
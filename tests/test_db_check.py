@@ -4,6 +4,7 @@ import json
 import pytest
 
 from explainshell.db_check import check as db_check
+from explainshell.db_check import run_checks
 from explainshell.models import ParsedManpage, RawManpage
 from explainshell.store import Store
 
@@ -128,6 +129,28 @@ class TestCheck:
         warnings = [msg for sev, msg in issues if sev == "warning"]
         assert any("positional on flagged option" in msg for msg in warnings)
 
+    def test_positional_message_shows_json_values(self, store, db_path):
+        """A boolean positional is reported as True, as stored, not as 1."""
+        opts = json.dumps(
+            [
+                {"text": "t", "short": ["-t"], "long": [], "positional": True},
+                {"text": "f", "short": ["-f"], "long": [], "positional": False},
+            ]
+        )
+        store._conn.execute("PRAGMA foreign_keys = OFF")
+        store._conn.execute(
+            "INSERT INTO parsed_manpages(source, name, options, aliases) "
+            "VALUES (?, ?, ?, '[]')",
+            ("ubuntu/26.04/1/find.1.gz", "find", opts),
+        )
+        store._conn.commit()
+        store._conn.execute("PRAGMA foreign_keys = ON")
+        issues = db_check(db_path)
+        warnings = [msg for sev, msg in issues if "positional on flagged" in msg]
+        assert warnings == [
+            "positional on flagged option: 'find' has positional=True on option ['-t']"
+        ]
+
     def test_positional_on_positional_ok(self, store, db_path):
         """Positional operands (no flags) with positional set should not warn."""
         opts = json.dumps(
@@ -209,3 +232,98 @@ class TestCheck:
         store._conn.execute("PRAGMA foreign_keys = ON")
         issues = db_check(db_path)
         assert not any("stale subcommand mapping" in msg for _, msg in issues)
+
+    def test_corrupt_options_json(self, store, db_path):
+        store._conn.execute("PRAGMA foreign_keys = OFF")
+        store._conn.execute(
+            "INSERT INTO parsed_manpages(source, name, options, aliases) "
+            "VALUES (?, ?, ?, '[]')",
+            ("ubuntu/26.04/1/cat.1.gz", "cat", "[{not json"),
+        )
+        store._conn.commit()
+        issues = db_check(db_path)
+        assert any(
+            sev == "error" and msg.startswith("corrupt options JSON: 'cat'")
+            for sev, msg in issues
+        )
+
+
+def _insert_raw_rows(store, manpages=(), mappings=()):
+    store._conn.execute("PRAGMA foreign_keys = OFF")
+    store._conn.executemany(
+        "INSERT INTO parsed_manpages(source, name, options, aliases) "
+        "VALUES (?, ?, ?, '[]')",
+        manpages,
+    )
+    store._conn.executemany(
+        "INSERT INTO mappings(src, dst, score) VALUES (?, ?, 1)", mappings
+    )
+    store._conn.commit()
+    store._conn.execute("PRAGMA foreign_keys = ON")
+
+
+class TestShardedCheck:
+    def test_shards_find_the_same_issues(self, store, db_path):
+        flagged = json.dumps([{"short": ["-x"], "long": [], "positional": "X"}])
+        git = ParsedManpage(
+            source="arch/latest/1/git.1.gz",
+            name="git",
+            synopsis="git - version control",
+            aliases=[("git", 10)],
+            subcommands=["commit"],
+        )
+        store.add_manpage(git, _make_raw())
+        for distro, release in (("ubuntu", "26.04"), ("arch", "latest")):
+            store.add_manpage(
+                _make_manpage("ps", "1", distro=distro, release=release), _make_raw()
+            )
+            store.add_manpage(
+                _make_manpage("git-push", "1", distro=distro, release=release),
+                _make_raw(),
+            )
+        _insert_raw_rows(
+            store,
+            manpages=[
+                ("tar.1.gz", "tar", "[]"),
+                ("ubuntu/26.04/1/procps-ps.1.gz", "ps", "[]"),
+                ("ubuntu/26.040/1/ps.1.gz", "ps", flagged),
+                ("debian/13/1/cat.1.gz", "cat", "{"),
+            ],
+            mappings=[
+                ("ghost", "fedora/40/1/ghost.1.gz"),
+                ("ghost", "ghost.1.gz"),
+                # git exists in arch only, and doesn't declare push.
+                ("git push", "ubuntu/26.04/1/git-push.1.gz"),
+                ("git push", "arch/latest/1/git-push.1.gz"),
+            ],
+        )
+
+        expected = sorted(db_check(db_path))
+        kinds = {msg.split(":")[0] for _, msg in expected}
+        assert kinds == {
+            "malformed source path",
+            "shadowed duplicate",
+            "orphaned mapping",
+            "positional on flagged option",
+            "corrupt options JSON",
+            "stale subcommand mapping",
+            "unreachable manpage",
+        }
+        result = run_checks(db_path, jobs=3)
+        assert sorted(result.issues) == expected
+        # ubuntu/26.04, ubuntu/26.040, arch/latest, debian/13, fedora/40, the
+        # bare ghost.1.gz mapping's own partition, and sources without one.
+        assert result.shards == 7
+
+    def test_timings_per_check(self, store, db_path):
+        store.add_manpage(_make_manpage("tar", "1"), _make_raw())
+        result = run_checks(db_path)
+        assert list(result.timings) == [
+            "source paths",
+            "shadowed duplicates",
+            "orphaned mappings",
+            "positional options",
+            "subcommand mappings",
+            "unreachable manpages",
+        ]
+        assert all(t >= 0 for t in result.timings.values())
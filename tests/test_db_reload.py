@@ -0,0 +1,209 @@
+import datetime
+import hashlib
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from explainshell.models import ParsedManpage, RawManpage
+from explainshell.store import Store
+from explainshell.web import create_app, get_store
+from explainshell.web.db_reload import (
+    RELOADER_EXTENSION_KEY,
+    SNAPSHOT_EXTENSION_KEY,
+    pin_db_file,
+    read_sidecar,
+    sweep_pins,
+)
+
+
+def _make_raw() -> RawManpage:
+    return RawManpage(
+        source_text="test manpage content",
+        generated_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+        generator="test",
+    )
+
+
+def _write_db(path: Path, name: str | None, release: str = "26.04") -> str:
+    """Build a one-manpage DB at *path*, write its sidecar, return the digest."""
+    s = Store.create(str(path))
+    if name is not None:
+        s.add_manpage(
+            ParsedManpage(
+                source=f"ubuntu/{release}/1/{name}.1.gz",
+                name=name,
+                synopsis=f"{name} synopsis",
+                aliases=[(name, 10)],
+            ),
+            _make_raw(),
+        )
+    s.close()
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    Path(str(path) + ".sha256").write_text(f"{digest}  {path.name}\n")
+    return digest
+
+
+def _replace_db(db_path: Path, name: str | None, release: str = "26.04") -> str:
+    """Move a freshly built DB over *db_path*, then its sidecar, like a deploy."""
+    staging = db_path.parent / "staging.db"
+    digest = _write_db(staging, name, release)
+    os.replace(staging, db_path)
+    os.replace(str(staging) + ".sha256", str(db_path) + ".sha256")
+    return digest
+
+
+@pytest.fixture
+def app_factory(tmp_path: Path):
+    db_path = tmp_path / "explainshell.db"
+    first_sha = _write_db(db_path, "tar")
+    apps = []
+
+    def make():
+        with (
+            patch("explainshell.config.DEBUG", False),
+            patch("explainshell.config.DB_RELOAD_INTERVAL", 0.001),
+        ):
+            app = create_app(str(db_path))
+        apps.append(app)
+        return app
+
+    yield make, db_path, first_sha
+
+    for app in apps:
+        app.extensions[SNAPSHOT_EXTENSION_KEY].store.close()
+
+
+def test_read_sidecar_accepts_sha256sum_format(tmp_path: Path) -> None:
+    db_path = tmp_path / "x.db"
+    Path(str(db_path) + ".sha256").write_text("abc123  x.db\n")
+    assert read_sidecar(str(db_path)) == "abc123"
+    assert read_sidecar(str(tmp_path / "missing.db")) is None
+
+
+def test_initial_snapshot_is_pinned(app_factory) -> None:
+    make, db_path, first_sha = app_factory
+    app = make()
+    snapshot = app.extensions[SNAPSHOT_EXTENSION_KEY]
+
+    assert snapshot.db_sha256 == first_sha
+    assert snapshot.db_path == f"{db_path}.{first_sha[:16]}"
+    assert os.path.samefile(snapshot.db_path, db_path)
+    assert snapshot.distros == [("ubuntu", "26.04")]
+
+
+def test_no_reload_when_sidecar_unchanged(app_factory) -> None:
+    make, _db_path, _sha = app_factory
+    app = make()
+    assert app.extensions[RELOADER_EXTENSION_KEY].maybe_reload() is None
+
+
+def test_reload_swaps_snapshot(app_factory) -> None:
+    make, db_path, _first_sha = app_factory
+    app = make()
+    client = app.test_client()
+    assert b"tar" in client.get("/explain/tar").data
+    old_etag = client.get("/explain/tar").headers["ETag"]
+
+    new_sha = _replace_db(db_path, "grep", release="26.10")
+    app.extensions[RELOADER_EXTENSION_KEY].maybe_reload().join()
+
+    snapshot = app.extensions[SNAPSHOT_EXTENSION_KEY]
+    assert snapshot.db_sha256 == new_sha
+    assert snapshot.distros == [("ubuntu", "26.10")]
+    rv = client.get("/explain/grep")
+    assert b"grep synopsis" in rv.data
+    assert rv.headers["ETag"] != old_etag
+    assert new_sha[:16] in rv.headers["ETag"]
+    assert b"missing man page" in client.get("/explain/tar").data
+
+    health = client.get("/health").get_json()
+    assert health["db_sha256"] == new_sha
+    assert health["distros"] == [{"distro": "ubuntu", "release": "26.10"}]
+    assert health["db_reload"]["reloads"] == 1
+    assert health["db_reload"]["build_seconds"] >= 0
+    # The previously hot key was replayed into the new cache.
+    assert health["manpage_cache"]["entries"] >= 1
+
+
+def test_in_flight_request_keeps_old_snapshot(app_factory) -> None:
+    make, db_path, _first_sha = app_factory
+    app = make()
+
+    with app.test_request_context("/"):
+        pinned = get_store()
+        _replace_db(db_path, "grep")
+        app.extensions[RELOADER_EXTENSION_KEY].maybe_reload().join()
+
+        assert get_store() is pinned
+        assert pinned.find_man_page("tar")[0].name == "tar"
+
+    with app.test_request_context("/"):
+        assert get_store() is not pinned
+        assert get_store().find_man_page("grep")[0].name == "grep"
+
+
+def test_empty_db_keeps_old_snapshot(app_factory) -> None:
+    make, db_path, first_sha = app_factory
+    app = make()
+
+    _replace_db(db_path, None)
+    reloader = app.extensions[RELOADER_EXTENSION_KEY]
+    reloader.maybe_reload().join()
+
+    assert app.extensions[SNAPSHOT_EXTENSION_KEY].db_sha256 == first_sha
+    assert "has no manpages" in reloader.info()["last_error"]
+
+
+def test_old_pins_removed_and_stores_closed(app_factory) -> None:
+    make, db_path, _first_sha = app_factory
+    app = make()
+    reloader = app.extensions[RELOADER_EXTENSION_KEY]
+    first = app.extensions[SNAPSHOT_EXTENSION_KEY]
+
+    _replace_db(db_path, "grep")
+    reloader.maybe_reload().join()
+    second = app.extensions[SNAPSHOT_EXTENSION_KEY]
+    # The previous snapshot may still be serving requests.
+    assert os.path.exists(first.db_path)
+    assert first.store.find_man_page("tar")[0].name == "tar"
+
+    _replace_db(db_path, "ls")
+    reloader.maybe_reload().join()
+
+    assert not os.path.exists(first.db_path)
+    assert not os.path.exists(first.db_path + ".lock")
+    with pytest.raises(RuntimeError, match="closed"):
+        list(first.store.distros())
+    assert os.path.exists(second.db_path)
+    assert second.store.find_man_page("grep")[0].name == "grep"
+
+
+def test_pin_held_by_another_process_is_kept(app_factory) -> None:
+    make, db_path, first_sha = app_factory
+    app = make()
+    reloader = app.extensions[RELOADER_EXTENSION_KEY]
+    first = app.extensions[SNAPSHOT_EXTENSION_KEY]
+    # Another worker (or the preloading master) still holds the boot pin;
+    # a separate open file description stands in for it.
+    _path, other_fd = pin_db_file(str(db_path), first_sha)
+
+    for name in ("grep", "ls"):
+        _replace_db(db_path, name)
+        reloader.maybe_reload().join()
+    assert os.path.exists(first.db_path)
+
+    os.close(other_fd)
+    assert sweep_pins(str(db_path)) == [first.db_path]
+    assert not os.path.exists(first.db_path)
+
+
+def test_reload_disabled_by_default(tmp_path: Path) -> None:
+    db_path = tmp_path / "explainshell.db"
+    _write_db(db_path, "tar")
+    with patch("explainshell.config.DEBUG", False):
+        app = create_app(str(db_path))
+
+    assert SNAPSHOT_EXTENSION_KEY not in app.extensions
+    assert "db_reload" not in app.test_client().get("/health").get_json()
@@ -0,0 +1,143 @@
+import datetime
+import sqlite3
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from explainshell import export
+from explainshell.models import ExtractionMeta, Option, ParsedManpage, RawManpage
+from explainshell.store import Store
+
+
+def _make_raw():
+    return RawManpage(
+        source_text="test manpage content",
+        generated_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+        generator="test",
+        source_gz_sha256="abc",
+    )
+
+
+def _make_manpage(name, section="1", release="26.04", options=None, model=None):
+    return ParsedManpage(
+        source=f"ubuntu/{release}/{section}/{name}.{section}.gz",
+        name=name,
+        synopsis=f"{name} - do things",
+        aliases=[(name, 10), (name + "2", 1)],
+        options=options or [],
+        extractor="llm",
+        extraction_meta=ExtractionMeta(model=model),
+    )
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        return pq.read_table(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test.db")
+    s = Store.create(path)
+    s.add_manpage(
+        _make_manpage(
+            "tar",
+            options=[
+                Option(text="create", short=["-c"], long=["--create"]),
+                Option(text="file", short=["-f"], has_argument=True),
+                Option(text="FILE", positional="FILE", prefix="@"),
+            ],
+            model="openai/gpt-5-mini",
+        ),
+        _make_raw(),
+    )
+    s.add_manpage(
+        _make_manpage(
+            "xargs",
+            release="24.04",
+            options=[Option(text="cmd", positional="COMMAND", nested_cmd=True)],
+        ),
+        _make_raw(),
+    )
+    s.add_manpage(_make_manpage("echo"), _make_raw())
+    s.close()
+    return path
+
+
+@pytest.mark.parametrize("fmt", export.FORMATS)
+def test_round_trip(db_path, tmp_path, fmt):
+    out_dir = str(tmp_path / "out")
+    counts = export.export(db_path, out_dir, fmt)
+
+    assert counts == {"manpages": 3, "options": 4, "mappings": 6}
+
+    manpages = _read(export.table_path(out_dir, "manpages", fmt), fmt)
+    assert manpages.schema == export.MANPAGES_SCHEMA
+    rows = {r["name"]: r for r in manpages.to_pylist()}
+    assert rows["tar"]["distro"] == "ubuntu"
+    assert rows["tar"]["release"] == "26.04"
+    assert rows["tar"]["section"] == "1"
+    assert rows["tar"]["aliases"] == ["tar", "tar2"]
+    assert rows["tar"]["n_options"] == 3
+    assert rows["tar"]["model"] == "openai/gpt-5-mini"
+    assert rows["tar"]["source_gz_sha256"] == "abc"
+    assert rows["xargs"]["release"] == "24.04"
+    assert rows["echo"]["n_options"] == 0
+    assert rows["echo"]["model"] is None
+
+    options = _read(export.table_path(out_dir, "options", fmt), fmt).to_pylist()
+    tar = [o for o in options if o["source"] == "ubuntu/26.04/1/tar.1.gz"]
+    assert [o["ordinal"] for o in tar] == [0, 1, 2]
+    assert tar[0]["short"] == ["-c"] and tar[0]["long"] == ["--create"]
+    assert tar[1]["has_argument"] == "true"
+    assert tar[2]["positional"] == "FILE" and tar[2]["prefix"] == "@"
+    xargs = [o for o in options if o["source"] == "ubuntu/24.04/1/xargs.1.gz"]
+    assert xargs[0]["nested_cmd"] == "true"
+
+    mappings = _read(export.table_path(out_dir, "mappings", fmt), fmt).to_pylist()
+    assert {(m["src"], m["release"]) for m in mappings} >= {
+        ("tar", "26.04"),
+        ("xargs", "24.04"),
+    }
+
+
+def test_small_batches(db_path, tmp_path):
+    out_dir = str(tmp_path / "out")
+    counts = export.export(db_path, out_dir, batch_rows=1)
+
+    for table, n in counts.items():
+        parquet = pq.ParquetFile(export.table_path(out_dir, table, "parquet"))
+        assert parquet.metadata.num_rows == n
+        assert parquet.metadata.num_row_groups > 1
+
+
+def test_no_tmp_files_left(db_path, tmp_path):
+    out_dir = tmp_path / "out"
+    export.export(db_path, str(out_dir), "arrow")
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        "manpages.arrow",
+        "mappings.arrow",
+        "options.arrow",
+    ]
+
+
+@pytest.mark.parametrize("fmt", export.FORMATS)
+def test_failed_table_removes_tmp_file(db_path, tmp_path, monkeypatch, fmt):
+    def failing_rows(conn, batch_rows):
+        yield from export._manpage_rows(conn, batch_rows)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    table, schema, _ = export._TABLES[0]
+    monkeypatch.setattr(export, "_TABLES", ((table, schema, failing_rows),))
+    out_dir = tmp_path / "out"
+    with pytest.raises(sqlite3.OperationalError):
+        export.export(db_path, str(out_dir), fmt)
+    assert list(out_dir.iterdir()) == []
+
+
+def test_unknown_format(db_path, tmp_path):
+    with pytest.raises(ValueError, match="unknown export format"):
+        export.export(db_path, str(tmp_path), "csv")
@@ -12,7 +12,14 @@ from unittest.mock import MagicMock, patch
 
 from click.testing import CliRunner
 
-from explainshell.extraction import ExtractorConfig
+from explainshell import config
+from explainshell.diff import DiffLog, load_diff_log
+from explainshell.extraction import ExtractorConfig, common
+from explainshell.extraction.manifest import (
+    BatchManifest,
+    BatchManifestEntry,
+    load_batch_manifest,
+)
 from explainshell.extraction.report import (
     DbCounts,
     ExtractConfig,
@@ -20,6 +27,7 @@ from explainshell.extraction.report import (
     ExtractSummary,
     GitInfo,
 )
+from explainshell.extraction.runner import ResumedBatch
 from explainshell.extraction.types import (
     BatchResult,
     ExtractionOutcome,
@@ -27,6 +35,7 @@ from explainshell.extraction.types import (
     ExtractionStats,
 )
 from explainshell.manager import (
+    _plan_resume,
     _run_diff_db,
     _run_diff_extractors,
     _write_report,
@@ -140,6 +149,8 @@ class TestBatchPerBatchDbWrites(unittest.TestCase):
                 on_start=None,
                 on_result=None,
                 manifest=None,
+                resume=(),
+                last_batch_idx=0,
             ):
                 batch = BatchResult()
                 for gz_path in files:
@@ -221,6 +232,8 @@ class TestBatchPerBatchDbWrites(unittest.TestCase):
                 on_start=None,
                 on_result=None,
                 manifest=None,
+                resume=(),
+                last_batch_idx=0,
             ):
                 batch = BatchResult()
                 for i, gz_path in enumerate(files):
@@ -282,6 +295,113 @@ class TestBatchPerBatchDbWrites(unittest.TestCase):
 # ---------------------------------------------------------------------------
 
 
+class TestExtractResume(unittest.TestCase):
+    """extract --resume <run_dir> picks up an interrupted batch run."""
+
+    def setUp(self) -> None:
+        self.run_dir = tempfile.mkdtemp()
+        self.files = [f"/fake/distro/release/1/{n}.1.gz" for n in "abcdef"]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def _manifest(self, model: str = "openai/test-model") -> BatchManifest:
+        a, b, c, d, e, _f = self.files
+
+        def _entry(idx, batch_id, status, files):
+            return BatchManifestEntry(
+                batch_idx=idx, batch_id=batch_id, status=status, error=None, files=files
+            )
+
+        return BatchManifest(
+            version=1,
+            model=model,
+            batch_size=7,
+            total_batches=None,
+            batches=[
+                _entry(1, "job-1", "completed", [a, b]),
+                _entry(2, "job-2", "submitted", [c, d]),
+                _entry(3, None, "failed", [e]),
+                _entry(4, "job-4", "completed", [c]),
+            ],
+        )
+
+    def test_plan_resume(self):
+        a, b, c, d, _e, _f = self.files
+        done, resumed = _plan_resume(self._manifest())
+        self.assertEqual(done, {a, b, c})
+        # Batch 2 is re-attached for d; its file list keeps the request keys.
+        self.assertEqual(resumed, [ResumedBatch(2, "job-2", [c, d])])
+
+    def _invoke(self, db_path: str, mode: str = "llm:openai/test-model"):
+        return CliRunner().invoke(
+            cli,
+            [
+                "--db",
+                db_path,
+                "extract",
+                "--mode",
+                mode,
+                "--resume",
+                self.run_dir,
+                "/fake/file.gz",
+            ],
+        )
+
+    @patch("explainshell.extraction.common.gz_sha256", side_effect=lambda p: p)
+    @patch("explainshell.manager.run")
+    @patch("explainshell.manager.make_extractor")
+    @patch("explainshell.util.collect_gz_files")
+    def test_resume_submits_only_unsubmitted_files(
+        self, mock_collect, mock_make_ext, mock_run, _mock_sha
+    ):
+        with open(os.path.join(self.run_dir, "batch-manifest.json"), "w") as f:
+            f.write(self._manifest().model_dump_json())
+        mock_collect.return_value = self.files
+        mock_make_ext.return_value = MagicMock()
+        mock_run.return_value = BatchResult()
+
+        with (
+            _temp_db() as db_path,
+            patch("explainshell.manager._attach_run_log") as mock_attach,
+        ):
+            mock_attach.side_effect = lambda _level, run_dir=None: run_dir
+            result = self._invoke(db_path)
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        # The resumed run logs and reports into the original run directory.
+        mock_attach.assert_called_once_with("INFO", self.run_dir)
+        (_, work_files), kwargs = mock_run.call_args
+        self.assertEqual(work_files, [self.files[4], self.files[5]])
+        self.assertEqual(kwargs["batch_size"], 7)
+        self.assertEqual([b.batch_id for b in kwargs["resume"]], ["job-2"])
+        # Completed batch 4 outranks re-attached batch 2; new batches follow it.
+        self.assertEqual(kwargs["last_batch_idx"], 4)
+        with open(os.path.join(self.run_dir, "report.json")) as f:
+            report = json.load(f)
+        self.assertEqual(report["config"]["resume"], self.run_dir)
+        self.assertEqual(len(report["batch_manifest"]["batches"]), 4)
+
+    def test_resume_reads_manifest_embedded_in_report(self):
+        with open(os.path.join(self.run_dir, "report.json"), "w") as f:
+            json.dump({"batch_manifest": self._manifest().model_dump()}, f)
+        self.assertEqual(load_batch_manifest(self.run_dir), self._manifest())
+
+    def test_resume_rejects_other_model(self):
+        with open(os.path.join(self.run_dir, "batch-manifest.json"), "w") as f:
+            f.write(self._manifest(model="openai/other").model_dump_json())
+        with _temp_db() as db_path:
+            result = self._invoke(db_path)
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("openai/other", result.output)
+
+    def test_resume_without_manifest(self):
+        with _temp_db() as db_path:
+            result = self._invoke(db_path)
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("no batch manifest", result.output)
+
+
 class TestLlmManagerDryRun(unittest.TestCase):
     """Tests for --dry-run: classifier runs, no extraction, no DB writes."""
 
@@ -372,6 +492,37 @@ class TestLlmManagerDryRun(unittest.TestCase):
         self.assertIn("ALREADY", msgs)
         self.assertIn("fake/release/1/echo.1.gz", msgs)
 
+    @patch("explainshell.util.collect_gz_files")
+    @patch(
+        "explainshell.manager.config.source_from_path",
+        return_value="fake/release/1/echo.1.gz",
+    )
+    def test_dry_run_reuses_sha256_cache(self, _mock_source, mock_collect):
+        with tempfile.TemporaryDirectory() as tmp, _temp_db() as db_path:
+            gz_path = os.path.join(tmp, "echo.1.gz")
+            with open(gz_path, "wb") as f:
+                f.write(b"echo")
+            mock_collect.return_value = [gz_path]
+            Store.create(db_path).close()
+            args = ["--db", db_path, "extract", "--mode", "llm:test-model"]
+            with (
+                patch(
+                    "explainshell.manager.config.SHA256_CACHE_PATH",
+                    os.path.join(tmp, "sha256.sqlite3"),
+                ),
+                patch(
+                    "explainshell.extraction.sha256cache.file_sha256",
+                    return_value="h",
+                ) as mock_hash,
+            ):
+                for _ in range(2):
+                    result = CliRunner().invoke(cli, [*args, "--dry-run", gz_path])
+                    self.assertEqual(result.exit_code, 0, result.output)
+
+        # Hashed on the first run only; the cache is uninstalled afterwards.
+        mock_hash.assert_called_once()
+        self.assertIsNone(common._sha256_cache)
+
     def test_dry_run_requires_existing_db(self):
         runner = CliRunner()
         with tempfile.TemporaryDirectory() as tmp:
@@ -483,6 +634,8 @@ class TestLlmManagerDryRun(unittest.TestCase):
                 on_start=None,
                 on_result=None,
                 manifest=None,
+                resume=(),
+                last_batch_idx=0,
             ):
                 batch = BatchResult()
                 for gz_path in files:
@@ -556,6 +709,8 @@ class TestSymlinkMapping(unittest.TestCase):
                 on_start=None,
                 on_result=None,
                 manifest=None,
+                resume=(),
+                last_batch_idx=0,
             ):
                 batch = BatchResult()
                 for gz_path in files:
@@ -615,6 +770,37 @@ class TestSymlinkMapping(unittest.TestCase):
                 10,
             )
 
+    @patch("explainshell.extraction.common.gz_sha256", side_effect=lambda p: p)
+    @patch("explainshell.manager.run")
+    @patch("explainshell.manager.make_extractor")
+    @patch("explainshell.util.collect_gz_files")
+    def test_llm_cache_flag(self, mock_collect, mock_make_ext, mock_run, _mock_sha):
+        """The response cache is on by default and off with --no-llm-cache."""
+        mock_collect.return_value = ["/fake/distro/release/1/alpha.1.gz"]
+        mock_make_ext.return_value = MagicMock()
+        mock_run.return_value = BatchResult()
+
+        for flags, expected in (
+            ([], config.LLM_CACHE_DIR),
+            (["--no-llm-cache"], None),
+        ):
+            with _temp_db() as db_path:
+                result = CliRunner().invoke(
+                    cli,
+                    [
+                        "--db",
+                        db_path,
+                        "extract",
+                        "--mode",
+                        "llm:openai/test-model",
+                        *flags,
+                        "/fake/file.gz",
+                    ],
+                )
+                self.assertEqual(result.exit_code, 0, result.output)
+                cfg = mock_make_ext.call_args.args[1]
+                self.assertEqual(cfg.llm_cache_dir, expected)
+
     @patch("explainshell.manager.run")
     @patch("explainshell.manager.make_extractor")
     @patch("explainshell.util.collect_gz_files")
@@ -2161,6 +2347,198 @@ class TestDiffDbSourceMatch(unittest.TestCase):
             real_store.close()
 
 
+# ---------------------------------------------------------------------------
+# TestDiffResume
+# ---------------------------------------------------------------------------
+
+
+def _success(gz_path: str, mp: ParsedManpage) -> ExtractionResult:
+    return ExtractionResult(
+        gz_path=gz_path,
+        outcome=ExtractionOutcome.SUCCESS,
+        mp=mp,
+        raw=_make_raw(),
+        stats=ExtractionStats(input_tokens=10, output_tokens=5),
+    )
+
+
+class TestDiffResume(unittest.TestCase):
+    """diffs.jsonl streaming and --resume for the diff commands."""
+
+    def setUp(self):
+        self.run_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.run_dir)
+
+    def _records(self, filename: str = "diffs.jsonl") -> list[dict]:
+        with open(os.path.join(self.run_dir, filename)) as f:
+            return [json.loads(line) for line in f]
+
+    def test_diff_db_writes_records_and_resume_skips_compared(self):
+        paths = [f"/m/ubuntu/26.04/1/{n}.1.gz" for n in ("find", "grep", "tar")]
+        stored = _make_manpage("find")
+        fresh = _make_manpage("find")
+        fresh.synopsis = "new synopsis"
+        results = {
+            paths[0]: _success(paths[0], fresh),
+            paths[1]: _success(paths[1], _make_manpage("grep")),
+            paths[2]: ExtractionResult(
+                gz_path=paths[2], outcome=ExtractionOutcome.FAILED, error="boom"
+            ),
+        }
+        calls = []
+
+        def _fake_run(ext, files, **kwargs):
+            calls.append((list(files), kwargs["jobs"]))
+            for p in files:
+                kwargs["on_result"](p, results[p])
+            return BatchResult()
+
+        with _temp_db() as db_path:
+            s = Store.create(db_path)
+            s.add_manpage(stored, _make_raw())
+            with (
+                patch("explainshell.manager.make_extractor"),
+                patch("explainshell.manager.run", side_effect=_fake_run),
+                patch(
+                    "explainshell.manager.config.source_from_path",
+                    side_effect=lambda p: p[len("/m/") :],
+                ),
+            ):
+                _run_diff_db(paths, "llm", "m", self.run_dir, False, s, jobs=3)
+                _run_diff_db(paths, "llm", "m", self.run_dir, False, s, jobs=3)
+            s.close()
+
+        # The failed file is the only one compared again.
+        self.assertEqual(calls, [(paths, 3), ([paths[2]], 3)])
+        records = self._records()
+        self.assertEqual(
+            [(r["source"], r["status"]) for r in records],
+            [
+                ("ubuntu/26.04/1/find.1.gz", "diffed"),
+                ("ubuntu/26.04/1/grep.1.gz", "not_in_db"),
+                ("ubuntu/26.04/1/tar.1.gz", "failed"),
+                ("ubuntu/26.04/1/tar.1.gz", "failed"),
+            ],
+        )
+        self.assertEqual(
+            records[0]["diffs"],
+            [
+                {
+                    "type": "field",
+                    "label": "synopsis",
+                    "details": [["synopsis", stored.synopsis, "new synopsis"]],
+                }
+            ],
+        )
+
+    def test_diff_extractors_resume_reuses_left_results(self):
+        paths = ["/m/a.1.gz", "/m/b.1.gz"]
+        left = {p: _success(p, _make_manpage(p[3])) for p in paths}
+        right = {p: _success(p, _make_manpage(p[3])) for p in paths}
+        for entry in right.values():
+            entry.mp.options = [Option(text="verbose", short=["-v"])]
+        calls = []
+
+        def _fake_run(ext, files, **kwargs):
+            side = "left" if ext is left_ext else "right"
+            calls.append((side, list(files)))
+            for p in files:
+                kwargs["on_result"](p, (left if side == "left" else right)[p])
+                if side == "right" and len(calls) == 2:
+                    raise KeyboardInterrupt
+            return BatchResult()
+
+        left_ext, right_ext = MagicMock(), MagicMock()
+        with (
+            patch("explainshell.manager.make_extractor") as mock_make_ext,
+            patch("explainshell.manager.run", side_effect=_fake_run),
+            patch(
+                "explainshell.manager.config.source_from_path",
+                side_effect=os.path.basename,
+            ),
+        ):
+            mock_make_ext.side_effect = [left_ext, right_ext, left_ext, right_ext]
+            first = _run_diff_extractors(
+                paths, ("llm", "m1"), ("llm", "m2"), self.run_dir
+            )
+            second = _run_diff_extractors(
+                paths, ("llm", "m1"), ("llm", "m2"), self.run_dir
+            )
+
+        self.assertTrue(first.interrupted)
+        self.assertEqual(
+            calls,
+            [("left", paths), ("right", paths), ("right", [paths[1]])],
+        )
+        # Reused left-hand results are not billed to the resumed run.
+        self.assertEqual(second.n_succeeded, 1)
+        self.assertEqual(second.stats.input_tokens, 10)
+        self.assertEqual(len(self._records("diff-left.jsonl")), 2)
+        records = self._records()
+        self.assertEqual([r["source"] for r in records], ["a.1.gz", "b.1.gz"])
+        self.assertEqual(records[1]["status"], "diffed")
+        self.assertEqual([d["type"] for d in records[1]["diffs"]], ["option_added"])
+        self.assertEqual(records[1]["diffs"][0]["details"]["short"], ["-v"])
+
+    def test_truncated_record_is_ignored(self):
+        path = os.path.join(self.run_dir, "diffs.jsonl")
+        with open(path, "w") as f:
+            f.write('{"source": "a.1.gz", "status": "diffed"}\n{"source": "b.1')
+        log = DiffLog(self.run_dir)
+        log.write({"source": "c.1.gz", "status": "diffed"})
+        log.close()
+        self.assertEqual(
+            [r["source"] for r in load_diff_log(self.run_dir)], ["a.1.gz", "c.1.gz"]
+        )
+
+    @patch("explainshell.manager.run")
+    @patch("explainshell.manager.make_extractor")
+    @patch("explainshell.util.collect_gz_files")
+    def test_cli_forwards_jobs_and_resume_dir(
+        self, mock_collect, mock_make_ext, mock_run
+    ):
+        mock_collect.return_value = ["/fake/a.1.gz"]
+        mock_run.return_value = BatchResult()
+        with open(os.path.join(self.run_dir, "diffs.jsonl"), "w") as f:
+            f.write(json.dumps({"source": "fake/a.1.gz", "status": "diffed"}) + "\n")
+
+        with (
+            patch(
+                "explainshell.manager.config.source_from_path",
+                return_value="fake/a.1.gz",
+            ),
+            patch("explainshell.manager._attach_run_log") as mock_attach,
+        ):
+            mock_attach.side_effect = lambda _level, run_dir=None: run_dir
+            result = CliRunner().invoke(
+                cli,
+                [
+                    "diff",
+                    "extractors",
+                    "-j",
+                    "4",
+                    "--resume",
+                    self.run_dir,
+                    "llm:m1..llm:m2",
+                    "/fake/a.1.gz",
+                ],
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        # a.1.gz was compared by the resumed run: nothing is extracted again.
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.args[1], [])
+        self.assertEqual(mock_run.call_args.kwargs["jobs"], 4)
+        self.assertEqual(mock_make_ext.call_args.args[1].llm_concurrency, 4)
+
+    def test_cli_rejects_zero_jobs(self):
+        result = CliRunner().invoke(
+            cli, ["diff", "db", "-m", "llm:m", "-j", "0", "/fake/a.1.gz"]
+        )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("--jobs must be >= 1", result.output)
+
+
 # ---------------------------------------------------------------------------
 # TestDbPathValidation
 # ---------------------------------------------------------------------------
@@ -2225,7 +2603,41 @@ class TestShowCli(unittest.TestCase):
 
         self.assertEqual(result.exit_code, 0)
         self.assertIn("parsed_manpages:   2", result.output)
-        self.assertIn("ubuntu/26.04", result.output)
+        self.assertIn("options:           2", result.output)
+        self.assertIn("options/manpage:   1.0 avg, 2 max, 1 without any", result.output)
+        self.assertIn("  llm: 2", result.output)
+        self.assertIn("ubuntu/26.04: 2", result.output)
+
+    def test_export(self):
+        out_dir = os.path.join(self.tmp, "export")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["--db", self.db_path, "export", "--format", "arrow", "-o", out_dir]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("manpages: 2 row(s)", result.output)
+        self.assertIn("options: 2 row(s)", result.output)
+        self.assertEqual(
+            sorted(os.listdir(out_dir)),
+            ["manpages.arrow", "mappings.arrow", "options.arrow"],
+        )
+        shutil.rmtree(out_dir)
+
+    def test_show_search(self):
+        self.store.rebuild_search_index()
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--db", self.db_path, "show", "search", "archive"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("ubuntu/26.04/1/tar.1.gz", result.output)
+
+    def test_show_search_no_results(self):
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--db", self.db_path, "show", "search", "tar"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("No results", result.output)
 
     def test_show_distros(self):
         runner = CliRunner()
@@ -2464,6 +2876,17 @@ class TestDbCheckCli(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         self.assertIn("No issues found", result.output)
 
+    def test_jobs_and_timings(self):
+        self.store.add_manpage(_make_manpage("tar"), _make_raw())
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["--db", self.db_path, "db-check", "-j", "2"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        # ubuntu/26.04 plus the shard for sources without a distro/release.
+        self.assertIn("2 shard(s)", result.output)
+        self.assertIn("shadowed duplicates", result.output)
+
     def test_reports_issues(self):
         """Insert an orphaned mapping so db-check has something to report."""
         self.store._conn.execute("PRAGMA foreign_keys = OFF")
@@ -2686,6 +3109,7 @@ class TestExtractionReport(unittest.TestCase):
 
         data = self._read_report()
         self.assertNotIn("batch_manifest", data)
+        self.assertNotIn("pipeline", data)
         self.assertNotIn("reason", data)
 
     def test_reason_embedded(self) -> None:
@@ -2714,6 +3138,26 @@ class TestExtractionReport(unittest.TestCase):
         self.assertEqual(data["batch_manifest"]["model"], "openai/test-model")
         self.assertEqual(data["batch_manifest"]["batch_size"], 50)
 
+    def test_pipeline_embedded(self) -> None:
+        """Batch pipeline timings and memory marks are included when provided."""
+        from explainshell.extraction.report import PipelineSummary
+
+        report = self._make_report(
+            pipeline=PipelineSummary(
+                batches=3,
+                poll_seconds=12.5,
+                max_held_files=40,
+                process_peak_rss_mb=210.3,
+            )
+        )
+        _write_report(self._run_dir, report)
+
+        data = self._read_report()
+        self.assertEqual(data["pipeline"]["batches"], 3)
+        self.assertEqual(data["pipeline"]["poll_seconds"], 12.5)
+        self.assertEqual(data["pipeline"]["max_held_files"], 40)
+        self.assertEqual(data["pipeline"]["process_peak_rss_mb"], 210.3)
+
     def test_standalone_manifest_cleaned_up(self) -> None:
         """_write_report removes batch-manifest.json if it exists."""
 
@@ -2832,6 +3276,8 @@ class TestReportFailureAndSkipReporting(unittest.TestCase):
                 on_start=None,
                 on_result=None,
                 manifest=None,
+                resume=(),
+                last_batch_idx=0,
             ):
                 batch = BatchResult()
                 # ok: SUCCESS with 4 options
@@ -2993,10 +3439,11 @@ class TestThrowSitesTagged(unittest.TestCase):
 
     def test_mandoc_failed(self) -> None:
         from explainshell.errors import ExtractionError, FailureReason
+        from explainshell.extraction import mandoc
         from explainshell.extraction.llm import text as text_mod
 
         # Patch subprocess.run to simulate mandoc failure.
-        with patch.object(text_mod, "subprocess") as mock_subp:
+        with patch.object(mandoc, "subprocess") as mock_subp:
             mock_subp.run.return_value = MagicMock(
                 returncode=1, stdout="", stderr="mandoc: parse error"
             )
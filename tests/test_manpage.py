@@ -1,9 +1,185 @@
+import glob
+import json
+import os
+import shutil
+import sqlite3
 import unittest
+from unittest.mock import patch
 
-from explainshell import manpage
+from explainshell import config, manpage, roff_utils
+
+_MANPAGES = os.path.join(os.path.dirname(__file__), "manpages", "ubuntu", "26.04", "1")
+_E2E = os.path.join(os.path.dirname(__file__), "e2e")
+
+# What the native parser reports for each page in tests/manpages. The pages
+# that are also in tests/e2e are checked against lexgrog's answers below.
+_EXPECTED = {
+    "basket.1.gz": ("Note-taking application", ["basket"]),
+    "bsdtar.1.gz": ("manipulate tape archives", ["bsdtar", "tar"]),
+    "curl.1.gz": ("transfer a URL", ["curl"]),
+    "docker.1.gz": ("Docker image and container command line interface", ["docker"]),
+    "doas.1.gz": ("execute commands as another user", ["doas"]),
+    "ebook-convert.1.gz": ("ebook-convert", ["ebook-convert"]),
+    "echo.1.gz": ("Display a line of text", ["echo"]),
+    "find.1.gz": ("search for files in a directory hierarchy", ["find"]),
+    "git-rebase.1.gz": ("Reapply commits on top of another base tip", ["git-rebase"]),
+    "git.1.gz": ("the stupid content tracker", ["git"]),
+    "grep.1.gz": (
+        "print lines that match patterns",
+        ["grep", "egrep", "fgrep", "rgrep"],
+    ),
+    "jq.1.gz": ("Command-line JSON processor", ["jq"]),
+    "logger.1.gz": ("enter messages into the system log", ["logger"]),
+    "more.1.gz": ("display the contents of a file in a terminal", ["more"]),
+    "nmap.1.gz": ("Network exploration tool and security / port scanner", ["nmap"]),
+    "node.1.gz": ("server-side JavaScript runtime", ["node"]),
+    "ps.1.gz": ("report a snapshot of the current processes", ["ps"]),
+    "su.1.gz": ("run a command with substitute user and group ID", ["su"]),
+    "tar.1.gz": ("an archiving utility", ["tar"]),
+    "taskset.1.gz": ("set or retrieve a process's CPU affinity", ["taskset"]),
+    "watch.1.gz": (
+        "execute a program periodically, showing output fullscreen",
+        ["watch"],
+    ),
+    "xargs.1.gz": ("build and execute command lines from standard input", ["xargs"]),
+    "xargs.1posix.gz": ("construct argument lists and invoke utility", ["xargs"]),
+}
+
+
+def _aliases(names):
+    return [(names[0], 10)] + [(n, 1) for n in names[1:]]
+
+
+def _lexgrog_rows():
+    """Synopsis and aliases per page in tests/e2e/e2e.db, built with lexgrog."""
+    conn = sqlite3.connect(f"file:{_E2E}/e2e.db?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT source, synopsis, aliases FROM parsed_manpages")
+        return {
+            source: (synopsis, [tuple(a) for a in json.loads(aliases)])
+            for source, synopsis, aliases in rows
+        }
+    finally:
+        conn.close()
 
 
 class test_manpage(unittest.TestCase):
     def test_missing_file_raises(self):
         with self.assertRaises(FileNotFoundError):
             manpage.get_synopsis_and_aliases("foo.1.gz")
+
+    @patch.object(config, "NAME_PARSER", "native")
+    def test_native_parser_on_corpus(self):
+        pages = sorted(os.path.basename(p) for p in glob.glob(f"{_MANPAGES}/*.gz"))
+        self.assertEqual(pages, sorted(_EXPECTED))
+        for page, (synopsis, names) in _EXPECTED.items():
+            with self.subTest(page=page):
+                self.assertEqual(
+                    manpage.get_synopsis_and_aliases(os.path.join(_MANPAGES, page)),
+                    (synopsis, _aliases(names)),
+                )
+
+    @patch.object(config, "NAME_PARSER", "native")
+    def test_native_parser_matches_lexgrog_rows(self):
+        rows = _lexgrog_rows()
+        pages = sorted(glob.glob(f"{_E2E}/manpages/*/*/*/*.gz"))
+        self.assertEqual(len(pages), len(rows))
+        for gz_path in pages:
+            source = config.source_from_path(gz_path)
+            with self.subTest(page=source):
+                self.assertTrue(
+                    manpage.same_synopsis_and_aliases(
+                        manpage.get_synopsis_and_aliases(gz_path), rows[source]
+                    )
+                )
+
+    def test_lexgrog_rows_agree_with_corpus(self):
+        """Pages in both tests/manpages and tests/e2e have lexgrog's answer."""
+        rows = _lexgrog_rows()
+        shared = 0
+        for page, (synopsis, names) in _EXPECTED.items():
+            row = rows.get(f"ubuntu/26.04/1/{page}")
+            if row is None:
+                continue
+            shared += 1
+            with self.subTest(page=page):
+                self.assertTrue(
+                    manpage.same_synopsis_and_aliases(row, (synopsis, _aliases(names)))
+                )
+        self.assertGreater(shared, 0)
+
+    @unittest.skipUnless(shutil.which("lexgrog"), "lexgrog not installed")
+    def test_native_parser_matches_lexgrog(self):
+        for gz_path in sorted(glob.glob(f"{_MANPAGES}/*.gz")):
+            with self.subTest(page=os.path.basename(gz_path)):
+                with patch.object(config, "NAME_PARSER", "native"):
+                    native = manpage.get_synopsis_and_aliases(gz_path)
+                expected = manpage.get_synopsis_and_aliases(gz_path)
+                self.assertTrue(manpage.same_synopsis_and_aliases(native, expected))
+
+    def test_lexgrog_mode_parses_lexgrog_output(self):
+        gz_path = os.path.join(_MANPAGES, "grep.1.gz")
+        out = "\n".join(
+            f'{gz_path}: "{n} - print lines that match patterns"'
+            for n in ("grep", "egrep")
+        )
+        with (
+            patch.object(config, "NAME_PARSER", "lexgrog"),
+            patch.object(manpage, "_run_lexgrog", return_value=out) as run,
+        ):
+            result = manpage.get_synopsis_and_aliases(gz_path)
+        run.assert_called_once()
+        self.assertEqual(
+            result,
+            ("print lines that match patterns", [("grep", 10), ("egrep", 1)]),
+        )
+
+    def test_verify_mode_warns_and_returns_lexgrog_result(self):
+        gz_path = os.path.join(_MANPAGES, "echo.1.gz")
+        out = f'{gz_path}: "echo - display a line of text."'
+        with (
+            patch.object(config, "NAME_PARSER", "verify"),
+            patch.object(manpage, "_run_lexgrog", return_value=out),
+            self.assertLogs("explainshell.manpage", "WARNING") as logs,
+        ):
+            result = manpage.get_synopsis_and_aliases(gz_path)
+        self.assertEqual(result, ("display a line of text", [("echo", 10)]))
+        self.assertIn("disagrees with lexgrog", logs.output[0])
+
+
+class TestParseNameSection(unittest.TestCase):
+    def _parse(self, source: str) -> list[tuple[str, str]]:
+        return roff_utils.parse_name_section(source.splitlines(keepends=True))
+
+    def test_no_name_section(self):
+        self.assertEqual(self._parse(".TH FOO 1\n.SH SYNOPSIS\nfoo\n"), [])
+
+    def test_name_without_description(self):
+        self.assertEqual(self._parse(".SH NAME\nfoo\n.SH SYNOPSIS\n"), [])
+
+    def test_records_split_by_breaks(self):
+        source = ".SH NAME\nfoo \\- do foo\n.br\n.B bar\n\\- do bar.\n.SH DESCRIPTION\n"
+        self.assertEqual(self._parse(source), [("foo", "do foo"), ("bar", "do bar")])
+
+    def test_comments_and_escapes(self):
+        source = (
+            '.SH "NAME"\n'
+            '.\\" a comment\n'
+            "\\fBfoo\\fR, \\f[B]foo2\\f[] \\(em the \\*(Aqfoo\\*(Aq \\(lqtool\\(rq "
+            '\\" trailing comment\n'
+            ".SH SYNOPSIS\n"
+        )
+        self.assertEqual(
+            self._parse(source),
+            [("foo", "the 'foo' \"tool\""), ("foo2", "the 'foo' \"tool\"")],
+        )
+
+    def test_names_with_spaces_are_skipped(self):
+        source = ".SH NAME\nfoo, foo bar \\- does foo\n"
+        self.assertEqual(self._parse(source), [("foo", "does foo")])
+
+    def test_mdoc(self):
+        source = ".Sh NAME\n.Nm foo ,\n.Nm bar\n.Nd do \\&foo things\n.Sh SYNOPSIS\n"
+        self.assertEqual(
+            self._parse(source), [("foo", "do foo things"), ("bar", "do foo things")]
+        )
@@ -0,0 +1,79 @@
+import random
+import string
+
+from explainshell.name_index import NameIndex, edit_distance
+
+
+def _reference_distance(a: str, b: str) -> int:
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+class TestEditDistance:
+    def test_matches_unbounded_reference(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 6)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 6)))
+            bound = rng.randint(0, 3)
+            expected = min(_reference_distance(a, b), bound + 1)
+            assert edit_distance(a, b, bound) == expected, (a, b, bound)
+
+
+_NAMES = ("grep", "egrep", "fgrep", "tar", "git", "git commit", "Xvfb", "ls")
+
+
+class TestNameIndex:
+    def test_membership(self):
+        index = NameIndex(_NAMES)
+
+        assert "git commit" in index
+        assert "gitcommit" not in index
+        assert len(index) == len(_NAMES)
+
+    def test_nearest_orders_by_distance_then_name(self):
+        index = NameIndex(_NAMES)
+
+        assert index.nearest("fgrp") == ["fgrep", "egrep", "grep"]
+        assert index.nearest("gerp", k=1) == ["grep"]
+
+    def test_nearest_excludes_query_and_respects_bound(self):
+        index = NameIndex(_NAMES)
+
+        assert "grep" not in index.nearest("grep")
+        assert index.nearest("git comit", max_distance=1) == ["git commit"]
+        assert index.nearest("gti comit", max_distance=1) == []
+
+    def test_nearest_is_case_insensitive(self):
+        index = NameIndex(_NAMES)
+
+        assert index.nearest("xvfb") == ["Xvfb"]
+
+    def test_nearest_agrees_with_brute_force(self):
+        rng = random.Random(1)
+        alphabet = string.ascii_lowercase[:6] + "-"
+        names = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 10)))
+            for _ in range(500)
+        }
+        index = NameIndex(names)
+        for name in rng.sample(sorted(names), 50):
+            query = name[:2] + name[3:]
+            expected = sorted(
+                (edit_distance(query, n, 1), n)
+                for n in names
+                if n != query and edit_distance(query, n, 1) <= 1
+            )
+            assert index.nearest(query, k=len(names), max_distance=1) == [
+                n for _, n in expected
+            ]
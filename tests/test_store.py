@@ -5,7 +5,7 @@ import pytest
 
 from explainshell import errors
 from explainshell.config import parse_distro_release
-from explainshell.models import ExtractionMeta, ParsedManpage, RawManpage
+from explainshell.models import ExtractionMeta, Option, ParsedManpage, RawManpage
 from explainshell.store import Store, validate_source_path
 
 
@@ -186,6 +186,162 @@ class TestHasManpageSource:
     def test_returns_false_for_missing_source(self, store):
         assert store.has_manpage_source("ubuntu/26.04/1/missing.1.gz") is False
 
+    def test_manpage_sources(self, store):
+        assert store.manpage_sources() == set()
+        store.add_manpage(_make_manpage("tar", "1"), _make_raw())
+
+        assert store.manpage_sources() == {"ubuntu/26.04/1/tar.1.gz"}
+
+
+def _make_tar_with_options():
+    mp = _make_manpage("tar", "1")
+    mp.options = [
+        Option(text="create archive", short=["-c"], long=["--create"]),
+        Option(
+            text="use archive FILE", short=["-f"], long=["--file"], has_argument=True
+        ),
+        Option(text="files to archive", positional="FILE"),
+    ]
+    return mp
+
+
+class TestOptionsTable:
+    def test_find_option_by_short_and_long_flag(self, store):
+        store.add_manpage(_make_tar_with_options(), _make_raw())
+
+        opt = store.find_option("ubuntu/26.04/1/tar.1.gz", "--file")
+        assert opt.text == "use archive FILE"
+        assert opt.has_argument is True
+        assert store.find_option("ubuntu/26.04/1/tar.1.gz", "-c").long == ["--create"]
+
+    def test_find_option_missing_flag(self, store):
+        store.add_manpage(_make_tar_with_options(), _make_raw())
+
+        assert store.find_option("ubuntu/26.04/1/tar.1.gz", "--nope") is None
+        assert store.find_option("ubuntu/26.04/1/missing.1.gz", "-c") is None
+
+    def test_rows_replaced_on_reimport(self, store):
+        mp = _make_tar_with_options()
+        store.add_manpage(mp, _make_raw())
+        mp.options = mp.options[:1]
+        store.add_manpage(mp, _make_raw())
+
+        assert store.find_option(mp.source, "--file") is None
+        n = store._conn.execute("SELECT COUNT(*) FROM options").fetchone()[0]
+        assert n == 2
+
+    def test_positional_row_has_null_flag(self, store):
+        store.add_manpage(_make_tar_with_options(), _make_raw())
+
+        row = store._conn.execute(
+            "SELECT ordinal, kind, positional FROM options WHERE flag IS NULL"
+        ).fetchone()
+        assert tuple(row) == (2, "positional", "FILE")
+
+    def test_sources_with_option(self, store):
+        store.add_manpage(_make_tar_with_options(), _make_raw())
+        store.add_manpage(_make_manpage("echo", "1"), _make_raw())
+
+        assert store.sources_with_option("--create") == ["ubuntu/26.04/1/tar.1.gz"]
+        assert store.sources_with_option("--color") == []
+
+    def test_delete_manpage_cascades(self, store):
+        mp = _make_tar_with_options()
+        store.add_manpage(mp, _make_raw())
+        store.delete_manpage(mp.source)
+
+        assert store._conn.execute("SELECT COUNT(*) FROM options").fetchone()[0] == 0
+
+    def test_create_backfills_existing_db(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        s = Store.create(db_path)
+        s.add_manpage(_make_tar_with_options(), _make_raw())
+        s._conn.execute("DROP TABLE options")
+        s.close()
+
+        s = Store.create(db_path)
+        try:
+            assert s.find_option("ubuntu/26.04/1/tar.1.gz", "-f").text == (
+                "use archive FILE"
+            )
+            assert s.sources_with_option("-f") == ["ubuntu/26.04/1/tar.1.gz"]
+        finally:
+            s.close()
+
+    def test_option_lookups_without_table_fall_back(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        s = Store.create(db_path)
+        s.add_manpage(_make_tar_with_options(), _make_raw())
+        s._conn.execute("DROP TABLE options")
+        s.close()
+
+        s = Store(db_path, read_only=True)
+        try:
+            assert s.find_option("ubuntu/26.04/1/tar.1.gz", "--create").short == ["-c"]
+            assert s.sources_with_option("-f") == ["ubuntu/26.04/1/tar.1.gz"]
+            assert s.sources_with_option("--create") == ["ubuntu/26.04/1/tar.1.gz"]
+            assert s.sources_with_option("--color") == []
+        finally:
+            s.close()
+
+
+class TestSearch:
+    def _populate(self, store):
+        store.add_manpage(_make_tar_with_options(), _make_raw())
+        store.add_manpage(_make_manpage("grep", "1"), _make_raw())
+        store.add_manpage(_make_manpage("egrep", "1"), _make_raw())
+        store.add_manpage(_make_manpage("grep", "1", release="24.04"), _make_raw())
+        store.rebuild_search_index()
+
+    def test_name_prefix(self, store):
+        self._populate(store)
+
+        results = store.search("gre")
+        assert {r.name for r in results} == {"grep"}
+
+    def test_exact_name_ranked_first(self, store):
+        self._populate(store)
+        store.add_manpage(
+            ParsedManpage(
+                source="ubuntu/26.04/1/zgrep.1.gz",
+                name="zgrep",
+                synopsis="grep grep grep compressed files",
+                aliases=[("zgrep", 10)],
+            ),
+            _make_raw(),
+        )
+        store.rebuild_search_index()
+
+        assert store.search("grep")[0].name == "grep"
+
+    def test_option_text_is_searchable(self, store):
+        self._populate(store)
+
+        results = store.search("archive")
+        assert [r.source for r in results] == ["ubuntu/26.04/1/tar.1.gz"]
+
+    def test_distro_release_filter(self, store):
+        self._populate(store)
+
+        results = store.search("grep", distro="ubuntu", release="24.04")
+        assert [r.source for r in results] == ["ubuntu/24.04/1/grep.1.gz"]
+
+    def test_limit(self, store):
+        self._populate(store)
+
+        assert len(store.search("grep", limit=1)) == 1
+
+    def test_query_syntax_is_not_interpreted(self, store):
+        self._populate(store)
+
+        assert {r.name for r in store.search('grep"')} == {"grep"}
+        assert store.search("--") == []
+
+    def test_missing_index_returns_empty(self, store):
+        store.add_manpage(_make_manpage("grep", "1"), _make_raw())
+
+        assert store.search("grep") == []
+
 
 class TestExtractorInfoIndex:
     def test_returns_extractor_and_meta_for_all_rows(self, store):
@@ -294,6 +450,79 @@ class TestFindManpageDistroScoping:
         results = store.find_man_page("ps")
         assert len(results) == 2
 
+    def test_scoped_lookup_uses_partition_index(self, store):
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT dst, score FROM mappings "
+            "WHERE distro = ? AND release = ? AND src = ?",
+            ("ubuntu", "26.04", "ps"),
+        ).fetchall()
+
+        assert "idx_mappings_partition" in plan[0]["detail"]
+
+    def test_partition_columns_follow_dst(self, store):
+        store.add_manpage(
+            _make_manpage("ps", "1", distro="arch", release="latest"), _make_raw()
+        )
+        store.add_mapping("procps", "arch/latest/1/ps.1.gz", 1)
+
+        rows = store._conn.execute(
+            "SELECT src, distro, release FROM mappings ORDER BY src"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ("procps", "arch", "latest"),
+            ("ps", "arch", "latest"),
+        ]
+
+    def test_suggestions_are_scoped(self, store):
+        store.add_manpage(_make_manpage("printf", "1"), _make_raw())
+        store.add_manpage(_make_manpage("printf", "3"), _make_raw())
+        store.add_manpage(
+            _make_manpage("printf", "3", distro="debian", release="12"), _make_raw()
+        )
+
+        results = store.find_man_page("printf.1", distro="ubuntu", release="26.04")
+        assert [r.source for r in results] == [
+            "ubuntu/26.04/1/printf.1.gz",
+            "ubuntu/26.04/3/printf.3.gz",
+        ]
+
+    @staticmethod
+    def _make_unpartitioned_db(db_path):
+        s = Store.create(db_path)
+        s.add_manpage(_make_manpage("ps", "1"), _make_raw())
+        s.add_manpage(
+            _make_manpage("ps", "1", distro="debian", release="12"), _make_raw()
+        )
+        s._conn.executescript("""
+            DROP INDEX idx_mappings_partition;
+            ALTER TABLE mappings DROP COLUMN release;
+            ALTER TABLE mappings DROP COLUMN distro;
+        """)
+        s.close()
+
+    def test_create_migrates_unpartitioned_db(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        self._make_unpartitioned_db(db_path)
+
+        s = Store.create(db_path)
+        try:
+            assert s._has_column("mappings", "distro")
+            results = s.find_man_page("ps", distro="debian", release="12")
+            assert [r.source for r in results] == ["debian/12/1/ps.1.gz"]
+        finally:
+            s.close()
+
+    def test_unpartitioned_db_still_scopes_read_only(self, tmp_path):
+        db_path = str(tmp_path / "old.db")
+        self._make_unpartitioned_db(db_path)
+
+        s = Store(db_path, read_only=True)
+        try:
+            results = s.find_man_page("ps", distro="debian", release="12")
+            assert [r.source for r in results] == ["debian/12/1/ps.1.gz"]
+        finally:
+            s.close()
+
 
 class TestDistros:
     def test_returns_distro_release_pairs(self, store):
@@ -0,0 +1,45 @@
+import unittest
+
+from explainshell import timing
+
+
+class TestRequestTimer(unittest.TestCase):
+    def tearDown(self):
+        self.assertIsNone(timing.current())
+
+    def test_stage_is_noop_without_timer(self):
+        with timing.stage("parse") as stage:
+            stage.name = "other"
+        self.assertIsNone(timing.current())
+
+    def test_nested_stages_are_exclusive(self):
+        token = timing.activate()
+        try:
+            timer = timing.current()
+            with timing.stage("match"):
+                for _ in range(2):
+                    with timing.stage("lookup-miss") as stage:
+                        stage.name = "lookup-hit"
+        finally:
+            timing.deactivate(token)
+
+        fields = timer.fields()
+        self.assertEqual(fields["match_n"], 1)
+        self.assertEqual(fields["lookup_hit_n"], 2)
+        self.assertNotIn("lookup_miss_n", fields)
+        self.assertLessEqual(
+            fields["match_ms"] + fields["lookup_hit_ms"], fields["total_ms"]
+        )
+
+    def test_header(self):
+        timer = timing.RequestTimer()
+        with timer.stage("parse"):
+            pass
+        with timer.stage("render"):
+            pass
+        with timer.stage("render"):
+            pass
+        names = [part.split(";")[0] for part in timer.header().split(", ")]
+        self.assertEqual(names, ["parse", "render", "total"])
+        self.assertIn("render;dur=", timer.header())
+        self.assertIn(';desc="2x"', timer.header())
@@ -1,8 +1,15 @@
 import datetime
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 import unittest.mock
 from pathlib import Path
 
+from prometheus_client import REGISTRY
+
+from explainshell import config
 from explainshell.caching_store import CachingStore
 from explainshell.models import Option, ParsedManpage, RawManpage
 from explainshell.store import Store
@@ -73,6 +80,36 @@ def test_get_store_uses_app_scoped_cache_when_debug_disabled(tmp_path: Path) ->
             cached.close()
 
 
+def test_missing_program_suggests_typo_fixes(tmp_path: Path) -> None:
+    db_path = tmp_path / "typo.db"
+    writable = Store.create(str(db_path))
+    writable.add_manpage(
+        ParsedManpage(
+            source="ubuntu/26.04/1/grep.1.gz",
+            name="grep",
+            synopsis="print lines that match patterns",
+            aliases=[("grep", 10)],
+        ),
+        RawManpage(
+            source_text="grep",
+            generated_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+            generator="test",
+        ),
+    )
+    writable.close()
+    app = create_app(str(db_path))
+    app.config["TESTING"] = True
+    cached = CachingStore(str(db_path))
+    _use_store(app, cached)
+
+    try:
+        rv = app.test_client().get("/explain/grpe")
+        assert b"Did you mean" in rv.data
+        assert b'<a href="/explain/grep">grep</a>' in rv.data
+    finally:
+        cached.close()
+
+
 class TestExplainRouter(unittest.TestCase):
     """Route-level tests for the unified explain_router."""
 
@@ -381,6 +418,47 @@ class TestDistroFallback(unittest.TestCase):
             self.assertIn(b"missing man page", rv.data)
 
 
+class TestSearchRoute(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.store = create_test_store()
+        self.store.rebuild_search_index()
+        _use_store(self.app, self.store)
+        self.app.config["TESTING"] = True
+        self.client = self.app.test_client()
+
+    def test_search_lists_matches(self):
+        rv = self.client.get("/search?q=markdown")
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn(b"markdown-page(1)", rv.data)
+        self.assertIn(b'href="/explain/ubuntu/26.04/1/markdown-page"', rv.data)
+
+    def test_search_no_results(self):
+        rv = self.client.get("/search?q=zzzzzz")
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn(b"No man pages matched", rv.data)
+
+    def test_empty_query_redirects(self):
+        rv = self.client.get("/search?q=")
+        self.assertEqual(rv.status_code, 302)
+
+    def test_missing_program_suggests_near_matches(self):
+        rv = self.client.get("/explain/withmulti")
+        self.assertIn(b"missing man page", rv.data)
+        self.assertIn(b"Did you mean", rv.data)
+        self.assertIn(b"withmultipos(1)", rv.data)
+
+    def test_missing_cmd_suggests_near_matches(self):
+        rv = self.client.get("/explain?cmd=nosyn+-a")
+        self.assertIn(b"missing man page", rv.data)
+        self.assertIn(b"nosynopsis(1)", rv.data)
+
+    def test_missing_without_matches_has_no_suggestions(self):
+        rv = self.client.get("/explain/zzzzzz")
+        self.assertIn(b"missing man page", rv.data)
+        self.assertNotIn(b"Did you mean", rv.data)
+
+
 class TestExplainCacheHeaders(unittest.TestCase):
     """/explain responses carry ETag + Cache-Control so Cloudflare and
     browsers can cache them. The ETag is ``<db_sha[:16]>-<app_ver>`` —
@@ -554,6 +632,222 @@ class TestExplainCacheHeadersDebug(unittest.TestCase):
         self.assertNotIn("Cache-Control", rv.headers)
 
 
+def _server_timing(response) -> dict[str, str]:
+    """Parse a Server-Timing header into {metric: params}."""
+    header = response.headers["Server-Timing"]
+    return dict(
+        (part.strip() + ";").split(";", 1) for part in header.split(",") if part
+    )
+
+
+class TestServerTiming(unittest.TestCase):
+    """SERVER_TIMING=header adds per-stage timings to /explain responses."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db_path = Path(self.tmp.name) / "timing.db"
+        writable = Store.create(str(db_path))
+        writable.add_manpage(
+            TestExplainCacheHeaders._make_mp(self), TestExplainCacheHeaders._RAW
+        )
+        writable.close()
+        self.app = create_app(str(db_path))
+        self.app.config["DEBUG"] = False
+        self.app.config["TESTING"] = True
+        self.app.config["SERVER_TIMING"] = frozenset({"header"})
+        self.store = CachingStore(str(db_path))
+        _use_store(self.app, self.store)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_cmd_stages(self):
+        first = _server_timing(self.client.get("/explain?cmd=bar+-a"))
+        self.assertLessEqual(
+            {"parse", "match", "lookup-miss", "markdown", "distros", "render"},
+            set(first),
+        )
+        self.assertTrue(first["total"].startswith("dur="))
+
+        second = _server_timing(self.client.get("/explain?cmd=bar+-a"))
+        self.assertIn("lookup-hit", second)
+        self.assertNotIn("lookup-miss", second)
+
+    def test_program_stages(self):
+        timings = _server_timing(self.client.get("/explain/bar"))
+        self.assertLessEqual(
+            {"lookup-miss", "markdown", "distros", "render", "total"}, set(timings)
+        )
+
+    def test_repeated_stages_are_counted(self):
+        rv = self.client.get("/explain?cmd=bar+-a+%7C+bar+%7C+bar")
+        timings = _server_timing(rv)
+        self.assertNotIn("desc", timings["lookup-miss"])
+        self.assertIn('desc="2x"', timings["lookup-hit"])
+
+    def test_log_fields(self):
+        self.app.config["SERVER_TIMING"] = frozenset({"log"})
+        with self.assertLogs("explainshell.web.timing", "INFO") as logs:
+            rv = self.client.get("/explain/bar")
+        self.assertNotIn("Server-Timing", rv.headers)
+        (record,) = [r for r in logs.records if hasattr(r, "server_timing")]
+        self.assertIn("render_ms", record.server_timing)
+        self.assertEqual(record.server_timing["lookup_miss_n"], 1)
+
+    def test_disabled_by_default(self):
+        self.app.config["SERVER_TIMING"] = frozenset()
+        rv = self.client.get("/explain?cmd=bar+-a")
+        self.assertNotIn("Server-Timing", rv.headers)
+
+
+class TestMetrics(unittest.TestCase):
+    """METRICS=true serves Prometheus metrics at /metrics."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "metrics.db"
+        writable = Store.create(str(self.db_path))
+        writable.add_manpage(
+            TestExplainCacheHeaders._make_mp(self), TestExplainCacheHeaders._RAW
+        )
+        writable.close()
+        with unittest.mock.patch.object(config, "METRICS", True):
+            self.app = create_app(str(self.db_path))
+        self.app.config["DEBUG"] = False
+        self.app.config["TESTING"] = True
+        self.store = CachingStore(str(self.db_path))
+        _use_store(self.app, self.store)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    def test_explain_requests_are_recorded(self):
+        count = "explainshell_request_duration_seconds_count"
+        before = {
+            "cmd": self._sample(count, route="explain_cmd"),
+            "hit": self._sample(
+                "explainshell_manpage_cache_lookups_total", result="hit"
+            ),
+            "parse": self._sample(
+                "explainshell_stage_duration_seconds_count", stage="parse"
+            ),
+            "ok": self._sample(
+                "explainshell_responses_total", route="explain_cmd", status="200"
+            ),
+        }
+        self.client.get("/explain?cmd=bar+-a")
+        self.client.get("/explain?cmd=bar+-a")
+
+        self.assertEqual(self._sample(count, route="explain_cmd") - before["cmd"], 2)
+        self.assertEqual(
+            self._sample(
+                "explainshell_responses_total", route="explain_cmd", status="200"
+            )
+            - before["ok"],
+            2,
+        )
+        self.assertEqual(
+            self._sample("explainshell_manpage_cache_lookups_total", result="hit")
+            - before["hit"],
+            1,
+        )
+        self.assertEqual(
+            self._sample("explainshell_stage_duration_seconds_count", stage="parse")
+            - before["parse"],
+            2,
+        )
+        self.assertEqual(self._sample("explainshell_manpage_cache_entries"), 1)
+        self.assertEqual(self._sample("explainshell_requests_in_flight"), 0)
+
+    def test_errors_are_counted(self):
+        parse = self._sample("explainshell_parse_errors_total")
+        missing = self._sample(
+            "explainshell_program_not_found_total", route="explain_program"
+        )
+        self.client.get("/explain?cmd=bar+%22unterminated")
+        self.client.get("/explain/nosuchprogram")
+        self.assertEqual(self._sample("explainshell_parse_errors_total") - parse, 1)
+        self.assertEqual(
+            self._sample(
+                "explainshell_program_not_found_total", route="explain_program"
+            )
+            - missing,
+            1,
+        )
+
+    def test_errors_not_counted_when_disabled(self):
+        app = create_app(str(self.db_path))
+        app.config["DEBUG"] = False
+        _use_store(app, self.store)
+        client = app.test_client()
+        parse = self._sample("explainshell_parse_errors_total")
+        missing = self._sample(
+            "explainshell_program_not_found_total", route="explain_program"
+        )
+        client.get("/explain?cmd=bar+%22unterminated")
+        client.get("/explain/nosuchprogram")
+        self.assertEqual(self._sample("explainshell_parse_errors_total"), parse)
+        self.assertEqual(
+            self._sample(
+                "explainshell_program_not_found_total", route="explain_program"
+            ),
+            missing,
+        )
+
+    def test_metrics_endpoint(self):
+        self.client.get("/explain/bar")
+        rv = self.client.get("/metrics")
+        self.assertEqual(rv.status_code, 200)
+        self.assertTrue(rv.content_type.startswith("text/plain"))
+        self.assertIn(
+            b'explainshell_request_duration_seconds_count{route="explain_program"}',
+            rv.data,
+        )
+
+    def test_disabled_by_default(self):
+        app = create_app(str(self.db_path))
+        self.assertEqual(app.test_client().get("/metrics").status_code, 404)
+
+    def test_workers_are_aggregated(self):
+        """Each worker records into PROMETHEUS_MULTIPROC_DIR; a scrape served
+        by any one of them reports the sum."""
+        worker = (
+            "import sys\n"
+            "from unittest.mock import patch\n"
+            "from explainshell import config\n"
+            "from explainshell.web import create_app\n"
+            "with patch.object(config, 'METRICS', True):\n"
+            "    app = create_app(sys.argv[1])\n"
+            "app.config['DEBUG'] = False\n"
+            "client = app.test_client()\n"
+            "client.get('/explain/bar')\n"
+            "if sys.argv[2:] == ['scrape']:\n"
+            "    sys.stdout.write(client.get('/metrics').get_data(as_text=True))\n"
+        )
+        multiproc_dir = Path(self.tmp.name) / "prometheus"
+        multiproc_dir.mkdir()
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(multiproc_dir))
+        for args in ([], ["scrape"]):
+            result = subprocess.run(
+                [sys.executable, "-c", worker, str(self.db_path), *args],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        self.assertIn(
+            'explainshell_request_duration_seconds_count{route="explain_program"} 2.0',
+            result.stdout,
+        )
+
+
 class TestManpageRoute(unittest.TestCase):
     """Route-level tests for /manpage endpoints."""
 
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmark text.chunk_text on the largest pages it accepts.
+
+Compares chunk_text with the previous version (kept below as
+``renumbering_chunk_text``), which numbered every candidate block to size
+it, and checks that both return byte-identical chunks.
+
+By default runs on synthetic pages up to MAX_MANPAGE_CHARS shaped like
+bash.1 and perlfunc: a few very long sections made of many paragraphs,
+option headings, and an occasional paragraph larger than a chunk. Pass .gz
+manpages to benchmark real pages instead (rendered with MANDOC_PATH).
+
+Usage:
+    python tools/bench_chunk_text.py
+    python tools/bench_chunk_text.py --sizes 100000,500000 --repeat 5
+    python tools/bench_chunk_text.py /usr/share/man/man1/bash.1.gz
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from explainshell.extraction.llm.text import (
+    CHUNK_SIZE_CHARS,
+    MAX_MANPAGE_CHARS,
+    _build_preamble,
+    _is_bare_option_heading,
+    _is_bare_option_heading_raw,
+    _split_sections,
+    chunk_text,
+    clean_mandoc_artifacts,
+    filter_sections,
+    get_manpage_text,
+    number_lines,
+)
+
+
+def renumbering_chunk_text(text: str) -> list[str]:
+    """chunk_text before prefix sums: re-numbers every candidate block."""
+    numbered_full, _ = number_lines(text)
+    if len(numbered_full) <= CHUNK_SIZE_CHARS:
+        return [numbered_full]
+
+    sections = _split_sections(text)
+    preamble = _build_preamble(text)
+    preamble_text = ""
+    if preamble:
+        preamble_text = (
+            "[Context — this is a continuation of the same man page]\n\n"
+            + preamble
+            + "\n\n---\n\n"
+        )
+    budget = CHUNK_SIZE_CHARS - len(preamble_text)
+
+    total_lines = text.count("\n") + 1
+    width = len(str(total_lines))
+
+    def _number_block(start_line: int, block_text: str) -> str:
+        lines = block_text.split("\n")
+        numbered = []
+        for j, line in enumerate(lines):
+            lineno = start_line + j
+            numbered.append(f"{lineno:>{width}}| {line}")
+        return "\n".join(numbered)
+
+    def _split_by_lines(start_line: int, block_text: str) -> list[tuple[int, str]]:
+        """Last-resort split: cut at line boundaries to fit budget."""
+        lines = block_text.split("\n")
+        result: list[tuple[int, str]] = []
+        cur_lines: list[str] = []
+        cur_start = start_line
+        for line in lines:
+            candidate = "\n".join(cur_lines + [line])
+            if len(_number_block(cur_start, candidate)) > budget and cur_lines:
+                result.append((cur_start, "\n".join(cur_lines)))
+                cur_start += len(cur_lines)
+                cur_lines = []
+            cur_lines.append(line)
+        if cur_lines:
+            result.append((cur_start, "\n".join(cur_lines)))
+        return result
+
+    blocks: list[tuple[int, str]] = []
+    for start_line, section_text in sections:
+        numbered = _number_block(start_line, section_text)
+        if len(numbered) <= budget:
+            blocks.append((start_line, section_text))
+        else:
+            paragraphs = section_text.split("\n\n")
+            cur_paras: list[str] = []
+            cur_start = start_line
+            for para in paragraphs:
+                candidate = "\n\n".join(cur_paras + [para])
+                numbered_candidate = _number_block(cur_start, candidate)
+                if len(numbered_candidate) > budget and cur_paras:
+                    carried: list[str] = []
+                    while len(cur_paras) > 1 and _is_bare_option_heading_raw(
+                        cur_paras[-1]
+                    ):
+                        carried.insert(0, cur_paras.pop())
+                    emitted = "\n\n".join(cur_paras)
+                    blocks.append((cur_start, emitted))
+                    cur_start = cur_start + emitted.count("\n") + 2
+                    cur_paras = carried
+                cur_paras.append(para)
+            if cur_paras:
+                blocks.append((cur_start, "\n\n".join(cur_paras)))
+
+    final_blocks: list[tuple[int, str]] = []
+    for start_line, block_text in blocks:
+        if len(_number_block(start_line, block_text)) > budget:
+            final_blocks.extend(_split_by_lines(start_line, block_text))
+        else:
+            final_blocks.append((start_line, block_text))
+    blocks = final_blocks
+
+    chunks: list[str] = []
+    current_parts: list[str] = []
+    current_len = 0
+
+    for start_line, block_text in blocks:
+        numbered_block = _number_block(start_line, block_text)
+        block_len = len(numbered_block) + 1
+
+        if current_len + block_len > budget and current_parts:
+            carried: list[str] = []
+            while current_parts and _is_bare_option_heading(current_parts[-1]):
+                carried.insert(0, current_parts.pop())
+            if current_parts:
+                chunks.append("\n".join(current_parts))
+            current_parts = carried
+            current_len = sum(len(c) + 1 for c in carried)
+
+        current_parts.append(numbered_block)
+        current_len += block_len
+
+    if current_parts:
+        chunks.append("\n".join(current_parts))
+
+    if len(chunks) > 1 and preamble_text:
+        for i in range(1, len(chunks)):
+            chunks[i] = preamble_text + chunks[i]
+
+    return chunks
+
+
+def synthetic_page(size: int, rng: random.Random) -> str:
+    """About *size* characters of markdown with a few huge sections."""
+    words = [
+        "the",
+        "of",
+        "to",
+        "and",
+        "a",
+        "in",
+        "is",
+        "it",
+        "you",
+        "that",
+        "he",
+        "was",
+        "for",
+        "on",
+        "are",
+        "with",
+        "as",
+    ]
+    parts = [
+        "# NAME",
+        "",
+        "prog - a synthetic page",
+        "",
+        "# SYNOPSIS",
+        "",
+        "prog [options]",
+    ]
+    n = 0
+    while sum(len(p) + 1 for p in parts) < size:
+        parts += ["", f"# SECTION {n}"]
+        for _ in range(rng.randint(200, 800)):
+            n += 1
+            parts += ["", f"**--option-{n}** *arg*", ""]
+            para = " ".join(rng.choices(words, k=rng.randint(10, 120)))
+            parts.append(para)
+            if rng.random() < 0.002:
+                # A paragraph larger than a chunk forces the line-level split.
+                parts += ["", "\n".join(para for _ in range(CHUNK_SIZE_CHARS // 200))]
+    return "\n".join(parts)[:size]
+
+
+def page_text(gz_path: str) -> str:
+    text, _ = filter_sections(clean_mandoc_artifacts(get_manpage_text(gz_path)))
+    return text
+
+
+def best_of(fn, text: str, repeat: int) -> tuple[float, list[str]]:
+    best = float("inf")
+    chunks: list[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        chunks = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", help=".gz manpages to benchmark")
+    parser.add_argument("--sizes", default=f"100000,250000,{MAX_MANPAGE_CHARS}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = [(os.path.basename(p), page_text(p)) for p in args.files]
+    else:
+        rng = random.Random(args.seed)
+        pages = [
+            (f"synthetic-{n}", synthetic_page(n, rng))
+            for n in (int(s) for s in args.sizes.split(","))
+        ]
+
+    print(
+        f"{'page':<30} {'chars':>8} {'chunks':>6} {'before':>10} {'after':>10} {'speedup':>8}"
+    )
+    for name, text in pages:
+        old_t, old = best_of(renumbering_chunk_text, text, args.repeat)
+        new_t, new = best_of(chunk_text, text, args.repeat)
+        if old != new:
+            sys.exit(f"{name}: chunk_text output differs from the previous version")
+        print(
+            f"{name:<30} {len(text):>8} {len(new):>6} {old_t * 1000:>8.1f}ms "
+            f"{new_t * 1000:>8.1f}ms {old_t / new_t:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
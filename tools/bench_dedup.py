@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Benchmark postprocess.dedup_options on pages with many options.
+
+Compares the indexed dedup_options with the original all-pairs version
+(kept below as ``all_pairs_dedup``) and checks that both return the same
+options.
+
+By default runs on synthetic pages shaped like ffmpeg/gcc/mpv: mostly
+distinct long flags, a share of short aliases and duplicate entries, and
+descriptions that mention other flags. With --db, runs on the pages with
+the most options in an explainshell DB instead.
+
+Usage:
+    python tools/bench_dedup.py
+    python tools/bench_dedup.py --sizes 500,1000,2000 --repeat 5
+    python tools/bench_dedup.py --db explainshell.db --pages 10
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from explainshell.extraction.postprocess import dedup_options
+from explainshell.models import Option
+
+
+def all_pairs_dedup(options: list[Option]) -> tuple[list[Option], int]:
+    """dedup_options before the flag index: every option against every other."""
+    flags_list = [frozenset(o.short + o.long) for o in options]
+    removed: set[int] = set()
+    seen: dict[frozenset[str], int] = {}
+    for i, fi in enumerate(flags_list):
+        if not fi:
+            continue
+        if fi in seen:
+            if len(options[i].text) > len(options[seen[fi]].text):
+                options[seen[fi]] = options[i]
+            removed.add(i)
+        else:
+            seen[fi] = i
+
+    def _mentions(desc: str, flags: frozenset[str]) -> bool:
+        for flag in flags:
+            pattern = r"(?<![a-zA-Z0-9\-])" + re.escape(flag) + r"(?![a-zA-Z0-9\-])"
+            if re.search(pattern, desc):
+                return True
+        return False
+
+    for i, fi in enumerate(flags_list):
+        if i in removed or not fi:
+            continue
+        best_j, best_extra = None, 0
+        for j, fj in enumerate(flags_list):
+            if j == i or j in removed or not fj:
+                continue
+            if fi < fj and _mentions(options[i].text, fj - fi):
+                extra = len(fj - fi)
+                if best_j is None or extra < best_extra:
+                    best_j, best_extra = j, extra
+        if best_j is not None:
+            sup, sub = options[best_j], options[i]
+            if len(sub.text) > len(sup.text):
+                options[best_j] = sup.model_copy(
+                    update={"text": sub.text, "meta": sub.meta}
+                )
+            removed.add(i)
+    return [o for idx, o in enumerate(options) if idx not in removed], len(removed)
+
+
+def synthetic_page(n: int, rng: random.Random) -> list[Option]:
+    """A page of *n* options, about 10% of them duplicates or subsets."""
+    longs = [f"--opt-{i}" for i in range(n)]
+    shorts = [f"-{chr(ord('a') + i % 26)}{i // 26 or ''}" for i in range(n)]
+    options = []
+    for i in range(n):
+        mentioned = rng.sample(longs, 2)
+        text = (
+            f"Set option {i}. See also {mentioned[0]} and {mentioned[1]}. "
+            + "Lorem ipsum dolor sit amet. " * rng.randint(1, 6)
+        )
+        short = [shorts[i]] if rng.random() < 0.3 else []
+        options.append(Option(text=text, short=short, long=[longs[i]]))
+    for _ in range(n // 10):
+        i = rng.randrange(n)
+        sup = options[i]
+        if rng.random() < 0.5:
+            # Exact duplicate from a second chunk.
+            options.append(sup.model_copy())
+        else:
+            # Subset entry cross-referencing the superset's other flags.
+            flag = sup.long[0]
+            text = f"Same as {' '.join(sup.short) or flag}."
+            options.append(Option(text=text, long=[flag]))
+    rng.shuffle(options)
+    return options
+
+
+def db_pages(db_path: str, n_pages: int) -> list[tuple[str, list[Option]]]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = conn.execute(
+        "SELECT source, options FROM parsed_manpages "
+        "ORDER BY json_array_length(options) DESC LIMIT ?",
+        (n_pages,),
+    ).fetchall()
+    conn.close()
+    return [
+        (source, [Option.model_validate(o) for o in json.loads(options)])
+        for source, options in rows
+    ]
+
+
+def best_of(fn, options: list[Option], repeat: int) -> tuple[float, tuple]:
+    best = float("inf")
+    result: tuple = ()
+    for _ in range(repeat):
+        # dedup_options rewrites entries in place; give each run a fresh list.
+        opts = list(options)
+        t0 = time.perf_counter()
+        result = fn(opts)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100,500,1000,2000")
+    parser.add_argument("--db", help="benchmark the largest pages of this DB")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.db:
+        pages = db_pages(args.db, args.pages)
+    else:
+        rng = random.Random(args.seed)
+        pages = [
+            (f"synthetic-{n}", synthetic_page(n, rng))
+            for n in (int(s) for s in args.sizes.split(","))
+        ]
+
+    print(
+        f"{'page':<40} {'options':>8} {'all-pairs':>11} {'indexed':>11} {'speedup':>8}"
+    )
+    for name, options in pages:
+        old_t, old = best_of(all_pairs_dedup, options, args.repeat)
+        new_t, new = best_of(dedup_options, options, args.repeat)
+        if old != new:
+            sys.exit(f"{name}: indexed dedup_options differs from all-pairs")
+        print(
+            f"{name:<40} {len(options):>8} {old_t * 1000:>9.1f}ms "
+            f"{new_t * 1000:>9.1f}ms {old_t / new_t:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
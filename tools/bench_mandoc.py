@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark rendering a release directory with mandoc, per page vs batched.
+
+Renders every page under DIR once with one mandoc process per page (what
+``get_manpage_text`` does with MANDOC_BATCH_SIZE unset) and once through a
+``MandocPool``, checks that both produce the same markdown (and fail on the
+same pages), and reports pages/sec for each.
+
+Usage:
+    python tools/bench_mandoc.py manpages/ubuntu/26.04/1
+    python tools/bench_mandoc.py manpages/ubuntu/26.04 --batch-size 64 --workers 4
+    python tools/bench_mandoc.py manpages/arch --limit 2000 --mandoc ~/mandoc/mandoc
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from explainshell import config
+from explainshell.errors import ExtractionError
+from explainshell.extraction.mandoc import MandocPool, render_page
+
+
+def render_all(render, gz_paths: list[str], workers: int) -> tuple[float, list]:
+    """Render *gz_paths* on *workers* threads; (seconds, text or error per page)."""
+
+    def _one(gz_path: str) -> str | ExtractionError:
+        try:
+            return render(gz_path)
+        except ExtractionError as e:
+            return e
+
+    t0 = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(_one, gz_paths))
+    return time.perf_counter() - t0, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("dir", help="directory of .gz manpages (searched recursively)")
+    parser.add_argument("--mandoc", default=config.MANDOC_PATH)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="concurrent mandoc processes"
+    )
+    parser.add_argument("--limit", type=int, help="only the first N pages")
+    args = parser.parse_args()
+
+    gz_paths = sorted(
+        p
+        for p in glob.glob(os.path.join(args.dir, "**", "*.gz"), recursive=True)
+        if not os.path.islink(p)
+    )[: args.limit]
+    if not gz_paths:
+        sys.exit(f"no .gz files under {args.dir}")
+
+    old_t, old = render_all(
+        lambda p: render_page(p, args.mandoc), gz_paths, args.workers
+    )
+
+    pool = MandocPool(args.mandoc, batch_size=args.batch_size, workers=args.workers)
+    pool.prefetch(gz_paths[: args.batch_size * args.workers])
+
+    def _batched(gz_path: str) -> str:
+        # Keep the pool a few batches ahead of the renders, as the runner does.
+        i = index[gz_path]
+        if i % args.batch_size == 0:
+            ahead = i + args.batch_size * args.workers
+            pool.prefetch(gz_paths[ahead : ahead + args.batch_size])
+        return pool.render(gz_path)
+
+    index = {p: i for i, p in enumerate(gz_paths)}
+    new_t, new = render_all(_batched, gz_paths, args.workers)
+    pool.close()
+
+    mismatched = [
+        p
+        for p, a, b in zip(gz_paths, old, new)
+        if (a if isinstance(a, str) else None) != (b if isinstance(b, str) else None)
+    ]
+    failed = sum(1 for r in old if not isinstance(r, str))
+
+    print(f"{len(gz_paths)} pages ({failed} failing to render), {args.workers} workers")
+    print(f"{'mode':<24} {'seconds':>9} {'pages/sec':>11}")
+    print(f"{'one page per process':<24} {old_t:>9.2f} {len(gz_paths) / old_t:>11.1f}")
+    print(
+        f"{f'batches of {args.batch_size}':<24} {new_t:>9.2f} "
+        f"{len(gz_paths) / new_t:>11.1f}"
+    )
+    print(
+        f"speedup {old_t / new_t:.1f}x; {pool.stats.batches} mandoc runs, "
+        f"{pool.stats.fallbacks} page(s) re-rendered alone"
+    )
+    if mismatched:
+        sys.exit(f"{len(mismatched)} page(s) differ, e.g. {mismatched[0]}")
+
+
+if __name__ == "__main__":
+    main()
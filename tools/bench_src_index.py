@@ -4,15 +4,25 @@
 Measures the three hot-path queries that filter on mappings.src (the queries
 hit by every /explain?cmd= request) with and without the index.
 
+With --releases, instead builds synthetic DBs holding the same command names
+in 2, 5, 10, ... releases and compares distro-scoped lookups done the old way
+(fetch every dst for src, filter in Python) with lookups on the
+idx_mappings_partition (distro, release, src) index.
+
 Usage:
     python tools/bench_src_index.py <db_path>
     python tools/bench_src_index.py <db_path> --iterations 5000
+    python tools/bench_src_index.py --releases 2,5,10
+    python tools/bench_src_index.py --releases 2,5,10 --names 20000
 """
 
 import argparse
+import datetime
+import os
 import random
 import sqlite3
 import statistics
+import tempfile
 import time
 
 # ---------------------------------------------------------------------------
@@ -43,6 +53,11 @@ WHERE m.src = ?
 """
 
 
+QUERY_FIND_PARTITION = (
+    "SELECT dst, score FROM mappings WHERE distro = ? AND release = ? AND src = ?"
+)
+
+
 def build_query_in(n: int) -> str:
     placeholders = ",".join("?" * n)
     return f"SELECT DISTINCT dst FROM mappings WHERE src IN ({placeholders})"
@@ -189,11 +204,144 @@ def run_suite(
     return results
 
 
+# ---------------------------------------------------------------------------
+# --releases: partitioned (distro, release, src) lookups vs. global src lookup
+# ---------------------------------------------------------------------------
+
+
+def build_synthetic_db(db_path: str, n_releases: int, n_names: int) -> list[str]:
+    """Create a DB with *n_names* commands (each with one alias) in each of
+    *n_releases* ubuntu releases. Return the release names."""
+    from explainshell.store import Store
+
+    Store.create(db_path).close()
+    releases = [f"{10 + i}.04" for i in range(n_releases)]
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    conn = sqlite3.connect(db_path)
+    for release in releases:
+        sources = [f"ubuntu/{release}/1/cmd{i}.1.gz" for i in range(n_names)]
+        conn.executemany(
+            "INSERT INTO manpages(source, data, generated_at, generator) "
+            "VALUES (?, x'', ?, 'bench')",
+            [(src, now) for src in sources],
+        )
+        conn.executemany(
+            "INSERT INTO parsed_manpages(source, name) VALUES (?, ?)",
+            [(src, f"cmd{i}") for i, src in enumerate(sources)],
+        )
+        conn.executemany(
+            "INSERT INTO mappings(src, dst, score) VALUES (?, ?, ?)",
+            [(f"cmd{i}", src, 10) for i, src in enumerate(sources)]
+            + [(f"alias{i}", src, 1) for i, src in enumerate(sources)],
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return releases
+
+
+def bench_scoped_global(
+    conn: sqlite3.Connection, params_list: list[tuple], iterations: int
+) -> list[float]:
+    """The pre-partition scoped lookup: every dst for src, filtered in Python."""
+    times: list[float] = []
+    for i in range(iterations):
+        distro, release, src = params_list[i % len(params_list)]
+        prefix = f"{distro}/{release}/"
+        start = time.perf_counter()
+        rows = conn.execute(QUERY_FIND, (src,)).fetchall()
+        [row for row in rows if row[0].startswith(prefix)]
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_find_man_page(
+    store: object, params_list: list[tuple], iterations: int
+) -> list[float]:
+    """End-to-end Store.find_man_page with distro/release set."""
+    times: list[float] = []
+    for i in range(iterations):
+        distro, release, src = params_list[i % len(params_list)]
+        start = time.perf_counter()
+        store.find_man_page(src, distro=distro, release=release)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_partition_bench(
+    release_counts: list[int], n_names: int, iterations: int
+) -> None:
+    from explainshell.store import Store
+
+    summary = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_releases in release_counts:
+            db_path = os.path.join(tmp, f"bench-{n_releases}.db")
+            releases = build_synthetic_db(db_path, n_releases, n_names)
+            params = [
+                ("ubuntu", random.choice(releases), f"cmd{random.randrange(n_names)}")
+                for _ in range(min(iterations, 1000))
+            ]
+
+            print(f"\n{'=' * 60}")
+            print(
+                f"  {n_releases} releases x {n_names:,} names "
+                f"({n_releases * n_names * 2:,} mappings)"
+            )
+            print(f"{'=' * 60}")
+            conn = sqlite3.connect(db_path)
+            conn.execute("SELECT COUNT(*) FROM mappings").fetchone()
+            glob = report(
+                "global src lookup + filter",
+                bench_scoped_global(conn, params, iterations),
+            )
+            part = report(
+                "partition lookup",
+                bench_query(conn, QUERY_FIND_PARTITION, params, iterations),
+            )
+            conn.close()
+
+            store = Store(db_path, read_only=True)
+            try:
+                e2e = report(
+                    "Store.find_man_page (scoped)",
+                    bench_find_man_page(store, params, iterations),
+                )
+            finally:
+                store.close()
+            summary.append((n_releases, glob, part, e2e))
+
+    print(f"\n{'=' * 60}")
+    print("  SUMMARY (mean per scoped lookup)")
+    print(f"{'=' * 60}")
+    print(
+        f"  {'releases':>8}  {'global+filter':>14}  {'partition':>10}  {'find_man_page':>14}"
+    )
+    for n_releases, glob, part, e2e in summary:
+        print(
+            f"  {n_releases:>8}  {glob['mean_us']:>12.1f}us  "
+            f"{part['mean_us']:>8.1f}us  {e2e['mean_us']:>12.1f}us"
+        )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Benchmark impact of idx_mappings_src index"
     )
-    parser.add_argument("db_path", help="Path to the explainshell SQLite database")
+    parser.add_argument(
+        "db_path", nargs="?", help="Path to the explainshell SQLite database"
+    )
+    parser.add_argument(
+        "--releases",
+        help="Comma-separated release counts to benchmark partitioned lookups "
+        "on synthetic DBs (e.g. 2,5,10); db_path is not used",
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=5000,
+        help="Command names per release for --releases (default: 5000)",
+    )
     parser.add_argument(
         "--iterations",
         "-n",
@@ -203,6 +351,13 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    if args.releases:
+        counts = [int(n) for n in args.releases.split(",")]
+        run_partition_bench(counts, args.names, args.iterations)
+        return
+    if not args.db_path:
+        parser.error("db_path is required unless --releases is given")
+
     conn = sqlite3.connect(args.db_path)
     conn.row_factory = sqlite3.Row
     # Match production settings
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Check the native NAME-section parser against lexgrog on a set of pages.
+
+For every .gz page under the given paths (tests/manpages by default),
+compares ``get_synopsis_and_aliases`` with NAME_PARSER=native against the
+reference: lexgrog's answer, or with --db the synopsis and aliases stored
+in an explainshell DB (which earlier extractions got from lexgrog). Alias
+order is ignored. Prints one line per page and a summary, and exits
+non-zero if any page differs.
+
+Usage:
+    python tools/name_conformance.py
+    python tools/name_conformance.py manpages/ubuntu/26.04/1 --only-mismatches
+    python tools/name_conformance.py tests/manpages --db tests/e2e/e2e.db
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sqlite3
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from explainshell import config, manpage
+
+_DEFAULT_PATHS = [os.path.join(os.path.dirname(__file__), "..", "tests", "manpages")]
+
+
+def parse_with(parser: str, gz_path: str):
+    with patch.object(config, "NAME_PARSER", parser):
+        try:
+            return manpage.get_synopsis_and_aliases(gz_path)
+        except Exception as e:
+            return f"error: {e}"
+
+
+def db_reference(db_path: str):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    rows = conn.execute("SELECT source, synopsis, aliases FROM parsed_manpages")
+    stored = {
+        source: (synopsis, [tuple(a) for a in json.loads(aliases)])
+        for source, synopsis, aliases in rows
+    }
+    conn.close()
+    return lambda gz_path: stored.get(config.source_from_path(gz_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", help="pages or directories")
+    parser.add_argument("--db", help="compare against the rows stored in this DB")
+    parser.add_argument("--only-mismatches", action="store_true")
+    args = parser.parse_args()
+
+    if args.db:
+        reference = db_reference(args.db)
+        ref_name = os.path.basename(args.db)
+    elif shutil.which("lexgrog"):
+        reference = lambda gz_path: parse_with("lexgrog", gz_path)  # noqa: E731
+        ref_name = "lexgrog"
+    else:
+        sys.exit("lexgrog not found; install man-db or pass --db")
+
+    gz_paths: list[str] = []
+    for path in args.paths or _DEFAULT_PATHS:
+        if os.path.isdir(path):
+            gz_paths += glob.glob(os.path.join(path, "**", "*.gz"), recursive=True)
+        else:
+            gz_paths.append(path)
+
+    matched = mismatched = missing = 0
+    for gz_path in sorted(gz_paths):
+        expected = reference(gz_path)
+        if expected is None:
+            missing += 1
+            continue
+        native = parse_with("native", gz_path)
+        same = (
+            not isinstance(native, str)
+            and not isinstance(expected, str)
+            and manpage.same_synopsis_and_aliases(native, expected)
+        )
+        if same:
+            matched += 1
+            if not args.only_mismatches:
+                print(f"ok        {config.source_from_path(gz_path)}")
+            continue
+        mismatched += 1
+        print(f"MISMATCH  {config.source_from_path(gz_path)}")
+        print(f"    native:  {native!r}")
+        print(f"    {ref_name}: {expected!r}")
+
+    total = matched + mismatched
+    print(f"\n{matched}/{total} page(s) match {ref_name}", end="")
+    print(f" ({missing} not in {ref_name})" if missing else "")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()